@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Profile of resolver alignment, reporting the share spent tokenizing.
+
+Chunks a synthetic document the way Annotator does, fabricates model
+extractions for each chunk (mostly verbatim mentions plus a few paraphrases
+that need fuzzy alignment) and runs Resolver.align on every chunk under
+cProfile.
+
+Usage:
+  python benchmarks/align_profile.py
+  python benchmarks/align_profile.py --sentences 2000 --top 15
+"""
+
+import argparse
+import cProfile
+import pstats
+import random
+
+from langextract import chunking
+from langextract import resolver as resolver_lib
+from langextract.core import data
+from langextract.core import tokenizer
+
+_SENTENCES = (
+    "Serum IL-6 was elevated in 42 patients with sepsis.",
+    "CRP levels above 10 mg/L predicted poor outcome.",
+    "Troponin I and BNP were measured at admission.",
+    "HbA1c decreased after 12 weeks of metformin therapy.",
+    "Procalcitonin guided antibiotic discontinuation.",
+)
+
+
+def build_workload(
+    num_sentences: int, max_char_buffer: int, fuzzy_rate: float, seed: int
+):
+  """Returns the document and per-chunk extractions to align."""
+  rng = random.Random(seed)
+  text = "\n".join(rng.choice(_SENTENCES) for _ in range(num_sentences))
+  document = data.Document(text=text, document_id="bench")
+  chunks = list(
+      chunking.ChunkIterator(
+          document.tokenized_text,
+          max_char_buffer,
+          tokenizer_impl=tokenizer.RegexTokenizer(),
+          document=document,
+      )
+  )
+  workload = []
+  for chunk in chunks:
+    words = chunk.chunk_text.split()
+    extractions = []
+    for i in range(0, len(words) - 2, 4):
+      mention = " ".join(words[i : i + 2])
+      if rng.random() < fuzzy_rate:
+        mention += " levels"  # Paraphrase that forces fuzzy alignment.
+      extractions.append(data.Extraction("biomarker", mention))
+    workload.append((chunk, extractions))
+  return document, workload
+
+
+def run(document, workload) -> int:
+  """Aligns every chunk and returns the number of aligned extractions."""
+  resolver = resolver_lib.Resolver()
+  aligned = 0
+  for chunk, extractions in workload:
+    for extraction in resolver.align(
+        [
+            data.Extraction(e.extraction_class, e.extraction_text)
+            for e in extractions
+        ],
+        chunk.chunk_text,
+        chunk.token_interval.start_index,
+        chunk.char_interval.start_pos,
+        document_tokenized_text=document.tokenized_text,
+    ):
+      aligned += extraction.char_interval is not None
+  return aligned
+
+
+def _function_stats(stats: pstats.Stats, fn) -> tuple[int, float]:
+  """Returns (call count, cumulative seconds) recorded for a function."""
+  code = fn.__code__
+  key = (code.co_filename, code.co_firstlineno, code.co_name)
+  calls, _, _, cumtime, _ = stats.stats.get(key, (0, 0, 0, 0.0, {}))  # pytype: disable=attribute-error
+  return calls, cumtime
+
+
+def main():
+  """Profiles alignment and prints the tokenizer share."""
+  parser = argparse.ArgumentParser(description="Resolver.align profile")
+  parser.add_argument("--sentences", type=int, default=500)
+  parser.add_argument("--max-char-buffer", type=int, default=500)
+  parser.add_argument(
+      "--fuzzy-rate",
+      type=float,
+      default=0.02,
+      help="Fraction of extractions that need fuzzy alignment",
+  )
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--top", type=int, default=0, help="Print top N funcs")
+  args = parser.parse_args()
+
+  document, workload = build_workload(
+      args.sentences, args.max_char_buffer, args.fuzzy_rate, args.seed
+  )
+  profiler = cProfile.Profile()
+  aligned = profiler.runcall(run, document, workload)
+
+  stats = pstats.Stats(profiler)
+  total = stats.total_tt
+  tokenize_calls, tokenize_s = _function_stats(
+      stats, tokenizer.RegexTokenizer.tokenize.__wrapped__
+  )
+  _, fuzzy_s = _function_stats(
+      stats, resolver_lib.WordAligner._fuzzy_align_extraction  # pylint: disable=protected-access
+  )
+  exact_s = total - fuzzy_s
+  print(
+      f"{len(workload)} chunks,"
+      f" {sum(len(e) for _, e in workload)} extractions, {aligned} aligned"
+  )
+  print(f"align total:     {total * 1000:9.1f} ms")
+  print(f"  fuzzy scan:    {fuzzy_s * 1000:9.1f} ms")
+  print(f"  remainder:     {exact_s * 1000:9.1f} ms")
+  print(
+      f"tokenizer:       {tokenize_s * 1000:9.1f} ms in {tokenize_calls} calls"
+      f" ({tokenize_s / total:.0%} of align,"
+      f" {tokenize_s / exact_s:.0%} of remainder)"
+  )
+  if args.top:
+    stats.sort_stats("cumulative").print_stats(args.top)
+
+
+if __name__ == "__main__":
+  main()
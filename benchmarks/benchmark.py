@@ -27,6 +27,10 @@ Usage:
   python benchmarks/benchmark.py --model gemini-2.5-flash
   python benchmarks/benchmark.py --model gemma2:2b  # Local model via Ollama
 
+  # Record live model outputs once, then replay them offline
+  python benchmarks/benchmark.py --replay rec.jsonl --record
+  python benchmarks/benchmark.py --replay rec.jsonl --latency-scale 0
+
   # Generate comparison plots from existing results
   python benchmarks/benchmark.py --compare
 
@@ -71,6 +75,22 @@ class BenchmarkRunner:
     self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     self.git_info = utils.get_git_info()
     self.tokenizer = core.tokenizer.RegexTokenizer()
+    self.replay_params: dict[str, Any] | None = None
+
+  def set_replay(self, path: str, record: bool, latency_scale: float):
+    """Route extraction through the record/replay provider.
+
+    Args:
+      path: Recording file.
+      record: Record live outputs instead of replaying them.
+      latency_scale: Multiplier for the recorded latency when replaying.
+    """
+    self.replay_params = {
+        "recording_path": path,
+        "mode": "record" if record else "replay",
+        "latency": {"distribution": "recorded", "scale": latency_scale},
+    }
+    print(f"Replay mode: {self.replay_params['mode']} ({path})")
 
   def set_tokenizer(self, tokenizer_type: str):
     """Set the tokenizer to use."""
@@ -198,7 +218,9 @@ class BenchmarkRunner:
           start_time = time.time()
           result = langextract.extract(
               text_or_documents=test_text,
-              model_id=model_id,
+              model_id=(
+                  f"replay:{model_id}" if self.replay_params else model_id
+              ),
               api_key=GEMINI_API_KEY,
               prompt_description=extraction_config["prompt"],
               examples=[example],
@@ -206,6 +228,7 @@ class BenchmarkRunner:
               temperature=config.MODELS.default_temperature,
               extraction_passes=config.MODELS.default_extraction_passes,
               tokenizer=self.tokenizer,
+              language_model_params=self.replay_params,
           )
           elapsed = time.time() - start_time
           break
@@ -298,7 +321,11 @@ class BenchmarkRunner:
 
         if result.get("success"):
           test_count += 1
-          if test_count % 3 == 0:
+          replaying = (
+              self.replay_params is not None
+              and self.replay_params["mode"] == "replay"
+          )
+          if test_count % 3 == 0 and not replaying:
             print(
                 "   Rate limit delay"
                 f" ({config.MODELS.gemini_rate_limit_delay}s)..."
@@ -389,6 +416,27 @@ def main():
       help="Tokenizer to use (default: regex)",
   )
 
+  parser.add_argument(
+      "--replay",
+      type=str,
+      default=None,
+      metavar="PATH",
+      help="Replay model outputs from a recording instead of calling the API",
+  )
+
+  parser.add_argument(
+      "--record",
+      action="store_true",
+      help="With --replay, call the live model and record its outputs",
+  )
+
+  parser.add_argument(
+      "--latency-scale",
+      type=float,
+      default=1.0,
+      help="With --replay, multiplier for the recorded latency (default: 1.0)",
+  )
+
   parser.add_argument(
       "--compare",
       action="store_true",
@@ -423,7 +471,8 @@ def main():
     return
 
   model_to_test = args.model or config.MODELS.default_model
-  if "gemini" in model_to_test.lower() and not GEMINI_API_KEY:
+  needs_api = args.replay is None or args.record
+  if needs_api and "gemini" in model_to_test.lower() and not GEMINI_API_KEY:
     print(
         f"Error: {model_to_test} requires GEMINI_API_KEY or LANGEXTRACT_API_KEY"
     )
@@ -431,6 +480,8 @@ def main():
 
   runner = BenchmarkRunner()
   runner.set_tokenizer(args.tokenizer)
+  if args.replay:
+    runner.set_replay(args.replay, args.record, args.latency_scale)
   runner.run_diverse_benchmark([args.model] if args.model else None)
 
 
@@ -26,19 +26,24 @@ from typing import Any, Dict
 
 from langextract import visualization
 from langextract.extraction import extract as extract_func
+from langextract.extraction import extract_async as extract_async_func
 
 __all__ = [
     # Public convenience functions (thin wrappers)
     "extract",
+    "extract_async",
     "visualize",
     # Submodules exposed lazily on attribute access for ergonomics:
     "annotation",
+    "cascade",
     "data",
     "providers",
     "schema",
     "inference",
     "factory",
+    "resilience",
     "resolver",
+    "response_cache",
     "prompting",
     "io",
     "visualization",
@@ -55,6 +60,11 @@ def extract(*args: Any, **kwargs: Any):
   return extract_func(*args, **kwargs)
 
 
+async def extract_async(*args: Any, **kwargs: Any):
+  """Top-level API: await lx.extract_async(...)."""
+  return await extract_async_func(*args, **kwargs)
+
+
 def visualize(*args: Any, **kwargs: Any):
   """Top-level API: lx.visualize(...)."""
   return visualization.visualize(*args, **kwargs)
@@ -63,6 +73,7 @@ def visualize(*args: Any, **kwargs: Any):
 # PEP 562 lazy loading
 _LAZY_MODULES = {
     "annotation": "langextract.annotation",
+    "cascade": "langextract.cascade",
     "chunking": "langextract.chunking",
     "data": "langextract.data",
     "data_lib": "langextract.data_lib",
@@ -74,7 +85,9 @@ _LAZY_MODULES = {
     "progress": "langextract.progress",
     "prompting": "langextract.prompting",
     "providers": "langextract.providers",
+    "resilience": "langextract.resilience",
     "resolver": "langextract.resolver",
+    "response_cache": "langextract.response_cache",
     "schema": "langextract.schema",
     "tokenizer": "langextract.tokenizer",
     "visualization": "langextract.visualization",
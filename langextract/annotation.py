@@ -25,24 +25,73 @@ Usage example:
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import collections
-from collections.abc import Iterable, Iterator
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+import concurrent.futures
 import time
-from typing import DefaultDict
+from typing import Any, Callable, DefaultDict
 
 from absl import logging
 
+from langextract import cascade
 from langextract import chunking
 from langextract import progress
 from langextract import prompting
+from langextract import resilience
 from langextract import resolver as resolver_lib
+from langextract import response_cache
 from langextract.core import base_model
 from langextract.core import data
 from langextract.core import exceptions
 from langextract.core import format_handler as fh
+from langextract.core import streaming
 from langextract.core import tokenizer as tokenizer_lib
 
 
+def _char_span(extraction: data.Extraction) -> tuple[int, int] | None:
+  """Returns an extraction's (start, end) char positions, or None if unset."""
+  interval = extraction.char_interval
+  if interval is None or interval.start_pos is None or interval.end_pos is None:
+    return None
+  return interval.start_pos, interval.end_pos
+
+
+class _IntervalIndex:
+  """Overlap index over char spans with O(log n) insert and query.
+
+  Spans are keyed by start position in a Fenwick tree holding the maximum end
+  position per prefix. A query span (qs, qe) overlaps a stored span (s, e)
+  exactly when s < qe and qs < e, so it suffices to check whether the largest
+  end among spans starting before qe exceeds qs. Stored spans may overlap one
+  another. All start positions must be known up front.
+  """
+
+  def __init__(self, starts: Iterable[int]):
+    self._starts = sorted(set(starts))
+    self._max_end: list[int | None] = [None] * (len(self._starts) + 1)
+
+  def add(self, start: int, end: int) -> None:
+    """Adds a span whose start was passed to the constructor."""
+    i = bisect.bisect_left(self._starts, start) + 1
+    while i < len(self._max_end):
+      current = self._max_end[i]
+      if current is None or current < end:
+        self._max_end[i] = end
+      i += i & -i
+
+  def overlaps(self, start: int, end: int) -> bool:
+    """Returns True if (start, end) overlaps any stored span."""
+    i = bisect.bisect_left(self._starts, end)
+    while i > 0:
+      current = self._max_end[i]
+      if current is not None and current > start:
+        return True
+      i -= i & -i
+    return False
+
+
 def _merge_non_overlapping_extractions(
     all_extractions: list[Iterable[data.Extraction]],
 ) -> list[data.Extraction]:
@@ -51,6 +100,7 @@ def _merge_non_overlapping_extractions(
   When extractions from different passes overlap in their character positions,
   the extraction from the earlier pass is kept (first-pass wins strategy).
   Only non-overlapping extractions from later passes are added to the result.
+  Extractions without character positions never overlap and are always kept.
 
   Args:
     all_extractions: List of extraction iterables from different sequential
@@ -66,20 +116,26 @@ def _merge_non_overlapping_extractions(
   if len(all_extractions) == 1:
     return list(all_extractions[0])
 
-  merged_extractions = list(all_extractions[0])
+  passes = [list(pass_extractions) for pass_extractions in all_extractions]
+  spans = [
+      [_char_span(e) for e in pass_extractions] for pass_extractions in passes
+  ]
+  index = _IntervalIndex(
+      span[0] for pass_spans in spans for span in pass_spans if span
+  )
 
-  for pass_extractions in all_extractions[1:]:
-    for extraction in pass_extractions:
-      overlaps = False
-      if extraction.char_interval is not None:
-        for existing_extraction in merged_extractions:
-          if existing_extraction.char_interval is not None:
-            if _extractions_overlap(extraction, existing_extraction):
-              overlaps = True
-              break
+  merged_extractions = passes[0]
+  for span in spans[0]:
+    if span is not None:
+      index.add(*span)
 
-      if not overlaps:
+  for pass_extractions, pass_spans in zip(passes[1:], spans[1:]):
+    for extraction, span in zip(pass_extractions, pass_spans):
+      if span is None:
+        merged_extractions.append(extraction)
+      elif not index.overlaps(*span):
         merged_extractions.append(extraction)
+        index.add(*span)
 
   return merged_extractions
 
@@ -160,6 +216,131 @@ def _document_chunk_iterator(
     yield from chunk_iter
 
 
+def _default_pipeline_depth(
+    extraction_passes: int, max_workers: int | None
+) -> int:
+  """Returns a pipeline depth that overlaps every pass of a batch.
+
+  A single pass runs in lock-step. Otherwise up to extraction_passes batches
+  are kept in flight, but never more than max_workers.
+  """
+  if extraction_passes <= 1:
+    return 0
+  if max_workers:
+    return min(extraction_passes, max_workers)
+  return extraction_passes
+
+
+class _DocumentTracker:
+  """Tracks document order and extractions for streaming, in-order emission.
+
+  Documents are registered lazily as chunking reads them, and extractions are
+  attributed by document ID and pass number as chunks finish. Because chunks
+  are processed in document order, every document registered before the one
+  owning the most recently processed chunk is complete, even when chunking has
+  read ahead of inference. With several passes, each document's per-pass
+  extractions are merged on emission.
+  """
+
+  def __init__(self, extraction_passes: int = 1, debug: bool = False):
+    self._extraction_passes = extraction_passes
+    self._debug = debug
+    self._order: list[str] = []
+    self._pos_by_id: dict[str, int] = {}
+    self._text_by_id: dict[str, str] = {}
+    self._extractions: DefaultDict[str, list[list[data.Extraction]]] = (
+        collections.defaultdict(
+            lambda: [[] for _ in range(self._extraction_passes)]
+        )
+    )
+    self._next_emit_idx = 0
+
+  def capture(
+      self, documents: Iterable[data.Document]
+  ) -> Iterator[data.Document]:
+    """Captures document order and text lazily as chunks are produced.
+
+    Args:
+      documents: Source documents.
+
+    Yields:
+      The same documents, unchanged.
+
+    Raises:
+      InvalidDocumentError: If a document ID is seen more than once.
+    """
+    for document in documents:
+      document_id = document.document_id
+      if document_id in self._text_by_id:
+        raise exceptions.InvalidDocumentError(
+            f"Duplicate document_id: {document_id}"
+        )
+      self._pos_by_id[document_id] = len(self._order)
+      self._order.append(document_id)
+      self._text_by_id[document_id] = document.text or ""
+      yield document
+
+  def add(
+      self,
+      document_id: str,
+      extractions: Iterable[data.Extraction],
+      pass_num: int = 0,
+  ) -> None:
+    """Appends a chunk's extractions from one pass to its document."""
+    self._extractions[document_id][pass_num].extend(extractions)
+
+  def emit(
+      self, last_chunk: chunking.TextChunk | None
+  ) -> Iterator[data.AnnotatedDocument]:
+    """Yields documents that are guaranteed complete.
+
+    Args:
+      last_chunk: The most recently processed chunk. Its document is retained
+        for additional extractions. If None, emits all remaining documents.
+
+    Yields:
+      Completed documents in input order.
+    """
+    if last_chunk is None:
+      limit = len(self._order)
+    else:
+      limit = self._pos_by_id[last_chunk.document_id]
+    while self._next_emit_idx < limit:
+      document_id = self._order[self._next_emit_idx]
+      yield data.AnnotatedDocument(
+          document_id=document_id,
+          extractions=self._merge_passes(document_id),
+          text=self._text_by_id.pop(document_id, ""),
+      )
+      self._pos_by_id.pop(document_id, None)
+      self._next_emit_idx += 1
+
+  def _merge_passes(self, document_id: str) -> list[data.Extraction]:
+    """Pops a document's extractions, merging passes first-pass-wins."""
+    all_pass_extractions = self._extractions.pop(document_id, None)
+    if all_pass_extractions is None:
+      return []
+    if self._extraction_passes == 1:
+      return all_pass_extractions[0]
+
+    merged_extractions = _merge_non_overlapping_extractions(
+        all_pass_extractions
+    )
+    if self._debug:
+      total_extractions = sum(
+          len(extractions) for extractions in all_pass_extractions
+      )
+      logging.info(
+          "Document %s: Merged %d extractions from %d passes into "
+          "%d non-overlapping extractions.",
+          document_id,
+          total_extractions,
+          self._extraction_passes,
+          len(merged_extractions),
+      )
+    return merged_extractions
+
+
 class Annotator:
   """Annotates documents with extractions using a language model."""
 
@@ -217,6 +398,11 @@ class Annotator:
       context_window_chars: int | None = None,
       show_progress: bool = True,
       tokenizer: tokenizer_lib.Tokenizer | None = None,
+      pipeline_depth: int | None = None,
+      max_batch_chars: int | None = None,
+      max_batch_tokens: int | None = None,
+      stream: bool = False,
+      stream_limits: streaming.StreamLimits | None = None,
       **kwargs,
   ) -> Iterator[data.AnnotatedDocument]:
     """Annotates a sequence of documents with NLP extractions.
@@ -244,27 +430,55 @@ class Annotator:
         resolution across chunk boundaries. Defaults to None (disabled).
       show_progress: Whether to show progress bar. Defaults to True.
       tokenizer: Optional tokenizer to use. If None, uses default tokenizer.
+      pipeline_depth: Number of batches that may be in flight with the
+        language model while earlier batches are resolved and aligned. 0 runs
+        inference and alignment in lock-step. Defaults to extraction_passes,
+        capped at max_workers when it is passed, so all passes over a batch
+        run concurrently; a single pass runs in lock-step.
+      max_batch_chars: If set, batches are filled up to this many chunk
+        characters instead of batch_length chunks, and may span documents.
+      max_batch_tokens: If set, batches are filled up to this many estimated
+        tokens instead of batch_length chunks, and may span documents.
+      stream: Whether to stream model output with LanguageModel.infer_stream.
+        Each extraction is resolved and aligned as soon as the model finishes
+        writing it, and generation is stopped early on a repetition loop or
+        when stream_limits.max_output_chars is reached. Extractions are
+        aligned one at a time, so a text that is mentioned several times may
+        align to a different occurrence than with stream=False.
+      stream_limits: Limits applied when stream is True. Defaults to
+        streaming.StreamLimits().
       **kwargs: Additional arguments passed to LanguageModel.infer and Resolver.
 
     Yields:
       Resolved annotations from input documents.
 
     Raises:
-      ValueError: If there are no scored outputs during inference.
+      InferenceOutputError: If the model returned no scored outputs for a
+        chunk. Prompts that a ResilientLanguageModel gave up on are skipped
+        instead.
     """
     if resolver is None:
       resolver = resolver_lib.Resolver(format_type=data.FormatType.YAML)
+    if pipeline_depth is None:
+      pipeline_depth = _default_pipeline_depth(
+          extraction_passes, kwargs.get("max_workers")
+      )
 
     if extraction_passes == 1:
-      yield from self._annotate_documents_single_pass(
+      yield from self._annotate_documents_streaming(
           documents,
           resolver,
           max_char_buffer,
           batch_length,
           debug,
-          show_progress,
+          show_progress=show_progress,
           context_window_chars=context_window_chars,
           tokenizer=tokenizer,
+          pipeline_depth=pipeline_depth,
+          max_batch_chars=max_batch_chars,
+          max_batch_tokens=max_batch_tokens,
+          stream=stream,
+          stream_limits=stream_limits,
           **kwargs,
       )
     else:
@@ -278,75 +492,66 @@ class Annotator:
           show_progress,
           context_window_chars=context_window_chars,
           tokenizer=tokenizer,
+          pipeline_depth=pipeline_depth,
+          max_batch_chars=max_batch_chars,
+          max_batch_tokens=max_batch_tokens,
+          stream=stream,
+          stream_limits=stream_limits,
           **kwargs,
       )
 
-  def _annotate_documents_single_pass(
+  def _annotate_documents_streaming(
       self,
       documents: Iterable[data.Document],
       resolver: resolver_lib.AbstractResolver,
       max_char_buffer: int,
       batch_length: int,
       debug: bool,
+      extraction_passes: int = 1,
       show_progress: bool = True,
       context_window_chars: int | None = None,
       tokenizer: tokenizer_lib.Tokenizer | None = None,
+      pipeline_depth: int = 0,
+      max_batch_chars: int | None = None,
+      max_batch_tokens: int | None = None,
+      stream: bool = False,
+      stream_limits: streaming.StreamLimits | None = None,
       **kwargs,
   ) -> Iterator[data.AnnotatedDocument]:
-    """Single-pass annotation with stable ordering and streaming emission.
+    """Annotation with stable ordering and streaming emission.
 
     Streams input without full materialization, maintains correct attribution
     across batches, and emits completed documents immediately to minimize
     peak memory usage. Handles generators from both infer() and align().
 
+    Each document is tokenized, chunked and prompted once. With
+    extraction_passes > 1 every batch is sent to the language model once per
+    pass, back to back, and a document is emitted with its passes merged as
+    soon as all passes of its last batch have been resolved.
+
     When context_window_chars is set, includes text from the previous chunk as
     context for coreference resolution across chunk boundaries.
+
+    When pipeline_depth > 0, up to that many later batches are submitted to the
+    language model while the current batch is being resolved and aligned.
+
+    When stream is True, chunks are resolved and aligned by _stream_batch while
+    their output is generated, instead of by _resolve_chunk afterwards.
     """
-    doc_order: list[str] = []
-    doc_text_by_id: dict[str, str] = {}
-    per_doc: DefaultDict[str, list[data.Extraction]] = collections.defaultdict(
-        list
+    tracker = _DocumentTracker(
+        extraction_passes=extraction_passes,
+        debug=debug and extraction_passes > 1,
     )
-    next_emit_idx = 0
-
-    def _capture_docs(src: Iterable[data.Document]) -> Iterator[data.Document]:
-      """Captures document order and text lazily as chunks are produced."""
-      for document in src:
-        document_id = document.document_id
-        if document_id in doc_text_by_id:
-          raise exceptions.InvalidDocumentError(
-              f"Duplicate document_id: {document_id}"
-          )
-        doc_order.append(document_id)
-        doc_text_by_id[document_id] = document.text or ""
-        yield document
-
-    def _emit_docs_iter(
-        keep_last_doc: bool,
-    ) -> Iterator[data.AnnotatedDocument]:
-      """Yields documents that are guaranteed complete.
-
-      Args:
-        keep_last_doc: If True, retains the most recently started document
-          for additional extractions. If False, emits all remaining documents.
-      """
-      nonlocal next_emit_idx
-      limit = max(0, len(doc_order) - 1) if keep_last_doc else len(doc_order)
-      while next_emit_idx < limit:
-        document_id = doc_order[next_emit_idx]
-        yield data.AnnotatedDocument(
-            document_id=document_id,
-            extractions=per_doc.get(document_id, []),
-            text=doc_text_by_id.get(document_id, ""),
-        )
-        per_doc.pop(document_id, None)
-        doc_text_by_id.pop(document_id, None)
-        next_emit_idx += 1
 
     chunk_iter = _document_chunk_iterator(
-        _capture_docs(documents), max_char_buffer, tokenizer=tokenizer
+        tracker.capture(documents), max_char_buffer, tokenizer=tokenizer
+    )
+    batches = chunking.make_batches_of_textchunk(
+        chunk_iter,
+        batch_length,
+        max_batch_chars=max_batch_chars,
+        max_batch_tokens=max_batch_tokens,
     )
-    batches = chunking.make_batches_of_textchunk(chunk_iter, batch_length)
 
     model_info = progress.get_model_info(self._language_model)
     batch_iter = progress.create_extraction_progress_bar(
@@ -360,19 +565,54 @@ class Annotator:
         context_window_chars=context_window_chars,
     )
 
-    try:
+    def _prompted_batches() -> (
+        Iterator[tuple[tuple[int, list[chunking.TextChunk]], list[str]]]
+    ):
+      """Builds prompts for each non-empty batch, repeated for every pass."""
       for batch in batch_iter:
         if not batch:
           continue
-
         prompts = [
             prompt_builder.build_prompt(
                 chunk.chunk_text, chunk.document_id, chunk.additional_context
             )
             for chunk in batch
         ]
+        for pass_num in range(extraction_passes):
+          yield (pass_num, batch), prompts
+
+    if stream:
+
+      def infer_fn(key, prompts):
+        pass_num, batch = key
+        return self._stream_batch(
+            batch,
+            prompts,
+            resolver,
+            debug=debug and pass_num == 0,
+            tokenizer=tokenizer,
+            stream_limits=stream_limits,
+            pass_num=pass_num,
+            **kwargs,
+        )
+
+    else:
+
+      def infer_fn(key, prompts):
+        pass_num, batch = key
+        return self._infer_batch(
+            prompts,
+            **self._source_kwargs(
+                batch, prompts, self._pass_kwargs(pass_num, kwargs)
+            ),
+        )
 
-        if show_progress:
+    try:
+      for (pass_num, batch), outputs in self._iter_batch_outputs(
+          _prompted_batches(), pipeline_depth, infer_fn=infer_fn, **kwargs
+      ):
+        first_pass = pass_num == 0
+        if show_progress and first_pass:
           current_chars = sum(
               len(text_chunk.chunk_text) for text_chunk in batch
           )
@@ -387,141 +627,377 @@ class Annotator:
           except AttributeError:
             pass
 
-        outputs = self._language_model.infer(batch_prompts=prompts, **kwargs)
-        if not isinstance(outputs, list):
-          outputs = list(outputs)
-
-        for text_chunk, scored_outputs in zip(batch, outputs):
-          if not isinstance(scored_outputs, list):
-            scored_outputs = list(scored_outputs)
-          if not scored_outputs:
-            raise exceptions.InferenceOutputError(
-                "No scored outputs from language model."
+        for text_chunk, chunk_output in zip(batch, outputs):
+          if stream:
+            extractions = chunk_output
+          else:
+            extractions = self._resolve_chunk(
+                text_chunk,
+                chunk_output,
+                resolver,
+                debug=debug and first_pass,
+                tokenizer=tokenizer,
+                **kwargs,
             )
+          tracker.add(text_chunk.document_id, extractions, pass_num=pass_num)
 
-          resolved_extractions = resolver.resolve(
-              scored_outputs[0].output, debug=debug, **kwargs
-          )
-
-          token_offset = (
-              text_chunk.token_interval.start_index
-              if text_chunk.token_interval
-              else 0
-          )
-          char_offset = (
-              text_chunk.char_interval.start_pos
-              if text_chunk.char_interval
-              else 0
-          )
-
-          aligned_extractions = resolver.align(
-              resolved_extractions,
-              text_chunk.chunk_text,
-              token_offset,
-              char_offset,
-              tokenizer_inst=tokenizer,
-              **kwargs,
-          )
-
-          for extraction in aligned_extractions:
-            per_doc[text_chunk.document_id].append(extraction)
-
-          if show_progress and text_chunk.char_interval is not None:
+          if (
+              show_progress
+              and first_pass
+              and text_chunk.char_interval is not None
+          ):
             chars_processed += (
                 text_chunk.char_interval.end_pos
                 - text_chunk.char_interval.start_pos
             )
 
-        yield from _emit_docs_iter(keep_last_doc=True)
+        if pass_num == extraction_passes - 1:
+          yield from tracker.emit(last_chunk=batch[-1])
 
     finally:
       batch_iter.close()
 
-    yield from _emit_docs_iter(keep_last_doc=False)
+    yield from tracker.emit(last_chunk=None)
 
-  def _annotate_documents_sequential_passes(
+  def _resolve_chunk(
       self,
-      documents: Iterable[data.Document],
+      text_chunk: chunking.TextChunk,
+      scored_outputs: Iterable[Any],
       resolver: resolver_lib.AbstractResolver,
-      max_char_buffer: int,
-      batch_length: int,
       debug: bool,
-      extraction_passes: int,
-      show_progress: bool = True,
-      context_window_chars: int | None = None,
       tokenizer: tokenizer_lib.Tokenizer | None = None,
       **kwargs,
-  ) -> Iterator[data.AnnotatedDocument]:
-    """Sequential extraction passes logic for improved recall."""
+  ) -> list[data.Extraction]:
+    """Resolves one chunk's model output and aligns it to the source text.
 
-    logging.info(
-        "Starting sequential extraction passes for improved recall with %d"
-        " passes.",
-        extraction_passes,
+    Args:
+      text_chunk: The chunk the output was generated for.
+      scored_outputs: Scored outputs for the chunk, best first.
+      resolver: Resolver used to parse and align extractions.
+      debug: Whether to populate debug fields.
+      tokenizer: Optional tokenizer used for alignment.
+      **kwargs: Additional arguments passed to the resolver.
+
+    Returns:
+      Aligned extractions with document-level token and char offsets. Empty
+      for a resilience.FailedOutput, which a ResilientLanguageModel yields
+      for prompts that failed after all retries.
+
+    Raises:
+      InferenceOutputError: If the model returned no scored outputs.
+    """
+    if isinstance(scored_outputs, resilience.FailedOutput):
+      logging.warning(
+          "Skipping chunk at %s after its prompt failed: %s",
+          text_chunk.char_interval,
+          scored_outputs.failure.error,
+      )
+      return []
+    if not isinstance(scored_outputs, list):
+      scored_outputs = list(scored_outputs)
+    if not scored_outputs:
+      raise exceptions.InferenceOutputError(
+          "No scored outputs from language model."
+      )
+
+    resolved_extractions = resolver.resolve(
+        scored_outputs[0].output, debug=debug, **kwargs
     )
 
-    document_list = list(documents)
+    return self._align_chunk(
+        text_chunk, resolved_extractions, resolver, tokenizer, **kwargs
+    )
 
-    document_extractions_by_pass: dict[str, list[list[data.Extraction]]] = {}
-    document_texts: dict[str, str] = {}
-    # Preserve text up-front so we can emit documents even if later passes
-    # produce no extractions.
-    for _doc in document_list:
-      document_texts[_doc.document_id] = _doc.text or ""
+  def _align_chunk(
+      self,
+      text_chunk: chunking.TextChunk,
+      extractions: Sequence[data.Extraction],
+      resolver: resolver_lib.AbstractResolver,
+      tokenizer: tokenizer_lib.Tokenizer | None = None,
+      **kwargs,
+  ) -> list[data.Extraction]:
+    """Aligns extractions to a chunk, returning document-level offsets."""
+    token_offset = (
+        text_chunk.token_interval.start_index
+        if text_chunk.token_interval
+        else 0
+    )
+    char_offset = (
+        text_chunk.char_interval.start_pos if text_chunk.char_interval else 0
+    )
 
-    for pass_num in range(extraction_passes):
-      logging.info(
-          "Starting extraction pass %d of %d", pass_num + 1, extraction_passes
+    return list(
+        resolver.align(
+            extractions,
+            text_chunk.chunk_text,
+            token_offset,
+            char_offset,
+            tokenizer_inst=tokenizer,
+            document_tokenized_text=text_chunk.document_text,
+            **kwargs,
+        )
+    )
+
+  def _stream_chunk(
+      self,
+      text_chunk: chunking.TextChunk,
+      prompt: str,
+      resolver: resolver_lib.AbstractResolver,
+      debug: bool,
+      tokenizer: tokenizer_lib.Tokenizer | None = None,
+      stream_limits: streaming.StreamLimits | None = None,
+      pass_num: int = 0,
+      **kwargs,
+  ) -> list[data.Extraction]:
+    """Streams one chunk's output, aligning extractions as they complete.
+
+    Args:
+      text_chunk: The chunk the prompt was built from.
+      prompt: The prompt for the chunk.
+      resolver: Resolver used to parse and align extractions.
+      debug: Whether to populate debug fields.
+      tokenizer: Optional tokenizer used for alignment.
+      stream_limits: Limits that stop generation early.
+      pass_num: Zero-based extraction pass the request belongs to.
+      **kwargs: Additional arguments passed to the model and resolver.
+
+    Returns:
+      Aligned extractions ordered by extraction index.
+    """
+    guard = streaming.StreamGuard(stream_limits)
+    resolution = resolver.start_stream(debug=debug, **kwargs)
+    aligned: list[data.Extraction] = []
+    for delta in guard.wrap(
+        self._language_model.infer_stream(
+            prompt,
+            **self._source_kwargs(
+                [text_chunk], [prompt], self._pass_kwargs(pass_num, kwargs)
+            ),
+        )
+    ):
+      completed = resolution.feed(delta)
+      if completed:
+        aligned.extend(
+            self._align_chunk(
+                text_chunk, completed, resolver, tokenizer, **kwargs
+            )
+        )
+    remaining = resolution.finish(partial=guard.aborted)
+    if remaining:
+      aligned.extend(
+          self._align_chunk(text_chunk, remaining, resolver, tokenizer, **kwargs)
       )
+    # Restore the order resolve() gives when extraction indexes are used.
+    aligned.sort(key=lambda extraction: extraction.extraction_index or 0)
+    return aligned
 
-      for annotated_doc in self._annotate_documents_single_pass(
-          document_list,
+  def _stream_batch(
+      self,
+      batch: Sequence[chunking.TextChunk],
+      prompts: Sequence[str],
+      resolver: resolver_lib.AbstractResolver,
+      debug: bool,
+      tokenizer: tokenizer_lib.Tokenizer | None = None,
+      stream_limits: streaming.StreamLimits | None = None,
+      pass_num: int = 0,
+      **kwargs,
+  ) -> list[list[data.Extraction]]:
+    """Streams every chunk of a batch concurrently on the model's pool.
+
+    Streams share the model's long-lived worker pool, so concurrency is
+    bounded by max_workers (or the model's own max_workers) across batches
+    and passes rather than per batch.
+
+    Returns:
+      Aligned extractions per chunk, in batch order.
+    """
+
+    def stream_one(item: tuple[chunking.TextChunk, str]):
+      text_chunk, prompt = item
+      return self._stream_chunk(
+          text_chunk,
+          prompt,
           resolver,
-          max_char_buffer,
-          batch_length,
-          debug=(debug and pass_num == 0),
-          show_progress=show_progress if pass_num == 0 else False,
-          context_window_chars=context_window_chars,
+          debug,
           tokenizer=tokenizer,
+          stream_limits=stream_limits,
+          pass_num=pass_num,
           **kwargs,
-      ):
-        doc_id = annotated_doc.document_id
-
-        if doc_id not in document_extractions_by_pass:
-          document_extractions_by_pass[doc_id] = []
-          # Keep first-seen text (already pre-filled above).
+      )
 
-        document_extractions_by_pass[doc_id].append(
-            annotated_doc.extractions or []
+    items = list(zip(batch, prompts))
+    max_workers = kwargs.get("max_workers") or getattr(
+        self._language_model, "max_workers", None
+    )
+    if not max_workers or max_workers <= 1 or len(items) <= 1:
+      return [stream_one(item) for item in items]
+    return list(
+        self._language_model._map_ordered(  # pylint: disable=protected-access
+            stream_one, items, max_workers
         )
+    )
 
-    # Emit results strictly in original input order.
-    for doc in document_list:
-      doc_id = doc.document_id
-      all_pass_extractions = document_extractions_by_pass.get(doc_id, [])
-      merged_extractions = _merge_non_overlapping_extractions(
-          all_pass_extractions
-      )
+  def _pass_kwargs(
+      self, pass_num: int, kwargs: dict[str, Any]
+  ) -> dict[str, Any]:
+    """Tags requests of later passes so a response cache keys them apart.
 
-      if debug:
-        total_extractions = sum(
-            len(extractions) for extractions in all_pass_extractions
-        )
-        logging.info(
-            "Document %s: Merged %d extractions from %d passes into "
-            "%d non-overlapping extractions.",
-            doc_id,
-            total_extractions,
-            extraction_passes,
-            len(merged_extractions),
-        )
+    Without the tag every pass after the first would be served the first
+    pass's cached response, which defeats multi-pass recall.
+    """
+    if pass_num and isinstance(
+        self._language_model, response_cache.CachingLanguageModel
+    ):
+      return {**kwargs, response_cache.EXTRACTION_PASS_PARAM: pass_num}
+    return kwargs
 
-      yield data.AnnotatedDocument(
-          document_id=doc_id,
-          extractions=merged_extractions,
-          text=document_texts.get(doc_id, doc.text or ""),
+  def _source_kwargs(
+      self,
+      batch: Sequence[chunking.TextChunk],
+      prompts: Sequence[str],
+      kwargs: dict[str, Any],
+  ) -> dict[str, Any]:
+    """Gives a model cascade the chunk text each prompt was built from.
+
+    The cascade aligns cheap answers against the chunk text, which cannot be
+    cut out of the prompt reliably when the chunk itself contains the
+    question prefix.
+    """
+    model = self._language_model
+    # Look through caching and retry wrappers, which forward kwargs as is.
+    while not isinstance(model, cascade.CascadeLanguageModel):
+      model = getattr(model, "__dict__", {}).get("model")
+      if model is None:
+        return kwargs
+    return {
+        **kwargs,
+        cascade.SOURCE_TEXTS_PARAM: {
+            prompt: text_chunk.chunk_text
+            for text_chunk, prompt in zip(batch, prompts)
+        },
+    }
+
+  def _infer_batch(
+      self, prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[Any]]:
+    """Runs inference on one batch and materializes the outputs."""
+    outputs = self._language_model.infer(batch_prompts=prompts, **kwargs)
+    if not isinstance(outputs, list):
+      outputs = list(outputs)
+    return outputs
+
+  def _iter_batch_outputs(
+      self,
+      prompted_batches: Iterator[tuple[Any, list[str]]],
+      pipeline_depth: int,
+      infer_fn: Callable[[Any, list[str]], list[Any]] | None = None,
+      **kwargs,
+  ) -> Iterator[tuple[Any, list[Sequence[Any]]]]:
+    """Yields each batch with its inference outputs, in submission order.
+
+    With pipeline_depth == 0 inference runs inline, one batch at a time. With
+    pipeline_depth > 0 a background worker keeps up to pipeline_depth batches
+    in flight ahead of the batch being consumed, so network latency overlaps
+    with resolution and alignment of earlier batches.
+
+    Args:
+      prompted_batches: Iterator of (batch, prompts) pairs. The batch element
+        is passed through unchanged and may carry extra bookkeeping.
+      pipeline_depth: Maximum number of batches submitted ahead of the one
+        currently yielded.
+      infer_fn: Optional function called with (batch, prompts) to produce the
+        outputs of a batch instead of LanguageModel.infer.
+      **kwargs: Additional arguments passed to LanguageModel.infer.
+
+    Yields:
+      (batch, outputs) pairs in the same order as prompted_batches.
+
+    Raises:
+      ValueError: If pipeline_depth is negative.
+    """
+    if pipeline_depth < 0:
+      raise ValueError(
+          f"pipeline_depth must be non-negative, got {pipeline_depth}."
       )
 
+    if infer_fn is None:
+
+      def infer_fn(unused_batch, prompts):
+        return self._infer_batch(prompts, **kwargs)
+
+    if pipeline_depth == 0:
+      for batch, prompts in prompted_batches:
+        yield batch, infer_fn(batch, prompts)
+      return
+
+    pending: collections.deque[tuple[Any, concurrent.futures.Future]] = (
+        collections.deque()
+    )
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=pipeline_depth, thread_name_prefix="langextract-infer"
+    )
+    try:
+      for batch, prompts in prompted_batches:
+        pending.append((batch, executor.submit(infer_fn, batch, prompts)))
+        if len(pending) > pipeline_depth:
+          done_batch, future = pending.popleft()
+          yield done_batch, future.result()
+      while pending:
+        done_batch, future = pending.popleft()
+        yield done_batch, future.result()
+    finally:
+      executor.shutdown(wait=True, cancel_futures=True)
+
+  def _annotate_documents_sequential_passes(
+      self,
+      documents: Iterable[data.Document],
+      resolver: resolver_lib.AbstractResolver,
+      max_char_buffer: int,
+      batch_length: int,
+      debug: bool,
+      extraction_passes: int,
+      show_progress: bool = True,
+      context_window_chars: int | None = None,
+      tokenizer: tokenizer_lib.Tokenizer | None = None,
+      pipeline_depth: int = 0,
+      max_batch_chars: int | None = None,
+      max_batch_tokens: int | None = None,
+      stream: bool = False,
+      stream_limits: streaming.StreamLimits | None = None,
+      **kwargs,
+  ) -> Iterator[data.AnnotatedDocument]:
+    """Multiple extraction passes for improved recall.
+
+    Passes share one chunking of each document and run batch by batch rather
+    than corpus by corpus, so documents stream out as soon as every pass over
+    them has finished. With pipeline_depth >= extraction_passes, the
+    default, all passes of a batch are in flight concurrently.
+    """
+
+    logging.info(
+        "Starting sequential extraction passes for improved recall with %d"
+        " passes.",
+        extraction_passes,
+    )
+
+    yield from self._annotate_documents_streaming(
+        documents,
+        resolver,
+        max_char_buffer,
+        batch_length,
+        debug,
+        extraction_passes=extraction_passes,
+        show_progress=show_progress,
+        context_window_chars=context_window_chars,
+        tokenizer=tokenizer,
+        pipeline_depth=pipeline_depth,
+        max_batch_chars=max_batch_chars,
+        max_batch_tokens=max_batch_tokens,
+        stream=stream,
+        stream_limits=stream_limits,
+        **kwargs,
+    )
+
     logging.info("Sequential extraction passes completed.")
 
   def annotate_text(
@@ -536,6 +1012,11 @@ class Annotator:
       context_window_chars: int | None = None,
       show_progress: bool = True,
       tokenizer: tokenizer_lib.Tokenizer | None = None,
+      pipeline_depth: int | None = None,
+      max_batch_chars: int | None = None,
+      max_batch_tokens: int | None = None,
+      stream: bool = False,
+      stream_limits: streaming.StreamLimits | None = None,
       **kwargs,
   ) -> data.AnnotatedDocument:
     """Annotates text with NLP extractions for text input.
@@ -557,6 +1038,16 @@ class Annotator:
         (disabled).
       show_progress: Whether to show progress bar. Defaults to True.
       tokenizer: Optional tokenizer instance.
+      pipeline_depth: Number of batches that may be in flight with the
+        language model while earlier batches are resolved and aligned. See
+        annotate_documents for the default.
+      max_batch_chars: Optional per-batch character budget that replaces
+        batch_length.
+      max_batch_tokens: Optional per-batch estimated token budget that
+        replaces batch_length.
+      stream: Whether to resolve and align extractions while the model is
+        still generating. See annotate_documents.
+      stream_limits: Limits applied to streamed output when stream is True.
       **kwargs: Additional arguments for inference and resolver_lib.
 
     Returns:
@@ -588,6 +1079,11 @@ class Annotator:
             context_window_chars=context_window_chars,
             show_progress=show_progress,
             tokenizer=tokenizer,
+            pipeline_depth=pipeline_depth,
+            max_batch_chars=max_batch_chars,
+            max_batch_tokens=max_batch_tokens,
+            stream=stream,
+            stream_limits=stream_limits,
             **kwargs,
         )
     )
@@ -618,3 +1114,131 @@ class Annotator:
         extractions=annotations[0].extractions,
         text=annotations[0].text,
     )
+
+  async def annotate_documents_async(
+      self,
+      documents: Iterable[data.Document],
+      resolver: resolver_lib.AbstractResolver | None = None,
+      max_char_buffer: int = 200,
+      max_concurrency: int = 16,
+      debug: bool = True,
+      context_window_chars: int | None = None,
+      tokenizer: tokenizer_lib.Tokenizer | None = None,
+      **kwargs,
+  ) -> AsyncIterator[data.AnnotatedDocument]:
+    """Asynchronously annotates documents, streaming results in input order.
+
+    Each chunk is sent to the language model through infer_async() as its own
+    request. Requests in flight are bounded by an asyncio.Semaphore of size
+    max_concurrency rather than by a batch size, so many chunks can be in
+    flight without a thread per request when the provider has a native async
+    client. Chunking, prompt building and resolution are CPU-bound, so they
+    run in worker threads via asyncio.to_thread() and never block the event
+    loop.
+
+    Args:
+      documents: Documents to annotate. Each document is expected to have a
+        unique document_id.
+      resolver: Resolver to use for extracting information from text.
+      max_char_buffer: Max number of characters that we can run inference on.
+        The text will be broken into chunks up to this length.
+      max_concurrency: Maximum number of concurrent language model requests.
+      debug: Whether to populate debug fields.
+      context_window_chars: Number of characters from the previous chunk to
+        include as context for the current chunk. Defaults to None (disabled).
+      tokenizer: Optional tokenizer to use. If None, uses default tokenizer.
+      **kwargs: Additional arguments passed to LanguageModel.infer_async and
+        Resolver.
+
+    Yields:
+      Resolved annotations from input documents, in input order, as soon as
+      each document is complete.
+
+    Raises:
+      ValueError: If max_concurrency is less than 1.
+      InferenceOutputError: If the model returned no scored outputs for a
+        chunk. Prompts that a ResilientLanguageModel gave up on are skipped
+        instead.
+    """
+    if max_concurrency < 1:
+      raise ValueError(
+          f"max_concurrency must be at least 1, got {max_concurrency}."
+      )
+    if resolver is None:
+      resolver = resolver_lib.Resolver(format_type=data.FormatType.YAML)
+
+    tracker = _DocumentTracker()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    prompt_builder = prompting.ContextAwarePromptBuilder(
+        generator=self._prompt_generator,
+        context_window_chars=context_window_chars,
+    )
+
+    async def _process(
+        text_chunk: chunking.TextChunk, prompt: str
+    ) -> list[data.Extraction]:
+      async with semaphore:
+        outputs = await self._language_model.infer_async(
+            batch_prompts=[prompt],
+            **self._source_kwargs([text_chunk], [prompt], kwargs),
+        )
+      if not outputs:
+        raise exceptions.InferenceOutputError(
+            "No scored outputs from language model."
+        )
+      return await asyncio.to_thread(
+          self._resolve_chunk,
+          text_chunk,
+          outputs[0],
+          resolver,
+          debug=debug,
+          tokenizer=tokenizer,
+          **kwargs,
+      )
+
+    # Twice the semaphore size keeps every slot busy while the oldest chunk,
+    # which gates in-order emission, is still outstanding.
+    max_pending = 2 * max_concurrency
+    pending: collections.deque[tuple[chunking.TextChunk, asyncio.Task]] = (
+        collections.deque()
+    )
+    chunk_iter = _document_chunk_iterator(
+        tracker.capture(documents), max_char_buffer, tokenizer=tokenizer
+    )
+
+    def _next_prompted() -> tuple[chunking.TextChunk, str] | None:
+      text_chunk = next(chunk_iter, None)
+      if text_chunk is None:
+        return None
+      prompt = prompt_builder.build_prompt(
+          text_chunk.chunk_text,
+          text_chunk.document_id,
+          text_chunk.additional_context,
+      )
+      return text_chunk, prompt
+
+    try:
+      # Only one _next_prompted call runs at a time, so the chunk iterator
+      # and the prompt builder are never used from two threads at once.
+      while (prompted := await asyncio.to_thread(_next_prompted)) is not None:
+        text_chunk, prompt = prompted
+        pending.append(
+            (text_chunk, asyncio.create_task(_process(text_chunk, prompt)))
+        )
+        while pending and (len(pending) >= max_pending or pending[0][1].done()):
+          done_chunk, task = pending.popleft()
+          tracker.add(done_chunk.document_id, await task)
+          for annotated_doc in tracker.emit(last_chunk=done_chunk):
+            yield annotated_doc
+
+      while pending:
+        done_chunk, task = pending.popleft()
+        tracker.add(done_chunk.document_id, await task)
+        for annotated_doc in tracker.emit(last_chunk=done_chunk):
+          yield annotated_doc
+    finally:
+      for _, task in pending:
+        task.cancel()
+
+    for annotated_doc in tracker.emit(last_chunk=None):
+      yield annotated_doc
@@ -0,0 +1,498 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Model cascade: a cheap first pass with escalation to a strong model.
+
+CascadeLanguageModel sends every prompt to a cheap model (for example a local
+Ollama model) and re-sends to a strong model only the prompts whose cheap
+answer looks unreliable. With the default CascadePolicy an answer is
+escalated when:
+
+- the cheap model raised or returned nothing;
+- the answer cannot be parsed into extractions;
+- any extraction fails to align to the chunk text, or more than half align
+  only fuzzily (MATCH_FUZZY);
+- its score is below min_score, or a custom rule rejects it.
+
+Abstracts with no findings, or with obvious ones, are then answered locally,
+and CascadeStats shows how often each tier served a prompt and why prompts
+were escalated.
+
+Usage example:
+    model = CascadeLanguageModel(
+        cheap=OllamaLanguageModel(model_id="gemma2:2b"),
+        strong=GeminiLanguageModel(model_id="gemini-2.5-pro"),
+    )
+    result = lx.extract(text, ..., model=model)
+    print(model.stats)
+"""
+
+from __future__ import annotations
+
+import collections
+from collections.abc import Iterator, Mapping, Sequence
+import dataclasses
+import threading
+import time
+from typing import Any, Callable
+
+from absl import logging
+
+from langextract import prompting
+from langextract import resolver as resolver_lib
+from langextract.core import base_model
+from langextract.core import data
+from langextract.core import exceptions
+from langextract.core import format_handler as fh
+from langextract.core import types
+
+__all__ = [
+    "CascadeCandidate",
+    "CascadeLanguageModel",
+    "CascadePolicy",
+    "CascadeStats",
+    "SOURCE_TEXTS_PARAM",
+]
+
+# Escalation reasons, as counted in CascadeStats.escalation_reasons.
+REASON_CHEAP_ERROR = "cheap_error"
+REASON_NO_OUTPUT = "no_output"
+REASON_PARSE_ERROR = "parse_error"
+REASON_EMPTY = "empty"
+REASON_UNALIGNED = "unaligned"
+REASON_FUZZY = "fuzzy"
+REASON_LOW_SCORE = "low_score"
+REASON_RULE = "rule"
+
+# Inference keyword argument mapping each prompt to the chunk text it was
+# built from. The annotator passes it so cheap answers are aligned against
+# the exact chunk; it is never forwarded to the cheap or strong model.
+SOURCE_TEXTS_PARAM = "cascade_source_texts"
+
+
+@dataclasses.dataclass(frozen=True)
+class CascadeCandidate:
+  """A cheap-model answer under review, as passed to custom rules.
+
+  Attributes:
+    prompt: The prompt sent to the cheap model.
+    source_text: The chunk text the prompt asks about.
+    output: The cheap model's best scored output.
+    extractions: The parsed extractions, aligned to source_text.
+  """
+
+  prompt: str
+  source_text: str
+  output: types.ScoredOutput
+  extractions: Sequence[data.Extraction]
+
+
+@dataclasses.dataclass(frozen=True)
+class CascadePolicy:
+  """Rules deciding when a cheap answer is escalated to the strong model.
+
+  Attributes:
+    escalate_on_error: Escalate the batch if the cheap model raises, rather
+      than propagating the error.
+    escalate_on_parse_error: Escalate answers that cannot be parsed.
+    escalate_empty: Escalate answers with no extractions. Off by default,
+      since most chunks legitimately contain nothing to extract.
+    max_unaligned_ratio: Escalate when more than this fraction of the
+      extractions cannot be located in the chunk, which usually means they
+      were invented. None disables the check.
+    max_fuzzy_ratio: Escalate when more than this fraction of the
+      extractions align only fuzzily. None disables the check.
+    min_score: Escalate answers scored below this. None disables the check.
+    rules: Extra checks; an answer is escalated if any returns True.
+  """
+
+  escalate_on_error: bool = True
+  escalate_on_parse_error: bool = True
+  escalate_empty: bool = False
+  max_unaligned_ratio: float | None = 0.0
+  max_fuzzy_ratio: float | None = 0.5
+  min_score: float | None = None
+  rules: Sequence[Callable[[CascadeCandidate], bool]] = ()
+
+
+@dataclasses.dataclass
+class CascadeStats:
+  """Counters for a CascadeLanguageModel.
+
+  Attributes:
+    prompts: Prompts received.
+    cheap_accepted: Prompts answered by the cheap model.
+    escalated: Prompts answered by the strong model.
+    escalation_reasons: Escalated prompts by reason.
+    cheap_seconds: Wall time spent in the cheap model.
+    strong_seconds: Wall time spent in the strong model.
+  """
+
+  prompts: int = 0
+  cheap_accepted: int = 0
+  escalated: int = 0
+  escalation_reasons: collections.Counter[str] = dataclasses.field(
+      default_factory=collections.Counter
+  )
+  cheap_seconds: float = 0.0
+  strong_seconds: float = 0.0
+
+  @property
+  def escalation_rate(self) -> float:
+    """Fraction of prompts sent to the strong model."""
+    return self.escalated / self.prompts if self.prompts else 0.0
+
+
+class CascadeLanguageModel(base_model.BaseLanguageModel):
+  """Runs a cheap model first and escalates unreliable answers.
+
+  Both models must produce the same output format. Answers are reviewed with
+  a resolver: extract() binds the one it builds, otherwise one matching the
+  strong model's format is created. Schema and fence settings are applied to
+  both models.
+
+  Attributes:
+    cheap: The first-pass model.
+    strong: The model unreliable answers are escalated to.
+    policy: The escalation rules.
+    resolver: Resolver used to parse and align cheap answers.
+    stats: Counters since construction.
+  """
+
+  def __init__(
+      self,
+      cheap: base_model.BaseLanguageModel,
+      strong: base_model.BaseLanguageModel,
+      policy: CascadePolicy | None = None,
+      *,
+      resolver: resolver_lib.AbstractResolver | None = None,
+      question_prefix: str = prompting.QAPromptGenerator.question_prefix,
+      answer_prefix: str = prompting.QAPromptGenerator.answer_prefix,
+  ):
+    """Initializes the cascade.
+
+    Args:
+      cheap: Model that sees every prompt first.
+      strong: Model that receives escalated prompts.
+      policy: Escalation rules. Defaults to CascadePolicy().
+      resolver: Resolver used to parse and align cheap answers. Defaults to
+        the one extract() builds, or one matching the strong model's format.
+      question_prefix: Prefix introducing the chunk text in prompts.
+      answer_prefix: Prefix ending prompts.
+    """
+    super().__init__()
+    self.cheap = cheap
+    self.strong = strong
+    self.policy = policy or CascadePolicy()
+    self.resolver = resolver
+    self.stats = CascadeStats()
+    self._question_prefix = question_prefix
+    self._answer_prefix = answer_prefix
+    self._alignment_kwargs: dict[str, Any] = {}
+    self._lock = threading.Lock()
+
+  @property
+  def model_id(self) -> str:
+    return (
+        f"cascade({getattr(self.cheap, 'model_id', type(self.cheap).__name__)}"
+        f" -> {getattr(self.strong, 'model_id', type(self.strong).__name__)})"
+    )
+
+  @property
+  def schema(self):
+    return self.strong.schema
+
+  def apply_schema(self, schema_instance) -> None:
+    self.cheap.apply_schema(schema_instance)
+    self.strong.apply_schema(schema_instance)
+
+  def set_fence_output(self, fence_output: bool | None) -> None:
+    self.cheap.set_fence_output(fence_output)
+    self.strong.set_fence_output(fence_output)
+
+  @property
+  def requires_fence_output(self) -> bool:
+    return self.strong.requires_fence_output
+
+  def merge_kwargs(
+      self, runtime_kwargs: Mapping[str, Any] | None = None
+  ) -> dict[str, Any]:
+    return self.strong.merge_kwargs(runtime_kwargs)
+
+  def parse_output(self, output: str) -> Any:
+    return self.strong.parse_output(output)
+
+  def close(self) -> None:
+    """Releases both models' resources."""
+    super().close()
+    self.cheap.close()
+    self.strong.close()
+
+  def bind_resolver(
+      self, resolver: resolver_lib.AbstractResolver, **alignment_kwargs
+  ) -> None:
+    """Reviews answers with the resolver and alignment settings of a run.
+
+    Has no effect if a resolver was passed to the constructor.
+
+    Args:
+      resolver: The resolver the extraction run uses.
+      **alignment_kwargs: Alignment settings passed to resolver.align().
+    """
+    if self.resolver is None:
+      self.resolver = resolver
+      self._alignment_kwargs = dict(alignment_kwargs)
+
+  def _get_resolver(self) -> resolver_lib.AbstractResolver:
+    if self.resolver is None:
+      format_type = getattr(self.strong, "format_type", data.FormatType.JSON)
+      self.resolver = resolver_lib.Resolver(
+          format_handler=fh.FormatHandler(
+              format_type=format_type,
+              use_fences=self.requires_fence_output,
+              wrapper_key=data.EXTRACTIONS_KEY,
+          )
+      )
+    return self.resolver
+
+  def _source_text(self, prompt: str) -> str:
+    """Recovers the chunk text from a prompt built by QAPromptGenerator.
+
+    Used only when the caller did not pass SOURCE_TEXTS_PARAM. The question
+    starts at the last line that begins with the question prefix, so a
+    prefix inside a line of the chunk (e.g. "CoQ: ") is kept.
+    """
+    _, found, text = prompt.rpartition("\n" + self._question_prefix)
+    if not found:
+      if not prompt.startswith(self._question_prefix):
+        return prompt
+      text = prompt[len(self._question_prefix) :]
+    text = text.rstrip()
+    answer_prefix = self._answer_prefix.rstrip()
+    if answer_prefix and text.endswith(answer_prefix):
+      text = text[: -len(answer_prefix)]
+    return text.rstrip("\n")
+
+  def _review(
+      self,
+      prompt: str,
+      outputs: Sequence[types.ScoredOutput],
+      source_text: str | None = None,
+  ) -> str | None:
+    """Returns why a cheap answer should be escalated, or None to keep it."""
+    if not outputs or outputs[0].output is None:
+      return REASON_NO_OUTPUT
+    best = outputs[0]
+    policy = self.policy
+    if (
+        policy.min_score is not None
+        and best.score is not None
+        and best.score < policy.min_score
+    ):
+      return REASON_LOW_SCORE
+
+    resolver = self._get_resolver()
+    if source_text is None:
+      source_text = self._source_text(prompt)
+    try:
+      extractions = resolver.resolve(best.output)
+      aligned = list(
+          resolver.align(
+              extractions, source_text, 0, 0, **self._alignment_kwargs
+          )
+      )
+    except (exceptions.LangExtractError, ValueError, TypeError) as e:
+      if policy.escalate_on_parse_error:
+        logging.debug("Cheap answer failed to parse: %s", e)
+        return REASON_PARSE_ERROR
+      aligned = []
+
+    if not aligned:
+      if policy.escalate_empty:
+        return REASON_EMPTY
+    else:
+      unaligned = sum(1 for e in aligned if e.alignment_status is None)
+      fuzzy = sum(
+          1
+          for e in aligned
+          if e.alignment_status == data.AlignmentStatus.MATCH_FUZZY
+      )
+      if (
+          policy.max_unaligned_ratio is not None
+          and unaligned / len(aligned) > policy.max_unaligned_ratio
+      ):
+        return REASON_UNALIGNED
+      if (
+          policy.max_fuzzy_ratio is not None
+          and fuzzy / len(aligned) > policy.max_fuzzy_ratio
+      ):
+        return REASON_FUZZY
+
+    if policy.rules:
+      candidate = CascadeCandidate(
+          prompt=prompt,
+          source_text=source_text,
+          output=best,
+          extractions=aligned,
+      )
+      if any(rule(candidate) for rule in policy.rules):
+        return REASON_RULE
+    return None
+
+  def _reviewed(
+      self,
+      prompts: Sequence[str],
+      cheap_outputs: Sequence[Sequence[types.ScoredOutput]] | None,
+      elapsed: float,
+      source_texts: Mapping[str, str] | None = None,
+  ) -> list[str | None]:
+    """Reviews a cheap pass and records it; returns per-prompt reasons."""
+    if cheap_outputs is None:
+      reasons = [REASON_CHEAP_ERROR] * len(prompts)
+    else:
+      source_texts = source_texts or {}
+      reasons = [
+          self._review(prompt, list(outputs), source_texts.get(prompt))
+          for prompt, outputs in zip(prompts, cheap_outputs)
+      ]
+    with self._lock:
+      self.stats.prompts += len(prompts)
+      self.stats.cheap_seconds += elapsed
+      for reason in reasons:
+        if reason is None:
+          self.stats.cheap_accepted += 1
+        else:
+          self.stats.escalated += 1
+          self.stats.escalation_reasons[reason] += 1
+    return reasons
+
+  def _cheap_error(self, error: Exception) -> None:
+    if not self.policy.escalate_on_error:
+      raise error
+    logging.warning(
+        "Cheap model failed (%s); escalating the batch to %s.",
+        error,
+        getattr(self.strong, "model_id", type(self.strong).__name__),
+    )
+
+  def _record_strong(self, elapsed: float) -> None:
+    with self._lock:
+      self.stats.strong_seconds += elapsed
+
+  @staticmethod
+  def _merge(
+      cheap_outputs: Sequence[Sequence[types.ScoredOutput]] | None,
+      reasons: Sequence[str | None],
+      strong_outputs: Sequence[Sequence[types.ScoredOutput]],
+  ) -> list[Sequence[types.ScoredOutput]]:
+    strong_iter = iter(strong_outputs)
+    return [
+        cheap_outputs[i] if reason is None else next(strong_iter)
+        for i, reason in enumerate(reasons)
+    ]
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[types.ScoredOutput]]:
+    """Runs the cheap model on the batch and escalates unreliable answers.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params, passed to both models, and
+        optionally SOURCE_TEXTS_PARAM.
+
+    Yields:
+      Lists of ScoredOutputs, in batch_prompts order.
+    """
+    prompts = list(batch_prompts)
+    if not prompts:
+      return
+    source_texts = kwargs.pop(SOURCE_TEXTS_PARAM, None)
+    start = time.monotonic()
+    try:
+      cheap_outputs = [list(o) for o in self.cheap.infer(prompts, **kwargs)]
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      self._cheap_error(e)
+      cheap_outputs = None
+    reasons = self._reviewed(
+        prompts, cheap_outputs, time.monotonic() - start, source_texts
+    )
+
+    escalated = [p for p, reason in zip(prompts, reasons) if reason]
+    strong_outputs = []
+    if escalated:
+      start = time.monotonic()
+      strong_outputs = list(self.strong.infer(escalated, **kwargs))
+      self._record_strong(time.monotonic() - start)
+    yield from self._merge(cheap_outputs, reasons, strong_outputs)
+
+  async def infer_async(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[types.ScoredOutput]]:
+    """Async counterpart of infer(), using both models' infer_async()."""
+    prompts = list(batch_prompts)
+    if not prompts:
+      return []
+    source_texts = kwargs.pop(SOURCE_TEXTS_PARAM, None)
+    start = time.monotonic()
+    try:
+      cheap_outputs = await self.cheap.infer_async(prompts, **kwargs)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      self._cheap_error(e)
+      cheap_outputs = None
+    reasons = self._reviewed(
+        prompts, cheap_outputs, time.monotonic() - start, source_texts
+    )
+
+    escalated = [p for p, reason in zip(prompts, reasons) if reason]
+    strong_outputs = []
+    if escalated:
+      start = time.monotonic()
+      strong_outputs = await self.strong.infer_async(escalated, **kwargs)
+      self._record_strong(time.monotonic() - start)
+    return self._merge(cheap_outputs, reasons, strong_outputs)
+
+  def infer_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+    """Streams the answer for one prompt.
+
+    The cheap answer has to be complete before it can be reviewed, so it is
+    yielded in one piece when accepted; an escalated prompt is streamed from
+    the strong model.
+
+    Args:
+      prompt: The prompt to run.
+      **kwargs: Additional generation params, passed to both models, and
+        optionally SOURCE_TEXTS_PARAM.
+
+    Yields:
+      Pieces of the completion text.
+    """
+    source_texts = kwargs.pop(SOURCE_TEXTS_PARAM, None)
+    start = time.monotonic()
+    try:
+      cheap_outputs = [list(o) for o in self.cheap.infer([prompt], **kwargs)]
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      self._cheap_error(e)
+      cheap_outputs = None
+    (reason,) = self._reviewed(
+        [prompt], cheap_outputs, time.monotonic() - start, source_texts
+    )
+    if reason is None:
+      yield cheap_outputs[0][0].output
+      return
+    start = time.monotonic()
+    try:
+      yield from self.strong.infer_stream(prompt, **kwargs)
+    finally:
+      self._record_strong(time.monotonic() - start)
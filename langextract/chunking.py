@@ -20,6 +20,8 @@ document into chunks of a required maximum length that we can perform
 inference on.
 """
 
+import array
+import bisect
 from collections.abc import Iterable, Iterator, Sequence
 import dataclasses
 import re
@@ -206,7 +208,7 @@ def get_token_interval_text(
   if tokenized_text.text and not return_string:
     raise TokenUtilError(
         "Token util returns an empty string unexpectedly. Number of tokens is"
-        f" tokenized_text: {len(tokenized_text.tokens)}, token_interval is"
+        f" tokenized_text: {tokenized_text.num_tokens}, token_interval is"
         f" {token_interval.start_index} to {token_interval.end_index}, which"
         " should not lead to empty string."
     )
@@ -234,12 +236,10 @@ def get_char_interval(
         f"Start index {token_interval.start_index} must be < end index "
         f"{token_interval.end_index}."
     )
-  start_token = tokenized_text.tokens[token_interval.start_index]
-  # Penultimate token prior to interval.end_index
-  final_token = tokenized_text.tokens[token_interval.end_index - 1]
   return data.CharInterval(
-      start_pos=start_token.char_interval.start_pos,
-      end_pos=final_token.char_interval.end_pos,
+      start_pos=tokenized_text.starts[token_interval.start_index],
+      # Penultimate token prior to interval.end_index
+      end_pos=tokenized_text.ends[token_interval.end_index - 1],
   )
 
 
@@ -265,18 +265,68 @@ def _sanitize(text: str) -> str:
 def make_batches_of_textchunk(
     chunk_iter: Iterator[TextChunk],
     batch_length: int,
+    max_batch_chars: int | None = None,
+    max_batch_tokens: int | None = None,
 ) -> Iterable[Sequence[TextChunk]]:
-  """Processes chunks into batches of TextChunk for inference, using itertools.batched.
+  """Processes chunks into batches of TextChunk for inference.
+
+  By default batches hold a fixed number of chunks. When max_batch_chars or
+  max_batch_tokens is set, batches are instead filled greedily up to that
+  budget, so a batch of short tail chunks carries as much text as a batch of
+  full-size chunks. Budgeted batches may span document boundaries; each chunk
+  keeps its document_id for attribution. A chunk that alone exceeds the budget
+  is emitted as a single-chunk batch.
 
   Args:
     chunk_iter: Iterator of TextChunks.
-    batch_length: Number of chunks to include in each batch.
+    batch_length: Number of chunks to include in each batch. Ignored when a
+      budget is set.
+    max_batch_chars: Maximum total chunk characters per batch.
+    max_batch_tokens: Maximum total estimated tokens per batch, using
+      tokenizer.estimate_token_count.
 
   Yields:
     Batches of TextChunks.
+
+  Raises:
+    ValueError: If a budget is not positive.
   """
-  for batch in more_itertools.batched(chunk_iter, batch_length):
-    yield list(batch)
+  if max_batch_chars is None and max_batch_tokens is None:
+    for batch in more_itertools.batched(chunk_iter, batch_length):
+      yield list(batch)
+    return
+
+  for name, budget in (
+      ("max_batch_chars", max_batch_chars),
+      ("max_batch_tokens", max_batch_tokens),
+  ):
+    if budget is not None and budget <= 0:
+      raise ValueError(f"{name} must be positive, got {budget}")
+
+  batch: list[TextChunk] = []
+  batch_chars = 0
+  batch_tokens = 0
+  for chunk in chunk_iter:
+    chunk_text = chunk.chunk_text
+    chunk_chars = len(chunk_text)
+    chunk_tokens = tokenizer_lib.estimate_token_count(chunk_text)
+    over_budget = (
+        max_batch_chars is not None
+        and batch_chars + chunk_chars > max_batch_chars
+    ) or (
+        max_batch_tokens is not None
+        and batch_tokens + chunk_tokens > max_batch_tokens
+    )
+    if batch and over_budget:
+      yield batch
+      batch = []
+      batch_chars = 0
+      batch_tokens = 0
+    batch.append(chunk)
+    batch_chars += chunk_chars
+    batch_tokens += chunk_tokens
+  if batch:
+    yield batch
 
 
 class SentenceIterator:
@@ -286,18 +336,22 @@ class SentenceIterator:
       self,
       tokenized_text: tokenizer_lib.TokenizedText,
       curr_token_pos: int = 0,
+      sentence_ends: array.array | None = None,
   ):
     """Constructor.
 
     Args:
       tokenized_text: Document to iterate through.
       curr_token_pos: Iterate through sentences from this token position.
+      sentence_ends: Sentence end index for every token position, as returned
+        by tokenizer_lib.find_sentence_ends. Computed from `tokenized_text`
+        when not provided.
 
     Raises:
       IndexError: if curr_token_pos is not within the document.
     """
     self.tokenized_text = tokenized_text
-    self.token_len = len(tokenized_text.tokens)
+    self.token_len = tokenized_text.num_tokens
     if curr_token_pos < 0:
       raise IndexError(
           f"Current token position {curr_token_pos} can not be negative."
@@ -307,6 +361,11 @@ class SentenceIterator:
           f"Current token position {curr_token_pos} is past the length of the "
           f"document {self.token_len}."
       )
+    if sentence_ends is None:
+      sentence_ends = tokenizer_lib.find_sentence_ends(
+          tokenized_text.text, tokenized_text
+      )
+    self.sentence_ends = sentence_ends
     self.curr_token_pos = curr_token_pos
 
   def __iter__(self) -> Iterator[tokenizer_lib.TokenInterval]:
@@ -324,17 +383,10 @@ class SentenceIterator:
     assert self.curr_token_pos <= self.token_len
     if self.curr_token_pos == self.token_len:
       raise StopIteration
-    # This locates the sentence which contains the current token position.
-    sentence_range = tokenizer_lib.find_sentence_range(
-        self.tokenized_text.text,
-        self.tokenized_text.tokens,
-        self.curr_token_pos,
-    )
-    assert sentence_range
     # Start the sentence from the current token position.
     # If we are in the middle of a sentence, we should start from there.
     sentence_range = create_token_interval(
-        self.curr_token_pos, sentence_range.end_index
+        self.curr_token_pos, self.sentence_ends[self.curr_token_pos]
     )
     self.curr_token_pos = sentence_range.end_index
     return sentence_range
@@ -404,12 +456,21 @@ class ChunkIterator:
 
     if isinstance(text, str):
       text = tokenizer_impl.tokenize(text)
-    elif isinstance(text, tokenizer_lib.TokenizedText) and not text.tokens:
+    elif isinstance(text, tokenizer_lib.TokenizedText) and not text.num_tokens:
       text_to_tokenize = text.text or (document.text if document else "")
       text = tokenizer_impl.tokenize(text_to_tokenize)
     self.tokenized_text = text
     self.max_char_buffer = max_char_buffer
-    self.sentence_iter = SentenceIterator(self.tokenized_text)
+    # Sentence boundaries and the most recent newline before each token are
+    # computed once per document so chunk fitting is a lookup plus a binary
+    # search over the (monotonic) token end offsets.
+    self.sentence_iter = SentenceIterator(
+        self.tokenized_text,
+        sentence_ends=tokenizer_lib.find_sentence_ends(
+            self.tokenized_text.text, self.tokenized_text
+        ),
+    )
+    self._last_newline = _last_newline_indices(self.tokenized_text)
     self.broken_sentence = False
 
     # TODO: Refactor redundancy between document and text.
@@ -438,6 +499,26 @@ class ChunkIterator:
         char_interval.end_pos - char_interval.start_pos
     ) > self.max_char_buffer
 
+  def _fitting_end(self, start_index: int, end_limit: int) -> int:
+    """Returns the largest end index whose chunk fits in the buffer.
+
+    Args:
+      start_index: First token of the chunk.
+      end_limit: Largest end index (exclusive) to consider.
+
+    Returns:
+      The largest `end` in [start_index, end_limit] such that the tokens
+      [start_index, end) do not exceed the maximum buffer size.
+    """
+    max_end_pos = self.tokenized_text.starts[start_index] + self.max_char_buffer
+    return bisect.bisect_right(
+        self.tokenized_text.ends, max_end_pos, start_index, end_limit
+    )
+
+  def _seek(self, token_pos: int) -> None:
+    """Moves the sentence iterator to the given token position."""
+    self.sentence_iter.curr_token_pos = token_pos
+
   def __next__(self) -> TextChunk:
     sentence = next(self.sentence_iter)
     # If the next token is greater than the max_char_buffer, let it be the
@@ -446,9 +527,7 @@ class ChunkIterator:
         sentence.start_index, sentence.start_index + 1
     )
     if self._tokens_exceed_buffer(curr_chunk):
-      self.sentence_iter = SentenceIterator(
-          self.tokenized_text, curr_token_pos=sentence.start_index + 1
-      )
+      self._seek(sentence.start_index + 1)
       self.broken_sentence = curr_chunk.end_index < sentence.end_index
       return TextChunk(
           token_interval=curr_chunk,
@@ -456,51 +535,63 @@ class ChunkIterator:
       )
 
     # Append tokens to the chunk up to the max_char_buffer.
-    start_of_new_line = -1
-    for token_index in range(curr_chunk.start_index, sentence.end_index):
-      if self.tokenized_text.tokens[token_index].first_token_after_newline:
-        start_of_new_line = token_index
-      test_chunk = create_token_interval(
-          curr_chunk.start_index, token_index + 1
+    fitting_end = self._fitting_end(curr_chunk.start_index, sentence.end_index)
+    if fitting_end < sentence.end_index:
+      # Token `fitting_end` is the first that does not fit. Only break at a
+      # newline if: 1) newline exists (> 0) and 2) it's after chunk start
+      # (prevents empty intervals)
+      start_of_new_line = self._last_newline[fitting_end]
+      if start_of_new_line > 0 and start_of_new_line > curr_chunk.start_index:
+        # Terminate the curr_chunk at the start of the most recent newline.
+        fitting_end = start_of_new_line
+      curr_chunk = create_token_interval(curr_chunk.start_index, fitting_end)
+      self._seek(curr_chunk.end_index)
+      self.broken_sentence = True
+      return TextChunk(
+          token_interval=curr_chunk,
+          document=self.document,
       )
-      if self._tokens_exceed_buffer(test_chunk):
-        # Only break at newline if: 1) newline exists (> 0) and
-        # 2) it's after chunk start (prevents empty intervals)
-        if start_of_new_line > 0 and start_of_new_line > curr_chunk.start_index:
-          # Terminate the curr_chunk at the start of the most recent newline.
-          curr_chunk = create_token_interval(
-              curr_chunk.start_index, start_of_new_line
-          )
-        self.sentence_iter = SentenceIterator(
-            self.tokenized_text, curr_token_pos=curr_chunk.end_index
-        )
-        self.broken_sentence = True
-        return TextChunk(
-            token_interval=curr_chunk,
-            document=self.document,
-        )
-      else:
-        curr_chunk = test_chunk
+    curr_chunk = sentence
 
     if self.broken_sentence:
       self.broken_sentence = False
     else:
-      for sentence in self.sentence_iter:
-        test_chunk = create_token_interval(
-            curr_chunk.start_index, sentence.end_index
+      # Add whole sentences while they fit.
+      fitting_end = self._fitting_end(
+          curr_chunk.start_index, self.tokenized_text.num_tokens
+      )
+      sentence_ends = self.sentence_iter.sentence_ends
+      while (
+          curr_chunk.end_index < self.tokenized_text.num_tokens
+          and sentence_ends[curr_chunk.end_index] <= fitting_end
+      ):
+        curr_chunk = create_token_interval(
+            curr_chunk.start_index, sentence_ends[curr_chunk.end_index]
         )
-        if self._tokens_exceed_buffer(test_chunk):
-          self.sentence_iter = SentenceIterator(
-              self.tokenized_text, curr_token_pos=curr_chunk.end_index
-          )
-          return TextChunk(
-              token_interval=curr_chunk,
-              document=self.document,
-          )
-        else:
-          curr_chunk = test_chunk
+      self._seek(curr_chunk.end_index)
 
     return TextChunk(
         token_interval=curr_chunk,
         document=self.document,
     )
+
+
+def _last_newline_indices(
+    tokenized_text: tokenizer_lib.TokenizedText,
+) -> array.array:
+  """Returns the index of the most recent newline-initial token per token.
+
+  Args:
+    tokenized_text: Document tokens.
+
+  Returns:
+    An integer array whose entry `i` is the largest index `j <= i` of a token
+    that follows a newline, or -1 if there is none.
+  """
+  last_newline = array.array("q", [-1]) * tokenized_text.num_tokens
+  latest = -1
+  for i, flag in enumerate(tokenized_text.newline_flags):
+    if flag:
+      latest = i
+    last_newline[i] = latest
+  return last_newline
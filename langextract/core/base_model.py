@@ -16,9 +16,12 @@
 from __future__ import annotations
 
 import abc
-from collections.abc import Iterator, Sequence
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+import concurrent.futures
 import json
-from typing import Any, Mapping
+import threading
+from typing import Any, Mapping, TypeVar
 
 import yaml
 
@@ -27,6 +30,15 @@ from langextract.core import types
 
 __all__ = ['BaseLanguageModel']
 
+_T = TypeVar('_T')
+_R = TypeVar('_R')
+
+# Guards lazy creation of each model's worker pools.
+_EXECUTOR_LOCK = threading.Lock()
+
+# Per thread, the shared pools whose _map_ordered task the thread is running.
+_WORKER_STATE = threading.local()
+
 
 class BaseLanguageModel(abc.ABC):
   """An abstract inference class for managing LLM inference.
@@ -48,6 +60,126 @@ class BaseLanguageModel(abc.ABC):
     self._fence_output_override: bool | None = None
     self._extra_kwargs: dict[str, Any] = kwargs.copy()
 
+  def __enter__(self) -> BaseLanguageModel:
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+  def close(self) -> None:
+    """Releases the model's worker pools and other held resources.
+
+    Waits for requests already running and cancels queued ones. The model
+    stays usable: resources are recreated on next use. Subclasses that hold
+    clients or sessions should release them and call super().close().
+    """
+    with _EXECUTOR_LOCK:
+      pools = self.__dict__.pop('_executor_pools', {})
+    for executor in pools.values():
+      executor.shutdown(wait=True, cancel_futures=True)
+
+  def _shared_executor(
+      self, max_workers: int
+  ) -> concurrent.futures.ThreadPoolExecutor:
+    """Returns the model's long-lived worker pool, creating it on first use.
+
+    Every infer() call on the model submits to this pool, so concurrent or
+    pipelined batches share max_workers slots instead of each spawning and
+    joining its own threads.
+
+    Args:
+      max_workers: Pool size. Each size gets its own pool, kept until
+        close(), so callers asking for another size never shut down a pool
+        that is still in use.
+
+    Returns:
+      The shared executor.
+    """
+    with _EXECUTOR_LOCK:
+      pools = self.__dict__.setdefault('_executor_pools', {})
+      executor = pools.get(max_workers)
+      if executor is None:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=type(self).__name__,
+        )
+        pools[max_workers] = executor
+      return executor
+
+  def _map_ordered(
+      self,
+      fn: Callable[[_T], _R],
+      items: Iterable[_T],
+      max_workers: int,
+  ) -> Iterator[_R]:
+    """Runs fn over items on the shared pool, yielding results in order.
+
+    Each result is yielded as soon as it and all earlier ones are done.
+    Closing the iterator early cancels the calls that have not started.
+    When called from a task already running on the same pool, fn runs
+    inline instead, since waiting on that pool from its own workers can
+    deadlock once every worker does so.
+
+    Args:
+      fn: Function to apply.
+      items: Inputs to fn.
+      max_workers: Size of the shared pool.
+
+    Yields:
+      fn(item) for each item, in order.
+    """
+    executor = self._shared_executor(max_workers)
+    active = getattr(_WORKER_STATE, 'pools', ())
+    if any(pool is executor for pool in active):
+      for item in items:
+        yield fn(item)
+      return
+
+    def run(item: _T) -> _R:
+      outer = getattr(_WORKER_STATE, 'pools', ())
+      _WORKER_STATE.pools = outer + (executor,)
+      try:
+        return fn(item)
+      finally:
+        _WORKER_STATE.pools = outer
+
+    futures = [executor.submit(run, item) for item in items]
+    try:
+      for future in futures:
+        yield future.result()
+    finally:
+      for future in futures:
+        future.cancel()
+
+  @staticmethod
+  def _close_on_loop(
+      close: Callable[[], Awaitable[Any]], loop: asyncio.AbstractEventLoop
+  ) -> None:
+    """Closes an async client or session on the event loop that created it.
+
+    Async HTTP clients cannot be closed from another loop. If their loop is
+    still running, the close is scheduled on it; once it has stopped, the
+    close runs on the current loop or, outside any loop, on a fresh one.
+
+    Args:
+      close: Returns the coroutine that closes the client.
+      loop: The loop the client was created on.
+    """
+    try:
+      running = asyncio.get_running_loop()
+    except RuntimeError:
+      running = None
+    if running is loop:
+      loop.create_task(close())
+    elif loop.is_running():
+      asyncio.run_coroutine_threadsafe(close(), loop)
+    elif running is not None:
+      running.create_task(close())
+    elif loop.is_closed():
+      asyncio.run(close())
+    else:
+      loop.run_until_complete(close())
+
   @classmethod
   def get_schema_class(cls) -> type[Any] | None:
     """Return the schema class this provider supports."""
@@ -134,6 +266,47 @@ class BaseLanguageModel(abc.ABC):
       descending score.
     """
 
+  async def infer_async(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[types.ScoredOutput]]:
+    """Asynchronous counterpart of infer().
+
+    The default implementation runs infer() in a worker thread so that any
+    provider can be awaited. Providers with a native async client should
+    override this to avoid holding a thread per request.
+
+    Args:
+      batch_prompts: Batch of inputs for inference.
+      **kwargs: Additional arguments for inference, as for infer().
+
+    Returns:
+      List of Sequence of probable output text outputs, one entry per prompt
+      in batch_prompts order, sorted by descending score.
+    """
+    return await asyncio.to_thread(
+        lambda: [list(output) for output in self.infer(batch_prompts, **kwargs)]
+    )
+
+  def infer_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+    """Streams the output for a single prompt as text deltas.
+
+    The default implementation runs infer() and yields the whole output at
+    once. Providers that support server-side streaming override this so that
+    callers can parse output while it is still being generated. Closing the
+    returned iterator early should abort the request.
+
+    Args:
+      prompt: The prompt to run.
+      **kwargs: Additional arguments for inference, as for infer().
+
+    Yields:
+      Consecutive pieces of the best output; joined they form the full text.
+    """
+    for outputs in self.infer([prompt], **kwargs):
+      outputs = list(outputs)
+      if outputs and outputs[0].output:
+        yield outputs[0].output
+
   def infer_batch(
       self, prompts: Sequence[str], batch_size: int = 32  # pylint: disable=unused-argument
   ) -> list[list[types.ScoredOutput]]:
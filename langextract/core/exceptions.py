@@ -69,6 +69,7 @@ class InferenceRuntimeError(InferenceError):
       *,
       original: BaseException | None = None,
       provider: str | None = None,
+      status_code: int | None = None,
   ) -> None:
     """Initialize the runtime error.
 
@@ -76,10 +77,12 @@ class InferenceRuntimeError(InferenceError):
       message: Error message.
       original: Original exception from the provider SDK.
       provider: Name of the provider that raised the error.
+      status_code: HTTP status code of the failed request, if known.
     """
     super().__init__(message)
     self.original = original
     self.provider = provider
+    self.status_code = status_code
 
 
 class InferenceOutputError(LangExtractError):
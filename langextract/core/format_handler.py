@@ -232,18 +232,40 @@ class FormatHandler:
       )
 
     for item in items:
-      if not isinstance(item, dict):
-        raise exceptions.FormatParseError(
-            "Each item in the sequence must be a mapping."
-        )
-      for k in item.keys():
-        if not isinstance(k, str):
-          raise exceptions.FormatParseError(
-              "All extraction keys must be strings (got a non-string key)."
-          )
+      _check_item(item)
 
     return items
 
+  def stream_parser(self, *, strict: bool | None = None) -> StreamingParser:
+    """Returns an incremental parser for model output that arrives in pieces.
+
+    Args:
+      strict: Strictness used when parsing, as for parse_output.
+
+    Returns:
+      A StreamingParser bound to this handler.
+    """
+    return StreamingParser(self, strict=strict)
+
+  def _accepts_top_level_list(self, strict: bool | None) -> bool:
+    """Whether parse_output accepts a bare list of extractions."""
+    require_wrapper = self.wrapper_key is not None and (
+        self.use_wrapper or bool(strict)
+    )
+    if require_wrapper and (strict or not self.allow_top_level_list):
+      return False
+    if strict and self.use_wrapper:
+      return False
+    return self.allow_top_level_list
+
+  def _item_list_keys(self, strict: bool | None) -> tuple[str, ...]:
+    """Keys of a mapping whose value parse_output reads as the extractions."""
+    if self.wrapper_key is not None and (self.use_wrapper or bool(strict)):
+      return (self.wrapper_key,)
+    return tuple(
+        key for key in (data.EXTRACTIONS_KEY, self.wrapper_key) if key
+    )
+
   def _add_fences(self, content: str) -> str:
     """Add code fences around content."""
     fence_type = self.format_type.value
@@ -475,3 +497,245 @@ class FormatHandler:
         strict_fences=strict_fences,
         attribute_suffix=attribute_suffix,
     )
+
+
+def _check_item(item: object) -> None:
+  """Raises FormatParseError unless item is a mapping with string keys."""
+  if not isinstance(item, dict):
+    raise exceptions.FormatParseError(
+        "Each item in the sequence must be a mapping."
+    )
+  for k in item.keys():
+    if not isinstance(k, str):
+      raise exceptions.FormatParseError(
+          "All extraction keys must be strings (got a non-string key)."
+      )
+
+
+class StreamingParser:
+  """Incrementally parses extraction items from streamed model output.
+
+  Text is fed as it is generated. Each extraction object inside the
+  extractions list is returned by feed() as soon as it is complete, so
+  downstream work can start before the model finishes. finish() parses the
+  full output with FormatHandler.parse_output and returns the items not yet
+  emitted, so the combined result matches a non-streaming parse.
+
+  Only JSON objects and YAML list entries are detected early; outputs in any
+  other shape are still handled by finish().
+  """
+
+  def __init__(self, handler: FormatHandler, *, strict: bool | None = None):
+    """Initializes the parser.
+
+    Args:
+      handler: Format handler describing the expected output.
+      strict: Strictness used when parsing, as for parse_output.
+    """
+    self._handler = handler
+    self._strict = strict
+    self._text = ""
+    self._pos = 0
+    self._emitted = 0
+    self._done = False
+    self._list_keys = handler._item_list_keys(strict)  # pylint: disable=protected-access
+    self._top_level_list = handler._accepts_top_level_list(strict)  # pylint: disable=protected-access
+    # JSON scanner state.
+    self._depth = 0
+    self._in_string = False
+    self._escape = False
+    self._list_depth: int | None = None
+    self._item_start: int | None = None
+    # YAML scanner state.
+    self._list_key_seen = False
+    self._item_indent: int | None = None
+    self._item_lines: list[str] = []
+
+  @property
+  def text(self) -> str:
+    """All output fed so far."""
+    return self._text
+
+  @property
+  def num_emitted(self) -> int:
+    """Number of items returned so far."""
+    return self._emitted
+
+  def feed(self, delta: str) -> list[Mapping[str, ExtractionValueType]]:
+    """Adds generated text and returns the items it completed.
+
+    Args:
+      delta: The next piece of model output.
+
+    Returns:
+      Extraction items completed by this piece, in output order.
+    """
+    self._text += delta
+    if self._done:
+      return []
+    if self._pos == 0 and not self._skip_think_block():
+      return []
+    if self._handler.format_type == data.FormatType.YAML:
+      items = self._scan_yaml()
+    else:
+      items = self._scan_json()
+    self._emitted += len(items)
+    return items
+
+  def finish(
+      self, *, partial: bool = False
+  ) -> list[Mapping[str, ExtractionValueType]]:
+    """Parses the complete output and returns the items not yet emitted.
+
+    Args:
+      partial: True if generation was cut short. A truncated output that no
+        longer parses then yields no further items instead of raising.
+
+    Returns:
+      The remaining extraction items, in output order.
+
+    Raises:
+      FormatError: If the output cannot be parsed and partial is False.
+    """
+    self._done = True
+    try:
+      items = self._handler.parse_output(self._text, strict=self._strict)
+    except exceptions.FormatError:
+      if partial:
+        return []
+      raise
+    remaining = list(items[self._emitted :])
+    self._emitted += len(remaining)
+    return remaining
+
+  def _skip_think_block(self) -> bool:
+    """Moves past a leading <think>...</think> block once it is complete."""
+    stripped = self._text.lstrip().lower()
+    if not stripped.startswith("<think>"[: len(stripped)]):
+      return True
+    if not stripped.startswith("<think>"):
+      return False
+    match = _THINK_TAG_RE.search(self._text)
+    if match is None:
+      return False
+    self._pos = match.end()
+    return True
+
+  def _scan_json(self) -> list[Mapping[str, ExtractionValueType]]:
+    """Scans new characters, returning objects that close at list level."""
+    items = []
+    text = self._text
+    for pos in range(self._pos, len(text)):
+      char = text[pos]
+      if self._in_string:
+        if self._escape:
+          self._escape = False
+        elif char == "\\":
+          self._escape = True
+        elif char == '"':
+          self._in_string = False
+        continue
+      if char == '"':
+        self._in_string = True
+      elif char in "[{":
+        if (
+            char == "["
+            and self._list_depth is None
+            and self._opens_item_list(pos)
+        ):
+          self._list_depth = self._depth + 1
+        elif char == "{" and self._depth == self._list_depth:
+          self._item_start = pos
+        self._depth += 1
+      elif char in "]}":
+        self._depth -= 1
+        if self._list_depth is None:
+          continue
+        if char == "}" and self._depth == self._list_depth:
+          item = self._load_item(text[self._item_start : pos + 1])
+          self._item_start = None
+          if item is not None:
+            items.append(item)
+        elif self._depth < self._list_depth:
+          self._done = True
+          self._pos = pos + 1
+          return items
+    self._pos = len(text)
+    return items
+
+  def _opens_item_list(self, pos: int) -> bool:
+    """Whether the "[" at pos starts the list holding the extractions."""
+    if self._depth == 0:
+      return self._top_level_list
+    if self._depth != 1:
+      return False
+    prefix = self._text[:pos].rstrip()
+    if not prefix.endswith(":"):
+      return False
+    prefix = prefix[:-1].rstrip()
+    return any(prefix.endswith(f'"{key}"') for key in self._list_keys)
+
+  def _load_item(self, content: str) -> Mapping[str, ExtractionValueType] | None:
+    """Parses one complete item, or returns None to defer it to finish()."""
+    try:
+      if self._handler.format_type == data.FormatType.YAML:
+        loaded = yaml.safe_load(content)
+        if not isinstance(loaded, list) or len(loaded) != 1:
+          return None
+        item = loaded[0]
+      else:
+        item = json.loads(content)
+      _check_item(item)
+    except (yaml.YAMLError, json.JSONDecodeError, exceptions.FormatError):
+      return None
+    return item
+
+  def _scan_yaml(self) -> list[Mapping[str, ExtractionValueType]]:
+    """Scans new complete lines, returning list entries that have ended."""
+    items = []
+    end = self._text.rfind("\n") + 1
+    if end <= self._pos:
+      return items
+    lines = self._text[self._pos : end].splitlines()
+    self._pos = end
+    for line in lines:
+      content = line.strip()
+      indent = len(line) - len(line.lstrip())
+      if self._item_indent is None:
+        if content.startswith("- ") or content == "-":
+          if self._list_key_seen or (indent == 0 and self._top_level_list):
+            self._item_indent = indent
+            self._item_lines = [line]
+        elif content.endswith(":") and (
+            content[:-1].strip().strip("'\"") in self._list_keys
+        ):
+          # The next list entry starts the extractions.
+          self._list_key_seen = True
+        continue
+      if not content:
+        self._item_lines.append(line)
+        continue
+      if indent == self._item_indent and (
+          content.startswith("- ") or content == "-"
+      ):
+        item = self._flush_yaml_item()
+        if item is not None:
+          items.append(item)
+        self._item_lines = [line]
+      elif indent > self._item_indent:
+        self._item_lines.append(line)
+      else:
+        # Dedent or fence: the list has ended.
+        item = self._flush_yaml_item()
+        if item is not None:
+          items.append(item)
+        self._done = True
+        break
+    return items
+
+  def _flush_yaml_item(self) -> Mapping[str, ExtractionValueType] | None:
+    """Parses the buffered YAML list entry."""
+    indent = self._item_indent or 0
+    block = "\n".join(line[indent:] for line in self._item_lines)
+    self._item_lines = []
+    return self._load_item(block)
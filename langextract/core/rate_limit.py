@@ -0,0 +1,575 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Client-side rate limiting for language model providers.
+
+A RateLimiter holds a requests-per-minute and a tokens-per-minute token
+bucket. Callers wrap each API call in RateLimiter.request() (or
+request_async()), which waits until both buckets can cover the call. The
+limiter adapts to the server: a 429 response halves the effective rate and
+pauses new requests for the server's Retry-After delay, and each successful
+call raises the rate again by a small step (AIMD) up to the configured limit.
+
+Limiters are shared through a process-wide registry keyed by provider and
+model, so every model instance talking to the same endpoint draws from the
+same budget.
+
+Usage example:
+    limiter = rate_limit.configure(
+        "openai", rate_limit.RateLimit(requests_per_minute=500),
+        model_id="gpt-4o-mini",
+    )
+    with limiter.request(tokens=1200):
+      response = client.chat.completions.create(...)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+import contextlib
+import dataclasses
+import email.utils
+import threading
+import time
+from typing import Any
+
+from absl import logging
+
+from langextract.core import tokenizer
+
+__all__ = [
+    "RateLimit",
+    "RateLimiter",
+    "TokenBucket",
+    "configure",
+    "error_status_code",
+    "estimate_tokens",
+    "get_limiter",
+    "is_rate_limit_error",
+    "limited",
+    "limited_async",
+    "limiter_for",
+    "reconcile_usage",
+    "reset",
+    "retry_after_seconds",
+]
+
+# Shortfall treated as zero so float rounding never causes a spin of tiny
+# sleeps.
+_EPSILON = 1e-9
+
+
+@dataclasses.dataclass(frozen=True)
+class RateLimit:
+  """Rate limits for one provider endpoint.
+
+  Attributes:
+    requests_per_minute: Maximum requests per minute. None means unlimited.
+    tokens_per_minute: Maximum prompt plus output tokens per minute. None
+      means unlimited.
+    burst_seconds: Size of each bucket, expressed as seconds of traffic at the
+      full rate. Smaller values spread requests more evenly.
+    decrease_factor: Multiplier applied to the rate after a 429 response.
+    increase_step: Fraction of the configured rate added back after each
+      successful request.
+    min_scale: Lowest fraction of the configured rate the limiter backs off
+      to.
+    default_retry_after: Pause, in seconds, after a 429 response that does
+      not say how long to wait.
+  """
+
+  requests_per_minute: float | None = None
+  tokens_per_minute: float | None = None
+  burst_seconds: float = 10.0
+  decrease_factor: float = 0.5
+  increase_step: float = 0.02
+  min_scale: float = 0.05
+  default_retry_after: float = 1.0
+
+  def __post_init__(self):
+    for name in ("requests_per_minute", "tokens_per_minute"):
+      value = getattr(self, name)
+      if value is not None and value <= 0:
+        raise ValueError(f"{name} must be positive, got {value}")
+    if self.burst_seconds <= 0:
+      raise ValueError(
+          f"burst_seconds must be positive, got {self.burst_seconds}"
+      )
+    if not 0 < self.decrease_factor <= 1:
+      raise ValueError(
+          f"decrease_factor must be in (0, 1], got {self.decrease_factor}"
+      )
+    if not 0 < self.min_scale <= 1:
+      raise ValueError(f"min_scale must be in (0, 1], got {self.min_scale}")
+
+
+class TokenBucket:
+  """Token bucket that refills continuously at a fixed rate.
+
+  Not thread-safe on its own; RateLimiter serializes access.
+
+  A request larger than the bucket is admitted once the bucket is full and
+  leaves the balance negative, so oversized requests are delayed rather than
+  rejected.
+  """
+
+  def __init__(self, rate_per_second: float, capacity: float, now: float):
+    """Initializes a full bucket.
+
+    Args:
+      rate_per_second: Refill rate.
+      capacity: Maximum balance.
+      now: Current monotonic time.
+    """
+    self.rate_per_second = rate_per_second
+    self.capacity = capacity
+    self.tokens = capacity
+    self._updated = now
+
+  def refill(self, now: float) -> None:
+    """Adds the tokens accrued since the last update."""
+    elapsed = max(now - self._updated, 0.0)
+    self.tokens = min(
+        self.capacity, self.tokens + elapsed * self.rate_per_second
+    )
+    self._updated = now
+
+  def wait_time(self, amount: float) -> float:
+    """Seconds until amount (capped at capacity) is available."""
+    needed = min(amount, self.capacity) - self.tokens
+    if needed <= _EPSILON:
+      return 0.0
+    return needed / self.rate_per_second
+
+  def take(self, amount: float) -> None:
+    """Removes amount from the balance, possibly leaving it negative."""
+    self.tokens -= amount
+
+  def give(self, amount: float) -> None:
+    """Returns amount to the balance, up to capacity."""
+    self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+  """Adaptive request and token rate limiter.
+
+  Thread-safe. request() blocks the calling thread and request_async()
+  suspends the calling coroutine; both can be used against the same limiter.
+  """
+
+  def __init__(self, limit: RateLimit, name: str = ""):
+    """Initializes the limiter.
+
+    Args:
+      limit: Configured rate limits.
+      name: Label used in log messages.
+    """
+    self.limit = limit
+    self.name = name
+    self._lock = threading.Lock()
+    self._scale = 1.0
+    self._paused_until = 0.0
+    now = time.monotonic()
+    self._request_bucket = self._make_bucket(limit.requests_per_minute, now)
+    self._token_bucket = self._make_bucket(limit.tokens_per_minute, now)
+
+  def _make_bucket(
+      self, per_minute: float | None, now: float
+  ) -> TokenBucket | None:
+    if per_minute is None:
+      return None
+    rate = per_minute / 60.0
+    return TokenBucket(rate, max(rate * self.limit.burst_seconds, 1.0), now)
+
+  @property
+  def scale(self) -> float:
+    """Current fraction of the configured rate, in [min_scale, 1]."""
+    with self._lock:
+      return self._scale
+
+  def _buckets(self) -> list[tuple[TokenBucket, str]]:
+    buckets = []
+    if self._request_bucket is not None:
+      buckets.append((self._request_bucket, "requests"))
+    if self._token_bucket is not None:
+      buckets.append((self._token_bucket, "tokens"))
+    return buckets
+
+  def _reserve(self, tokens: float) -> float:
+    """Takes capacity for one request, or returns how long to wait first."""
+    now = time.monotonic()
+    with self._lock:
+      if now < self._paused_until:
+        return self._paused_until - now
+      wait = 0.0
+      for bucket, kind in self._buckets():
+        bucket.refill(now)
+        amount = 1.0 if kind == "requests" else tokens
+        wait = max(wait, bucket.wait_time(amount))
+      if wait > 0:
+        return wait
+      if self._request_bucket is not None:
+        self._request_bucket.take(1.0)
+      if self._token_bucket is not None:
+        self._token_bucket.take(tokens)
+      return 0.0
+
+  def acquire(self, tokens: float = 0.0) -> None:
+    """Blocks until a request of the given token size may be sent.
+
+    Args:
+      tokens: Estimated prompt plus output tokens of the request.
+    """
+    while (wait := self._reserve(tokens)) > 0:
+      time.sleep(wait)
+
+  async def acquire_async(self, tokens: float = 0.0) -> None:
+    """Async counterpart of acquire()."""
+    while (wait := self._reserve(tokens)) > 0:
+      await asyncio.sleep(wait)
+
+  def _set_scale(self, scale: float) -> None:
+    """Sets the rate multiplier. Caller holds the lock."""
+    self._scale = min(1.0, max(self.limit.min_scale, scale))
+    now = time.monotonic()
+    for bucket, kind in self._buckets():
+      bucket.refill(now)
+      per_minute = (
+          self.limit.requests_per_minute
+          if kind == "requests"
+          else self.limit.tokens_per_minute
+      )
+      bucket.rate_per_second = per_minute / 60.0 * self._scale
+
+  def on_success(self) -> None:
+    """Additively raises the rate after a successful request."""
+    with self._lock:
+      if self._scale < 1.0:
+        self._set_scale(self._scale + self.limit.increase_step)
+
+  def on_rate_limited(self, retry_after: float | None = None) -> None:
+    """Multiplicatively lowers the rate and pauses after a 429 response.
+
+    Args:
+      retry_after: Seconds the server asked to wait, if it said.
+    """
+    if retry_after is None:
+      retry_after = self.limit.default_retry_after
+    with self._lock:
+      self._set_scale(self._scale * self.limit.decrease_factor)
+      self._paused_until = max(
+          self._paused_until, time.monotonic() + retry_after
+      )
+      scale = self._scale
+    logging.warning(
+        "Rate limited%s; pausing %.1fs and reducing rate to %.0f%%.",
+        f" by {self.name}" if self.name else "",
+        retry_after,
+        scale * 100,
+    )
+
+  def record_usage(self, estimated_tokens: float, actual_tokens: float) -> None:
+    """Corrects the token bucket once a response reports its real usage.
+
+    Args:
+      estimated_tokens: Tokens reserved for the request.
+      actual_tokens: Tokens the provider reported.
+    """
+    if self._token_bucket is None:
+      return
+    with self._lock:
+      self._token_bucket.refill(time.monotonic())
+      difference = actual_tokens - estimated_tokens
+      if difference > 0:
+        self._token_bucket.take(difference)
+      else:
+        self._token_bucket.give(-difference)
+
+  def _observe(self, error: BaseException | None) -> None:
+    if error is None:
+      self.on_success()
+    elif is_rate_limit_error(error):
+      self.on_rate_limited(retry_after_seconds(error))
+
+  @contextlib.contextmanager
+  def request(self, tokens: float = 0.0) -> Iterator[None]:
+    """Waits for capacity, then runs the wrapped call and observes its result.
+
+    A 429 error raised inside the block lowers the rate before propagating.
+
+    Args:
+      tokens: Estimated prompt plus output tokens of the request.
+
+    Yields:
+      None.
+    """
+    self.acquire(tokens)
+    try:
+      yield
+    except BaseException as e:
+      self._observe(e)
+      raise
+    self._observe(None)
+
+  @contextlib.asynccontextmanager
+  async def request_async(self, tokens: float = 0.0) -> AsyncIterator[None]:
+    """Async counterpart of request()."""
+    await self.acquire_async(tokens)
+    try:
+      yield
+    except BaseException as e:
+      self._observe(e)
+      raise
+    self._observe(None)
+
+
+def estimate_tokens(prompt: str, max_output_tokens: int | None = None) -> int:
+  """Estimates the tokens a request will consume.
+
+  Args:
+    prompt: Prompt text.
+    max_output_tokens: Output token cap for the request, if set.
+
+  Returns:
+    Approximate prompt tokens, as tokenizer.estimate_token_count counts them
+    for token-budgeted batches, plus the output cap.
+  """
+  return tokenizer.estimate_token_count(prompt) + (max_output_tokens or 0)
+
+
+def limited(
+    limiter: RateLimiter | None, tokens: float = 0.0
+) -> contextlib.AbstractContextManager[None]:
+  """Returns limiter.request(tokens), or a no-op context if limiter is None."""
+  if limiter is None:
+    return contextlib.nullcontext()
+  return limiter.request(tokens)
+
+
+def limited_async(
+    limiter: RateLimiter | None, tokens: float = 0.0
+) -> contextlib.AbstractAsyncContextManager[None]:
+  """Async counterpart of limited()."""
+  if limiter is None:
+    return contextlib.nullcontext()
+  return limiter.request_async(tokens)
+
+
+def reconcile_usage(
+    limiter: RateLimiter | None, estimated_tokens: float, actual_tokens: Any
+) -> None:
+  """Passes reported usage to limiter.record_usage() when both are present.
+
+  Args:
+    limiter: Limiter used for the request, or None.
+    estimated_tokens: Tokens reserved for the request.
+    actual_tokens: Usage reported by the provider; ignored unless numeric.
+  """
+  if limiter is None or isinstance(actual_tokens, bool):
+    return
+  if isinstance(actual_tokens, (int, float)):
+    limiter.record_usage(estimated_tokens, actual_tokens)
+
+
+def _own_status_code(error: BaseException) -> int | None:
+  for attr in ("status_code", "code", "status"):
+    value = getattr(error, attr, None)
+    if isinstance(value, int) and not isinstance(value, bool):
+      return value
+  response = getattr(error, "response", None)
+  value = getattr(response, "status_code", None)
+  return value if isinstance(value, int) else None
+
+
+def _error_chain(error: BaseException) -> Iterator[BaseException]:
+  """Yields error, then the errors it wraps via .original or __cause__."""
+  seen = set()
+  current: BaseException | None = error
+  while current is not None and id(current) not in seen:
+    seen.add(id(current))
+    yield current
+    current = getattr(current, "original", None) or current.__cause__
+
+
+def error_status_code(error: BaseException) -> int | None:
+  """Returns the HTTP status code carried by error or an error it wraps.
+
+  Understands errors carrying status_code (openai, httpx, langextract
+  InferenceRuntimeError) or code (google-genai), requests.HTTPError via its
+  response, and wrapped errors via .original or __cause__.
+
+  Args:
+    error: Exception raised by a provider call.
+
+  Returns:
+    The first status code found, or None.
+  """
+  for current in _error_chain(error):
+    if (status := _own_status_code(current)) is not None:
+      return status
+  return None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+  """Whether error is an HTTP 429 from any supported client library.
+
+  Args:
+    error: Exception raised by a provider call.
+
+  Returns:
+    True if the server rejected the call for exceeding a rate limit.
+  """
+  return error_status_code(error) == 429
+
+
+def _parse_retry_after_header(value: str) -> float | None:
+  try:
+    return max(float(value), 0.0)
+  except ValueError:
+    pass
+  try:
+    when = email.utils.parsedate_to_datetime(value)
+  except (TypeError, ValueError):
+    return None
+  return max(when.timestamp() - time.time(), 0.0)
+
+
+def _retry_delay_from_details(details: Any) -> float | None:
+  """Reads google.rpc.RetryInfo.retryDelay (e.g. "13s") from error JSON."""
+  if isinstance(details, dict):
+    delay = details.get("retryDelay")
+    if isinstance(delay, str) and delay.endswith("s"):
+      try:
+        return float(delay[:-1])
+      except ValueError:
+        return None
+    values = details.values()
+  elif isinstance(details, list):
+    values = details
+  else:
+    return None
+  for value in values:
+    if (delay := _retry_delay_from_details(value)) is not None:
+      return delay
+  return None
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+  """Returns the server's requested retry delay for a 429 error, if any.
+
+  Args:
+    error: Exception raised by a provider call.
+
+  Returns:
+    Seconds to wait from the Retry-After header or Gemini RetryInfo, or None
+    if the error does not say.
+  """
+  for current in _error_chain(error):
+    headers = getattr(getattr(current, "response", None), "headers", None)
+    if headers is not None:
+      value = headers.get("retry-after") or headers.get("Retry-After")
+      if value:
+        delay = _parse_retry_after_header(str(value))
+        if delay is not None:
+          return delay
+    delay = _retry_delay_from_details(getattr(current, "details", None))
+    if delay is not None:
+      return delay
+  return None
+
+
+_registry: dict[tuple[str, str | None], RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def _key(provider: str, model_id: str | None) -> tuple[str, str | None]:
+  return provider.lower(), model_id
+
+
+def configure(
+    provider: str, limit: RateLimit, model_id: str | None = None
+) -> RateLimiter:
+  """Registers a shared limiter, replacing any existing one for the key.
+
+  Args:
+    provider: Provider name, e.g. "openai" or "gemini".
+    limit: Limits to enforce.
+    model_id: Model the limits apply to. None applies them to every model of
+      the provider that has no model-specific limiter.
+
+  Returns:
+    The registered limiter.
+  """
+  key = _key(provider, model_id)
+  limiter = RateLimiter(limit, name="/".join(k for k in key if k))
+  with _registry_lock:
+    _registry[key] = limiter
+  return limiter
+
+
+def get_limiter(
+    provider: str, model_id: str | None = None
+) -> RateLimiter | None:
+  """Returns the shared limiter for a provider and model, if configured.
+
+  A model-specific limiter takes precedence over a provider-wide one.
+
+  Args:
+    provider: Provider name.
+    model_id: Model identifier.
+
+  Returns:
+    The limiter, or None if no limits are configured.
+  """
+  with _registry_lock:
+    limiter = _registry.get(_key(provider, model_id))
+    if limiter is None and model_id is not None:
+      limiter = _registry.get(_key(provider, None))
+    return limiter
+
+
+def limiter_for(
+    provider: str,
+    model_id: str | None,
+    limit: RateLimit | RateLimiter | None,
+) -> RateLimiter | None:
+  """Resolves a provider's rate_limit argument to a shared limiter.
+
+  Args:
+    provider: Provider name.
+    model_id: Model identifier.
+    limit: A RateLimiter to use as is, a RateLimit to share with every
+      instance configured with the same limits for this model, or None to use
+      whatever configure() registered.
+
+  Returns:
+    The limiter to use, or None for no limiting.
+  """
+  if isinstance(limit, RateLimiter):
+    return limit
+  if limit is None:
+    return get_limiter(provider, model_id)
+  key = _key(provider, model_id)
+  with _registry_lock:
+    existing = _registry.get(key)
+    if existing is not None and existing.limit == limit:
+      return existing
+  return configure(provider, limit, model_id=model_id)
+
+
+def reset() -> None:
+  """Removes every registered limiter."""
+  with _registry_lock:
+    _registry.clear()
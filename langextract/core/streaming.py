@@ -0,0 +1,175 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Guards for streamed model output.
+
+A StreamGuard wraps the text deltas produced by
+BaseLanguageModel.infer_stream() and stops consuming them once the output
+exceeds a character cap or degenerates into a repetition loop. Stopping
+closes the provider's stream, which aborts generation on the server.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import dataclasses
+
+from absl import logging
+
+__all__ = [
+    "StreamLimits",
+    "StreamGuard",
+    "find_repetition",
+]
+
+ABORT_OUTPUT_CAP = "output_cap"
+ABORT_REPETITION = "repetition"
+
+
+@dataclasses.dataclass(frozen=True)
+class StreamLimits:
+  """Limits applied to a streamed model response.
+
+  Attributes:
+    max_output_chars: Stop after this many characters of output. None
+      disables the cap.
+    repetition_min_period: Shortest repeated block, in characters, that counts
+      as a loop.
+    repetition_max_period: Longest repeated block, in characters, that is
+      checked for.
+    repetition_min_repeats: Number of back-to-back copies of a block at the end
+      of the output that count as a loop. 0 disables repetition detection.
+    check_interval: Number of new characters between repetition checks.
+  """
+
+  max_output_chars: int | None = None
+  repetition_min_period: int = 16
+  repetition_max_period: int = 512
+  repetition_min_repeats: int = 6
+  check_interval: int = 256
+
+
+def find_repetition(
+    text: str,
+    min_period: int,
+    max_period: int,
+    min_repeats: int,
+) -> int | None:
+  """Returns the period of a block repeated at the end of text, if any.
+
+  Args:
+    text: Output generated so far.
+    min_period: Shortest block length to consider.
+    max_period: Longest block length to consider.
+    min_repeats: Number of consecutive copies required at the end of text.
+
+  Returns:
+    The length of the shortest block that the last min_repeats * period
+    characters of text consist of, or None if there is no such block.
+  """
+  if min_repeats < 2:
+    return None
+  max_period = min(max_period, len(text) // min_repeats)
+  for period in range(min_period, max_period + 1):
+    # Cheap rejection before building the repeated block.
+    if text[-1 - period] != text[-1]:
+      continue
+    block = text[-period:]
+    if text.endswith(block * min_repeats):
+      return period
+  return None
+
+
+class StreamGuard:
+  """Iterates over streamed text until a StreamLimits limit is hit.
+
+  Attributes:
+    limits: The limits being enforced.
+    abort_reason: None while within limits, otherwise "output_cap" or
+      "repetition".
+    text: All text passed through so far.
+  """
+
+  def __init__(self, limits: StreamLimits | None = None):
+    """Initializes the guard.
+
+    Args:
+      limits: Limits to enforce. Defaults to StreamLimits().
+    """
+    self.limits = limits or StreamLimits()
+    self.abort_reason: str | None = None
+    self.text = ""
+    self._checked_len = 0
+
+  @property
+  def aborted(self) -> bool:
+    """Whether the stream was cut short."""
+    return self.abort_reason is not None
+
+  def wrap(self, deltas: Iterable[str]) -> Iterator[str]:
+    """Yields deltas until a limit is exceeded, then closes the stream.
+
+    The delta that crosses the output cap is truncated to the cap. On a
+    repetition loop the delta that revealed it is still yielded, so the
+    parser sees the same text the guard inspected.
+
+    Args:
+      deltas: Text pieces from BaseLanguageModel.infer_stream().
+
+    Yields:
+      The text pieces, in order.
+    """
+    iterator = iter(deltas)
+    try:
+      for delta in iterator:
+        if not delta:
+          continue
+        cap = self.limits.max_output_chars
+        if cap is not None and len(self.text) + len(delta) > cap:
+          delta = delta[: max(cap - len(self.text), 0)]
+          self.abort_reason = ABORT_OUTPUT_CAP
+        self.text += delta
+        if delta:
+          yield delta
+        if self.abort_reason is None and self._has_repetition():
+          self.abort_reason = ABORT_REPETITION
+        if self.abort_reason is not None:
+          logging.warning(
+              "Stopping generation after %d characters: %s",
+              len(self.text),
+              self.abort_reason,
+          )
+          return
+    finally:
+      close = getattr(iterator, "close", None)
+      if close is not None:
+        close()
+
+  def _has_repetition(self) -> bool:
+    """Checks for a loop once every check_interval new characters."""
+    limits = self.limits
+    if not limits.repetition_min_repeats:
+      return False
+    if len(self.text) - self._checked_len < limits.check_interval:
+      return False
+    self._checked_len = len(self.text)
+    return (
+        find_repetition(
+            self.text,
+            limits.repetition_min_period,
+            limits.repetition_max_period,
+            limits.repetition_min_repeats,
+        )
+        is not None
+    )
@@ -17,11 +17,15 @@
 Provides methods to split text into regex-based or Unicode-aware tokens.
 Tokenization is used for alignment in `resolver.py` and for determining
 sentence boundaries for smaller context use cases. This module is not used
-for tokenization within the language model during inference.
+for tokenization within the language model during inference; for budgeting
+requests it only offers a rough model token estimate (estimate_token_count).
 """
 
+from __future__ import annotations
+
 import abc
-from collections.abc import Sequence, Set
+import array
+from collections.abc import Iterable, Iterator, MutableSequence, Sequence, Set
 import dataclasses
 import enum
 import functools
@@ -47,6 +51,8 @@ __all__ = [
     "tokenize",
     "tokens_text",
     "find_sentence_range",
+    "find_sentence_ends",
+    "estimate_token_count",
 ]
 
 
@@ -131,18 +137,177 @@ class Token:
   first_token_after_newline: bool = False
 
 
-@dataclasses.dataclass
+# array typecodes for the columnar token storage.
+_POSITION_TYPECODE = "q"
+_FLAG_TYPECODE = "B"
+
+_TOKEN_TYPES = tuple(TokenType)
+
+
 class TokenizedText:
   """Holds the result of tokenizing a text string.
 
+  Tokens are stored column-wise in parallel arrays (start offset, end offset,
+  token type and newline flag) rather than as one object per token, which
+  keeps long documents compact and makes offset lookups cheap. The `tokens`
+  attribute provides a list-like view that builds Token objects on access for
+  code written against the object representation.
+
   Attributes:
     text: The text that was tokenized. For UnicodeTokenizer, this is
       NOT normalized to NFC (to preserve indices).
-    tokens: A list of Token objects extracted from the text.
+    tokens: A sequence view of Token objects extracted from the text. Tokens
+      read from it are copies; append to the view or use add_token() to add
+      tokens.
+    starts: Start character offset of each token.
+    ends: End character offset (exclusive) of each token.
+    token_types: TokenType value of each token.
+    newline_flags: 1 where the token follows a newline, else 0.
   """
 
-  text: str
-  tokens: list[Token] = dataclasses.field(default_factory=list)
+  __slots__ = ("text", "starts", "ends", "token_types", "newline_flags")
+
+  def __init__(self, text: str, tokens: Iterable[Token] | None = None):
+    """Initializes the tokenized text.
+
+    Args:
+      text: The text that was tokenized.
+      tokens: Optional Token objects to store, in order.
+    """
+    self.text = text
+    self.starts = array.array(_POSITION_TYPECODE)
+    self.ends = array.array(_POSITION_TYPECODE)
+    self.token_types = array.array(_FLAG_TYPECODE)
+    self.newline_flags = array.array(_FLAG_TYPECODE)
+    if tokens is not None:
+      for token in tokens:
+        self.add_token(
+            token.char_interval.start_pos,
+            token.char_interval.end_pos,
+            token.token_type,
+            token.first_token_after_newline,
+        )
+
+  @property
+  def tokens(self) -> _TokenView:
+    return _TokenView(self)
+
+  @tokens.setter
+  def tokens(self, tokens: Iterable[Token]) -> None:
+    replacement = TokenizedText(self.text, list(tokens))
+    self.starts = replacement.starts
+    self.ends = replacement.ends
+    self.token_types = replacement.token_types
+    self.newline_flags = replacement.newline_flags
+
+  @property
+  def num_tokens(self) -> int:
+    """Number of tokens."""
+    return len(self.starts)
+
+  def add_token(
+      self,
+      start_pos: int,
+      end_pos: int,
+      token_type: TokenType,
+      first_token_after_newline: bool = False,
+  ) -> None:
+    """Appends a token given its character span and attributes."""
+    self.starts.append(start_pos)
+    self.ends.append(end_pos)
+    self.token_types.append(token_type)
+    self.newline_flags.append(first_token_after_newline)
+
+  def token(self, index: int) -> Token:
+    """Builds the Token object at index (negative indices allowed)."""
+    if index < 0:
+      index += len(self.starts)
+    return Token(
+        index=index,
+        token_type=_TOKEN_TYPES[self.token_types[index]],
+        char_interval=CharInterval(
+            start_pos=self.starts[index], end_pos=self.ends[index]
+        ),
+        first_token_after_newline=bool(self.newline_flags[index]),
+    )
+
+  def token_text(self, index: int) -> str:
+    """Returns the substring of text covered by the token at index."""
+    return self.text[self.starts[index] : self.ends[index]]
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, TokenizedText):
+      return NotImplemented
+    return (
+        self.text == other.text
+        and self.starts == other.starts
+        and self.ends == other.ends
+        and self.token_types == other.token_types
+        and self.newline_flags == other.newline_flags
+    )
+
+  def __repr__(self) -> str:
+    return f"TokenizedText(text={self.text!r}, tokens={list(self.tokens)!r})"
+
+
+class _TokenView(MutableSequence):
+  """List-like view of a TokenizedText's tokens as Token objects."""
+
+  __slots__ = ("_tokenized",)
+
+  def __init__(self, tokenized: TokenizedText):
+    self._tokenized = tokenized
+
+  def __len__(self) -> int:
+    return len(self._tokenized.starts)
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return [self._tokenized.token(i) for i in range(len(self))[index]]
+    if not -len(self) <= index < len(self):
+      raise IndexError("token index out of range")
+    return self._tokenized.token(index)
+
+  def __iter__(self) -> Iterator[Token]:
+    token = self._tokenized.token
+    for i in range(len(self)):
+      yield token(i)
+
+  def __setitem__(self, index, value) -> None:
+    tokens = list(self)
+    tokens[index] = value
+    self._tokenized.tokens = tokens
+
+  def __delitem__(self, index) -> None:
+    tokens = list(self)
+    del tokens[index]
+    self._tokenized.tokens = tokens
+
+  def insert(self, index: int, value: Token) -> None:
+    if index >= len(self):
+      self.append(value)
+      return
+    tokens = list(self)
+    tokens.insert(index, value)
+    self._tokenized.tokens = tokens
+
+  def append(self, value: Token) -> None:
+    self._tokenized.add_token(
+        value.char_interval.start_pos,
+        value.char_interval.end_pos,
+        value.token_type,
+        value.first_token_after_newline,
+    )
+
+  def __eq__(self, other: object) -> bool:
+    if isinstance(other, _TokenView):
+      return self._tokenized == other._tokenized
+    if isinstance(other, Sequence):
+      return list(self) == list(other)
+    return NotImplemented
+
+  def __repr__(self) -> str:
+    return repr(list(self))
 
 
 _LETTERS_PATTERN = r"[^\W\d_]+"
@@ -199,30 +364,24 @@ class RegexTokenizer(Tokenizer):
       A TokenizedText object containing all extracted tokens.
     """
     tokenized = TokenizedText(text=text)
+    add_token = tokenized.add_token
     previous_end = 0
     for token_index, match in enumerate(_TOKEN_PATTERN.finditer(text)):
       start_pos, end_pos = match.span()
       matched_text = match.group()
-      token = Token(
-          index=token_index,
-          char_interval=CharInterval(start_pos=start_pos, end_pos=end_pos),
-          token_type=TokenType.WORD,
-          first_token_after_newline=False,
-      )
+      has_newline = False
       if token_index > 0:
         # Optimization: Check gap without slicing.
         has_newline = text.find("\n", previous_end, start_pos) != -1
         if not has_newline:
           has_newline = text.find("\r", previous_end, start_pos) != -1
-        if has_newline:
-          token.first_token_after_newline = True
       if regex.fullmatch(_DIGITS_PATTERN, matched_text):
-        token.token_type = TokenType.NUMBER
+        token_type = TokenType.NUMBER
       elif _WORD_PATTERN.fullmatch(matched_text):
-        token.token_type = TokenType.WORD
+        token_type = TokenType.WORD
       else:
-        token.token_type = TokenType.PUNCTUATION
-      tokenized.tokens.append(token)
+        token_type = TokenType.PUNCTUATION
+      add_token(start_pos, end_pos, token_type, has_newline)
       previous_end = end_pos
     return tokenized
 
@@ -342,7 +501,7 @@ class UnicodeTokenizer(Tokenizer):
     Returns:
       A TokenizedText object.
     """
-    tokens: list[Token] = []
+    tokens = TokenizedText(text=text)
 
     current_start = 0
     current_type = None
@@ -439,32 +598,26 @@ class UnicodeTokenizer(Tokenizer):
           tokens, text, current_start, len(text), current_type, previous_end
       )
 
-    return TokenizedText(text=text, tokens=tokens)
+    return tokens
 
   def _emit_token(
       self,
-      tokens: list[Token],
+      tokens: TokenizedText,
       text: str,
       start: int,
       end: int,
       token_type: TokenType,
       previous_end: int,
   ):
-    """Helper to create and append a token."""
-    token = Token(
-        index=len(tokens),
-        char_interval=CharInterval(start_pos=start, end_pos=end),
-        token_type=token_type,
-        first_token_after_newline=False,
-    )
-
+    """Helper to append a token."""
     # Check for newlines in the gap between the previous token and this one
+    first_token_after_newline = False
     if start > previous_end:
       gap = text[previous_end:start]
       if "\n" in gap or "\r" in gap:
-        token.first_token_after_newline = True
+        first_token_after_newline = True
 
-    tokens.append(token)
+    tokens.add_token(start, end, token_type, first_token_after_newline)
 
 
 def tokens_text(
@@ -490,26 +643,36 @@ def tokens_text(
 
   if (
       token_interval.start_index < 0
-      or token_interval.end_index > len(tokenized_text.tokens)
+      or token_interval.end_index > tokenized_text.num_tokens
       or token_interval.start_index > token_interval.end_index
   ):
 
     raise InvalidTokenIntervalError(
         f"Invalid token interval. start_index={token_interval.start_index}, "
         f"end_index={token_interval.end_index}, "
-        f"total_tokens={len(tokenized_text.tokens)}."
+        f"total_tokens={tokenized_text.num_tokens}."
     )
 
-  start_token = tokenized_text.tokens[token_interval.start_index]
-  end_token = tokenized_text.tokens[token_interval.end_index - 1]
   return tokenized_text.text[
-      start_token.char_interval.start_pos : end_token.char_interval.end_pos
+      tokenized_text.starts[token_interval.start_index] : tokenized_text.ends[
+          token_interval.end_index - 1
+      ]
   ]
 
 
+def _as_tokenized_text(
+    text: str, tokens: Sequence[Token] | TokenizedText
+) -> TokenizedText:
+  """Returns columnar storage for tokens, converting only when needed."""
+  if isinstance(tokens, TokenizedText):
+    return tokens
+  if isinstance(tokens, _TokenView):
+    return tokens._tokenized  # pylint: disable=protected-access
+  return TokenizedText(text, tokens)
+
+
 def _is_end_of_sentence_token(
-    text: str,
-    tokens: Sequence[Token],
+    tokenized: TokenizedText,
     current_idx: int,
     known_abbreviations: Set[str] = _KNOWN_ABBREVIATIONS,
 ) -> bool:
@@ -519,8 +682,7 @@ def _is_end_of_sentence_token(
   abbreviation. Only searches the text corresponding to the current token.
 
   Args:
-    text: The entire input text.
-    tokens: The sequence of Token objects.
+    tokenized: Columnar tokens over the entire input text.
     current_idx: The current token index to check.
     known_abbreviations: Abbreviations that should not count as sentence enders
       (e.g., "Dr.").
@@ -528,18 +690,10 @@ def _is_end_of_sentence_token(
   Returns:
     True if the token at `current_idx` ends a sentence, otherwise False.
   """
-  current_token_text = text[
-      tokens[current_idx]
-      .char_interval.start_pos : tokens[current_idx]
-      .char_interval.end_pos
-  ]
+  current_token_text = tokenized.token_text(current_idx)
   if _END_OF_SENTENCE_PATTERN.search(current_token_text):
     if current_idx > 0:
-      prev_token_text = text[
-          tokens[current_idx - 1]
-          .char_interval.start_pos : tokens[current_idx - 1]
-          .char_interval.end_pos
-      ]
+      prev_token_text = tokenized.token_text(current_idx - 1)
       if f"{prev_token_text}{current_token_text}" in known_abbreviations:
         return False
     return True
@@ -547,39 +701,34 @@ def _is_end_of_sentence_token(
 
 
 def _is_sentence_break_after_newline(
-    text: str,
-    tokens: Sequence[Token],
+    tokenized: TokenizedText,
     current_idx: int,
 ) -> bool:
   """Checks if the next token starts uppercase and follows a newline.
 
   Args:
-    text: The entire input text.
-    tokens: The sequence of Token objects.
+    tokenized: Columnar tokens over the entire input text.
     current_idx: The current token index.
 
   Returns:
     True if a newline is found between current_idx and current_idx+1, and
     the next token (if any) begins with an uppercase character.
   """
-  if current_idx + 1 >= len(tokens):
+  next_idx = current_idx + 1
+  if next_idx >= tokenized.num_tokens:
     return False
 
-  next_token = tokens[current_idx + 1]
-
-  if not next_token.first_token_after_newline:
+  if not tokenized.newline_flags[next_idx]:
     return False
 
-  next_token_text = text[
-      next_token.char_interval.start_pos : next_token.char_interval.end_pos
-  ]
+  next_token_text = tokenized.token_text(next_idx)
   # Assume break unless lowercase (covers numbers/quotes).
   return bool(next_token_text) and not next_token_text[0].islower()
 
 
 def find_sentence_range(
     text: str,
-    tokens: Sequence[Token],
+    tokens: Sequence[Token] | TokenizedText,
     start_token_index: int,
     known_abbreviations: Set[str] = _KNOWN_ABBREVIATIONS,
 ) -> TokenInterval:
@@ -596,7 +745,8 @@ def find_sentence_range(
 
   Args:
     text: The text to analyze.
-    tokens: The tokens that make up `text`.
+    tokens: The tokens that make up `text`, either as a TokenizedText, its
+      `tokens` view (both used without copying) or a sequence of Token.
       Note: For UnicodeTokenizer, use normalized text.
     start_token_index: The index of the token to start the sentence from.
     known_abbreviations: A set of strings that are known abbreviations and
@@ -611,37 +761,128 @@ def find_sentence_range(
   Raises:
     SentenceRangeError: If `start_token_index` is out of range.
   """
-  if not tokens:
+  tokenized = _as_tokenized_text(text, tokens)
+  num_tokens = tokenized.num_tokens
+  if not num_tokens:
     return TokenInterval(0, 0)
 
-  if start_token_index < 0 or start_token_index >= len(tokens):
+  if start_token_index < 0 or start_token_index >= num_tokens:
     raise SentenceRangeError(
         f"start_token_index={start_token_index} out of range. "
-        f"Total tokens: {len(tokens)}."
+        f"Total tokens: {num_tokens}."
     )
 
   i = start_token_index
-  while i < len(tokens):
-    if tokens[i].token_type == TokenType.PUNCTUATION:
-      if _is_end_of_sentence_token(text, tokens, i, known_abbreviations):
-        end_index = i + 1
-        # Consume any trailing closing punctuation (e.g. quotes, parens)
-        while end_index < len(tokens):
-          next_token_text = text[
-              tokens[end_index]
-              .char_interval.start_pos : tokens[end_index]
-              .char_interval.end_pos
-          ]
-          if (
-              tokens[end_index].token_type == TokenType.PUNCTUATION
-              and next_token_text in _CLOSING_PUNCTUATION
-          ):
-            end_index += 1
-          else:
-            break
-        return TokenInterval(start_index=start_token_index, end_index=end_index)
-    if _is_sentence_break_after_newline(text, tokens, i):
-      return TokenInterval(start_index=start_token_index, end_index=i + 1)
+  while i < num_tokens:
+    end_index = _sentence_break_end(tokenized, i, known_abbreviations)
+    if end_index is not None:
+      return TokenInterval(start_index=start_token_index, end_index=end_index)
     i += 1
 
-  return TokenInterval(start_index=start_token_index, end_index=len(tokens))
+  return TokenInterval(start_index=start_token_index, end_index=num_tokens)
+
+
+def find_sentence_ends(
+    text: str,
+    tokens: Sequence[Token] | TokenizedText,
+    known_abbreviations: Set[str] = _KNOWN_ABBREVIATIONS,
+) -> array.array:
+  """Computes the sentence end for every token position in one pass.
+
+  Entry `i` of the result equals
+  `find_sentence_range(text, tokens, i).end_index`, so callers that walk a
+  document sentence by sentence can look boundaries up instead of rescanning
+  tokens from each start position.
+
+  Args:
+    text: The text to analyze.
+    tokens: The tokens that make up `text`, either as a TokenizedText, its
+      `tokens` view or a sequence of Token.
+    known_abbreviations: A set of strings that are known abbreviations and
+      should not be treated as sentence boundaries.
+
+  Returns:
+    An integer array with one exclusive sentence end index per token.
+  """
+  tokenized = _as_tokenized_text(text, tokens)
+  num_tokens = tokenized.num_tokens
+  sentence_ends = array.array(_POSITION_TYPECODE, [0]) * num_tokens
+  token_types = tokenized.token_types
+  newline_flags = tokenized.newline_flags
+  punctuation = int(TokenType.PUNCTUATION)
+  next_end = num_tokens
+  for i in range(num_tokens - 1, -1, -1):
+    # Only punctuation or a following newline can end a sentence.
+    if token_types[i] == punctuation or (
+        i + 1 < num_tokens and newline_flags[i + 1]
+    ):
+      end_index = _sentence_break_end(tokenized, i, known_abbreviations)
+      if end_index is not None:
+        next_end = end_index
+    sentence_ends[i] = next_end
+  return sentence_ends
+
+
+def _sentence_break_end(
+    tokenized: TokenizedText,
+    i: int,
+    known_abbreviations: Set[str],
+) -> int | None:
+  """Returns the sentence end if a sentence boundary occurs at token `i`.
+
+  Args:
+    tokenized: Columnar tokens over the entire input text.
+    i: The token index to check.
+    known_abbreviations: Abbreviations that should not count as sentence enders.
+
+  Returns:
+    The exclusive end index of the sentence terminated at token `i`, including
+    any trailing closing punctuation, or None if token `i` does not end a
+    sentence.
+  """
+  token_types = tokenized.token_types
+  num_tokens = tokenized.num_tokens
+  punctuation = int(TokenType.PUNCTUATION)
+  if token_types[i] == punctuation:
+    if _is_end_of_sentence_token(tokenized, i, known_abbreviations):
+      end_index = i + 1
+      # Consume any trailing closing punctuation (e.g. quotes, parens)
+      while end_index < num_tokens:
+        if (
+            token_types[end_index] == punctuation
+            and tokenized.token_text(end_index) in _CLOSING_PUNCTUATION
+        ):
+          end_index += 1
+        else:
+          break
+      return end_index
+  # Inlined precheck for _is_sentence_break_after_newline.
+  if (
+      i + 1 < num_tokens
+      and tokenized.newline_flags[i + 1]
+      and _is_sentence_break_after_newline(tokenized, i)
+  ):
+    return i + 1
+  return None
+
+
+# Rough characters-per-token ratio used when no tokenizer-specific count is
+# available. Matches the commonly quoted average for English BPE vocabularies.
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_token_count(text: str) -> int:
+  """Estimates the number of model tokens in text.
+
+  Shared by token-budgeted batching and request rate limiting so both count
+  a prompt the same way.
+
+  Args:
+    text: Text to estimate.
+
+  Returns:
+    Estimated token count, at least 1 for non-empty text.
+  """
+  if not text:
+    return 0
+  return max(1, -(-len(text) // _CHARS_PER_TOKEN))
@@ -16,20 +16,26 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable
+import os
 import typing
 from typing import cast
 import warnings
 
 from langextract import annotation
+from langextract import cascade as cascade_lib
 from langextract import factory
 from langextract import io
 from langextract import prompt_validation as pv
 from langextract import prompting
+from langextract import resilience as resilience_lib
 from langextract import resolver
+from langextract import response_cache as response_cache_lib
 from langextract.core import base_model
 from langextract.core import data
 from langextract.core import format_handler as fh
+from langextract.core import streaming
 from langextract.core import tokenizer as tokenizer_lib
 
 
@@ -62,6 +68,15 @@ def extract(
     prompt_validation_strict: bool = False,
     show_progress: bool = True,
     tokenizer: tokenizer_lib.Tokenizer | None = None,
+    pipeline_depth: int | None = None,
+    max_batch_chars: int | None = None,
+    max_batch_tokens: int | None = None,
+    response_cache: (
+        str | os.PathLike[str] | response_cache_lib.ResponseCache | None
+    ) = None,
+    resilience: bool | resilience_lib.ResilienceConfig | None = None,
+    stream: bool = False,
+    stream_limits: streaming.StreamLimits | None = None,
 ) -> list[data.AnnotatedDocument] | data.AnnotatedDocument:
   """Extracts structured information from text.
 
@@ -149,7 +164,9 @@ def extract(
         model_id, api_key, and language_model_type parameters. When both model
         and config are provided, model takes precedence.
       model: Pre-configured language model to use for extraction. Takes
-        precedence over all other parameters including config.
+        precedence over all other parameters including config. A
+        cascade.CascadeLanguageModel reviews its cheap answers with this
+        run's resolver and alignment settings.
       fetch_urls: Whether to automatically download content when the input is a
         URL string. When True (default), strings starting with http:// or
         https:// are fetched. When False, all strings are treated as literal
@@ -160,6 +177,38 @@ def extract(
       prompt_validation_strict: When True and prompt_validation_level is ERROR,
         raises on non-exact matches (MATCH_FUZZY, MATCH_LESSER). Defaults to False.
       show_progress: Whether to show progress bar during extraction. Defaults to True.
+      pipeline_depth: Number of batches that may be in flight with the language
+        model while earlier batches are parsed and aligned. 0 runs inference
+        and alignment in lock-step. Values >= 1 overlap network latency with
+        CPU work without changing output order. Defaults to
+        extraction_passes, capped at max_workers, so that all passes over a
+        batch run concurrently while a single pass stays in lock-step.
+        Requests still share the model's max_workers slots. This is a
+        keyword-only parameter.
+      max_batch_chars: If set, batches are filled with chunks up to this many
+        characters instead of batch_length chunks, and may mix chunks from
+        different documents. Useful to keep request sizes steady against
+        TPM-limited APIs. This is a keyword-only parameter.
+      max_batch_tokens: Like max_batch_chars but budgets estimated tokens
+        (about 4 characters per token). This is a keyword-only parameter.
+      response_cache: Path to a local response cache file, or a
+        response_cache.ResponseCache. When set, model responses are stored
+        keyed by model, generation parameters, schema and prompt, and
+        repeated requests are served from the cache without calling the
+        model. This is a keyword-only parameter.
+      resilience: True or a resilience.ResilienceConfig to send each prompt
+        separately with retries on transient errors, a circuit breaker and
+        optional hedged requests. Prompts that still fail on a transient
+        error produce no extractions instead of aborting the run; other
+        errors are raised. Batches the model sends to a Batch API are
+        retried whole. This is a keyword-only parameter.
+      stream: Whether to stream model output. Extractions are parsed and
+        aligned while the model is still generating, and generation is
+        stopped early on a repetition loop or output cap. Ollama and OpenAI
+        stream natively; other providers return their full output at once.
+        This is a keyword-only parameter.
+      stream_limits: streaming.StreamLimits applied when stream is True, e.g.
+        to set max_output_chars. This is a keyword-only parameter.
 
   Returns:
       An AnnotatedDocument with the extracted information when input is a
@@ -172,6 +221,267 @@ def extract(
       requests.RequestException: If URL download fails.
       pv.PromptAlignmentError: If validation fails in ERROR mode.
   """
+  annotator, res, alignment_kwargs = _build_annotator(
+      prompt_description=prompt_description,
+      examples=examples,
+      model_id=model_id,
+      api_key=api_key,
+      language_model_type=language_model_type,
+      format_type=format_type,
+      temperature=temperature,
+      fence_output=fence_output,
+      use_schema_constraints=use_schema_constraints,
+      max_workers=max_workers,
+      resolver_params=resolver_params,
+      language_model_params=language_model_params,
+      debug=debug,
+      model_url=model_url,
+      config=config,
+      model=model,
+      prompt_validation_level=prompt_validation_level,
+      prompt_validation_strict=prompt_validation_strict,
+      tokenizer=tokenizer,
+      response_cache=response_cache,
+      resilience=resilience,
+  )
+
+  if max_workers is not None and batch_length < max_workers:
+    warnings.warn(
+        f"batch_length ({batch_length}) < max_workers ({max_workers}). "
+        f"Only {batch_length} workers will be used. "
+        "Set batch_length >= max_workers for optimal parallelization.",
+        UserWarning,
+    )
+
+  if (
+      fetch_urls
+      and isinstance(text_or_documents, str)
+      and io.is_url(text_or_documents)
+  ):
+    text_or_documents = io.download_text_from_url(text_or_documents)
+
+  if isinstance(text_or_documents, str):
+    result = annotator.annotate_text(
+        text=text_or_documents,
+        resolver=res,
+        max_char_buffer=max_char_buffer,
+        batch_length=batch_length,
+        additional_context=additional_context,
+        debug=debug,
+        extraction_passes=extraction_passes,
+        context_window_chars=context_window_chars,
+        show_progress=show_progress,
+        max_workers=max_workers,
+        tokenizer=tokenizer,
+        pipeline_depth=pipeline_depth,
+        max_batch_chars=max_batch_chars,
+        max_batch_tokens=max_batch_tokens,
+        stream=stream,
+        stream_limits=stream_limits,
+        **alignment_kwargs,
+    )
+    return result
+  else:
+    documents = cast(Iterable[data.Document], text_or_documents)
+    result = annotator.annotate_documents(
+        documents=documents,
+        resolver=res,
+        max_char_buffer=max_char_buffer,
+        batch_length=batch_length,
+        debug=debug,
+        extraction_passes=extraction_passes,
+        context_window_chars=context_window_chars,
+        show_progress=show_progress,
+        max_workers=max_workers,
+        tokenizer=tokenizer,
+        pipeline_depth=pipeline_depth,
+        max_batch_chars=max_batch_chars,
+        max_batch_tokens=max_batch_tokens,
+        stream=stream,
+        stream_limits=stream_limits,
+        **alignment_kwargs,
+    )
+    return list(result)
+
+
+async def extract_async(
+    text_or_documents: typing.Any,
+    prompt_description: str | None = None,
+    examples: typing.Sequence[typing.Any] | None = None,
+    model_id: str = "gemini-2.5-flash",
+    api_key: str | None = None,
+    format_type: typing.Any = None,
+    max_char_buffer: int = 1000,
+    temperature: float | None = None,
+    fence_output: bool | None = None,
+    use_schema_constraints: bool = True,
+    max_concurrency: int = 16,
+    additional_context: str | None = None,
+    resolver_params: dict | None = None,
+    language_model_params: dict | None = None,
+    debug: bool = False,
+    model_url: str | None = None,
+    context_window_chars: int | None = None,
+    config: typing.Any = None,
+    model: typing.Any = None,
+    *,
+    fetch_urls: bool = True,
+    prompt_validation_level: pv.PromptValidationLevel = pv.PromptValidationLevel.WARNING,
+    prompt_validation_strict: bool = False,
+    tokenizer: tokenizer_lib.Tokenizer | None = None,
+    response_cache: (
+        str | os.PathLike[str] | response_cache_lib.ResponseCache | None
+    ) = None,
+    resilience: bool | resilience_lib.ResilienceConfig | None = None,
+) -> list[data.AnnotatedDocument] | data.AnnotatedDocument:
+  """Asynchronously extracts structured information from text.
+
+  Async counterpart of extract() for use inside a running event loop. Every
+  chunk is sent through the model's infer_async(), and the number of requests
+  in flight is bounded by max_concurrency instead of batch_length and
+  max_workers. Providers with a native async client (Gemini, OpenAI, Ollama)
+  do not hold a thread per request. To stream results document by document,
+  use annotation.Annotator.annotate_documents_async directly.
+
+  Args:
+      text_or_documents: The source text, a URL (when fetch_urls is True), or
+        an iterable of Document objects.
+      prompt_description: Instructions for what to extract from the text.
+      examples: List of ExampleData objects to guide the extraction.
+      model_id: The model ID to use for extraction.
+      api_key: API key for the model provider.
+      format_type: The format type for the output (JSON or YAML).
+      max_char_buffer: Max number of characters for inference.
+      temperature: The sampling temperature for generation.
+      fence_output: Whether to expect/generate fenced output. See extract().
+      use_schema_constraints: Whether to generate schema constraints for
+        models.
+      max_concurrency: Maximum number of concurrent model requests. Defaults
+        to 16.
+      additional_context: Additional context to be added to the prompt when
+        the input is a string.
+      resolver_params: Parameters for the `resolver.Resolver`. See extract().
+      language_model_params: Additional parameters for the language model.
+      debug: Whether to enable debug logging.
+      model_url: Endpoint URL for self-hosted or on-prem models.
+      context_window_chars: Number of characters from the previous chunk to
+        include as context for the current chunk.
+      config: Model configuration to use for extraction.
+      model: Pre-configured language model to use for extraction.
+      fetch_urls: Whether to download content when the input is a URL string.
+      prompt_validation_level: Controls pre-flight alignment checks on few-shot
+        examples.
+      prompt_validation_strict: Whether non-exact matches fail validation in
+        ERROR mode.
+      tokenizer: Optional Tokenizer instance to use for chunking and alignment.
+      response_cache: Path to a local response cache file, or a
+        response_cache.ResponseCache. See extract().
+      resilience: True or a resilience.ResilienceConfig. See extract().
+
+  Returns:
+      An AnnotatedDocument when input is a string or URL, or a list of
+      AnnotatedDocuments when input is an iterable of Documents.
+
+  Raises:
+      ValueError: If examples is None or empty.
+      ValueError: If max_concurrency is less than 1.
+      requests.RequestException: If URL download fails.
+      pv.PromptAlignmentError: If validation fails in ERROR mode.
+  """
+  annotator, res, alignment_kwargs = _build_annotator(
+      prompt_description=prompt_description,
+      examples=examples,
+      model_id=model_id,
+      api_key=api_key,
+      language_model_type=None,
+      format_type=format_type,
+      temperature=temperature,
+      fence_output=fence_output,
+      use_schema_constraints=use_schema_constraints,
+      max_workers=max_concurrency,
+      resolver_params=resolver_params,
+      language_model_params=language_model_params,
+      debug=debug,
+      model_url=model_url,
+      config=config,
+      model=model,
+      prompt_validation_level=prompt_validation_level,
+      prompt_validation_strict=prompt_validation_strict,
+      tokenizer=tokenizer,
+      response_cache=response_cache,
+      resilience=resilience,
+  )
+
+  if (
+      fetch_urls
+      and isinstance(text_or_documents, str)
+      and io.is_url(text_or_documents)
+  ):
+    text_or_documents = await asyncio.to_thread(
+        io.download_text_from_url, text_or_documents
+    )
+
+  is_single_text = isinstance(text_or_documents, str)
+  if is_single_text:
+    documents = [
+        data.Document(
+            text=text_or_documents, additional_context=additional_context
+        )
+    ]
+  else:
+    documents = cast(Iterable[data.Document], text_or_documents)
+
+  results = [
+      annotated_doc
+      async for annotated_doc in annotator.annotate_documents_async(
+          documents=documents,
+          resolver=res,
+          max_char_buffer=max_char_buffer,
+          max_concurrency=max_concurrency,
+          debug=debug,
+          context_window_chars=context_window_chars,
+          tokenizer=tokenizer,
+          **alignment_kwargs,
+      )
+  ]
+  if is_single_text:
+    return results[0]
+  return results
+
+
+def _build_annotator(
+    *,
+    prompt_description: str | None,
+    examples: typing.Sequence[typing.Any] | None,
+    model_id: str,
+    api_key: str | None,
+    language_model_type: typing.Type[typing.Any] | None,
+    format_type: typing.Any,
+    temperature: float | None,
+    fence_output: bool | None,
+    use_schema_constraints: bool,
+    max_workers: int,
+    resolver_params: dict | None,
+    language_model_params: dict | None,
+    debug: bool,
+    model_url: str | None,
+    config: typing.Any,
+    model: typing.Any,
+    prompt_validation_level: pv.PromptValidationLevel,
+    prompt_validation_strict: bool,
+    tokenizer: tokenizer_lib.Tokenizer | None,
+    response_cache: (
+        str | os.PathLike[str] | response_cache_lib.ResponseCache | None
+    ) = None,
+    resilience: bool | resilience_lib.ResilienceConfig | None = None,
+) -> tuple[annotation.Annotator, resolver.Resolver, dict[str, typing.Any]]:
+  """Validates inputs and builds the annotator shared by extract APIs.
+
+  See extract() for a description of the arguments.
+
+  Returns:
+    A tuple of (annotator, resolver, alignment_kwargs).
+  """
   if not examples:
     raise ValueError(
         "Examples are required for reliable extraction. Please provide at least"
@@ -200,21 +510,6 @@ def extract(
   if format_type is None:
     format_type = data.FormatType.JSON
 
-  if max_workers is not None and batch_length < max_workers:
-    warnings.warn(
-        f"batch_length ({batch_length}) < max_workers ({max_workers}). "
-        f"Only {batch_length} workers will be used. "
-        "Set batch_length >= max_workers for optimal parallelization.",
-        UserWarning,
-    )
-
-  if (
-      fetch_urls
-      and isinstance(text_or_documents, str)
-      and io.is_url(text_or_documents)
-  ):
-    text_or_documents = io.download_text_from_url(text_or_documents)
-
   prompt_template = prompting.PromptTemplateStructured(
       description=prompt_description
   )
@@ -231,7 +526,7 @@ def extract(
           "'use_schema_constraints' is ignored when 'model' is provided. "
           "The model should already be configured with schema constraints.",
           UserWarning,
-          stacklevel=2,
+          stacklevel=3,
       )
   elif config:
     if use_schema_constraints:
@@ -239,7 +534,7 @@ def extract(
           "With 'config', schema constraints are still applied via examples. "
           "Or pass explicit schema in config.provider_kwargs.",
           UserWarning,
-          stacklevel=2,
+          stacklevel=3,
       )
 
     language_model = factory.create_model(
@@ -254,7 +549,7 @@ def extract(
           "'language_model_type' is deprecated and will be removed in v2.0.0. "
           "Use model, config, or model_id parameters instead.",
           FutureWarning,
-          stacklevel=2,
+          stacklevel=3,
       )
 
     base_lm_kwargs: dict[str, typing.Any] = {
@@ -272,7 +567,7 @@ def extract(
           "'gemini_schema' is deprecated. Schema constraints are now "
           "automatically handled. This parameter will be ignored.",
           FutureWarning,
-          stacklevel=2,
+          stacklevel=3,
       )
       language_model_params = dict(language_model_params or {})
       language_model_params.pop("gemini_schema", None)
@@ -303,6 +598,28 @@ def extract(
   if language_model.schema is not None:
     language_model.schema.validate_format(format_handler)
 
+  cascade_model = (
+      language_model
+      if isinstance(language_model, cascade_lib.CascadeLanguageModel)
+      else None
+  )
+
+  if resilience:
+    language_model = resilience_lib.ResilientLanguageModel(
+        language_model,
+        resilience
+        if isinstance(resilience, resilience_lib.ResilienceConfig)
+        else None,
+    )
+
+  # The cache wraps the retry layer so that hits never reach it.
+  if response_cache is not None:
+    if not isinstance(response_cache, response_cache_lib.ResponseCache):
+      response_cache = response_cache_lib.ResponseCache(response_cache)
+    language_model = response_cache_lib.CachingLanguageModel(
+        language_model, response_cache
+    )
+
   # Pull alignment settings from normalized params
   alignment_kwargs = {}
   for key in resolver.ALIGNMENT_PARAM_KEYS:
@@ -325,41 +642,14 @@ def extract(
       ) from e
     raise
 
+  # A cascade reviews cheap answers the same way this run resolves them.
+  if cascade_model is not None:
+    cascade_model.bind_resolver(res, **alignment_kwargs)
+
   annotator = annotation.Annotator(
       language_model=language_model,
       prompt_template=prompt_template,
       format_handler=format_handler,
   )
 
-  if isinstance(text_or_documents, str):
-    result = annotator.annotate_text(
-        text=text_or_documents,
-        resolver=res,
-        max_char_buffer=max_char_buffer,
-        batch_length=batch_length,
-        additional_context=additional_context,
-        debug=debug,
-        extraction_passes=extraction_passes,
-        context_window_chars=context_window_chars,
-        show_progress=show_progress,
-        max_workers=max_workers,
-        tokenizer=tokenizer,
-        **alignment_kwargs,
-    )
-    return result
-  else:
-    documents = cast(Iterable[data.Document], text_or_documents)
-    result = annotator.annotate_documents(
-        documents=documents,
-        resolver=res,
-        max_char_buffer=max_char_buffer,
-        batch_length=batch_length,
-        debug=debug,
-        extraction_passes=extraction_passes,
-        context_window_chars=context_window_chars,
-        show_progress=show_progress,
-        max_workers=max_workers,
-        tokenizer=tokenizer,
-        **alignment_kwargs,
-    )
-    return list(result)
+  return annotator, res, alignment_kwargs
@@ -229,7 +229,15 @@ def _create_model_with_schema(
 
   schema_instance = None
   if use_schema_constraints and examples:
-    schema_class = provider_class.get_schema_class()
+    schema_provider = provider_class
+    # Providers that wrap another model ID, such as replay:<model_id>,
+    # constrain output the way the wrapped model does.
+    wrapped_provider_class = getattr(
+        provider_class, "wrapped_provider_class", None
+    )
+    if wrapped_provider_class is not None and config.model_id:
+      schema_provider = wrapped_provider_class(config.model_id)
+    schema_class = schema_provider.get_schema_class()
     if schema_class is not None:
       schema_instance = schema_class.from_examples(examples)
 
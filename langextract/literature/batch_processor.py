@@ -24,17 +24,21 @@ from tqdm import tqdm
 
 
 try:
+  from langextract.literature import metadata_cache
   from langextract.literature import metadata_models as mm
   from langextract.literature import pdf_parser
   from langextract.literature import pubmed_client
   from langextract.literature import biorxiv_client
+  from langextract.literature import preprint_mirror
 except ImportError:
   import sys
   sys.path.append('..')
+  from langextract.literature import metadata_cache
   from langextract.literature import metadata_models as mm
   from langextract.literature import pdf_parser
   from langextract.literature import pubmed_client
   from langextract.literature import biorxiv_client
+  from langextract.literature import preprint_mirror
 
 
 class LiteratureBatchProcessor:
@@ -44,7 +48,9 @@ class LiteratureBatchProcessor:
       self,
       pubmed_email: str,
       pubmed_api_key: Optional[str] = None,
-      max_workers: int = 10
+      max_workers: int = 10,
+      preprint_mirror_path: Optional[str] = None,
+      metadata_cache_path: Optional[str] = None
   ):
     """Initialize batch processor.
     
@@ -52,12 +58,29 @@ class LiteratureBatchProcessor:
       pubmed_email: Email for PubMed API.
       pubmed_api_key: Optional API key for higher rate limits.
       max_workers: Maximum parallel workers.
+      preprint_mirror_path: Optional SQLite file for a local preprint
+        mirror. Preprint searches then only download days not yet mirrored.
+      metadata_cache_path: Optional SQLite file for a paper metadata cache
+        shared by the PubMed and preprint clients. Papers fetched by earlier
+        searches are then served from disk.
     """
+    self.metadata_cache = (
+        metadata_cache.MetadataCache(metadata_cache_path)
+        if metadata_cache_path else None
+    )
     self.pubmed_client = pubmed_client.PubMedClient(
         email=pubmed_email,
-        api_key=pubmed_api_key
+        api_key=pubmed_api_key,
+        cache=self.metadata_cache
+    )
+    mirror = (
+        preprint_mirror.PreprintMirror(preprint_mirror_path)
+        if preprint_mirror_path else None
+    )
+    self.biorxiv_client = biorxiv_client.BioRxivClient(
+        mirror=mirror,
+        cache=self.metadata_cache
     )
-    self.biorxiv_client = biorxiv_client.BioRxivClient()
     self.pdf_parser = pdf_parser.PaperPDFParser()
     self.max_workers = max_workers
   
@@ -295,21 +318,22 @@ class LiteratureBatchProcessor:
             "source": "pubmed",
             "error": str(e)
         })
-      
-      try:
-        preprints = self.biorxiv_client.search_biomarkers(
-            biomarker_terms=[term],
-            days_back=preprint_days_back
-        )
-        all_papers.extend([
-            mm.ParsedPaper(metadata=paper) for paper in preprints
-        ])
-      except Exception as e:
-        errors.append({
-            "term": term,
-            "source": "preprints",
-            "error": str(e)
-        })
+    
+    # All terms are matched against one download of the preprint window.
+    try:
+      preprints = self.biorxiv_client.search_biomarkers(
+          biomarker_terms=biomarker_terms,
+          days_back=preprint_days_back
+      )
+      all_papers.extend([
+          mm.ParsedPaper(metadata=paper) for paper in preprints
+      ])
+    except Exception as e:
+      errors.append({
+          "term": ", ".join(biomarker_terms),
+          "source": "preprints",
+          "error": str(e)
+      })
     
     seen_ids = set()
     unique_papers = []
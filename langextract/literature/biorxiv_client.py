@@ -16,45 +16,93 @@
 
 from __future__ import annotations
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import requests
 
 
 try:
+  from langextract.literature import metadata_cache
   from langextract.literature import metadata_models as mm
+  from langextract.literature import preprint_mirror
+  from langextract.literature import term_matcher
 except ImportError:
   import sys
   sys.path.append('..')
+  from langextract.literature import metadata_cache
   from langextract.literature import metadata_models as mm
+  from langextract.literature import preprint_mirror
+  from langextract.literature import term_matcher
 
 
 class BioRxivClient:
   """Client for bioRxiv and medRxiv APIs."""
   
   BASE_URL = "https://api.biorxiv.org"
+  PAGE_SIZE = 100
   
-  def __init__(self, requests_per_minute: int = 60):
+  def __init__(
+      self,
+      requests_per_minute: int = 60,
+      max_workers: int = 4,
+      mirror: Optional[preprint_mirror.PreprintMirror] = None,
+      cache: Optional[metadata_cache.MetadataCache] = None
+  ):
     """Initialize bioRxiv/medRxiv client.
     
     Args:
       requests_per_minute: Rate limit for API requests.
+      max_workers: Maximum concurrent page downloads. Requests still start
+        no faster than requests_per_minute allows.
+      mirror: Optional local mirror. When set, recent-paper fetches and
+        keyword searches first sync the days missing from the mirror and
+        are then answered from it.
+      cache: Optional metadata cache. Parsed papers are stored by DOI and
+        reused while the server still reports the same version.
     """
     self.requests_per_minute = requests_per_minute
+    self.max_workers = max_workers
+    self.mirror = mirror
+    self.cache = cache
     self.last_request_time = 0.0
+    self._rate_lock = threading.Lock()
     self.session = requests.Session()
   
   def _rate_limit(self) -> None:
-    """Implement rate limiting for API requests."""
+    """Implement rate limiting for API requests.
+    
+    Each caller reserves the next free request slot under a lock, so
+    concurrent page fetches are spaced out like sequential ones while their
+    network round-trips overlap.
+    """
     min_interval = 60.0 / self.requests_per_minute
-    elapsed = time.time() - self.last_request_time
+    with self._rate_lock:
+      slot = max(time.time(), self.last_request_time + min_interval)
+      self.last_request_time = slot
+    
+    delay = slot - time.time()
+    if delay > 0:
+      time.sleep(delay)
+  
+  def _fetch_page(
+      self,
+      start_date: str,
+      end_date: str,
+      server: str,
+      cursor: int
+  ) -> dict:
+    """Fetch one page of the details endpoint starting at cursor."""
+    self._rate_limit()
     
-    if elapsed < min_interval:
-      time.sleep(min_interval - elapsed)
+    url = f"{self.BASE_URL}/details/{server}/{start_date}/{end_date}/{cursor}"
     
-    self.last_request_time = time.time()
+    response = self.session.get(url, timeout=30)
+    response.raise_for_status()
+    return response.json()
   
   def fetch_papers(
       self,
@@ -64,6 +112,9 @@ class BioRxivClient:
   ) -> List[dict]:
     """Fetch papers from bioRxiv or medRxiv for date range.
     
+    The first page reports the total number of papers; the remaining pages
+    are then fetched concurrently and joined in cursor order.
+    
     Args:
       start_date: Start date in YYYY-MM-DD format.
       end_date: End date in YYYY-MM-DD format.
@@ -72,15 +123,31 @@ class BioRxivClient:
     Returns:
       List of paper dictionaries from API.
     """
-    self._rate_limit()
+    first = self._fetch_page(start_date, end_date, server, 0)
+    papers = list(first.get('collection', []))
     
-    url = f"{self.BASE_URL}/details/{server}/{start_date}/{end_date}"
+    messages = first.get('messages') or [{}]
+    try:
+      total = int(messages[0].get('total', len(papers)))
+    except (TypeError, ValueError):
+      total = len(papers)
     
-    response = self.session.get(url, timeout=30)
-    response.raise_for_status()
+    page_size = len(papers) or self.PAGE_SIZE
+    cursors = range(len(papers), total, page_size) if papers else []
+    if not cursors:
+      return papers
+    
+    with ThreadPoolExecutor(
+        max_workers=min(self.max_workers, len(cursors))
+    ) as executor:
+      pages = executor.map(
+          lambda cursor: self._fetch_page(start_date, end_date, server, cursor),
+          cursors
+      )
+      for page in pages:
+        papers.extend(page.get('collection', []))
     
-    data = response.json()
-    return data.get('collection', [])
+    return papers
   
   def fetch_recent_papers(
       self,
@@ -96,14 +163,33 @@ class BioRxivClient:
     Returns:
       List of paper dictionaries.
     """
+    start_date, end_date = self._window(days_back)
+    
+    if self.mirror is not None:
+      self.mirror.sync(server, start_date, end_date, self.fetch_papers)
+      return self.mirror.papers(server, start_date, end_date)
+    
+    return self.fetch_papers(start_date, end_date, server=server)
+  
+  def _window(self, days_back: int) -> Tuple[str, str]:
+    """Return (start_date, end_date) strings for the last days_back days."""
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
-    
-    return self.fetch_papers(
-        start_date.strftime("%Y-%m-%d"),
-        end_date.strftime("%Y-%m-%d"),
-        server=server
-    )
+    return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+  
+  def _search_mirror(
+      self,
+      terms: List[str],
+      days_back: int,
+      server: str
+  ) -> Dict[str, List[dict]]:
+    """Sync the mirror for the window and look up each term in its index."""
+    start_date, end_date = self._window(days_back)
+    self.mirror.sync(server, start_date, end_date, self.fetch_papers)
+    return {
+        term: self.mirror.search(term, server, start_date, end_date)
+        for term in terms
+    }
   
   def search_by_keyword(
       self,
@@ -121,21 +207,23 @@ class BioRxivClient:
     Returns:
       List of PaperMetadata objects matching keyword.
     """
-    papers_data = self.fetch_recent_papers(days_back, server)
-    
-    matching_papers = []
-    keyword_lower = keyword.lower()
-    
-    for paper_data in papers_data:
-      title = paper_data.get('title', '').lower()
-      abstract = paper_data.get('abstract', '').lower()
+    if self.mirror is not None:
+      hits = self._search_mirror([keyword], days_back, server)[keyword]
+    else:
+      papers_data = self.fetch_recent_papers(days_back, server)
       
-      if keyword_lower in title or keyword_lower in abstract:
-        paper = self._parse_preprint(paper_data, server)
-        if paper:
-          matching_papers.append(paper)
+      hits = []
+      keyword_lower = keyword.lower()
+      
+      for paper_data in papers_data:
+        title = paper_data.get('title', '').lower()
+        abstract = paper_data.get('abstract', '').lower()
+        
+        if keyword_lower in title or keyword_lower in abstract:
+          hits.append(paper_data)
     
-    return matching_papers
+    papers = self._parse_preprints(hits, server)
+    return [paper for paper in papers if paper]
   
   def search_biomarkers(
       self,
@@ -151,23 +239,117 @@ class BioRxivClient:
       server: Server name.
     
     Returns:
-      List of matching papers.
+      List of matching papers, grouped by the first term they match in
+      biomarker_terms order, without duplicate DOIs.
+    """
+    if self.mirror is not None:
+      hits_by_term = self._search_mirror(biomarker_terms, days_back, server)
+    else:
+      papers_data = self.fetch_recent_papers(days_back, server)
+      hits_by_term = self._match_terms(papers_data, biomarker_terms)
+    return self._unique_papers(hits_by_term, server)
+  
+  def _match_terms(
+      self,
+      papers_data: List[dict],
+      terms: List[str]
+  ) -> Dict[str, List[dict]]:
+    """Match all terms against titles and abstracts in a single pass.
+    
+    Args:
+      papers_data: Raw paper data from API.
+      terms: Search terms, matched case-insensitively as substrings.
+    
+    Returns:
+      Raw papers matching each term, in papers_data order.
     """
-    all_papers = []
+    matcher = term_matcher.TermMatcher(terms)
+    hits_by_term = {term: [] for term in terms}
+    
+    for paper_data in papers_data:
+      text = (
+          f"{paper_data.get('title') or ''}\x00"
+          f"{paper_data.get('abstract') or ''}"
+      )
+      for term in matcher.find(text):
+        hits_by_term[term].append(paper_data)
+    
+    return hits_by_term
+  
+  def _unique_papers(
+      self,
+      hits_by_term: Dict[str, List[dict]],
+      server: str
+  ) -> List[mm.PaperMetadata]:
+    """Parse matches term by term, keeping the first paper for each DOI.
     
-    for term in biomarker_terms:
-      papers = self.search_by_keyword(term, days_back, server)
-      all_papers.extend(papers)
+    Args:
+      hits_by_term: Raw papers matching each term, in term order.
+      server: Server name for source tracking.
     
+    Returns:
+      Unique papers ordered as if each term had been searched in turn.
+    """
     seen_dois = set()
-    unique_papers = []
+    candidates = []
     
-    for paper in all_papers:
-      if paper.doi and paper.doi not in seen_dois:
-        seen_dois.add(paper.doi)
-        unique_papers.append(paper)
+    for term in hits_by_term:
+      for paper_data in hits_by_term[term]:
+        doi = paper_data.get('doi')
+        if not doi or doi in seen_dois:
+          continue
+        seen_dois.add(doi)
+        candidates.append(paper_data)
     
-    return unique_papers
+    papers = self._parse_preprints(candidates, server)
+    return [paper for paper in papers if paper]
+  
+  def _parse_preprints(
+      self,
+      papers_data: List[dict],
+      server: str
+  ) -> List[Optional[mm.PaperMetadata]]:
+    """Parse raw papers, reusing cached metadata where it is current.
+    
+    A cached paper is reused if it came from the same server and has the
+    same version as the raw record; otherwise the record is parsed again
+    and the cache is updated.
+    
+    Args:
+      papers_data: Raw paper data from API.
+      server: Server name for source tracking.
+    
+    Returns:
+      One PaperMetadata or None per raw paper, in order.
+    """
+    if self.cache is None:
+      return [
+          self._parse_preprint(paper_data, server) for paper_data in papers_data
+      ]
+    
+    cached = self.cache.get_many(
+        metadata_cache.doi_key(paper_data['doi'])
+        for paper_data in papers_data if paper_data.get('doi')
+    )
+    
+    papers = []
+    fresh = []
+    for paper_data in papers_data:
+      doi = paper_data.get('doi')
+      paper = cached.get(metadata_cache.doi_key(doi)) if doi else None
+      if paper is not None and (
+          paper.metadata_extras.get('server') != server
+          or paper.metadata_extras.get('version') != paper_data.get('version')
+      ):
+        paper = None
+      if paper is None:
+        paper = self._parse_preprint(paper_data, server)
+        if paper:
+          fresh.append(paper)
+      papers.append(paper)
+    
+    self.cache.put_papers(fresh)
+    return papers
   
   def _parse_preprint(
       self,
@@ -250,6 +432,8 @@ class BioRxivClient:
   ) -> List[mm.PaperMetadata]:
     """Search both bioRxiv and medRxiv for keyword.
     
+    With a mirror, both servers are synced into and searched from it.
+    
     Args:
       keyword: Search keyword.
       days_back: Number of days to search.
@@ -0,0 +1,215 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent cache of parsed paper metadata keyed by PMID and DOI.
+
+Literature clients look papers up here in bulk before downloading, and only
+fetch the misses. Entries expire after a TTL, and entries written under a
+different cache version are treated as misses, so changing how metadata is
+parsed only requires bumping the version.
+
+Usage example:
+    cache = metadata_cache.MetadataCache("~/.cache/langextract/papers.db")
+    client = pubmed_client.PubMedClient(email, cache=cache)
+    papers = client.fetch_abstracts(pmids)  # Only uncached PMIDs are fetched.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+  from langextract.literature import metadata_models as mm
+except ImportError:
+  import sys
+  sys.path.append('..')
+  from langextract.literature import metadata_models as mm
+
+# Bump when PaperMetadata or the parsers change in a way that makes stored
+# entries stale.
+CACHE_VERSION = 1
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# Stays well below SQLite's limit on host parameters per statement.
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+def pmid_key(pmid: str) -> str:
+  """Returns the cache key for a PubMed ID."""
+  return f"pmid:{str(pmid).strip()}"
+
+
+def doi_key(doi: str) -> str:
+  """Returns the cache key for a DOI. DOIs are case-insensitive."""
+  return f"doi:{doi.strip().lower()}"
+
+
+def paper_keys(paper: mm.PaperMetadata) -> List[str]:
+  """Returns every key a paper is stored under."""
+  keys = []
+  if paper.pmid:
+    keys.append(pmid_key(paper.pmid))
+  if paper.doi:
+    keys.append(doi_key(paper.doi))
+  return keys
+
+
+class MetadataCache:
+  """SQLite-backed store of PaperMetadata with TTL and version invalidation.
+
+  The cache is safe to share between threads and clients.
+  """
+
+  def __init__(
+      self,
+      path: str,
+      ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+      version: str = ""
+  ):
+    """Opens or creates the cache.
+
+    Args:
+      path: SQLite database file. Parent directories are created as needed.
+        Use ":memory:" for a process-local cache.
+      ttl_seconds: Age after which entries are treated as misses. None keeps
+        entries until they are replaced.
+      version: Caller-defined label stored with each entry, e.g. a parser
+        option. Entries written under another label are misses.
+    """
+    if path != ":memory:":
+      path = os.path.expanduser(path)
+      Path(path).parent.mkdir(parents=True, exist_ok=True)
+    self.path = path
+    self.ttl_seconds = ttl_seconds
+    self.version = f"{CACHE_VERSION}:{version}"
+    self.hits = 0
+    self.misses = 0
+    self._lock = threading.Lock()
+    self._conn = sqlite3.connect(path, check_same_thread=False)
+    with self._conn:
+      if path != ":memory:":
+        self._conn.execute("PRAGMA journal_mode=WAL")
+      self._conn.executescript(_SCHEMA)
+
+  def __enter__(self) -> MetadataCache:
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+  def close(self) -> None:
+    """Closes the underlying database connection."""
+    with self._lock:
+      self._conn.close()
+
+  def _oldest_valid(self, now: float) -> float:
+    if self.ttl_seconds is None:
+      return float("-inf")
+    return now - self.ttl_seconds
+
+  def get_many(self, keys: Iterable[str]) -> Dict[str, mm.PaperMetadata]:
+    """Looks up many keys at once.
+
+    Args:
+      keys: Keys built with pmid_key() or doi_key().
+
+    Returns:
+      Papers for the keys that have a current entry. Expired entries and
+      entries from another version are left out.
+    """
+    keys = list(dict.fromkeys(keys))
+    oldest = self._oldest_valid(time.time())
+    rows = []
+    with self._lock:
+      for i in range(0, len(keys), _LOOKUP_CHUNK):
+        chunk = keys[i:i + _LOOKUP_CHUNK]
+        rows.extend(self._conn.execute(
+            "SELECT key, data FROM papers"
+            f" WHERE key IN ({', '.join('?' * len(chunk))})"
+            " AND version = ? AND stored_at >= ?",
+            (*chunk, self.version, oldest)
+        ).fetchall())
+
+    found = {}
+    for key, data in rows:
+      try:
+        found[key] = mm.PaperMetadata.model_validate_json(data)
+      except ValueError as e:
+        print(f"Dropping unreadable cache entry {key}: {e}")
+    with self._lock:
+      self.hits += len(found)
+      self.misses += len(keys) - len(found)
+    return found
+
+  def get(self, key: str) -> Optional[mm.PaperMetadata]:
+    """Looks up one key."""
+    return self.get_many([key]).get(key)
+
+  def put_papers(self, papers: Iterable[mm.PaperMetadata]) -> int:
+    """Stores papers under their PMID and DOI keys, in one transaction.
+
+    Args:
+      papers: Parsed papers. Existing entries for the same keys are
+        replaced.
+
+    Returns:
+      Number of keys written.
+    """
+    now = time.time()
+    rows = []
+    for paper in papers:
+      data = paper.model_dump_json()
+      rows.extend((key, self.version, now, data) for key in paper_keys(paper))
+    if not rows:
+      return 0
+    with self._lock, self._conn:
+      self._conn.executemany(
+          "INSERT OR REPLACE INTO papers (key, version, stored_at, data)"
+          " VALUES (?, ?, ?, ?)",
+          rows
+      )
+    return len(rows)
+
+  def prune(self) -> int:
+    """Deletes expired entries and entries from other versions.
+
+    Returns:
+      Number of entries deleted.
+    """
+    oldest = self._oldest_valid(time.time())
+    with self._lock, self._conn:
+      return self._conn.execute(
+          "DELETE FROM papers WHERE version != ? OR stored_at < ?",
+          (self.version, oldest)
+      ).rowcount
+
+  def count(self) -> int:
+    """Returns the number of stored entries, including stale ones."""
+    with self._lock:
+      return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
@@ -0,0 +1,325 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local SQLite mirror of bioRxiv/medRxiv preprint metadata.
+
+The mirror stores the raw records returned by the details endpoint together
+with a full-text index (FTS5, trigram tokenizer) over titles and abstracts.
+Each sync downloads only the days that are not yet in the mirror, plus the
+most recent days, which the servers may still add papers to. Keyword
+searches are then answered from the index without network access.
+
+Usage example:
+    mirror = preprint_mirror.PreprintMirror("~/.cache/langextract/preprints.db")
+    client = biorxiv_client.BioRxivClient(mirror=mirror)
+    papers = client.search_biomarkers(["CRP", "IL-6"], days_back=90)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import requests
+
+_DATE_FORMAT = "%Y-%m-%d"
+# The trigram tokenizer cannot match terms shorter than three characters.
+_MIN_FTS_TERM_LENGTH = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    doi TEXT NOT NULL,
+    version TEXT NOT NULL,
+    date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (server, doi, version)
+);
+CREATE INDEX IF NOT EXISTS papers_server_date ON papers (server, date);
+CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+    title, abstract, content='papers', content_rowid='id',
+    tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+  INSERT INTO papers_fts (rowid, title, abstract)
+  VALUES (new.id, new.title, new.abstract);
+END;
+CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+  INSERT INTO papers_fts (papers_fts, rowid, title, abstract)
+  VALUES ('delete', old.id, old.title, old.abstract);
+END;
+CREATE TABLE IF NOT EXISTS synced_days (
+    server TEXT NOT NULL,
+    day TEXT NOT NULL,
+    PRIMARY KEY (server, day)
+);
+"""
+
+
+def _days(start_date: str, end_date: str) -> List[date]:
+  start = datetime.strptime(start_date, _DATE_FORMAT).date()
+  end = datetime.strptime(end_date, _DATE_FORMAT).date()
+  return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _runs(days: Iterable[date]) -> List[Tuple[date, date]]:
+  """Groups sorted days into (first, last) runs of consecutive days."""
+  runs: List[Tuple[date, date]] = []
+  for day in days:
+    if runs and day == runs[-1][1] + timedelta(days=1):
+      runs[-1] = (runs[-1][0], day)
+    else:
+      runs.append((day, day))
+  return runs
+
+
+class PreprintMirror:
+  """Incrementally synced, full-text indexed store of preprint metadata.
+
+  The mirror is safe to share between threads.
+  """
+
+  def __init__(self, path: str, refresh_days: int = 2):
+    """Opens or creates the mirror.
+
+    Args:
+      path: SQLite database file. Parent directories are created as needed.
+        Use ":memory:" for a process-local mirror.
+      refresh_days: Number of most recent days that are downloaded again on
+        every sync, because the servers may still be adding papers to them.
+    """
+    if path != ":memory:":
+      path = os.path.expanduser(path)
+      Path(path).parent.mkdir(parents=True, exist_ok=True)
+    self.path = path
+    self.refresh_days = refresh_days
+    self._lock = threading.Lock()
+    self._conn = sqlite3.connect(path, check_same_thread=False)
+    with self._conn:
+      if path != ":memory:":
+        self._conn.execute("PRAGMA journal_mode=WAL")
+      # INSERT OR REPLACE only fires the delete trigger with this set.
+      self._conn.execute("PRAGMA recursive_triggers=ON")
+      self._conn.executescript(_SCHEMA)
+
+  def __enter__(self) -> PreprintMirror:
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+  def close(self) -> None:
+    """Closes the underlying database connection."""
+    with self._lock:
+      self._conn.close()
+
+  def missing_days(
+      self,
+      server: str,
+      start_date: str,
+      end_date: str,
+      today: Optional[date] = None
+  ) -> List[date]:
+    """Returns the days of the range that a sync would download.
+
+    Args:
+      server: Server name: 'biorxiv' or 'medrxiv'.
+      start_date: First day, YYYY-MM-DD.
+      end_date: Last day, YYYY-MM-DD.
+      today: Reference date for the refresh window. Defaults to today.
+
+    Returns:
+      Days not yet synced or inside the refresh window, in order.
+    """
+    days = _days(start_date, end_date)
+    if not days:
+      return []
+    with self._lock:
+      synced = {
+          row[0] for row in self._conn.execute(
+              "SELECT day FROM synced_days"
+              " WHERE server = ? AND day BETWEEN ? AND ?",
+              (server, start_date, end_date)
+          )
+      }
+    refresh_from = (today or date.today()) - timedelta(days=self.refresh_days)
+    return [
+        day for day in days
+        if day.strftime(_DATE_FORMAT) not in synced or day > refresh_from
+    ]
+
+  def add_papers(
+      self,
+      server: str,
+      papers: Iterable[dict],
+      synced_days: Iterable[date] = ()
+  ) -> int:
+    """Stores papers and records days as synced, in one transaction.
+
+    Args:
+      server: Server name the papers came from.
+      papers: Raw paper dictionaries from the details endpoint.
+      synced_days: Days whose papers are now completely stored.
+
+    Returns:
+      Number of papers stored.
+    """
+    rows = []
+    for paper in papers:
+      doi = paper.get('doi')
+      if not doi:
+        continue
+      rows.append((
+          server,
+          doi,
+          str(paper.get('version') or '1'),
+          paper.get('date') or '',
+          paper.get('title') or '',
+          paper.get('abstract') or '',
+          json.dumps(paper, ensure_ascii=False),
+      ))
+    with self._lock, self._conn:
+      # Replacing deletes the old row, which keeps the index in sync.
+      self._conn.executemany(
+          "INSERT OR REPLACE INTO papers"
+          " (server, doi, version, date, title, abstract, data)"
+          " VALUES (?, ?, ?, ?, ?, ?, ?)",
+          rows
+      )
+      self._conn.executemany(
+          "INSERT OR IGNORE INTO synced_days (server, day) VALUES (?, ?)",
+          [(server, day.strftime(_DATE_FORMAT)) for day in synced_days]
+      )
+    return len(rows)
+
+  def sync(
+      self,
+      server: str,
+      start_date: str,
+      end_date: str,
+      fetch: Callable[[str, str, str], List[dict]],
+      today: Optional[date] = None
+  ) -> int:
+    """Downloads the days of the range that are missing from the mirror.
+
+    Consecutive missing days are fetched as one date range. Days inside the
+    refresh window are stored but not marked as synced. If a download fails
+    with a network error, the mirror keeps what it has and the error is
+    reported; searches then use the stored papers.
+
+    Args:
+      server: Server name: 'biorxiv' or 'medrxiv'.
+      start_date: First day, YYYY-MM-DD.
+      end_date: Last day, YYYY-MM-DD.
+      fetch: Function (start_date, end_date, server) returning raw papers,
+        typically BioRxivClient.fetch_papers.
+      today: Reference date for the refresh window. Defaults to today.
+
+    Returns:
+      Number of papers downloaded.
+    """
+    today = today or date.today()
+    refresh_from = today - timedelta(days=self.refresh_days)
+    downloaded = 0
+    for first, last in _runs(
+        self.missing_days(server, start_date, end_date, today)
+    ):
+      try:
+        papers = fetch(
+            first.strftime(_DATE_FORMAT), last.strftime(_DATE_FORMAT), server
+        )
+      except requests.RequestException as e:
+        print(f"Preprint mirror sync failed for {server} {first}..{last}: {e}")
+        continue
+      final_days = [
+          day for day in _days(
+              first.strftime(_DATE_FORMAT), last.strftime(_DATE_FORMAT)
+          )
+          if day <= refresh_from
+      ]
+      downloaded += self.add_papers(server, papers, final_days)
+    return downloaded
+
+  def papers(
+      self,
+      server: str,
+      start_date: str,
+      end_date: str
+  ) -> List[dict]:
+    """Returns all stored papers of a server in a date range, oldest first."""
+    with self._lock:
+      rows = self._conn.execute(
+          "SELECT data FROM papers WHERE server = ? AND date BETWEEN ? AND ?"
+          " ORDER BY date, id",
+          (server, start_date, end_date)
+      ).fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+  def search(
+      self,
+      keyword: str,
+      server: str,
+      start_date: str,
+      end_date: str
+  ) -> List[dict]:
+    """Returns stored papers whose title or abstract contains keyword.
+
+    Matching is case-insensitive substring matching, like `keyword in text`.
+    Keywords of three or more characters use the full-text index; shorter
+    ones fall back to a scan of the date range.
+
+    Args:
+      keyword: Search keyword.
+      server: Server name: 'biorxiv' or 'medrxiv'.
+      start_date: First day, YYYY-MM-DD.
+      end_date: Last day, YYYY-MM-DD.
+
+    Returns:
+      Raw paper dictionaries, oldest first.
+    """
+    if len(keyword) >= _MIN_FTS_TERM_LENGTH:
+      phrase = '"' + keyword.replace('"', '""') + '"'
+      query = (
+          "SELECT p.data FROM papers_fts f JOIN papers p ON p.id = f.rowid"
+          " WHERE papers_fts MATCH ? AND p.server = ?"
+          " AND p.date BETWEEN ? AND ? ORDER BY p.date, p.id"
+      )
+      params = ('{title abstract}: ' + phrase, server, start_date, end_date)
+    else:
+      query = (
+          "SELECT data FROM papers WHERE server = ? AND date BETWEEN ? AND ?"
+          " AND (instr(lower(title), ?) OR instr(lower(abstract), ?))"
+          " ORDER BY date, id"
+      )
+      params = (server, start_date, end_date, keyword.lower(), keyword.lower())
+    with self._lock:
+      rows = self._conn.execute(query, params).fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+  def count(self, server: Optional[str] = None) -> int:
+    """Returns the number of stored papers, optionally for one server."""
+    with self._lock:
+      if server is None:
+        return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+      return self._conn.execute(
+          "SELECT COUNT(*) FROM papers WHERE server = ?", (server,)
+      ).fetchone()[0]
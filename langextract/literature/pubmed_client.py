@@ -16,21 +16,59 @@
 
 from __future__ import annotations
 
-import time
+import collections
+import dataclasses
+import hashlib
+import itertools
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 from Bio import Entrez
 
 
 try:
+  from langextract.core import rate_limit
+  from langextract.literature import metadata_cache
   from langextract.literature import metadata_models as mm
 except ImportError:
   import sys
   sys.path.append('..')
+  from langextract.core import rate_limit
+  from langextract.literature import metadata_cache
   from langextract.literature import metadata_models as mm
 
 
+@dataclasses.dataclass(frozen=True)
+class HistorySearch:
+  """A search result set stored on the NCBI history server.
+  
+  Attributes:
+    count: Total number of records matching the query.
+    webenv: Web environment string identifying the history session.
+    query_key: Key of the result set within the session.
+  """
+  
+  count: int
+  webenv: str
+  query_key: str
+
+
+def _limiter_id(api_key: Optional[str]) -> str:
+  """Return the rate limit registry ID for an API key, without the key."""
+  if not api_key:
+    return "anonymous"
+  return "api_key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _text(element: Optional[ET.Element]) -> str:
+  """Return the text of an element including inline markup, stripped."""
+  if element is None:
+    return ''
+  return ''.join(element.itertext()).strip()
+
+
 class PubMedClient:
   """Client for PubMed E-utilities API using Biopython."""
   
@@ -38,7 +76,11 @@ class PubMedClient:
       self,
       email: str,
       api_key: Optional[str] = None,
-      tool: str = "BiomarkerExtract"
+      tool: str = "BiomarkerExtract",
+      max_workers: int = 3,
+      rate_limiter: Optional[rate_limit.RateLimiter] = None,
+      stream_xml: bool = False,
+      cache: Optional[metadata_cache.MetadataCache] = None
   ):
     """Initialize PubMed client with authentication.
     
@@ -46,6 +88,18 @@ class PubMedClient:
       email: Email address for NCBI identification.
       api_key: Optional API key for higher rate limits (10 req/s vs 3 req/s).
       tool: Tool name for NCBI tracking.
+      max_workers: Maximum number of efetch requests in flight at once.
+      rate_limiter: Optional limiter to draw requests from. By default all
+        clients with the same API key (or all clients without one) share a
+        limiter: the one registered with rate_limit.configure("ncbi", ...)
+        if any, otherwise one at the NCBI ceiling.
+      stream_xml: Whether to parse efetch responses incrementally with
+        iterparse instead of Entrez.read. Memory then stays flat regardless
+        of batch size, which makes large batches practical.
+      cache: Optional metadata cache. When set, fetch_abstracts() and
+        iter_abstracts() only download PMIDs without a current entry, and
+        search_biomarkers() pages IDs instead of the history server so it
+        can consult the cache.
     """
     Entrez.email = email
     Entrez.tool = tool
@@ -56,17 +110,64 @@ class PubMedClient:
     self.email = email
     self.api_key = api_key
     self.requests_per_second = 10 if api_key else 3
-    self.last_request_time = 0.0
+    self.max_workers = max(1, max_workers)
+    self.stream_xml = stream_xml
+    self.cache = cache
+    # NCBI enforces its limit per API key, or per IP address without one, so
+    # every client in the process using the same key draws from one budget.
+    # The NCBI ceiling is registered only when no limiter is configured.
+    limiter_id = _limiter_id(api_key)
+    self.rate_limiter = (
+        rate_limiter
+        or rate_limit.get_limiter("ncbi", limiter_id)
+        or rate_limit.configure(
+            "ncbi",
+            rate_limit.RateLimit(
+                requests_per_minute=self.requests_per_second * 60,
+                burst_seconds=1.0
+            ),
+            model_id=limiter_id
+        )
+    )
   
   def _rate_limit(self) -> None:
-    """Implement rate limiting for API requests."""
-    min_interval = 1.0 / self.requests_per_second
-    elapsed = time.time() - self.last_request_time
+    """Block until the shared limiter admits another request."""
+    self.rate_limiter.acquire()
+  
+  def _open(self, request: Callable[..., Any], **params) -> Any:
+    """Send one E-utilities request under the rate limit."""
+    with self.rate_limiter.request():
+      return request(**params)
+  
+  def _read(self, request: Callable[..., Any], **params) -> Any:
+    """Send one E-utilities request and parse it with Entrez.read."""
+    handle = self._open(request, **params)
+    try:
+      return Entrez.read(handle)
+    finally:
+      handle.close()
+  
+  def _search_params(
+      self,
+      query: str,
+      max_results: int,
+      sort: str,
+      date_from: Optional[str],
+      date_to: Optional[str]
+  ) -> Dict[str, Any]:
+    search_params = {
+        "db": "pubmed",
+        "term": query,
+        "retmax": max_results,
+        "sort": sort
+    }
     
-    if elapsed < min_interval:
-      time.sleep(min_interval - elapsed)
+    if date_from and date_to:
+      search_params["mindate"] = date_from
+      search_params["maxdate"] = date_to
+      search_params["datetype"] = "pdat"
     
-    self.last_request_time = time.time()
+    return search_params
   
   def search(
       self,
@@ -88,25 +189,155 @@ class PubMedClient:
     Returns:
       List of PubMed IDs matching the query.
     """
-    self._rate_limit()
+    record = self._read(
+        Entrez.esearch,
+        **self._search_params(query, max_results, sort, date_from, date_to)
+    )
     
-    search_params = {
-        "db": "pubmed",
-        "term": query,
-        "retmax": max_results,
-        "sort": sort
-    }
+    return record.get("IdList", [])
+  
+  def search_history(
+      self,
+      query: str,
+      sort: str = "relevance",
+      date_from: Optional[str] = None,
+      date_to: Optional[str] = None
+  ) -> HistorySearch:
+    """Search PubMed and keep the full result set on the history server.
     
-    if date_from and date_to:
-      search_params["mindate"] = date_from
-      search_params["maxdate"] = date_to
-      search_params["datetype"] = "pdat"
+    Unlike search(), no IDs are transferred; the result set is paged with
+    fetch_history() instead, so it is not capped by retmax.
+    
+    Args:
+      query: PubMed search query with field qualifiers.
+      sort: Sort order: relevance, pub_date, or first_author.
+      date_from: Start date in YYYY/MM/DD format.
+      date_to: End date in YYYY/MM/DD format.
     
-    handle = Entrez.esearch(**search_params)
-    record = Entrez.read(handle)
-    handle.close()
+    Returns:
+      HistorySearch referencing the stored result set.
+    """
+    search_params = self._search_params(query, 0, sort, date_from, date_to)
+    search_params["usehistory"] = "y"
+    record = self._read(Entrez.esearch, **search_params)
     
-    return record.get("IdList", [])
+    return HistorySearch(
+        count=int(record["Count"]),
+        webenv=str(record["WebEnv"]),
+        query_key=str(record["QueryKey"])
+    )
+  
+  def fetch_history(
+      self,
+      history: HistorySearch,
+      max_results: Optional[int] = None,
+      batch_size: int = 100
+  ) -> Iterator[mm.PaperMetadata]:
+    """Fetch the papers of a history server result set.
+    
+    Windows of batch_size records are requested concurrently through
+    WebEnv/query_key paging, and papers are yielded as soon as their window
+    is parsed, in result set order.
+    
+    Args:
+      history: Result set returned by search_history().
+      max_results: Maximum papers to fetch. None fetches the whole set.
+      batch_size: Number of records to fetch per API call.
+    
+    Yields:
+      PaperMetadata objects with parsed information. With a cache, they
+      are also stored in it.
+    """
+    total = history.count
+    if max_results is not None:
+      total = min(total, max_results)
+    
+    windows = [
+        {
+            "webenv": history.webenv,
+            "query_key": history.query_key,
+            "retstart": start,
+            "retmax": min(batch_size, total - start)
+        }
+        for start in range(0, total, batch_size)
+    ]
+    yield from self._store_fetched(self._fetch_windows(windows), batch_size)
+  
+  def iter_abstracts(
+      self,
+      pmid_list: List[str],
+      batch_size: int = 100
+  ) -> Iterator[mm.PaperMetadata]:
+    """Fetch paper metadata for PMIDs, yielding papers batch by batch.
+    
+    Args:
+      pmid_list: List of PubMed IDs to fetch.
+      batch_size: Number of records to fetch per API call.
+    
+    Yields:
+      PaperMetadata objects in the order of pmid_list. With a cache, cached
+      papers are yielded without a request.
+    """
+    cached = {}
+    if self.cache is not None:
+      cached = self.cache.get_many(
+          metadata_cache.pmid_key(pmid) for pmid in pmid_list
+      )
+    missing = [
+        pmid for pmid in pmid_list
+        if metadata_cache.pmid_key(pmid) not in cached
+    ]
+    
+    windows = [
+        {"id": missing[i:i + batch_size]}
+        for i in range(0, len(missing), batch_size)
+    ]
+    fetched = self._store_fetched(self._fetch_windows(windows), batch_size)
+    if not cached:
+      yield from fetched
+      return
+    
+    # Merge cached and fetched papers back into pmid_list order. Fetched
+    # papers whose PMID differs from the requested one (merged records)
+    # are yielded at the end.
+    pending = {}
+    for pmid in pmid_list:
+      paper = cached.get(metadata_cache.pmid_key(pmid))
+      if paper is None:
+        paper = pending.pop(pmid, None)
+        while paper is None:
+          fetched_paper = next(fetched, None)
+          if fetched_paper is None:
+            break
+          if fetched_paper.pmid == pmid:
+            paper = fetched_paper
+          else:
+            pending[fetched_paper.pmid] = fetched_paper
+      if paper is not None:
+        yield paper
+    yield from pending.values()
+    yield from fetched
+  
+  def _store_fetched(
+      self,
+      papers: Iterator[mm.PaperMetadata],
+      batch_size: int
+  ) -> Iterator[mm.PaperMetadata]:
+    """Pass papers through, writing them to the cache batch by batch."""
+    if self.cache is None:
+      yield from papers
+      return
+    
+    fresh = []
+    try:
+      for paper in papers:
+        fresh.append(paper)
+        if len(fresh) >= batch_size:
+          self.cache.put_papers(fresh)
+          fresh = []
+        yield paper
+    finally:
+      self.cache.put_papers(fresh)
   
   def fetch_abstracts(
       self,
@@ -122,29 +353,57 @@ class PubMedClient:
     Returns:
       List of PaperMetadata objects with parsed information.
     """
-    papers = []
+    return list(self.iter_abstracts(pmid_list, batch_size))
+  
+  def _fetch_batch(self, window: Dict[str, Any]) -> List[mm.PaperMetadata]:
+    """Fetch and parse one efetch window."""
+    efetch_params = dict(db="pubmed", rettype="medline", retmode="xml")
+    if self.stream_xml:
+      handle = self._open(Entrez.efetch, **efetch_params, **window)
+      try:
+        return list(self._iter_pubmed_xml(handle))
+      finally:
+        handle.close()
     
-    for i in range(0, len(pmid_list), batch_size):
-      batch = pmid_list[i:i + batch_size]
-      self._rate_limit()
-      
-      handle = Entrez.efetch(
-          db="pubmed",
-          id=batch,
-          rettype="medline",
-          retmode="xml"
-      )
-      
-      records = Entrez.read(handle)
-      handle.close()
-      
-      for record in records['PubmedArticle']:
-        paper = self._parse_pubmed_record(record)
-        if paper:
-          papers.append(paper)
+    records = self._read(Entrez.efetch, **efetch_params, **window)
     
+    papers = []
+    for record in records['PubmedArticle']:
+      paper = self._parse_pubmed_record(record)
+      if paper:
+        papers.append(paper)
     return papers
   
+  def _fetch_windows(
+      self,
+      windows: List[Dict[str, Any]]
+  ) -> Iterator[mm.PaperMetadata]:
+    """Fetch efetch windows concurrently and yield their papers in order.
+    
+    At most twice max_workers windows are requested ahead of the consumer,
+    so a slow consumer does not buffer the whole result set.
+    """
+    if not windows:
+      return
+    
+    with ThreadPoolExecutor(
+        max_workers=min(self.max_workers, len(windows))
+    ) as executor:
+      remaining = iter(windows)
+      pending = collections.deque(
+          executor.submit(self._fetch_batch, window)
+          for window in itertools.islice(remaining, 2 * self.max_workers)
+      )
+      try:
+        while pending:
+          papers = pending.popleft().result()
+          for window in itertools.islice(remaining, 1):
+            pending.append(executor.submit(self._fetch_batch, window))
+          yield from papers
+      finally:
+        for future in pending:
+          future.cancel()
+  
   def _parse_pubmed_record(self, record: dict) -> Optional[mm.PaperMetadata]:
     """Parse PubMed XML record into PaperMetadata object.
     
@@ -198,8 +457,9 @@ class PubMedClient:
           mesh_terms.append(str(descriptor))
       
       keywords = []
-      keyword_list = medline_citation.get('KeywordList', [[]])[0]
-      keywords = [str(kw) for kw in keyword_list]
+      # Entrez returns an empty KeywordList for records without keywords.
+      keyword_lists = medline_citation.get('KeywordList') or [[]]
+      keywords = [str(kw) for kw in keyword_lists[0]]
       
       doi = None
       article_ids = record.get('PubmedData', {}).get('ArticleIdList', [])
@@ -209,22 +469,176 @@ class PubMedClient:
       
       pub_type = self._determine_publication_type(article)
       
-      return mm.PaperMetadata(
+      return self._make_paper(
+          pmid=pmid,
+          doi=doi,
+          title=title,
+          authors=authors,
+          journal=journal,
+          pub_date=pub_date,
+          pub_type=pub_type,
+          abstract=abstract,
+          keywords=keywords,
+          mesh_terms=mesh_terms,
+          pmcid=self._extract_pmcid(article_ids)
+      )
+    
+    except Exception as e:
+      print(f"Error parsing PubMed record: {e}")
+      return None
+  
+  def _make_paper(
+      self,
+      pmid: str,
+      doi: Optional[str],
+      title: str,
+      authors: List[mm.Author],
+      journal: mm.Journal,
+      pub_date: Optional[datetime],
+      pub_type: mm.PublicationType,
+      abstract: str,
+      keywords: List[str],
+      mesh_terms: List[str],
+      pmcid: Optional[str]
+  ) -> mm.PaperMetadata:
+    """Build PaperMetadata from fields shared by both parsers."""
+    return mm.PaperMetadata(
+        pmid=pmid,
+        doi=doi,
+        title=title,
+        authors=authors,
+        journal=journal,
+        publication_date=pub_date,
+        publication_type=pub_type,
+        source=mm.LiteratureSource.PUBMED,
+        abstract=abstract if abstract else None,
+        keywords=keywords,
+        mesh_terms=mesh_terms,
+        full_text_url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        metadata_extras={
+            'pmcid': pmcid
+        }
+    )
+  
+  def _iter_pubmed_xml(self, handle: Any) -> Iterator[mm.PaperMetadata]:
+    """Parse an efetch XML response incrementally.
+    
+    Each PubmedArticle is turned into PaperMetadata as soon as its end tag
+    is read, and the parsed elements are then dropped from the tree, so
+    only one article is held in memory at a time. Unlike Entrez.read,
+    inline markup such as <i> or <sup> is reduced to its text.
+    
+    Args:
+      handle: Binary file-like efetch response.
+    
+    Yields:
+      PaperMetadata objects, skipping records that fail to parse.
+    """
+    root = None
+    for event, element in ET.iterparse(handle, events=("start", "end")):
+      if root is None:
+        root = element
+        continue
+      if event != "end" or element.tag not in (
+          "PubmedArticle", "PubmedBookArticle"
+      ):
+        continue
+      if element.tag == "PubmedArticle":
+        paper = self._parse_article_element(element)
+        if paper:
+          yield paper
+      root.clear()
+  
+  def _parse_article_element(
+      self,
+      element: ET.Element
+  ) -> Optional[mm.PaperMetadata]:
+    """Parse one PubmedArticle element into PaperMetadata.
+    
+    Extracts the same fields as _parse_pubmed_record.
+    """
+    try:
+      medline_citation = element.find('MedlineCitation')
+      article = medline_citation.find('Article')
+      
+      pmid = _text(medline_citation.find('PMID'))
+      if not pmid:
+        raise ValueError("record has no PMID")
+      
+      title = _text(article.find('ArticleTitle'))
+      
+      authors = []
+      for author_data in article.iterfind('AuthorList/Author'):
+        last_name = author_data.findtext('LastName')
+        if last_name is not None:
+          authors.append(mm.Author(
+              last_name=last_name,
+              first_name=author_data.findtext('ForeName'),
+              initials=author_data.findtext('Initials'),
+              affiliation=author_data.findtext('Affiliation')
+          ))
+      
+      abstract = ' '.join(
+          _text(part) for part in article.iterfind('Abstract/AbstractText')
+      )
+      
+      journal_issue = article.find('Journal/JournalIssue')
+      journal = mm.Journal(
+          name=article.findtext('Journal/Title', ''),
+          issn=article.findtext('Journal/ISSN', ''),
+          volume=article.findtext('Journal/JournalIssue/Volume'),
+          issue=article.findtext('Journal/JournalIssue/Issue')
+      )
+      
+      pub_date_info = {}
+      if journal_issue is not None:
+        pub_date_info = {
+            child.tag: child.text
+            for child in journal_issue.iterfind('PubDate/*')
+        }
+      pub_date = self._parse_publication_date(pub_date_info)
+      
+      mesh_terms = [
+          _text(descriptor) for descriptor in medline_citation.iterfind(
+              'MeshHeadingList/MeshHeading/DescriptorName'
+          )
+      ]
+      
+      keywords = []
+      keyword_list = medline_citation.find('KeywordList')
+      if keyword_list is not None:
+        keywords = [_text(kw) for kw in keyword_list.iterfind('Keyword')]
+      
+      doi = None
+      pmcid = None
+      for article_id in element.iterfind('PubmedData/ArticleIdList/ArticleId'):
+        id_type = article_id.get('IdType')
+        if id_type == 'doi':
+          doi = _text(article_id)
+        elif id_type == 'pmc' and pmcid is None:
+          pmcid = _text(article_id)
+      
+      pub_type = self._determine_publication_type({
+          'PublicationTypeList': [
+              _text(pub_type)
+              for pub_type in article.iterfind(
+                  'PublicationTypeList/PublicationType'
+              )
+          ]
+      })
+      
+      return self._make_paper(
           pmid=pmid,
           doi=doi,
           title=title,
           authors=authors,
           journal=journal,
-          publication_date=pub_date,
-          publication_type=pub_type,
-          source=mm.LiteratureSource.PUBMED,
-          abstract=abstract if abstract else None,
+          pub_date=pub_date,
+          pub_type=pub_type,
+          abstract=abstract,
           keywords=keywords,
           mesh_terms=mesh_terms,
-          full_text_url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-          metadata_extras={
-              'pmcid': self._extract_pmcid(article_ids)
-          }
+          pmcid=pmcid
       )
     
     except Exception as e:
@@ -299,11 +713,22 @@ class PubMedClient:
     
     query = f"({biomarker_query}) AND ({aging_query})"
     
-    pmids = self.search(
+    date_from = f"{start_year}/01/01"
+    date_to = f"{current_year}/12/31"
+    
+    if self.cache is not None:
+      pmids = self.search(
+          query=query,
+          max_results=max_results,
+          date_from=date_from,
+          date_to=date_to
+      )
+      return self.fetch_abstracts(pmids)
+    
+    history = self.search_history(
         query=query,
-        max_results=max_results,
-        date_from=f"{start_year}/01/01",
-        date_to=f"{current_year}/12/31"
+        date_from=date_from,
+        date_to=date_to
     )
     
-    return self.fetch_abstracts(pmids)
+    return list(self.fetch_history(history, max_results=max_results))
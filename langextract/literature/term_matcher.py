@@ -0,0 +1,99 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Multi-term substring matching with an Aho-Corasick automaton."""
+
+from __future__ import annotations
+
+import collections
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class TermMatcher:
+  """Finds which of many terms occur in a text in one pass.
+
+  Matching has the same semantics as `term in text` for every term
+  (case-insensitive by default), but the text is scanned once regardless of
+  the number of terms.
+  """
+
+  def __init__(self, terms: Iterable[str], case_sensitive: bool = False):
+    """Builds the automaton.
+
+    Args:
+      terms: Terms to search for. Duplicates are allowed.
+      case_sensitive: Whether matching distinguishes case.
+    """
+    self.terms: Tuple[str, ...] = tuple(terms)
+    self.case_sensitive = case_sensitive
+
+    # Trie of the normalized terms; outputs hold term indices.
+    goto: List[Dict[str, int]] = [{}]
+    outputs: List[List[int]] = [[]]
+    for index, term in enumerate(self.terms):
+      state = 0
+      for char in self._normalize(term):
+        next_state = goto[state].get(char)
+        if next_state is None:
+          next_state = len(goto)
+          goto[state][char] = next_state
+          goto.append({})
+          outputs.append([])
+        state = next_state
+      outputs[state].append(index)
+
+    # Breadth-first construction of failure links, folded into a full
+    # transition table so that scanning never follows failure links.
+    fail = [0] * len(goto)
+    delta: List[Dict[str, int]] = [dict(goto[0])] + [{}] * (len(goto) - 1)
+    queue = collections.deque(goto[0].values())
+    while queue:
+      state = queue.popleft()
+      delta[state] = dict(delta[fail[state]])
+      delta[state].update(goto[state])
+      outputs[state] = outputs[state] + outputs[fail[state]]
+      for char, child in goto[state].items():
+        fail[child] = delta[fail[state]].get(char, 0)
+        queue.append(child)
+
+    self._delta = delta
+    self._outputs: List[Tuple[int, ...]] = [tuple(o) for o in outputs]
+
+  def _normalize(self, text: str) -> str:
+    return text if self.case_sensitive else text.lower()
+
+  def find(self, text: str) -> Set[str]:
+    """Returns the terms that occur in text."""
+    found: Set[int] = set(self._outputs[0])
+    delta = self._delta
+    outputs = self._outputs
+    state = 0
+    for char in self._normalize(text):
+      state = delta[state].get(char, 0)
+      if outputs[state]:
+        found.update(outputs[state])
+    return {self.terms[index] for index in found}
+
+  def matches(self, text: str) -> bool:
+    """Returns whether any term occurs in text."""
+    if self._outputs[0]:
+      return True
+    delta = self._delta
+    outputs = self._outputs
+    state = 0
+    for char in self._normalize(text):
+      state = delta[state].get(char, 0)
+      if outputs[state]:
+        return True
+    return False
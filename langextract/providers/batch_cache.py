@@ -0,0 +1,206 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Result caches shared by the batch inference helpers.
+
+A batch cache maps the request data of one prompt (model, prompt, generation
+config, schema) to the text the batch job returned for it, so reruns only
+submit prompts whose results are not already known. gemini_batch provides a
+GCS-backed implementation; SQLiteBatchCache keeps results in a local file
+for on-prem and CI use.
+
+Usage example:
+    cache = batch_cache.SQLiteBatchCache("~/.cache/langextract/batch.sqlite")
+    model = GeminiLanguageModel(..., batch={..., "cache": cache})
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+import dataclasses
+import enum
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+from typing import Any, Protocol, runtime_checkable
+
+from absl import logging
+
+# SQLite limits the number of bound parameters per statement.
+_SQL_CHUNK = 500
+
+
+@runtime_checkable
+class BatchCache(Protocol):
+  """Interface for batch result caches."""
+
+  def get_multi(self, key_data_list: Sequence[dict]) -> dict[int, str]:
+    """Looks up several requests at once.
+
+    Args:
+      key_data_list: Request data, one dict per prompt.
+
+    Returns:
+      Dict mapping index in key_data_list to cached text, for hits only.
+    """
+    ...
+
+  def set_multi(self, items: Sequence[tuple[dict, Any]]) -> None:
+    """Stores results.
+
+    Args:
+      items: List of (key_data, result_text) tuples.
+    """
+    ...
+
+  def iter_items(self) -> Iterator[tuple[str, str]]:
+    """Iterates over all items in the cache.
+
+    Yields:
+      Tuple of (key_hash, text_content).
+    """
+    ...
+
+
+def compute_hash(key_data: dict) -> str:
+  """Compute SHA256 hash of the canonicalized request data."""
+  canonical_json = json.dumps(key_data, sort_keys=True, ensure_ascii=False)
+  return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+
+
+def _json_default(obj):
+  if dataclasses.is_dataclass(obj):
+    return dataclasses.asdict(obj)
+  if isinstance(obj, enum.Enum):
+    return obj.value
+  raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def to_text(result: Any) -> str | None:
+  """Returns a result as cacheable text, or None if it cannot be serialized."""
+  if isinstance(result, str):
+    return result
+  try:
+    return json.dumps(result, default=_json_default, ensure_ascii=False)
+  except Exception as e:
+    logging.warning("Serialization error: %s", e)
+    return None
+
+
+class SQLiteBatchCache:
+  """Batch result cache stored in a local SQLite file.
+
+  Lookups for a whole batch run as a handful of indexed queries, so cache
+  hits cost no network round-trips. The cache is safe to share between
+  threads.
+  """
+
+  def __init__(self, path: str | os.PathLike[str]):
+    """Opens or creates the cache file.
+
+    Args:
+      path: SQLite database file. Parent directories are created as needed.
+        Use ":memory:" for a process-local cache.
+    """
+    path = os.fspath(path)
+    if path != ":memory:":
+      path = os.path.expanduser(path)
+      pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    self.path = path
+    self._lock = threading.Lock()
+    self._conn = sqlite3.connect(path, check_same_thread=False)
+    with self._conn:
+      if path != ":memory:":
+        self._conn.execute("PRAGMA journal_mode=WAL")
+      self._conn.execute(
+          "CREATE TABLE IF NOT EXISTS batch_results"
+          " (key TEXT PRIMARY KEY, text TEXT NOT NULL)"
+      )
+
+  def __enter__(self) -> SQLiteBatchCache:
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+  def __len__(self) -> int:
+    with self._lock:
+      return self._conn.execute(
+          "SELECT COUNT(*) FROM batch_results"
+      ).fetchone()[0]
+
+  def close(self) -> None:
+    """Closes the underlying database connection."""
+    with self._lock:
+      self._conn.close()
+
+  def get_multi(self, key_data_list: Sequence[dict]) -> dict[int, str]:
+    """Looks up several requests at once.
+
+    Returns:
+      Dict mapping index in key_data_list to cached text.
+    """
+    hashes = [compute_hash(key_data) for key_data in key_data_list]
+    unique_hashes = list(dict.fromkeys(hashes))
+    found: dict[str, str] = {}
+    with self._lock:
+      for start in range(0, len(unique_hashes), _SQL_CHUNK):
+        chunk = unique_hashes[start : start + _SQL_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        found.update(
+            self._conn.execute(
+                "SELECT key, text FROM batch_results"
+                f" WHERE key IN ({placeholders})",
+                chunk,
+            ).fetchall()
+        )
+    return {
+        idx: found[key_hash]
+        for idx, key_hash in enumerate(hashes)
+        if key_hash in found
+    }
+
+  def set_multi(self, items: Sequence[tuple[dict, Any]]) -> None:
+    """Stores results in a single transaction.
+
+    Args:
+      items: List of (key_data, result_text) tuples.
+    """
+    rows = []
+    for key_data, result in items:
+      text = to_text(result)
+      if text is not None:
+        rows.append((compute_hash(key_data), text))
+    if not rows:
+      return
+    with self._lock, self._conn:
+      self._conn.executemany(
+          "INSERT OR REPLACE INTO batch_results (key, text) VALUES (?, ?)",
+          rows,
+      )
+
+  def iter_items(self) -> Iterator[tuple[str, str]]:
+    """Iterates over all items in the cache.
+
+    Yields:
+      Tuple of (key_hash, text_content).
+    """
+    with self._lock:
+      rows = self._conn.execute(
+          "SELECT key, text FROM batch_results ORDER BY key"
+      ).fetchall()
+    yield from rows
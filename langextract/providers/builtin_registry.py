@@ -48,4 +48,9 @@ BUILTIN_PROVIDERS: list[ProviderConfig] = [
         'target': 'langextract.providers.openai:OpenAILanguageModel',
         'priority': patterns.OPENAI_PRIORITY,
     },
+    {
+        'patterns': patterns.REPLAY_PATTERNS,
+        'target': 'langextract.providers.replay:ReplayLanguageModel',
+        'priority': patterns.REPLAY_PRIORITY,
+    },
 ]
@@ -17,7 +17,7 @@
 
 from __future__ import annotations
 
-import concurrent.futures
+import asyncio
 import dataclasses
 from typing import Any, Final, Iterator, Sequence
 
@@ -26,6 +26,7 @@ from absl import logging
 from langextract.core import base_model
 from langextract.core import data
 from langextract.core import exceptions
+from langextract.core import rate_limit as rate_limit_lib
 from langextract.core import schema
 from langextract.core import types as core_types
 from langextract.providers import gemini_batch
@@ -68,6 +69,9 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):  # pylint: disable=too-
   temperature: float = 0.0
   max_workers: int = 10
   fence_output: bool = False
+  _rate_limiter: rate_limit_lib.RateLimiter | None = dataclasses.field(
+      default=None, repr=False, compare=False
+  )
   _extra_kwargs: dict[str, Any] = dataclasses.field(
       default_factory=dict, repr=False, compare=False
   )
@@ -105,6 +109,9 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):  # pylint: disable=too-
       temperature: float = 0.0,
       max_workers: int = 10,
       fence_output: bool = False,
+      rate_limit: (
+          rate_limit_lib.RateLimit | rate_limit_lib.RateLimiter | None
+      ) = None,
       **kwargs,
   ) -> None:
     """Initialize the Gemini language model.
@@ -120,9 +127,15 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):  # pylint: disable=too-
       gemini_schema: Optional schema for structured output.
       format_type: Output format (JSON or YAML).
       temperature: Sampling temperature.
-      max_workers: Maximum number of parallel API calls.
+      max_workers: Maximum number of parallel API calls. Calls run on a
+        worker pool owned by the model and shared by all infer() calls;
+        release it with close() or by using the model as a context manager.
       fence_output: Whether to wrap output in markdown fences (ignored,
         Gemini handles this based on schema).
+      rate_limit: Client-side request/token limits, or a RateLimiter to share.
+        Instances with equal limits for the same model share one limiter.
+        Defaults to any limiter registered with rate_limit.configure() for
+        "gemini". Batch API jobs are not rate limited.
       **kwargs: Additional Gemini API parameters. Only allowlisted keys are
         forwarded to the API (response_schema, response_mime_type, tools,
         safety_settings, stop_sequences, candidate_count, system_instruction).
@@ -171,6 +184,10 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):  # pylint: disable=too-
           'API key will take precedence for authentication.'
       )
 
+    self._rate_limiter = rate_limit_lib.limiter_for(
+        'gemini', self.model_id, rate_limit
+    )
+
     self._client = genai.Client(
         api_key=self.api_key,
         vertexai=vertexai,
@@ -199,24 +216,33 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):  # pylint: disable=too-
           'Set format_type=JSON or use_schema_constraints=False.'
       )
 
+  def _apply_request_config(self, config: dict) -> None:
+    """Fills stored kwargs and schema settings into a request config."""
+    # Apply stored kwargs that weren't already set in config
+    for key, value in self._extra_kwargs.items():
+      if key not in config and value is not None:
+        config[key] = value
+
+    if self.gemini_schema:
+      self._validate_schema_config()
+      config.setdefault('response_mime_type', 'application/json')
+      config.setdefault('response_schema', self.gemini_schema.schema_dict)
+
   def _process_single_prompt(
       self, prompt: str, config: dict
   ) -> core_types.ScoredOutput:
     """Process a single prompt and return a ScoredOutput."""
+    tokens = rate_limit_lib.estimate_tokens(
+        prompt, config.get('max_output_tokens')
+    )
     try:
-      # Apply stored kwargs that weren't already set in config
-      for key, value in self._extra_kwargs.items():
-        if key not in config and value is not None:
-          config[key] = value
-
-      if self.gemini_schema:
-        self._validate_schema_config()
-        config.setdefault('response_mime_type', 'application/json')
-        config.setdefault('response_schema', self.gemini_schema.schema_dict)
-
-      response = self._client.models.generate_content(
-          model=self.model_id, contents=prompt, config=config
-      )
+      self._apply_request_config(config)
+
+      with rate_limit_lib.limited(self._rate_limiter, tokens):
+        response = self._client.models.generate_content(
+            model=self.model_id, contents=prompt, config=config
+        )
+      self._reconcile_usage(tokens, response)
 
       return core_types.ScoredOutput(score=1.0, output=response.text)
 
@@ -225,18 +251,40 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):  # pylint: disable=too-
           f'Gemini API error: {str(e)}', original=e
       ) from e
 
-  def infer(
-      self, batch_prompts: Sequence[str], **kwargs
-  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
-    """Runs inference on a list of prompts via Gemini's API.
+  async def _process_single_prompt_async(
+      self, prompt: str, config: dict
+  ) -> core_types.ScoredOutput:
+    """Async counterpart of _process_single_prompt."""
+    tokens = rate_limit_lib.estimate_tokens(
+        prompt, config.get('max_output_tokens')
+    )
+    try:
+      self._apply_request_config(config)
 
-    Args:
-      batch_prompts: A list of string prompts.
-      **kwargs: Additional generation params (temperature, top_p, top_k, etc.)
+      async with rate_limit_lib.limited_async(self._rate_limiter, tokens):
+        response = await self._client.aio.models.generate_content(
+            model=self.model_id, contents=prompt, config=config
+        )
+      self._reconcile_usage(tokens, response)
 
-    Yields:
-      Lists of ScoredOutputs.
-    """
+      return core_types.ScoredOutput(score=1.0, output=response.text)
+
+    except Exception as e:
+      raise exceptions.InferenceRuntimeError(
+          f'Gemini API error: {str(e)}', original=e
+      ) from e
+
+  def _reconcile_usage(self, estimated_tokens: int, response: Any) -> None:
+    """Corrects the token budget with the usage the response reports."""
+    usage = getattr(response, 'usage_metadata', None)
+    rate_limit_lib.reconcile_usage(
+        self._rate_limiter,
+        estimated_tokens,
+        getattr(usage, 'total_token_count', None),
+    )
+
+  def _build_config(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Builds the per-request generation config from runtime kwargs."""
     merged_kwargs = self.merge_kwargs(kwargs)
 
     config = {
@@ -254,6 +302,29 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):  # pylint: disable=too-
           and value is not None
       ):
         config[key] = value
+    return config
+
+  def _use_batch_api(self, batch_prompts: Sequence[str]) -> bool:
+    """Whether this batch should be routed to the Gemini Batch API."""
+    return bool(
+        self._batch_cfg
+        and self._batch_cfg.enabled
+        and len(batch_prompts) >= self._batch_cfg.threshold
+    )
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
+    """Runs inference on a list of prompts via Gemini's API.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, top_k, etc.)
+
+    Yields:
+      Lists of ScoredOutputs.
+    """
+    config = self._build_config(kwargs)
 
     # Use batch API if threshold met
     if self._batch_cfg and self._batch_cfg.enabled:
@@ -305,36 +376,49 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):  # pylint: disable=too-
 
     # Use parallel processing for batches larger than 1
     if len(batch_prompts) > 1 and self.max_workers > 1:
-      with concurrent.futures.ThreadPoolExecutor(
-          max_workers=min(self.max_workers, len(batch_prompts))
-      ) as executor:
-        future_to_index = {
-            executor.submit(
-                self._process_single_prompt, prompt, config.copy()
-            ): i
-            for i, prompt in enumerate(batch_prompts)
-        }
-
-        results: list[core_types.ScoredOutput | None] = [None] * len(
-            batch_prompts
-        )
-        for future in concurrent.futures.as_completed(future_to_index):
-          index = future_to_index[future]
-          try:
-            results[index] = future.result()
-          except Exception as e:
-            raise exceptions.InferenceRuntimeError(
-                f'Parallel inference error: {str(e)}', original=e
-            ) from e
-
-        for result in results:
-          if result is None:
-            raise exceptions.InferenceRuntimeError(
-                'Failed to process one or more prompts'
-            )
+      # Prompts run on the model's long-lived pool, so the next batch can
+      # take free slots while this one's slowest prompt is still running.
+      outputs = self._map_ordered(
+          lambda prompt: self._process_single_prompt(prompt, config.copy()),
+          batch_prompts,
+          self.max_workers,
+      )
+      try:
+        for result in outputs:
           yield [result]
+      except Exception as e:
+        raise exceptions.InferenceRuntimeError(
+            f'Parallel inference error: {str(e)}', original=e
+        ) from e
+      finally:
+        outputs.close()
     else:
       # Sequential processing for single prompt or worker
       for prompt in batch_prompts:
         result = self._process_single_prompt(prompt, config.copy())
         yield [result]  # pylint: disable=duplicate-code
+
+  async def infer_async(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[core_types.ScoredOutput]]:
+    """Runs inference on a list of prompts via Gemini's async client.
+
+    Batches that qualify for the Batch API are delegated to infer() in a
+    worker thread, since batch jobs are polled rather than awaited.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, top_k, etc.)
+
+    Returns:
+      Lists of ScoredOutputs in batch_prompts order.
+    """
+    if self._use_batch_api(batch_prompts):
+      return await super().infer_async(batch_prompts, **kwargs)
+
+    config = self._build_config(kwargs)
+    results = await asyncio.gather(*(
+        self._process_single_prompt_async(prompt, config.copy())
+        for prompt in batch_prompts
+    ))
+    return [[result] for result in results]
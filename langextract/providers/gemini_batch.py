@@ -27,13 +27,12 @@ from __future__ import annotations
 from collections.abc import Iterator, Sequence
 import concurrent.futures
 import dataclasses
-import enum
-import hashlib
 import json
 import logging as std_logging
 import os
 import re
 import tempfile
+import threading
 import time
 from typing import Any, Callable, Protocol
 import uuid
@@ -44,6 +43,7 @@ from google.api_core import exceptions as google_exceptions
 from google.cloud import storage
 
 from langextract.core import exceptions
+from langextract.providers import batch_cache
 
 _MIME_TYPE_JSON = "application/json"
 _DEFAULT_LOCATION = "us-central1"
@@ -51,6 +51,15 @@ _EXT_JSON = ".json"
 _EXT_JSONL = ".jsonl"
 _KEY_IDX = "idx-"
 _CACHE_PREFIX = "cache"
+_CACHE_PACK_PREFIX = f"{_CACHE_PREFIX}/packs/"
+_CACHE_PACK_SIZE = 10000
+# Packs holding fewer entries than this are merged once there are at least
+# _CACHE_COMPACT_MIN_PACKS of them (legacy single-entry blobs included).
+_CACHE_SMALL_PACK = 1000
+_CACHE_COMPACT_MIN_PACKS = 16
+# Match the default HTTP connection pool size.
+_CACHE_MAX_WORKERS = 10
+_MIME_TYPE_JSONL = "application/jsonl"
 _UNSET = object()
 
 
@@ -61,12 +70,21 @@ class BatchConfig:
   Attributes:
     enabled: Whether batch mode is enabled.
     threshold: Minimum prompts to trigger batch processing.
-    poll_interval: Seconds between job status checks.
+    poll_interval: Seconds before the first job status re-check. The interval
+      then grows by poll_backoff after each check, up to max_poll_interval.
     timeout: Maximum seconds to wait for job completion.
-    max_prompts_per_job: Max prompts allowed in one batch job.
+    max_prompts_per_job: Max prompts allowed in one batch job. Larger inputs
+      are split into evenly sized shards, one job each.
     ignore_item_errors: If True, continue on per-item errors.
-    enable_caching: If True, use GCS-based caching for inference results.
+    enable_caching: If True, cache inference results so reruns only submit
+      new prompts.
     retention_days: Days to keep GCS data (default 30). None for permanent.
+    cache: Cache backend used when enable_caching is True, e.g. a
+      batch_cache.SQLiteBatchCache for on-prem or CI runs. Defaults to the
+      shared GCSBatchCache of the batch bucket (see get_gcs_cache).
+    max_concurrent_jobs: Max shard jobs submitted and polled at once.
+    max_poll_interval: Upper bound in seconds for the polling interval.
+    poll_backoff: Factor applied to the polling interval after each check.
   """
 
   enabled: bool = False
@@ -78,6 +96,10 @@ class BatchConfig:
   enable_caching: bool | None = _UNSET  # type: ignore
   retention_days: int | None = _UNSET  # type: ignore
   on_job_create: Callable[[Any], None] | None = None
+  cache: batch_cache.BatchCache | None = None
+  max_concurrent_jobs: int = 4
+  max_poll_interval: float = 300
+  poll_backoff: float = 1.5
 
   def __post_init__(self):
     """Validate numeric knobs early."""
@@ -88,10 +110,22 @@ class BatchConfig:
         (self.timeout > 0, "batch.timeout must be > 0"),
         (self.timeout > 0, "batch.timeout must be > 0"),
         (self.max_prompts_per_job > 0, "batch.max_prompts_per_job must be > 0"),
+        (
+            self.max_concurrent_jobs >= 1,
+            "batch.max_concurrent_jobs must be >= 1",
+        ),
+        (self.max_poll_interval > 0, "batch.max_poll_interval must be > 0"),
+        (self.poll_backoff >= 1, "batch.poll_backoff must be >= 1"),
     ]
     for is_valid, error_msg in validations:
       if not is_valid:
         raise ValueError(error_msg)
+    if self.cache is not None and not isinstance(
+        self.cache, batch_cache.BatchCache
+    ):
+      raise ValueError(
+          "batch.cache must provide get_multi, set_multi and iter_items"
+      )
 
     if self.enabled:
       if self.enable_caching is _UNSET:
@@ -376,18 +410,37 @@ def _submit_file(
 
 
 class GCSBatchCache:
-  """GCS-based cache for batch inference results."""
+  """GCS-based cache for batch inference results.
+
+  Results are written as pack files (``cache/packs/*.jsonl``), one per
+  set_multi() call, each line holding a key hash and its text. A lookup
+  lists the cache prefix and downloads only the packs this instance has not
+  read yet, so hits and misses alike cost a few requests per batch rather
+  than one per prompt. infer_batch() reuses one instance per bucket (see
+  get_gcs_cache), so each pack is downloaded once per process. Single-entry
+  blobs (``cache/<hash>.json``) written by earlier versions are still read,
+  but only for keys the listing shows to exist.
+
+  Small batches leave many small packs behind. Once a lookup sees
+  _CACHE_COMPACT_MIN_PACKS of them, compact() merges them, together with
+  any single-entry blobs, into full packs.
+  """
 
   def __init__(self, bucket_name: str, project: str | None = None):
     self.bucket_name = bucket_name
     self.project = project
     self._client = storage.Client(project=project)
     self._bucket = self._client.bucket(bucket_name)
+    self._lock = threading.RLock()
+    self._index: dict[str, str] = {}
+    self._loaded_packs: set[str] = set()
+    self._single_entries: set[str] = set()
+    # Keys of the loaded packs smaller than _CACHE_SMALL_PACK.
+    self._small_packs: dict[str, list[str]] = {}
 
   def _compute_hash(self, key_data: dict) -> str:
     """Compute SHA256 hash of the canonicalized request data."""
-    canonical_json = json.dumps(key_data, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
+    return batch_cache.compute_hash(key_data)
 
   def _get_single(self, key_hash: str) -> str | None:
     """Fetch single item from GCS."""
@@ -401,66 +454,186 @@ class GCSBatchCache:
       logging.warning("Cache read error for %s: %s", key_hash, e)
     return None
 
+  def _read_pack(self, blob: storage.Blob) -> dict[str, str] | None:
+    """Download one pack file and return its entries, or None on failure."""
+    entries = {}
+    try:
+      for line in blob.download_as_text().splitlines():
+        if not line.strip():
+          continue
+        item = json.loads(line)
+        if isinstance(item.get("text"), str):
+          entries[item["key"]] = item["text"]
+    except Exception as e:
+      logging.warning("Failed to read cache pack %s: %s", blob.name, e)
+      return None
+    return entries
+
+  def _add_pack(self, name: str, entries: dict[str, str]) -> None:
+    self._index.update(entries)
+    self._loaded_packs.add(name)
+    if len(entries) < _CACHE_SMALL_PACK:
+      self._small_packs[name] = list(entries)
+
+  def _refresh_index(self) -> None:
+    """List the cache prefix and load packs not read yet."""
+    new_packs = []
+    for blob in self._bucket.list_blobs(prefix=f"{_CACHE_PREFIX}/"):
+      name = blob.name
+      if name.startswith(_CACHE_PACK_PREFIX) and name.endswith(_EXT_JSONL):
+        if name not in self._loaded_packs:
+          new_packs.append(blob)
+      elif name.endswith(_EXT_JSON):
+        self._single_entries.add(
+            name.rsplit("/", maxsplit=1)[-1].removesuffix(_EXT_JSON)
+        )
+    if not new_packs:
+      return
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=_CACHE_MAX_WORKERS
+    ) as executor:
+      for blob, entries in zip(
+          new_packs, executor.map(self._read_pack, new_packs)
+      ):
+        # Unreadable packs are retried on the next refresh and never
+        # compacted away.
+        if entries is not None:
+          self._add_pack(blob.name, entries)
+    logging.info(
+        "Batch cache: loaded %d packs (%d entries) from gs://%s",
+        len(new_packs),
+        len(self._index),
+        self.bucket_name,
+    )
+
+  def _fetch_singles(self, key_hashes: Sequence[str]) -> dict[str, str]:
+    """Fetch single-entry blobs in parallel and add them to the index."""
+    found = {}
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=_CACHE_MAX_WORKERS
+    ) as executor:
+      for key_hash, text in zip(
+          key_hashes, executor.map(self._get_single, key_hashes)
+      ):
+        if text is not None:
+          found[key_hash] = text
+    self._index.update(found)
+    return found
+
   def get_multi(self, key_data_list: Sequence[dict]) -> dict[int, str]:
-    """Fetch multiple items from GCS in parallel.
+    """Fetch multiple items from GCS.
 
     Returns:
       Dict mapping index in key_data_list to cached text.
     """
-    results = {}
-    # Limit max_workers to 10 to match default HTTP connection pool size.
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-      future_to_idx = {}
+    with self._lock:
+      self._refresh_index()
+      if (
+          len(self._small_packs) + len(self._single_entries)
+          >= _CACHE_COMPACT_MIN_PACKS
+      ):
+        self.compact()
+      results = {}
+      singles: dict[str, list[int]] = {}
       for idx, key_data in enumerate(key_data_list):
         key_hash = self._compute_hash(key_data)
-        future = executor.submit(self._get_single, key_hash)
-        future_to_idx[future] = idx
+        if key_hash in self._index:
+          results[idx] = self._index[key_hash]
+        elif key_hash in self._single_entries:
+          singles.setdefault(key_hash, []).append(idx)
 
-      for future in concurrent.futures.as_completed(future_to_idx):
-        idx = future_to_idx[future]
-        text = future.result()
-        if text is not None:
+      for key_hash, text in self._fetch_singles(list(singles)).items():
+        for idx in singles[key_hash]:
           results[idx] = text
     return results
 
-  def set_multi(self, items: Sequence[tuple[dict, str]]) -> None:
-    """Upload multiple items to GCS in parallel.
+  def _write_packs(self, entries: dict[str, str]) -> bool:
+    """Uploads entries as pack files and adds them to the index.
+
+    Returns:
+      Whether every pack was uploaded.
+    """
+    pairs = list(entries.items())
+    uploaded = True
+    for start in range(0, len(pairs), _CACHE_PACK_SIZE):
+      chunk = dict(pairs[start : start + _CACHE_PACK_SIZE])
+      name = f"{_CACHE_PACK_PREFIX}{int(time.time())}-{uuid.uuid4().hex}"
+      name += _EXT_JSONL
+      payload = "".join(
+          json.dumps({"key": k, "text": v}, ensure_ascii=False) + "\n"
+          for k, v in chunk.items()
+      )
+      try:
+        self._bucket.blob(name).upload_from_string(
+            payload, content_type=_MIME_TYPE_JSONL
+        )
+      except Exception as e:
+        logging.warning("Cache write error for %s: %s", name, e, exc_info=True)
+        uploaded = False
+        continue
+      with self._lock:
+        self._add_pack(name, chunk)
+    return uploaded
+
+  def set_multi(self, items: Sequence[tuple[dict, Any]]) -> None:
+    """Upload multiple items to GCS as pack files.
 
     Args:
       items: List of (key_data, result_text) tuples.
     """
+    entries = {}
+    for key_data, result in items:
+      text = batch_cache.to_text(result)
+      if text is not None:
+        entries[self._compute_hash(key_data)] = text
+    if entries:
+      self._write_packs(entries)
 
-    def _upload(text: str, key_data: dict):
-      key_hash = self._compute_hash(key_data)
-      blob = self._bucket.blob(f"{_CACHE_PREFIX}/{key_hash}{_EXT_JSON}")
+  def compact(self) -> int:
+    """Merges small packs and single-entry blobs into full packs.
+
+    The merged packs are uploaded before the originals are deleted, so
+    concurrent readers never miss an entry; at worst they load it twice.
+
+    Returns:
+      Number of blobs merged away.
+    """
+    with self._lock:
+      self._refresh_index()
+      self._fetch_singles(
+          [h for h in self._single_entries if h not in self._index]
+      )
+      # Blobs that could not be read are left in place.
+      singles = sorted(h for h in self._single_entries if h in self._index)
+      small_packs = self._small_packs
+      sources = list(small_packs) + [
+          f"{_CACHE_PREFIX}/{h}{_EXT_JSON}" for h in singles
+      ]
+      if len(sources) < 2:
+        return 0
+      keys = [k for pack_keys in small_packs.values() for k in pack_keys]
+      merged = {k: self._index[k] for k in keys + singles}
+      self._small_packs = {}
+      if not self._write_packs(merged):
+        # Keep the originals rather than lose the entries that failed.
+        self._small_packs.update(small_packs)
+        return 0
+      self._single_entries.difference_update(singles)
+      self._loaded_packs.difference_update(small_packs)
+
+    for name in sources:
       try:
-        blob.upload_from_string(
-            json.dumps({"text": text}, ensure_ascii=False),
-            content_type=_MIME_TYPE_JSON,
-        )
+        self._bucket.blob(name).delete()
+      except google_exceptions.NotFound:
+        pass
       except Exception as e:
-        logging.warning(
-            "Cache write error for %s: %s", key_hash, e, exc_info=True
-        )
-
-    def _json_default(obj):
-      if dataclasses.is_dataclass(obj):
-        return dataclasses.asdict(obj)
-      if isinstance(obj, enum.Enum):
-        return obj.value
-      raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-      for key_data, text in items:
-        # If text is not a string, try to serialize it
-        if not isinstance(text, str):
-          try:
-            text = json.dumps(text, default=_json_default, ensure_ascii=False)
-          except Exception as e:
-            logging.warning("Serialization error: %s", e)
-            continue
-
-        executor.submit(_upload, text, key_data)
+        logging.warning("Failed to delete cache blob %s: %s", name, e)
+    logging.info(
+        "Batch cache: compacted %d blobs in gs://%s",
+        len(sources),
+        self.bucket_name,
+    )
+    return len(sources)
 
   def iter_items(self) -> Iterator[tuple[str, str]]:
     """Iterate over all items in the cache.
@@ -470,6 +643,10 @@ class GCSBatchCache:
     """
     blobs = self._bucket.list_blobs(prefix=f"{_CACHE_PREFIX}/")
     for blob in blobs:
+      if blob.name.startswith(_CACHE_PACK_PREFIX):
+        if blob.name.endswith(_EXT_JSONL):
+          yield from (self._read_pack(blob) or {}).items()
+        continue
       if not blob.name.endswith(_EXT_JSON):
         continue
       try:
@@ -482,6 +659,39 @@ class GCSBatchCache:
         logging.warning("Failed to read cache item %s: %s", blob.name, e)
 
 
+_gcs_caches: dict[tuple[str, str | None], GCSBatchCache] = {}
+_gcs_caches_lock = threading.Lock()
+
+
+def get_gcs_cache(
+    bucket_name: str, project: str | None = None
+) -> GCSBatchCache:
+  """Returns the process-wide GCSBatchCache for a bucket, creating it once.
+
+  Sharing the instance keeps its index across infer_batch() calls, so a
+  model's later batches only download packs written since the previous one.
+
+  Args:
+    bucket_name: Bucket holding the cache.
+    project: Google Cloud project of the bucket.
+
+  Returns:
+    The shared cache.
+  """
+  with _gcs_caches_lock:
+    cache = _gcs_caches.get((bucket_name, project))
+    if cache is None:
+      cache = GCSBatchCache(bucket_name, project)
+      _gcs_caches[(bucket_name, project)] = cache
+    return cache
+
+
+def reset_gcs_caches() -> None:
+  """Drops the shared GCSBatchCache instances."""
+  with _gcs_caches_lock:
+    _gcs_caches.clear()
+
+
 class _TextResponse(Protocol):
   """Protocol for inline response objects with text attribute."""
 
@@ -537,25 +747,51 @@ def _extract_text(resp: _TextResponse | dict[str, Any] | None) -> str | None:
   return text if isinstance(text, str) else None
 
 
+def _poll_delays(cfg: BatchConfig) -> Iterator[float]:
+  """Yield polling delays growing geometrically up to cfg.max_poll_interval.
+
+  Short jobs are noticed soon after they finish, while long ones are not
+  polled every few seconds for hours.
+  """
+  delay = min(cfg.poll_interval, cfg.max_poll_interval)
+  while True:
+    yield delay
+    delay = min(delay * cfg.poll_backoff, cfg.max_poll_interval)
+
+
+def _cancel_job(client: genai.Client, name: str, reason: str) -> None:
+  """Best-effort cancellation of a running batch job."""
+  try:
+    client.batches.cancel(name=name)
+  except Exception as e:
+    logging.warning("Failed to cancel %s batch job %s: %s", reason, name, e)
+
+
 def _poll_completion(
-    client: genai.Client, job: genai.types.BatchJob, cfg: BatchConfig
+    client: genai.Client,
+    job: genai.types.BatchJob,
+    cfg: BatchConfig,
+    stop: threading.Event | None = None,
 ) -> genai.types.BatchJob:
   """Poll batch job until completion or timeout.
 
   Args:
     client: google.genai.Client instance for polling job status.
     job: Batch job object returned from client.batches.create().
-    cfg: Batch configuration including timeout and poll_interval.
+    cfg: Batch configuration including timeout and polling intervals.
+    stop: Optional event set when sibling shards failed; the job is then
+      cancelled instead of waited for.
 
   Returns:
     Completed batch job object.
 
   Raises:
-    RuntimeError: If the job enters a failed terminal state.
-    TimeoutError: If the job does not complete within cfg.timeout.
+    InferenceRuntimeError: If the job enters a failed terminal state, does
+      not complete within cfg.timeout, or is abandoned because stop was set.
   """
   start = time.time()
   name = job.name
+  delays = _poll_delays(cfg)
 
   while True:
     job = client.batches.get(name=name)
@@ -571,19 +807,40 @@ def _poll_completion(
           f"error={error_details}"
       )
 
-    if time.time() - start > cfg.timeout:
-      try:
-        client.batches.cancel(name=name)
-      except Exception as e:
-        logging.warning("Failed to cancel timed-out batch job %s: %s", name, e)
+    remaining = cfg.timeout - (time.time() - start)
+    if remaining <= 0:
+      _cancel_job(client, name, "timed-out")
       raise exceptions.InferenceRuntimeError(
           f"Batch job timed out after {cfg.timeout}s: {name}"
       )
 
-    time.sleep(cfg.poll_interval)
+    delay = min(next(delays), remaining)
+    if stop is None:
+      time.sleep(delay)
+    elif stop.wait(delay):
+      _cancel_job(client, name, "abandoned")
+      raise exceptions.InferenceRuntimeError(
+          f"Batch job cancelled after another shard failed: {name}"
+      )
     logging.info("Batch job is running... (State: %s)", state.name)
 
 
+def _shard(items: Sequence[Any], max_per_shard: int) -> list[Sequence[Any]]:
+  """Split items into the fewest shards of at most max_per_shard items.
+
+  Shard sizes differ by at most one, so no job is left with a small tail.
+  """
+  num_shards = max(1, -(-len(items) // max_per_shard))
+  base, extra = divmod(len(items), num_shards)
+  shards = []
+  start = 0
+  for i in range(num_shards):
+    end = start + base + (1 if i < extra else 0)
+    shards.append(items[start:end])
+    start = end
+  return shards
+
+
 def _parse_batch_line(
     line: str, outputs: dict[int, str], cfg: BatchConfig
 ) -> None:
@@ -756,8 +1013,11 @@ def infer_batch(
   project, location = _get_project_location(client, project, location)
   bucket_name = _get_bucket_name(project, location)
 
-  cache = GCSBatchCache(bucket_name, project) if cfg.enable_caching else None
-  if cache:
+  cache = None
+  if cfg.enable_caching and cfg.cache is not None:
+    cache = cfg.cache
+  elif cfg.enable_caching:
+    cache = get_gcs_cache(bucket_name, project)
     logging.info(
         "Batch API: Using GCS bucket:"
         " https://console.cloud.google.com/storage/browser/%s",
@@ -767,20 +1027,18 @@ def infer_batch(
   prompts_to_process: list[tuple[int, str]] = []
   cached_results: dict[int, str] = {}
 
-  if cache:
-
-    key_data_list = []
-    for prompt in prompts:
-      key_data_list.append({
-          "model_id": model_id,
-          "prompt": prompt,
-          "system_instruction": system_instruction,
-          "gen_config": gen_config,
-          "safety_settings": safety_settings,
-          "schema": schema_dict,
-      })
+  def _key_data(prompt: str) -> dict:
+    return {
+        "model_id": model_id,
+        "prompt": prompt,
+        "system_instruction": system_instruction,
+        "gen_config": gen_config,
+        "safety_settings": safety_settings,
+        "schema": schema_dict,
+    }
 
-    cached_results = cache.get_multi(key_data_list)
+  if cache is not None:
+    cached_results = cache.get_multi([_key_data(p) for p in prompts])
 
     for idx, prompt in enumerate(prompts):
       if idx not in cached_results:
@@ -798,6 +1056,8 @@ def infer_batch(
       len(prompts_to_process),
   )
 
+  stop = threading.Event()
+
   def _process_batch(
       batch_items: Sequence[tuple[int, str]], display: str
   ) -> dict[int, str]:
@@ -806,6 +1066,10 @@ def infer_batch(
     Returns:
       Dict mapping original index to result text.
     """
+    if stop.is_set():
+      raise exceptions.InferenceRuntimeError(
+          f"Batch shard {display} not submitted after another shard failed"
+      )
     batch_prompts = [p for _, p in batch_items]
     requests = [
         _build_request(
@@ -827,8 +1091,8 @@ def infer_batch(
         cfg.on_job_create(job)
       except Exception as e:
         logging.warning("Batch job creation callback failed: %s", e)
-    job = _poll_completion(client, job, cfg)
-    logging.info("Batch job completed successfully.")
+    job = _poll_completion(client, job, cfg, stop)
+    logging.info("Batch job completed successfully: %s", job.name)
     results = _extract_from_file(
         client, job, cfg, expected_count=len(batch_prompts)
     )
@@ -840,39 +1104,57 @@ def infer_batch(
 
     return mapped_results
 
+  shards = _shard(prompts_to_process, cfg.max_prompts_per_job)
   new_results: dict[int, str] = {}
 
-  if (
-      cfg.max_prompts_per_job
-      and len(prompts_to_process) > cfg.max_prompts_per_job
-  ):
-    chunk_size = cfg.max_prompts_per_job
-    for chunk_num, i in enumerate(
-        range(0, len(prompts_to_process), chunk_size)
-    ):
-      chunk_items = prompts_to_process[i : i + chunk_size]
-      chunk_results = _process_batch(
-          chunk_items, f"{display_base}-part-{chunk_num}"
+  def _store(results: dict[int, str]) -> None:
+    """Collect one shard's results and cache them right away."""
+    new_results.update(results)
+    if cache is not None:
+      cache.set_multi(
+          [(_key_data(prompts[idx]), text) for idx, text in results.items()]
       )
-      new_results.update(chunk_results)
+
+  if len(shards) == 1:
+    _store(_process_batch(shards[0], display_base))
   else:
-    new_results = _process_batch(prompts_to_process, display_base)
-
-  if cache:
-    upload_list = []
-    for idx, text in new_results.items():
-      prompt = prompts[idx]
-      key_data = {
-          "model_id": model_id,
-          "prompt": prompt,
-          "system_instruction": system_instruction,
-          "gen_config": gen_config,
-          "safety_settings": safety_settings,
-          "schema": schema_dict,
-      }
-      upload_list.append((key_data, text))
-
-    cache.set_multi(upload_list)
+    logging.info(
+        "Batch API: Splitting %d prompts into %d jobs (%d at a time)",
+        len(prompts_to_process),
+        len(shards),
+        cfg.max_concurrent_jobs,
+    )
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(cfg.max_concurrent_jobs, len(shards)),
+        thread_name_prefix="gemini-batch",
+    )
+    first_error: Exception | None = None
+    try:
+      futures = [
+          executor.submit(_process_batch, shard, f"{display_base}-part-{i}")
+          for i, shard in enumerate(shards)
+      ]
+      # Shards are stored (and cached) as they finish, not in order, so a
+      # slow or failing shard does not hold back the others' results. After
+      # a failure, running jobs are cancelled but whatever still completes
+      # is kept for the next run.
+      for done, future in enumerate(concurrent.futures.as_completed(futures)):
+        try:
+          results = future.result()
+        except Exception as e:
+          if first_error is None:
+            first_error = e
+            stop.set()
+          continue
+        _store(results)
+        logging.info("Batch API: %d/%d jobs finished", done + 1, len(shards))
+    except BaseException:
+      stop.set()
+      raise
+    finally:
+      executor.shutdown(wait=True, cancel_futures=True)
+    if first_error is not None:
+      raise first_error
 
   final_outputs = []
   for i in range(len(prompts)):
@@ -50,6 +50,13 @@ Direct provider instantiation (when model ID conflicts with other providers):
         model_url="http://localhost:11434",  # optional, uses default if not specified
     )
 
+    # Parallel inference across two Ollama hosts (round-robin per prompt)
+    model = OllamaLanguageModel(
+        model_id="gemma2:2b",
+        base_url=["http://gpu-a:11434", "http://gpu-b:11434"],
+        per_host_parallel=4,  # matches OLLAMA_NUM_PARALLEL=4 on each host
+    )
+
     # Use with extract by passing the model instance
     result = lx.extract(
         text_or_documents="Your text here",
@@ -83,12 +90,18 @@ Prerequisites:
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import dataclasses
-from typing import Any, Iterator, Mapping, Sequence
+import itertools
+import json
+import threading
+from typing import Any, AsyncIterator, Iterator, Mapping, Sequence
 from urllib.parse import urljoin
 from urllib.parse import urlparse
 import warnings
 
+import aiohttp
 import requests
 
 # Import from core modules directly
@@ -133,10 +146,26 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
 
   Authentication is supported for proxied Ollama instances:
     lx.extract(..., language_model_params={"api_key": "sk-..."})
+
+  Prompts in a batch are sent over a pooled HTTP session by up to
+  `max_workers` threads. Passing a list of URLs as `base_url`/`model_url`
+  spreads prompts round-robin across several Ollama hosts, skipping hosts
+  that are busy. Every request, including streamed and async ones, holds one
+  of `per_host_parallel` slots on its host (default 1, matching Ollama's
+  default OLLAMA_NUM_PARALLEL) until it completes, so neither the generic
+  `max_workers` that lx.extract() passes to every provider nor
+  extract_async()'s concurrency can overload a single server; raise
+  `per_host_parallel` for servers configured to serve requests in parallel.
+  Results are always yielded in prompt order.
   """
 
   _model: str
   _model_url: str
+  _model_urls: list[str] = dataclasses.field(
+      default_factory=list, repr=False, compare=False
+  )
+  max_workers: int = 1
+  per_host_parallel: int = 1
   format_type: core_types.FormatType = core_types.FormatType.JSON
   _constraint: schema.Constraint = dataclasses.field(
       default_factory=schema.Constraint, repr=False, compare=False
@@ -172,27 +201,34 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
   def __init__(
       self,
       model_id: str,
-      model_url: str = _OLLAMA_DEFAULT_MODEL_URL,
-      base_url: str | None = None,  # Alias for model_url
+      model_url: str | Sequence[str] = _OLLAMA_DEFAULT_MODEL_URL,
+      base_url: str | Sequence[str] | None = None,  # Alias for model_url
       format_type: core_types.FormatType | None = None,
       structured_output_format: str | None = None,  # Deprecated
       constraint: schema.Constraint = schema.Constraint(),
       timeout: int | None = None,
+      max_workers: int | None = None,
+      per_host_parallel: int = 1,
       **kwargs,
   ) -> None:
     """Initialize the Ollama language model.
 
     Args:
       model_id: The Ollama model ID to use.
-      model_url: URL for Ollama server (legacy parameter).
-      base_url: Alternative parameter name for Ollama server URL.
+      model_url: URL for Ollama server (legacy parameter), or a list of URLs to
+        distribute prompts across round-robin.
+      base_url: Alternative parameter name for Ollama server URL(s).
       format_type: Output format (JSON or YAML). Defaults to JSON.
       structured_output_format: DEPRECATED - use format_type instead.
       constraint: Schema constraints.
       timeout: Request timeout in seconds. Defaults to 120.
+      max_workers: Maximum number of prompts in flight at once. Capped at
+        per_host_parallel times the number of server URLs, which is also the
+        default.
+      per_host_parallel: Requests each server handles at once. Set this to
+        the servers' OLLAMA_NUM_PARALLEL.
       **kwargs: Additional parameters.
     """
-    self._requests = requests
 
     # Handle deprecated structured_output_format parameter
     if structured_output_format is not None:
@@ -220,8 +256,26 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
     if format_type is None:
       format_type = core_types.FormatType.JSON
 
+    urls = base_url or model_url or _OLLAMA_DEFAULT_MODEL_URL
+    if isinstance(urls, str):
+      urls = [urls]
+    self._model_urls = list(urls) or [_OLLAMA_DEFAULT_MODEL_URL]
+    if per_host_parallel < 1:
+      raise exceptions.InferenceConfigError(
+          f'per_host_parallel must be positive, got {per_host_parallel}'
+      )
+    if max_workers is not None and max_workers < 1:
+      raise exceptions.InferenceConfigError(
+          f'max_workers must be positive, got {max_workers}'
+      )
+    host_capacity = per_host_parallel * len(self._model_urls)
+    if max_workers is None or max_workers > host_capacity:
+      max_workers = host_capacity
+
     self._model = model_id
-    self._model_url = base_url or model_url or _OLLAMA_DEFAULT_MODEL_URL
+    self._model_url = self._model_urls[0]
+    self.max_workers = max_workers
+    self.per_host_parallel = per_host_parallel
     self.format_type = format_type
     self._constraint = constraint
 
@@ -230,8 +284,8 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
     self._auth_header = kwargs.pop('auth_header', 'Authorization')
 
     if self._api_key:
-      host = urlparse(self._model_url).hostname
-      if host in ('localhost', '127.0.0.1', '::1'):
+      hosts = {urlparse(url).hostname for url in self._model_urls}
+      if hosts & {'localhost', '127.0.0.1', '::1'}:
         warnings.warn(
             'API key provided for localhost Ollama instance. '
             "Native Ollama doesn't require authentication. "
@@ -239,11 +293,119 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
             UserWarning,
         )
 
+    # One keep-alive connection pool per host, sized for the worker count.
+    self._session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=len(self._model_urls), pool_maxsize=self.max_workers
+    )
+    self._session.mount('http://', adapter)
+    self._session.mount('https://', adapter)
+    self._url_cycle = itertools.cycle(self._model_urls)
+    self._url_lock = threading.Lock()
+    # Request slots per host: threading semaphores for infer/infer_stream and,
+    # since asyncio primitives belong to one loop, asyncio semaphores created
+    # per loop for infer_async.
+    self._host_slots = {
+        url: threading.BoundedSemaphore(per_host_parallel)
+        for url in self._model_urls
+    }
+    self._async_host_slots: dict[str, asyncio.Semaphore] = {}
+    self._async_slots_loop: asyncio.AbstractEventLoop | None = None
+    # Created lazily by infer_async on the event loop that uses it.
+    self._async_session: aiohttp.ClientSession | None = None
+    self._async_loop: asyncio.AbstractEventLoop | None = None
+
     super().__init__(constraint=constraint)
     if timeout is not None:
       kwargs['timeout'] = timeout
     self._extra_kwargs = kwargs or {}
 
+  def close(self) -> None:
+    """Closes the pooled HTTP sessions and the worker pool."""
+    self._session.close()
+    self._close_async_session()
+    super().close()
+
+  def _get_async_session(self) -> aiohttp.ClientSession:
+    """Returns the aiohttp session bound to the running event loop.
+
+    The session is kept across infer_async calls so connections are reused.
+    aiohttp sessions cannot move between loops, so a call on a different loop
+    replaces it.
+    """
+    loop = asyncio.get_running_loop()
+    if (
+        self._async_session is None
+        or self._async_session.closed
+        or self._async_loop is not loop
+    ):
+      self._close_async_session()
+      self._async_session = aiohttp.ClientSession()
+      self._async_loop = loop
+    return self._async_session
+
+  def _close_async_session(self) -> None:
+    """Closes the aiohttp session on the loop that created it."""
+    session, loop = self._async_session, self._async_loop
+    self._async_session = self._async_loop = None
+    if session is None or session.closed:
+      return
+    self._close_on_loop(session.close, loop)
+
+  def _next_model_url(self) -> str:
+    """Returns the next server URL in round-robin order."""
+    with self._url_lock:
+      return next(self._url_cycle)
+
+  def _hosts_to_try(self) -> list[str]:
+    """Returns the server URLs, starting at the next round-robin one."""
+    first = self._next_model_url()
+    start = self._model_urls.index(first)
+    return self._model_urls[start:] + self._model_urls[:start]
+
+  @contextlib.contextmanager
+  def _host_slot(self) -> Iterator[str]:
+    """Holds a request slot on a server for the duration of a request.
+
+    Takes the next round-robin server with a free slot, or waits for a slot
+    on the next round-robin server when all are busy.
+
+    Yields:
+      The URL of the server to send the request to.
+    """
+    hosts = self._hosts_to_try()
+    url = next(
+        (url for url in hosts if self._host_slots[url].acquire(blocking=False)),
+        None,
+    )
+    if url is None:
+      url = hosts[0]
+      self._host_slots[url].acquire()
+    try:
+      yield url
+    finally:
+      self._host_slots[url].release()
+
+  @contextlib.asynccontextmanager
+  async def _host_slot_async(self) -> AsyncIterator[str]:
+    """Async counterpart of _host_slot() for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if self._async_slots_loop is not loop:
+      self._async_host_slots = {
+          url: asyncio.Semaphore(self.per_host_parallel)
+          for url in self._model_urls
+      }
+      self._async_slots_loop = loop
+    slots = self._async_host_slots
+    hosts = self._hosts_to_try()
+    url = next((url for url in hosts if not slots[url].locked()), hosts[0])
+    # A free semaphore is acquired without yielding to the loop.
+    await slots[url].acquire()
+    try:
+      yield url
+    finally:
+      slots[url].release()
+
   def infer(
       self, batch_prompts: Sequence[str], **kwargs
   ) -> Iterator[Sequence[core_types.ScoredOutput]]:
@@ -257,25 +419,155 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       Lists of ScoredOutputs.
     """
     combined_kwargs = self.merge_kwargs(kwargs)
+    structured_output_format = (
+        'json' if self.format_type == core_types.FormatType.JSON else 'yaml'
+    )
 
-    for prompt in batch_prompts:
+    def _one(prompt: str) -> core_types.ScoredOutput:
       try:
-        response = self._ollama_query(
-            prompt=prompt,
-            model=self._model,
-            structured_output_format='json'
-            if self.format_type == core_types.FormatType.JSON
-            else 'yaml',
-            model_url=self._model_url,
-            **combined_kwargs,
-        )
-        yield [core_types.ScoredOutput(score=1.0, output=response['response'])]
+        with self._host_slot() as model_url:
+          response = self._ollama_query(
+              prompt=prompt,
+              model=self._model,
+              structured_output_format=structured_output_format,
+              model_url=model_url,
+              **combined_kwargs,
+          )
       except Exception as e:
         raise exceptions.InferenceRuntimeError(
             f'Ollama API error: {str(e)}', original=e
         ) from e
+      return core_types.ScoredOutput(score=1.0, output=response['response'])
 
-  def _ollama_query(
+    if len(batch_prompts) <= 1 or self.max_workers <= 1:
+      for prompt in batch_prompts:
+        yield [_one(prompt)]
+      return
+
+    # Each worker picks a server with a free slot when it starts a prompt;
+    # results come back in prompt order as soon as each leading one is ready.
+    outputs = self._map_ordered(_one, batch_prompts, self.max_workers)
+    try:
+      for result in outputs:
+        yield [result]
+    finally:
+      outputs.close()
+
+  def infer_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+    """Streams the output for one prompt from Ollama's generate endpoint.
+
+    Closing the iterator early closes the HTTP response, which makes Ollama
+    stop generating. The request holds a slot on its server until then.
+
+    Args:
+      prompt: The prompt to run.
+      **kwargs: Additional generation params.
+
+    Yields:
+      Pieces of the generated text as they arrive.
+
+    Raises:
+      InferenceConfigError: If the server returns a 404 (model not found).
+      InferenceRuntimeError: For any other HTTP errors, timeouts, or request
+        exceptions.
+    """
+    combined_kwargs = self.merge_kwargs(kwargs)
+    with self._host_slot() as model_url:
+      yield from self._stream_from(model_url, prompt, combined_kwargs)
+
+  def _stream_from(
+      self, model_url: str, prompt: str, combined_kwargs: dict[str, Any]
+  ) -> Iterator[str]:
+    """Streams one prompt's output from the server at model_url."""
+    api_url, headers, payload, request_timeout = self._build_generate_request(
+        prompt=prompt,
+        model=self._model,
+        model_url=model_url,
+        **combined_kwargs,
+    )
+    payload['stream'] = True
+    num_threads = combined_kwargs.get('num_threads')
+
+    try:
+      response = self._session.post(
+          api_url,
+          headers=headers,
+          json=payload,
+          timeout=request_timeout,
+          stream=True,
+      )
+    except requests.exceptions.RequestException as e:
+      raise self._request_error(e, request_timeout, num_threads) from e
+
+    try:
+      if response.status_code != 200:
+        self._handle_response_status(response.status_code, payload['model'])
+      # Ollama streams one JSON object per line.
+      for line in response.iter_lines():
+        if not line:
+          continue
+        chunk = json.loads(line)
+        if 'error' in chunk:
+          raise exceptions.InferenceRuntimeError(
+              f'Ollama API error: {chunk["error"]}', provider='Ollama'
+          )
+        if chunk.get('response'):
+          yield chunk['response']
+        if chunk.get('done'):
+          return
+    except requests.exceptions.RequestException as e:
+      raise self._request_error(e, request_timeout, num_threads) from e
+    finally:
+      response.close()
+
+  async def infer_async(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[core_types.ScoredOutput]]:
+    """Runs inference on a list of prompts via Ollama's API with aiohttp.
+
+    Prompts in the batch are sent concurrently over the model's persistent
+    aiohttp session, each waiting for a free slot on a server, so at most
+    per_host_parallel run on any server at once. The session is released by
+    close().
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params.
+
+    Returns:
+      Lists of ScoredOutputs in batch_prompts order.
+    """
+    combined_kwargs = self.merge_kwargs(kwargs)
+    structured_output_format = (
+        'json' if self.format_type == core_types.FormatType.JSON else 'yaml'
+    )
+
+    async def _one(
+        session: aiohttp.ClientSession, prompt: str
+    ) -> core_types.ScoredOutput:
+      try:
+        async with self._host_slot_async() as model_url:
+          response = await self._ollama_query_async(
+              session,
+              prompt=prompt,
+              model=self._model,
+              structured_output_format=structured_output_format,
+              model_url=model_url,
+              **combined_kwargs,
+          )
+      except Exception as e:
+        raise exceptions.InferenceRuntimeError(
+            f'Ollama API error: {str(e)}', original=e
+        ) from e
+      return core_types.ScoredOutput(score=1.0, output=response['response'])
+
+    session = self._get_async_session()
+    results = await asyncio.gather(
+        *(_one(session, prompt) for prompt in batch_prompts)
+    )
+    return [[result] for result in results]
+
+  def _build_generate_request(
       self,
       prompt: str,
       model: str | None = None,
@@ -294,51 +586,14 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       num_ctx: int | None = None,
       stop: str | list[str] | None = None,
       **kwargs,
-  ) -> Mapping[str, Any]:
-    """Sends a prompt to an Ollama model and returns the generated response.
+  ) -> tuple[str, dict[str, str], dict[str, Any], int]:
+    """Builds the URL, headers, payload and timeout for /api/generate.
 
-    Note: This is a low-level method. Constructor timeout is only used when
-    calling through infer(). Direct calls use the timeout parameter here.
-
-    This function makes an HTTP POST request to the `/api/generate` endpoint of
-    an Ollama server. It can optionally load the specified model first, generate
-    a response (with or without streaming), then return a parsed JSON response.
-
-    Args:
-      prompt: The text prompt to send to the model.
-      model: The name of the model to use. Defaults to self._model.
-      temperature: Sampling temperature. Higher values produce more diverse
-        output.
-      seed: Seed for reproducible generation. If None, random seed is used.
-      top_k: The top-K parameter for sampling.
-      top_p: The top-P (nucleus) sampling parameter.
-      max_output_tokens: Maximum tokens to generate. If None, the model's
-        default is used.
-      structured_output_format: If set to "json" or a JSON schema dict, requests
-        structured outputs from the model. See Ollama documentation for details.
-      system: A system prompt to override any system-level instructions.
-      raw: If True, bypasses any internal prompt templating; you provide the
-        entire raw prompt.
-      model_url: The base URL for the Ollama server. Defaults to self._model_url.
-      timeout: Timeout (in seconds) for the HTTP request. Defaults to 120.
-      keep_alive: How long (in seconds) the model remains loaded after
-        generation completes.
-      num_threads: Number of CPU threads to use. If None, Ollama uses a default
-        heuristic.
-      num_ctx: Number of context tokens allowed. If None, uses model's default
-        or config.
-      stop: Stop sequences to halt generation. Can be a string or list of strings.
-      **kwargs: Additional parameters passed through.
+    Shared by the synchronous and asynchronous query paths. See _ollama_query
+    for a description of the arguments.
 
     Returns:
-      A mapping (dictionary-like) containing the server's JSON response. For
-      non-streaming calls, the `"response"` key typically contains the entire
-      generated text.
-
-    Raises:
-      InferenceConfigError: If the server returns a 404 (model not found).
-      InferenceRuntimeError: For any other HTTP errors, timeouts, or request
-        exceptions.
+      A tuple of (api_url, headers, payload, request_timeout).
     """
     model = model or self._model
     model_url = model_url or self._model_url
@@ -422,33 +677,228 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       else:
         headers[self._auth_header] = self._api_key
 
+    return api_url, headers, payload, request_timeout
+
+  def _request_error(
+      self,
+      error: requests.exceptions.RequestException,
+      request_timeout: int,
+      num_threads: int | None,
+  ) -> exceptions.InferenceRuntimeError:
+    """Maps a requests exception to the provider error to raise."""
+    if isinstance(error, requests.exceptions.ReadTimeout):
+      msg = (
+          f'Ollama Model timed out (timeout={request_timeout},'
+          f' num_threads={num_threads})'
+      )
+      return exceptions.InferenceRuntimeError(
+          msg, original=error, provider='Ollama'
+      )
+    return exceptions.InferenceRuntimeError(
+        f'Ollama request failed: {str(error)}', original=error, provider='Ollama'
+    )
+
+  def _handle_response_status(self, status_code: int, model: str) -> None:
+    """Raises the provider error matching a non-200 Ollama status code."""
+    if status_code == 404:
+      raise exceptions.InferenceConfigError(
+          f"Can't find Ollama {model}. Try: ollama run {model}"
+      )
+    msg = f'Bad status code from Ollama: {status_code}'
+    raise exceptions.InferenceRuntimeError(
+        msg, provider='Ollama', status_code=status_code
+    )
+
+  def _ollama_query(
+      self,
+      prompt: str,
+      model: str | None = None,
+      temperature: float | None = None,
+      seed: int | None = None,
+      top_k: int | None = None,
+      top_p: float | None = None,
+      max_output_tokens: int | None = None,
+      structured_output_format: str | None = None,
+      system: str = '',
+      raw: bool = False,
+      model_url: str | None = None,
+      timeout: int | None = None,
+      keep_alive: int | None = None,
+      num_threads: int | None = None,
+      num_ctx: int | None = None,
+      stop: str | list[str] | None = None,
+      **kwargs,
+  ) -> Mapping[str, Any]:
+    """Sends a prompt to an Ollama model and returns the generated response.
+
+    Note: This is a low-level method. Constructor timeout is only used when
+    calling through infer(). Direct calls use the timeout parameter here.
+
+    This function makes an HTTP POST request to the `/api/generate` endpoint of
+    an Ollama server. It can optionally load the specified model first, generate
+    a response (with or without streaming), then return a parsed JSON response.
+
+    Args:
+      prompt: The text prompt to send to the model.
+      model: The name of the model to use. Defaults to self._model.
+      temperature: Sampling temperature. Higher values produce more diverse
+        output.
+      seed: Seed for reproducible generation. If None, random seed is used.
+      top_k: The top-K parameter for sampling.
+      top_p: The top-P (nucleus) sampling parameter.
+      max_output_tokens: Maximum tokens to generate. If None, the model's
+        default is used.
+      structured_output_format: If set to "json" or a JSON schema dict, requests
+        structured outputs from the model. See Ollama documentation for details.
+      system: A system prompt to override any system-level instructions.
+      raw: If True, bypasses any internal prompt templating; you provide the
+        entire raw prompt.
+      model_url: The base URL for the Ollama server. Defaults to self._model_url.
+      timeout: Timeout (in seconds) for the HTTP request. Defaults to 120.
+      keep_alive: How long (in seconds) the model remains loaded after
+        generation completes.
+      num_threads: Number of CPU threads to use. If None, Ollama uses a default
+        heuristic.
+      num_ctx: Number of context tokens allowed. If None, uses model's default
+        or config.
+      stop: Stop sequences to halt generation. Can be a string or list of strings.
+      **kwargs: Additional parameters passed through.
+
+    Returns:
+      A mapping (dictionary-like) containing the server's JSON response. For
+      non-streaming calls, the `"response"` key typically contains the entire
+      generated text.
+
+    Raises:
+      InferenceConfigError: If the server returns a 404 (model not found).
+      InferenceRuntimeError: For any other HTTP errors, timeouts, or request
+        exceptions.
+    """
+    api_url, headers, payload, request_timeout = self._build_generate_request(
+        prompt=prompt,
+        model=model,
+        temperature=temperature,
+        seed=seed,
+        top_k=top_k,
+        top_p=top_p,
+        max_output_tokens=max_output_tokens,
+        structured_output_format=structured_output_format,
+        system=system,
+        raw=raw,
+        model_url=model_url,
+        timeout=timeout,
+        keep_alive=keep_alive,
+        num_threads=num_threads,
+        num_ctx=num_ctx,
+        stop=stop,
+        **kwargs,
+    )
+
     try:
-      response = self._requests.post(
+      response = self._session.post(
           api_url,
           headers=headers,
           json=payload,
           timeout=request_timeout,
       )
-    except self._requests.exceptions.RequestException as e:
-      if isinstance(e, self._requests.exceptions.ReadTimeout):
-        msg = (
-            f'Ollama Model timed out (timeout={request_timeout},'
-            f' num_threads={num_threads})'
-        )
-        raise exceptions.InferenceRuntimeError(
-            msg, original=e, provider='Ollama'
-        ) from e
-      raise exceptions.InferenceRuntimeError(
-          f'Ollama request failed: {str(e)}', original=e, provider='Ollama'
-      ) from e
+    except requests.exceptions.RequestException as e:
+      raise self._request_error(e, request_timeout, num_threads) from e
 
     response.encoding = 'utf-8'
     if response.status_code == 200:
       return response.json()
-    if response.status_code == 404:
-      raise exceptions.InferenceConfigError(
-          f"Can't find Ollama {model}. Try: ollama run {model}"
+    self._handle_response_status(response.status_code, payload['model'])
+
+  async def _ollama_query_async(
+      self,
+      session: Any,
+      prompt: str,
+      model: str | None = None,
+      temperature: float | None = None,
+      seed: int | None = None,
+      top_k: int | None = None,
+      top_p: float | None = None,
+      max_output_tokens: int | None = None,
+      structured_output_format: str | None = None,
+      system: str = '',
+      raw: bool = False,
+      model_url: str | None = None,
+      timeout: int | None = None,
+      keep_alive: int | None = None,
+      num_threads: int | None = None,
+      num_ctx: int | None = None,
+      stop: str | list[str] | None = None,
+      **kwargs,
+  ) -> Mapping[str, Any]:
+    """Async counterpart of _ollama_query using a shared aiohttp session.
+
+    Args:
+      session: An open aiohttp.ClientSession used for the request.
+      prompt: The text prompt to send to the model.
+      model: See _ollama_query.
+      temperature: See _ollama_query.
+      seed: See _ollama_query.
+      top_k: See _ollama_query.
+      top_p: See _ollama_query.
+      max_output_tokens: See _ollama_query.
+      structured_output_format: See _ollama_query.
+      system: See _ollama_query.
+      raw: See _ollama_query.
+      model_url: See _ollama_query.
+      timeout: See _ollama_query.
+      keep_alive: See _ollama_query.
+      num_threads: See _ollama_query.
+      num_ctx: See _ollama_query.
+      stop: See _ollama_query.
+      **kwargs: Additional parameters passed through.
+
+    Returns:
+      The server's JSON response.
+
+    Raises:
+      InferenceConfigError: If the server returns a 404 (model not found).
+      InferenceRuntimeError: For any other HTTP errors, timeouts, or request
+        exceptions.
+    """
+    api_url, headers, payload, request_timeout = self._build_generate_request(
+        prompt=prompt,
+        model=model,
+        temperature=temperature,
+        seed=seed,
+        top_k=top_k,
+        top_p=top_p,
+        max_output_tokens=max_output_tokens,
+        structured_output_format=structured_output_format,
+        system=system,
+        raw=raw,
+        model_url=model_url,
+        timeout=timeout,
+        keep_alive=keep_alive,
+        num_threads=num_threads,
+        num_ctx=num_ctx,
+        stop=stop,
+        **kwargs,
+    )
+
+    try:
+      async with session.post(
+          api_url,
+          headers=headers,
+          json=payload,
+          timeout=aiohttp.ClientTimeout(total=request_timeout),
+      ) as response:
+        if response.status != 200:
+          self._handle_response_status(response.status, payload['model'])
+        return await response.json(content_type=None)
+    except asyncio.TimeoutError as e:
+      msg = (
+          f'Ollama Model timed out (timeout={request_timeout},'
+          f' num_threads={num_threads})'
       )
-    else:
-      msg = f'Bad status code from Ollama: {response.status_code}'
-      raise exceptions.InferenceRuntimeError(msg, provider='Ollama')
+      raise exceptions.InferenceRuntimeError(
+          msg, original=e, provider='Ollama'
+      ) from e
+    except aiohttp.ClientError as e:
+      raise exceptions.InferenceRuntimeError(
+          f'Ollama request failed: {str(e)}', original=e, provider='Ollama'
+      ) from e
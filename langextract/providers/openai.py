@@ -17,15 +17,19 @@
 
 from __future__ import annotations
 
-import concurrent.futures
+import asyncio
 import dataclasses
 from typing import Any, Iterator, Sequence
 
+from absl import logging
+
 from langextract.core import base_model
 from langextract.core import data
 from langextract.core import exceptions
+from langextract.core import rate_limit as rate_limit_lib
 from langextract.core import schema
 from langextract.core import types as core_types
+from langextract.providers import openai_batch
 from langextract.providers import patterns
 from langextract.providers import router
 
@@ -46,6 +50,18 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
   temperature: float | None = None
   max_workers: int = 10
   _client: Any = dataclasses.field(default=None, repr=False, compare=False)
+  _rate_limiter: rate_limit_lib.RateLimiter | None = dataclasses.field(
+      default=None, repr=False, compare=False
+  )
+  _async_client: Any = dataclasses.field(
+      default=None, repr=False, compare=False
+  )
+  _async_loop: asyncio.AbstractEventLoop | None = dataclasses.field(
+      default=None, repr=False, compare=False
+  )
+  _batch_cfg: openai_batch.BatchConfig = dataclasses.field(
+      default_factory=openai_batch.BatchConfig, repr=False, compare=False
+  )
   _extra_kwargs: dict[str, Any] = dataclasses.field(
       default_factory=dict, repr=False, compare=False
   )
@@ -66,6 +82,9 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
       format_type: data.FormatType = data.FormatType.JSON,
       temperature: float | None = None,
       max_workers: int = 10,
+      rate_limit: (
+          rate_limit_lib.RateLimit | rate_limit_lib.RateLimiter | None
+      ) = None,
       **kwargs,
   ) -> None:
     """Initialize the OpenAI language model.
@@ -77,9 +96,17 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
       organization: Optional OpenAI organization ID.
       format_type: Output format (JSON or YAML).
       temperature: Sampling temperature.
-      max_workers: Maximum number of parallel API calls.
+      max_workers: Maximum number of parallel API calls. Calls run on a
+        worker pool owned by the model and shared by all infer() calls;
+        release it with close() or by using the model as a context manager.
+      rate_limit: Client-side request/token limits, or a RateLimiter to share.
+        Instances with equal limits for the same model share one limiter.
+        Defaults to any limiter registered with rate_limit.configure() for
+        "openai".
       **kwargs: Ignored extra parameters so callers can pass a superset of
         arguments shared across back-ends without raising ``TypeError``.
+        A ``batch`` dict configures the OpenAI Batch API; see
+        openai_batch.BatchConfig.
     """
     # Lazy import: OpenAI package required
     try:
@@ -108,6 +135,16 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
         base_url=self.base_url,
         organization=self.organization,
     )
+    # Created by infer_async() on the event loop that uses it.
+    self._async_client = None
+    self._async_loop = None
+    self._rate_limiter = rate_limit_lib.limiter_for(
+        'openai', self.model_id, rate_limit
+    )
+
+    # Extract batch config before we filter kwargs into _extra_kwargs
+    batch_cfg_dict = kwargs.pop('batch', None)
+    self._batch_cfg = openai_batch.BatchConfig.from_dict(batch_cfg_dict)
 
     super().__init__(
         constraint=schema.Constraint(constraint_type=schema.ConstraintType.NONE)
@@ -130,58 +167,67 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
 
     return result
 
+  def _build_api_params(self, prompt: str, config: dict) -> dict[str, Any]:
+    """Builds chat completion request parameters for a single prompt."""
+    normalized_config = self._normalize_reasoning_params(config)
+    system_message = ''
+    if self.format_type == data.FormatType.JSON:
+      system_message = (
+          'You are a helpful assistant that responds in JSON format.'
+      )
+    elif self.format_type == data.FormatType.YAML:
+      system_message = (
+          'You are a helpful assistant that responds in YAML format.'
+      )
+
+    messages = [{'role': 'user', 'content': prompt}]
+    if system_message:
+      messages.insert(0, {'role': 'system', 'content': system_message})
+
+    api_params = {
+        'model': self.model_id,
+        'messages': messages,
+        'n': 1,
+    }
+
+    temp = normalized_config.get('temperature', self.temperature)
+    if temp is not None:
+      api_params['temperature'] = temp
+
+    if self.format_type == data.FormatType.JSON:
+      api_params.setdefault('response_format', {'type': 'json_object'})
+
+    if (v := normalized_config.get('max_output_tokens')) is not None:
+      api_params['max_tokens'] = v
+    if (v := normalized_config.get('top_p')) is not None:
+      api_params['top_p'] = v
+    for key in [
+        'frequency_penalty',
+        'presence_penalty',
+        'seed',
+        'stop',
+        'logprobs',
+        'top_logprobs',
+        'reasoning',
+        'response_format',
+    ]:
+      if (v := normalized_config.get(key)) is not None:
+        api_params[key] = v
+
+    return api_params
+
   def _process_single_prompt(
       self, prompt: str, config: dict
   ) -> core_types.ScoredOutput:
     """Process a single prompt and return a ScoredOutput."""
+    tokens = rate_limit_lib.estimate_tokens(
+        prompt, config.get('max_output_tokens')
+    )
     try:
-      normalized_config = self._normalize_reasoning_params(config)
-
-      system_message = ''
-      if self.format_type == data.FormatType.JSON:
-        system_message = (
-            'You are a helpful assistant that responds in JSON format.'
-        )
-      elif self.format_type == data.FormatType.YAML:
-        system_message = (
-            'You are a helpful assistant that responds in YAML format.'
-        )
-
-      messages = [{'role': 'user', 'content': prompt}]
-      if system_message:
-        messages.insert(0, {'role': 'system', 'content': system_message})
-
-      api_params = {
-          'model': self.model_id,
-          'messages': messages,
-          'n': 1,
-      }
-
-      temp = normalized_config.get('temperature', self.temperature)
-      if temp is not None:
-        api_params['temperature'] = temp
-
-      if self.format_type == data.FormatType.JSON:
-        api_params.setdefault('response_format', {'type': 'json_object'})
-
-      if (v := normalized_config.get('max_output_tokens')) is not None:
-        api_params['max_tokens'] = v
-      if (v := normalized_config.get('top_p')) is not None:
-        api_params['top_p'] = v
-      for key in [
-          'frequency_penalty',
-          'presence_penalty',
-          'seed',
-          'stop',
-          'logprobs',
-          'top_logprobs',
-          'reasoning',
-          'response_format',
-      ]:
-        if (v := normalized_config.get(key)) is not None:
-          api_params[key] = v
-
-      response = self._client.chat.completions.create(**api_params)
+      api_params = self._build_api_params(prompt, config)
+      with rate_limit_lib.limited(self._rate_limiter, tokens):
+        response = self._client.chat.completions.create(**api_params)
+      self._reconcile_usage(tokens, response)
 
       # Extract the response text using the v1.x response format
       output_text = response.choices[0].message.content
@@ -193,18 +239,114 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
           f'OpenAI API error: {str(e)}', original=e
       ) from e
 
-  def infer(
-      self, batch_prompts: Sequence[str], **kwargs
-  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
-    """Runs inference on a list of prompts via OpenAI's API.
+  def infer_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+    """Streams the completion for one prompt via OpenAI's streaming API.
+
+    Closing the iterator early closes the HTTP stream, which stops the
+    request.
 
     Args:
-      batch_prompts: A list of string prompts.
+      prompt: The prompt to run.
       **kwargs: Additional generation params (temperature, top_p, etc.)
 
     Yields:
-      Lists of ScoredOutputs.
+      Pieces of the completion text as they arrive.
     """
+    config = self._build_config(kwargs)
+    api_params = self._build_api_params(prompt, config)
+    tokens = rate_limit_lib.estimate_tokens(
+        prompt, config.get('max_output_tokens')
+    )
+    try:
+      with rate_limit_lib.limited(self._rate_limiter, tokens):
+        stream = self._client.chat.completions.create(
+            **api_params, stream=True
+        )
+    except Exception as e:
+      raise exceptions.InferenceRuntimeError(
+          f'OpenAI API error: {str(e)}', original=e
+      ) from e
+
+    try:
+      for chunk in stream:
+        if not chunk.choices:
+          continue
+        content = chunk.choices[0].delta.content
+        if content:
+          yield content
+    except Exception as e:
+      raise exceptions.InferenceRuntimeError(
+          f'OpenAI API error: {str(e)}', original=e
+      ) from e
+    finally:
+      stream.close()
+
+  def _reconcile_usage(self, estimated_tokens: int, response: Any) -> None:
+    """Corrects the token budget with the usage the response reports."""
+    usage = getattr(response, 'usage', None)
+    rate_limit_lib.reconcile_usage(
+        self._rate_limiter,
+        estimated_tokens,
+        getattr(usage, 'total_tokens', None),
+    )
+
+  def _get_async_client(self) -> Any:
+    """Returns the AsyncOpenAI client bound to the running event loop.
+
+    The client is kept across infer_async calls so connections are reused.
+    Its connection pool belongs to the loop it was created on, so a call on
+    a different loop replaces it.
+    """
+    loop = asyncio.get_running_loop()
+    if self._async_client is None or self._async_loop is not loop:
+      self._close_async_client()
+      # pylint: disable=import-outside-toplevel
+      import openai
+
+      self._async_client = openai.AsyncOpenAI(
+          api_key=self.api_key,
+          base_url=self.base_url,
+          organization=self.organization,
+      )
+      self._async_loop = loop
+    return self._async_client
+
+  def _close_async_client(self) -> None:
+    """Closes the AsyncOpenAI client on the loop that created it."""
+    client, loop = self._async_client, self._async_loop
+    self._async_client = self._async_loop = None
+    if client is not None and loop is not None:
+      self._close_on_loop(client.close, loop)
+
+  def close(self) -> None:
+    """Closes the async client and the worker pool."""
+    self._close_async_client()
+    super().close()
+
+  async def _process_single_prompt_async(
+      self, prompt: str, config: dict
+  ) -> core_types.ScoredOutput:
+    """Async counterpart of _process_single_prompt."""
+    tokens = rate_limit_lib.estimate_tokens(
+        prompt, config.get('max_output_tokens')
+    )
+    try:
+      api_params = self._build_api_params(prompt, config)
+      async with rate_limit_lib.limited_async(self._rate_limiter, tokens):
+        response = await self._get_async_client().chat.completions.create(
+            **api_params
+        )
+      self._reconcile_usage(tokens, response)
+      output_text = response.choices[0].message.content
+      return core_types.ScoredOutput(score=1.0, output=output_text)
+
+    except Exception as e:
+      raise exceptions.InferenceRuntimeError(
+          f'OpenAI API error: {str(e)}', original=e
+      ) from e
+
+  def _build_config(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Builds the per-request generation config from runtime kwargs."""
     merged_kwargs = self.merge_kwargs(kwargs)
 
     config = {}
@@ -230,39 +372,109 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
     ]:
       if key in merged_kwargs:
         config[key] = merged_kwargs[key]
+    return config
+
+  def _use_batch_api(self, batch_prompts: Sequence[str]) -> bool:
+    """Whether this batch should be routed to the OpenAI Batch API."""
+    return bool(
+        self._batch_cfg
+        and self._batch_cfg.enabled
+        and len(batch_prompts) >= self._batch_cfg.threshold
+    )
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
+    """Runs inference on a list of prompts via OpenAI's API.
+
+    Batches of at least batch.threshold prompts are sent through the Batch
+    API when batch mode is enabled.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, etc.)
+
+    Yields:
+      Lists of ScoredOutputs.
+    """
+    config = self._build_config(kwargs)
+
+    if self._use_batch_api(batch_prompts):
+      try:
+        outputs = openai_batch.infer_batch(
+            client=self._client,
+            bodies=[
+                self._build_api_params(prompt, config)
+                for prompt in batch_prompts
+            ],
+            cfg=self._batch_cfg,
+        )
+      except exceptions.InferenceRuntimeError:
+        raise
+      except Exception as e:
+        raise exceptions.InferenceRuntimeError(
+            f'OpenAI Batch API error: {e}', original=e
+        ) from e
+
+      for text in outputs:
+        yield [core_types.ScoredOutput(score=1.0, output=text)]
+      return
+
+    if self._batch_cfg.enabled:
+      logging.info(
+          'OpenAI batch mode enabled but prompt count (%d) is below the'
+          ' threshold (%d); using real-time API.',
+          len(batch_prompts),
+          self._batch_cfg.threshold,
+      )
 
     # Use parallel processing for batches larger than 1
     if len(batch_prompts) > 1 and self.max_workers > 1:
-      with concurrent.futures.ThreadPoolExecutor(
-          max_workers=min(self.max_workers, len(batch_prompts))
-      ) as executor:
-        future_to_index = {
-            executor.submit(
-                self._process_single_prompt, prompt, config.copy()
-            ): i
-            for i, prompt in enumerate(batch_prompts)
-        }
-
-        results: list[core_types.ScoredOutput | None] = [None] * len(
-            batch_prompts
-        )
-        for future in concurrent.futures.as_completed(future_to_index):
-          index = future_to_index[future]
-          try:
-            results[index] = future.result()
-          except Exception as e:
-            raise exceptions.InferenceRuntimeError(
-                f'Parallel inference error: {str(e)}', original=e
-            ) from e
-
-        for result in results:
-          if result is None:
-            raise exceptions.InferenceRuntimeError(
-                'Failed to process one or more prompts'
-            )
+      # Prompts run on the model's long-lived pool, so the next batch can
+      # take free slots while this one's slowest prompt is still running.
+      outputs = self._map_ordered(
+          lambda prompt: self._process_single_prompt(prompt, config.copy()),
+          batch_prompts,
+          self.max_workers,
+      )
+      try:
+        for result in outputs:
           yield [result]
+      except Exception as e:
+        raise exceptions.InferenceRuntimeError(
+            f'Parallel inference error: {str(e)}', original=e
+        ) from e
+      finally:
+        outputs.close()
     else:
       # Sequential processing for single prompt or worker
       for prompt in batch_prompts:
         result = self._process_single_prompt(prompt, config.copy())
         yield [result]  # pylint: disable=duplicate-code
+
+  async def infer_async(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[core_types.ScoredOutput]]:
+    """Runs inference on a list of prompts via OpenAI's async client.
+
+    All prompts in the batch are sent concurrently on the running event loop;
+    callers bound overall concurrency themselves. Batches that qualify for
+    the Batch API are delegated to infer() in a worker thread, since batch
+    jobs are polled rather than awaited.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, etc.)
+
+    Returns:
+      Lists of ScoredOutputs in batch_prompts order.
+    """
+    if self._use_batch_api(batch_prompts):
+      return await super().infer_async(batch_prompts, **kwargs)
+
+    config = self._build_config(kwargs)
+    results = await asyncio.gather(*(
+        self._process_single_prompt_async(prompt, config.copy())
+        for prompt in batch_prompts
+    ))
+    return [[result] for result in results]
@@ -0,0 +1,485 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""OpenAI Batch API helper module for LangExtract.
+
+This module provides batch inference support using the openai SDK and
+mirrors gemini_batch. It handles:
+- JSONL file upload and batch job submission
+- Job polling and result extraction (including the per-item error file)
+- Optional local caching of results across runs
+- Order preservation across batch processing
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+import dataclasses
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable
+
+from absl import logging
+
+from langextract.core import exceptions
+from langextract.providers import batch_cache
+
+_CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+_COMPLETION_WINDOW = "24h"
+_EXT_JSONL = ".jsonl"
+_KEY_IDX = "idx-"
+_SECONDS_PER_DAY = 86400
+# OpenAI accepts file expirations between one hour and 30 days.
+_MAX_RETENTION_DAYS = 30
+_DEFAULT_CACHE_PATH = "~/.cache/langextract/openai_batch.sqlite"
+_UNSET = object()
+
+_TERMINAL_FAIL = frozenset({"failed", "expired", "cancelled"})
+_TERMINAL_OK = frozenset({"completed"})
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class BatchConfig:
+  """Define and validate OpenAI Batch API configuration.
+
+  Attributes:
+    enabled: Whether batch mode is enabled.
+    threshold: Minimum prompts to trigger batch processing.
+    poll_interval: Seconds between job status checks.
+    timeout: Maximum seconds to wait for job completion. Batch jobs have a
+      24 hour completion window, so the default waits for all of it.
+    max_prompts_per_job: Max prompts allowed in one batch job.
+    ignore_item_errors: If True, continue on per-item errors.
+    enable_caching: If True, cache results so unchanged requests are not
+      resubmitted.
+    cache_path: SQLite file used when enable_caching is True and no cache
+      backend is given.
+    retention_days: Days before the uploaded input and the result files
+      expire on OpenAI (at most 30). None keeps OpenAI's defaults.
+    cache: Cache backend used when enable_caching is True. Defaults to a
+      batch_cache.SQLiteBatchCache at cache_path.
+  """
+
+  enabled: bool = False
+  threshold: int = 50
+  poll_interval: float = 30
+  timeout: float = 86400
+  max_prompts_per_job: int = 50000
+  ignore_item_errors: bool = False
+  enable_caching: bool | None = _UNSET  # type: ignore
+  cache_path: str = _DEFAULT_CACHE_PATH
+  retention_days: int | None = _UNSET  # type: ignore
+  on_job_create: Callable[[Any], None] | None = None
+  cache: batch_cache.BatchCache | None = None
+
+  def __post_init__(self):
+    """Validate numeric knobs early."""
+
+    validations = [
+        (self.threshold >= 1, "batch.threshold must be >= 1"),
+        (self.poll_interval > 0, "batch.poll_interval must be > 0"),
+        (self.timeout > 0, "batch.timeout must be > 0"),
+        (self.max_prompts_per_job > 0, "batch.max_prompts_per_job must be > 0"),
+    ]
+    for is_valid, error_msg in validations:
+      if not is_valid:
+        raise ValueError(error_msg)
+    if self.cache is not None and not isinstance(
+        self.cache, batch_cache.BatchCache
+    ):
+      raise ValueError(
+          "batch.cache must provide get_multi, set_multi and iter_items"
+      )
+
+    if self.enabled:
+      if self.enable_caching is _UNSET:
+        raise ValueError(
+            "batch.enable_caching must be explicitly set when batch is enabled"
+        )
+      if self.retention_days is _UNSET:
+        raise ValueError(
+            "batch.retention_days must be explicitly set when batch is enabled"
+            " (use None for OpenAI's default retention)"
+        )
+      if self.retention_days is not None and not (
+          0 < self.retention_days <= _MAX_RETENTION_DAYS
+      ):
+        raise ValueError(
+            f"batch.retention_days must be between 1 and {_MAX_RETENTION_DAYS}"
+            " or None."
+        )
+
+  @classmethod
+  def from_dict(cls, d: dict | None) -> BatchConfig:
+    """Create BatchConfig from dictionary, using defaults for missing keys."""
+    if d is None:
+      return cls()
+    valid_keys = {f.name for f in dataclasses.fields(cls)}
+    filtered_dict = {k: v for k, v in d.items() if k in valid_keys}
+
+    unknown = sorted(set(d.keys()) - valid_keys)
+    if unknown:
+      logging.warning(
+          "Ignoring unknown batch config keys: %s", ", ".join(unknown)
+      )
+    cfg = cls(**filtered_dict)
+    if cfg.on_job_create is None:
+      object.__setattr__(cfg, "on_job_create", _default_job_create_callback)
+    return cfg
+
+
+def _default_job_create_callback(job: Any) -> None:
+  """Default callback to log batch job details."""
+  logging.info("Batch job created successfully: %s", job.id)
+  logging.info("Job Status: %s", job.status)
+  logging.info(
+      "Job Dashboard URL: https://platform.openai.com/batches/%s", job.id
+  )
+
+
+def _expires_after(retention_days: int | None) -> dict | None:
+  """Build the expires_after parameter for uploaded and output files."""
+  if not retention_days:
+    return None
+  return {
+      "anchor": "created_at",
+      "seconds": retention_days * _SECONDS_PER_DAY,
+  }
+
+
+def _submit_file(
+    client: Any,
+    bodies: Sequence[dict],
+    display: str,
+    retention_days: int | None,
+    endpoint: str = _CHAT_COMPLETIONS_ENDPOINT,
+) -> Any:
+  """Upload a JSONL request file and create a batch job for it.
+
+  Args:
+    client: openai.OpenAI client instance.
+    bodies: Request bodies for the endpoint, one per prompt.
+    display: Name used for the uploaded file and the job metadata.
+    retention_days: Days before the input and output files expire, or None.
+    endpoint: API endpoint each request is sent to.
+
+  Returns:
+    Batch object that can be polled for completion status.
+  """
+  expires_after = _expires_after(retention_days)
+  path = None
+  try:
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=_EXT_JSONL, delete=False, encoding="utf-8"
+    ) as f:
+      path = f.name
+      for idx, body in enumerate(bodies):
+        # The custom_id carries the original index because the output file
+        # is not guaranteed to follow input order.
+        line = {
+            "custom_id": f"{_KEY_IDX}{idx}",
+            "method": "POST",
+            "url": endpoint,
+            "body": body,
+        }
+        f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+    file_kwargs = {}
+    if expires_after:
+      file_kwargs["expires_after"] = expires_after
+    with open(path, "rb") as f:
+      input_file = client.files.create(
+          file=(f"{display}{_EXT_JSONL}", f),
+          purpose="batch",
+          **file_kwargs,
+      )
+
+    job_kwargs = {}
+    if expires_after:
+      job_kwargs["output_expires_after"] = expires_after
+    return client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=endpoint,
+        completion_window=_COMPLETION_WINDOW,
+        metadata={"display_name": display},
+        **job_kwargs,
+    )
+  finally:
+    if path:
+      try:
+        os.unlink(path)
+      except OSError:
+        pass
+
+
+def _poll_completion(client: Any, job: Any, cfg: BatchConfig) -> Any:
+  """Poll batch job until completion or timeout.
+
+  Args:
+    client: openai.OpenAI client instance for polling job status.
+    job: Batch object returned from client.batches.create().
+    cfg: Batch configuration including timeout and poll_interval.
+
+  Returns:
+    Completed batch object.
+
+  Raises:
+    InferenceRuntimeError: If the job fails, expires, is cancelled or does
+      not complete within cfg.timeout.
+  """
+  start = time.time()
+  batch_id = job.id
+
+  while True:
+    job = client.batches.retrieve(batch_id)
+    status = job.status
+
+    if status in _TERMINAL_OK:
+      return job
+
+    if status in _TERMINAL_FAIL:
+      error_details = getattr(job, "errors", None) or "(no error details)"
+      raise exceptions.InferenceRuntimeError(
+          f"Batch job failed: status={status}, id={batch_id}, "
+          f"error={error_details}"
+      )
+
+    if time.time() - start > cfg.timeout:
+      try:
+        client.batches.cancel(batch_id)
+      except Exception as e:
+        logging.warning(
+            "Failed to cancel timed-out batch job %s: %s", batch_id, e
+        )
+      raise exceptions.InferenceRuntimeError(
+          f"Batch job timed out after {cfg.timeout}s: {batch_id}"
+      )
+
+    time.sleep(cfg.poll_interval)
+    logging.info("Batch job is running... (Status: %s)", status)
+
+
+def _extract_text(body: Any) -> str | None:
+  """Extract the message text from a chat completion response body."""
+  if not isinstance(body, dict):
+    return None
+  choices = body.get("choices")
+  if not isinstance(choices, list) or not choices:
+    return None
+  message = choices[0].get("message") if isinstance(choices[0], dict) else None
+  text = message.get("content") if isinstance(message, dict) else None
+  return text if isinstance(text, str) else None
+
+
+def _parse_batch_line(
+    line: str, outputs: dict[int, str], cfg: BatchConfig
+) -> None:
+  """Parse a single line from a batch output or error JSONL file."""
+  try:
+    obj = json.loads(line)
+  except json.JSONDecodeError:
+    return
+
+  response = obj.get("response") or {}
+  status_code = response.get("status_code")
+  error = obj.get("error")
+  if not error and status_code not in (None, 200):
+    error = (response.get("body") or {}).get("error") or {
+        "status_code": status_code
+    }
+  if error and not cfg.ignore_item_errors:
+    raise exceptions.InferenceRuntimeError(
+        f"Batch item error for {obj.get('custom_id')}: {error}",
+        status_code=status_code if status_code not in (None, 200) else None,
+    )
+
+  text = "" if error else _extract_text(response.get("body")) or ""
+
+  key = obj.get("custom_id", "")
+  try:
+    # Extract the original index from the key (e.g., "idx-5" -> 5)
+    idx = int(str(key).rsplit(_KEY_IDX, maxsplit=1)[-1])
+  except (ValueError, IndexError):
+    idx = max(outputs.keys(), default=-1) + 1
+  outputs[idx] = text
+
+
+def _iter_file_lines(client: Any, file_id: str) -> Iterable[str]:
+  """Yield the lines of a file stored on OpenAI."""
+  content = client.files.content(file_id)
+  for line in content.iter_lines():
+    if line.strip():
+      yield line
+
+
+def _extract_results(
+    client: Any, job: Any, cfg: BatchConfig, expected_count: int
+) -> list[str]:
+  """Extract text outputs from a completed batch job, preserving order.
+
+  Args:
+    client: openai.OpenAI client instance for downloading result files.
+    job: Completed batch object.
+    cfg: Batch configuration including error handling settings.
+    expected_count: Number of prompts submitted (for order preservation).
+
+  Returns:
+    List of text outputs corresponding 1:1 to input prompts. Missing results
+    are padded with empty strings.
+
+  Raises:
+    InferenceRuntimeError: If the job has no result files or an item failed.
+  """
+  file_ids = [
+      file_id
+      for file_id in (job.output_file_id, getattr(job, "error_file_id", None))
+      if file_id
+  ]
+  if not file_ids:
+    raise exceptions.InferenceRuntimeError(
+        f"Batch job {job.id} completed without output files"
+    )
+
+  outputs_by_idx: dict[int, str] = {}
+  for file_id in file_ids:
+    logging.info("Batch API: Downloading results from file %s", file_id)
+    for line in _iter_file_lines(client, file_id):
+      _parse_batch_line(line, outputs_by_idx, cfg)
+
+  logging.info("Batch API: Parsed %d results", len(outputs_by_idx))
+  return [outputs_by_idx.get(i, "") for i in range(expected_count)]
+
+
+def infer_batch(
+    client: Any,
+    bodies: Sequence[dict],
+    cfg: BatchConfig,
+    endpoint: str = _CHAT_COMPLETIONS_ENDPOINT,
+) -> list[str]:
+  """Execute batch inference on multiple requests using the OpenAI Batch API.
+
+  This function:
+  - Serves requests found in the local cache (when enabled)
+  - Uploads the remaining requests as JSONL and submits batch jobs
+  - Polls for job completion
+  - Extracts and returns results in request order
+
+  Args:
+    client: openai.OpenAI client instance.
+    bodies: Request bodies for the endpoint (e.g. chat completion params),
+        one per prompt.
+    cfg: Batch configuration including thresholds, timeouts, and error
+        handling.
+    endpoint: API endpoint each request is sent to.
+
+  Returns:
+    List of text outputs corresponding 1:1 to bodies. Missing results are
+    padded with empty strings.
+
+  Raises:
+    InferenceRuntimeError: If a batch job fails or times out, or individual
+        items have errors (when cfg.ignore_item_errors is False).
+  """
+  if not bodies:
+    return []
+
+  logging.info("Batch API: Processing %d prompts", len(bodies))
+
+  display_base = f"langextract-batch-{int(time.time())}"
+
+  cache = None
+  owns_cache = False
+  if cfg.enable_caching and cfg.cache is not None:
+    cache = cfg.cache
+  elif cfg.enable_caching:
+    cache = batch_cache.SQLiteBatchCache(cfg.cache_path)
+    owns_cache = True
+  try:
+    cached_results: dict[int, str] = {}
+    if cache is not None:
+      # The request body holds the model, prompt and generation parameters.
+      cached_results = cache.get_multi(bodies)
+
+    items_to_process = [
+        (idx, body)
+        for idx, body in enumerate(bodies)
+        if idx not in cached_results
+    ]
+    if not items_to_process:
+      logging.info("Batch API: All %d prompts found in cache", len(bodies))
+      return [cached_results[i] for i in range(len(bodies))]
+
+    logging.info(
+        "Batch API: %d cached, %d to submit",
+        len(cached_results),
+        len(items_to_process),
+    )
+
+    def _process_batch(
+        batch_items: Sequence[tuple[int, dict]], display: str
+    ) -> dict[int, str]:
+      """Submit batch job, poll completion, and extract results.
+
+      Returns:
+        Dict mapping original index to result text.
+      """
+      job = _submit_file(
+          client,
+          [body for _, body in batch_items],
+          display,
+          cfg.retention_days,
+          endpoint,
+      )
+      if cfg.on_job_create:
+        try:
+          cfg.on_job_create(job)
+        except Exception as e:
+          logging.warning("Batch job creation callback failed: %s", e)
+      job = _poll_completion(client, job, cfg)
+      logging.info("Batch job completed successfully.")
+      results = _extract_results(
+          client, job, cfg, expected_count=len(batch_items)
+      )
+      return {
+          orig_idx: result
+          for (orig_idx, _), result in zip(batch_items, results)
+      }
+
+    new_results: dict[int, str] = {}
+    chunk_size = cfg.max_prompts_per_job
+    for chunk_num, i in enumerate(range(0, len(items_to_process), chunk_size)):
+      display = (
+          display_base
+          if len(items_to_process) <= chunk_size
+          else f"{display_base}-part-{chunk_num}"
+      )
+      new_results.update(
+          _process_batch(items_to_process[i : i + chunk_size], display)
+      )
+
+    if cache is not None:
+      # Empty results come from failed items; leave them to be retried.
+      cache.set_multi(
+          [(bodies[idx], text) for idx, text in new_results.items() if text]
+      )
+
+    return [
+        cached_results[i] if i in cached_results else new_results.get(i, "")
+        for i in range(len(bodies))
+    ]
+  finally:
+    if owns_cache:
+      cache.close()
@@ -62,3 +62,7 @@ OLLAMA_PATTERNS = (
     r'^WizardLM/',
 )
 OLLAMA_PRIORITY = 10
+
+# Record/replay provider patterns ("replay:<model_id>")
+REPLAY_PATTERNS = (r'^replay:',)
+REPLAY_PRIORITY = 20
@@ -0,0 +1,503 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Record/replay provider for offline, reproducible benchmarks.
+
+Model IDs of the form "replay:<model_id>" wrap <model_id>. In "record" mode
+every prompt is sent to the live model and its outputs and latency are
+appended to a JSONL recording, keyed by a hash of the model ID and prompt.
+In "replay" mode the recorded outputs are returned without any network
+access, after a simulated delay drawn from a latency distribution, with
+optional injected failures and a concurrency limit. Simulation is seeded per
+request, so a run is reproducible regardless of thread scheduling.
+
+Usage example:
+    # Record once against the live API.
+    lx.extract(..., model_id="replay:gemini-2.5-flash",
+               language_model_params={"recording_path": "rec.jsonl",
+                                      "mode": "record"})
+
+    # Replay in CI: lognormal latency, 2% 503s, at most 8 requests in flight.
+    lx.extract(..., model_id="replay:gemini-2.5-flash",
+               language_model_params={
+                   "recording_path": "rec.jsonl",
+                   "latency": {"distribution": "lognormal", "seconds": 1.2,
+                               "jitter": 0.4, "scale": 0.01},
+                   "failure_rate": 0.02,
+                   "max_concurrency": 8,
+               })
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+import dataclasses
+import json
+import math
+import os
+import pathlib
+import random
+import threading
+import time
+from typing import Any
+
+from absl import logging
+
+from langextract.core import base_model
+from langextract.core import exceptions
+from langextract.core import types as core_types
+from langextract.providers import batch_cache
+from langextract.providers import patterns
+from langextract.providers import router
+
+MODE_REPLAY = "replay"
+MODE_RECORD = "record"
+MODE_AUTO = "auto"
+_MODES = (MODE_REPLAY, MODE_RECORD, MODE_AUTO)
+
+_PREFIX = "replay:"
+_PROVIDER = "replay"
+_DEFAULT_MAX_WORKERS = 10
+_DISTRIBUTIONS = ("none", "constant", "uniform", "lognormal", "recorded")
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class LatencyModel:
+  """Distribution of simulated per-request latency.
+
+  Attributes:
+    distribution: "none" (no delay), "constant" (`seconds`), "uniform"
+      (`seconds` ± `jitter`), "lognormal" (median `seconds`, sigma `jitter`)
+      or "recorded" (the latency measured when the prompt was recorded).
+    seconds: Constant delay, uniform center or lognormal median.
+    jitter: Uniform half-width in seconds, or lognormal sigma.
+    scale: Multiplier applied to every sampled delay, e.g. 0.01 to run a
+      recording 100x faster while keeping its latency profile.
+  """
+
+  distribution: str = "recorded"
+  seconds: float = 0.0
+  jitter: float = 0.0
+  scale: float = 1.0
+
+  def __post_init__(self):
+    if self.distribution not in _DISTRIBUTIONS:
+      raise ValueError(
+          f"distribution must be one of {_DISTRIBUTIONS}, got"
+          f" {self.distribution!r}"
+      )
+    if self.seconds < 0 or self.jitter < 0 or self.scale < 0:
+      raise ValueError("seconds, jitter and scale must be non-negative")
+    if self.distribution == "lognormal" and self.seconds <= 0:
+      raise ValueError("lognormal latency requires seconds > 0")
+
+  @classmethod
+  def from_value(
+      cls, value: LatencyModel | float | Mapping[str, Any] | None
+  ) -> LatencyModel:
+    """Builds a LatencyModel from a float (constant seconds) or a dict."""
+    if value is None:
+      return cls()
+    if isinstance(value, LatencyModel):
+      return value
+    if isinstance(value, (int, float)):
+      return cls(distribution="constant", seconds=float(value))
+    return cls(**value)
+
+  def sample(self, rng: random.Random, recorded: float) -> float:
+    """Draws one delay in seconds.
+
+    Args:
+      rng: Random source for this request.
+      recorded: Latency measured when the prompt was recorded.
+
+    Returns:
+      The delay to simulate.
+    """
+    if self.distribution == "none":
+      delay = 0.0
+    elif self.distribution == "constant":
+      delay = self.seconds
+    elif self.distribution == "uniform":
+      delay = rng.uniform(self.seconds - self.jitter, self.seconds + self.jitter)
+    elif self.distribution == "lognormal":
+      delay = rng.lognormvariate(math.log(self.seconds), self.jitter)
+    else:
+      delay = recorded
+    return max(0.0, delay) * self.scale
+
+
+@dataclasses.dataclass
+class ReplayStats:
+  """Counters for a ReplayLanguageModel.
+
+  Attributes:
+    requests: Prompts received.
+    replayed: Prompts answered from the recording.
+    recorded: Prompts sent to the live model and recorded.
+    failures: Simulated failures raised.
+    rejected: Requests rejected because the concurrency limit was reached.
+    max_in_flight: Highest number of simulated requests running at once.
+    simulated_seconds: Total simulated latency.
+  """
+
+  requests: int = 0
+  replayed: int = 0
+  recorded: int = 0
+  failures: int = 0
+  rejected: int = 0
+  max_in_flight: int = 0
+  simulated_seconds: float = 0.0
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class _Recording:
+  outputs: tuple[core_types.ScoredOutput, ...]
+  seconds: float
+
+
+def _load(path: str) -> dict[str, _Recording]:
+  """Reads a recording file; later lines for the same key win."""
+  recordings: dict[str, _Recording] = {}
+  if not os.path.exists(path):
+    return recordings
+  with open(path, encoding="utf-8") as f:
+    for line_no, line in enumerate(f, 1):
+      if not line.strip():
+        continue
+      try:
+        item = json.loads(line)
+        recordings[item["key"]] = _Recording(
+            outputs=tuple(
+                core_types.ScoredOutput(score=o.get("score"), output=o["output"])
+                for o in item["outputs"]
+            ),
+            seconds=float(item.get("seconds", 0.0)),
+        )
+      except (ValueError, KeyError, TypeError) as e:
+        logging.warning("Skipping bad recording line %s:%d: %s", path, line_no, e)
+  return recordings
+
+
+@router.register(
+    *patterns.REPLAY_PATTERNS,
+    priority=patterns.REPLAY_PRIORITY,
+)
+class ReplayLanguageModel(base_model.BaseLanguageModel):
+  """Records live model outputs and replays them with simulated latency.
+
+  Modes:
+    "replay": answer from the recording only; a missing prompt raises
+      InferenceRuntimeError.
+    "record": send every prompt to the live model and (re)record it.
+    "auto": replay recorded prompts and record the rest.
+
+  Simulated latency, failures and the concurrency limit apply to replayed
+  prompts only; recorded prompts take as long as the live call.
+
+  Schema constraints come from the wrapped model ID's provider (see
+  wrapped_provider_class), and schema and fence settings are forwarded to
+  the live model when there is one: in "record" mode, or when live_model is
+  passed. Otherwise fence output follows the stored schema, so pass
+  fence_output explicitly if the live model decides it differently (as
+  OpenAI's JSON mode does), to keep replayed prompts identical to the
+  recorded ones.
+
+  Attributes:
+    model_id: The wrapped model ID (without the "replay:" prefix).
+    recording_path: JSONL file holding the recording.
+    mode: One of "replay", "record" or "auto".
+    latency: Distribution of simulated latency.
+    failure_rate: Probability that a replayed request fails.
+    failure_status: HTTP status code carried by simulated failures.
+    max_concurrency: Maximum simulated requests in flight, or None.
+    reject_over_limit: Fail with status 429 instead of waiting when
+      max_concurrency requests are already in flight.
+    max_workers: Prompts of a batch processed in parallel.
+    stats: Counters since construction.
+  """
+
+  def __init__(
+      self,
+      model_id: str,
+      recording_path: str | os.PathLike[str],
+      mode: str = MODE_REPLAY,
+      *,
+      latency: LatencyModel | float | Mapping[str, Any] | None = None,
+      failure_rate: float = 0.0,
+      failure_status: int = 503,
+      max_concurrency: int | None = None,
+      reject_over_limit: bool = False,
+      seed: int = 0,
+      max_workers: int = _DEFAULT_MAX_WORKERS,
+      live_model: base_model.BaseLanguageModel | None = None,
+      **kwargs,
+  ) -> None:
+    """Initializes the replay model.
+
+    Args:
+      model_id: "replay:<model_id>" or the wrapped model ID itself.
+      recording_path: JSONL recording file. Created when recording.
+      mode: "replay", "record" or "auto".
+      latency: LatencyModel, constant seconds, or a dict of LatencyModel
+        fields. Defaults to the recorded latency.
+      failure_rate: Probability in [0, 1] that a replayed request raises
+        InferenceRuntimeError.
+      failure_status: Status code set on simulated failures, so retry
+        middleware treats them like real provider errors.
+      max_concurrency: Maximum simulated requests in flight at once.
+      reject_over_limit: Raise a 429 error instead of waiting for a slot.
+      seed: Seed for latency and failure sampling.
+      max_workers: Prompts of a batch processed in parallel.
+      live_model: Model used for recording. Defaults to one created from the
+        wrapped model ID with the remaining kwargs.
+      **kwargs: Passed to the live model when it is created here.
+    """
+    if mode not in _MODES:
+      raise exceptions.InferenceConfigError(
+          f"mode must be one of {_MODES}, got {mode!r}"
+      )
+    if not 0.0 <= failure_rate <= 1.0:
+      raise exceptions.InferenceConfigError(
+          f"failure_rate must be in [0, 1], got {failure_rate}"
+      )
+    if max_concurrency is not None and max_concurrency < 1:
+      raise exceptions.InferenceConfigError(
+          f"max_concurrency must be positive, got {max_concurrency}"
+      )
+    if max_workers < 1:
+      raise exceptions.InferenceConfigError(
+          f"max_workers must be positive, got {max_workers}"
+      )
+    try:
+      self.latency = LatencyModel.from_value(latency)
+    except (TypeError, ValueError) as e:
+      raise exceptions.InferenceConfigError(f"Invalid latency: {e}") from e
+
+    super().__init__()
+    self.model_id = model_id.removeprefix(_PREFIX)
+    self.recording_path = os.path.expanduser(os.fspath(recording_path))
+    self.mode = mode
+    self.failure_rate = failure_rate
+    self.failure_status = failure_status
+    self.max_concurrency = max_concurrency
+    self.reject_over_limit = reject_over_limit
+    self.max_workers = max_workers
+    self.stats = ReplayStats()
+    self._seed = seed
+    self._live_model = live_model
+    self._owns_live_model = live_model is None
+    self._live_kwargs = kwargs
+    self._lock = threading.Lock()
+    self._live_lock = threading.Lock()
+    self._slots = (
+        threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+    )
+    self._in_flight = 0
+    self._occurrences: dict[str, int] = {}
+    self._recordings = _load(self.recording_path)
+    if mode == MODE_REPLAY and not self._recordings:
+      logging.warning("Recording %s is empty or missing", self.recording_path)
+
+  def __repr__(self) -> str:
+    return (
+        f"{type(self).__name__}(model_id={self.model_id!r},"
+        f" recording_path={self.recording_path!r}, mode={self.mode!r})"
+    )
+
+  @classmethod
+  def wrapped_provider_class(
+      cls, model_id: str
+  ) -> type[base_model.BaseLanguageModel]:
+    """Returns the provider class of the model ID wrapped by model_id.
+
+    The factory uses it to build schema constraints for the wrapped model.
+
+    Args:
+      model_id: "replay:<model_id>" or the wrapped model ID itself.
+    """
+    return router.resolve(model_id.removeprefix(_PREFIX))
+
+  def _forward_target(self) -> base_model.BaseLanguageModel | None:
+    """Returns the live model that settings are forwarded to, if any."""
+    if self._live_model is None and self.mode != MODE_RECORD:
+      return None
+    return self._get_live_model()
+
+  def apply_schema(self, schema_instance) -> None:
+    super().apply_schema(schema_instance)
+    live = self._forward_target()
+    if live is not None:
+      live.apply_schema(schema_instance)
+
+  def set_fence_output(self, fence_output: bool | None) -> None:
+    super().set_fence_output(fence_output)
+    live = self._forward_target()
+    if live is not None:
+      live.set_fence_output(fence_output)
+
+  @property
+  def requires_fence_output(self) -> bool:
+    live = self._forward_target()
+    if live is None:
+      return super().requires_fence_output
+    return live.requires_fence_output
+
+  def close(self) -> None:
+    """Closes the live model, if this instance created it."""
+    if self._owns_live_model and self._live_model is not None:
+      self._live_model.close()
+      self._live_model = None
+    super().close()
+
+  def _get_live_model(self) -> base_model.BaseLanguageModel:
+    """Returns the live model, creating it from the wrapped ID on first use."""
+    with self._live_lock:
+      if self._live_model is None:
+        # Imported here because factory imports the provider registry.
+        from langextract import factory  # pylint: disable=import-outside-toplevel
+
+        live_model = factory.create_model(
+            factory.ModelConfig(
+                model_id=self.model_id, provider_kwargs=self._live_kwargs
+            )
+        )
+        live_model.apply_schema(self.schema)
+        live_model.set_fence_output(self._fence_output_override)
+        self._live_model = live_model
+      return self._live_model
+
+  def _key(self, prompt: str) -> str:
+    return batch_cache.compute_hash({"model_id": self.model_id, "prompt": prompt})
+
+  def _record(
+      self,
+      key: str,
+      prompt: str,
+      outputs: Sequence[core_types.ScoredOutput],
+      seconds: float,
+  ) -> None:
+    """Stores one live result in memory and appends it to the file."""
+    recording = _Recording(outputs=tuple(outputs), seconds=seconds)
+    line = json.dumps(
+        {
+            "key": key,
+            "model_id": self.model_id,
+            "prompt": prompt,
+            "outputs": [
+                {"score": o.score, "output": o.output} for o in outputs
+            ],
+            "seconds": seconds,
+        },
+        ensure_ascii=False,
+    )
+    with self._lock:
+      self._recordings[key] = recording
+      pathlib.Path(self.recording_path).parent.mkdir(
+          parents=True, exist_ok=True
+      )
+      with open(self.recording_path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+      self.stats.recorded += 1
+
+  def _live(self, key: str, prompt: str, kwargs: dict[str, Any]):
+    start = time.perf_counter()
+    outputs = list(next(iter(self._get_live_model().infer([prompt], **kwargs))))
+    self._record(key, prompt, outputs, time.perf_counter() - start)
+    return outputs
+
+  def _rng(self, key: str) -> random.Random:
+    """Returns a random source determined by the prompt and its repeat count."""
+    with self._lock:
+      occurrence = self._occurrences.get(key, 0)
+      self._occurrences[key] = occurrence + 1
+    return random.Random(f"{self._seed}:{key}:{occurrence}")
+
+  def _acquire_slot(self) -> None:
+    if self._slots is None:
+      return
+    if self._slots.acquire(blocking=not self.reject_over_limit):
+      return
+    with self._lock:
+      self.stats.rejected += 1
+    raise exceptions.InferenceRuntimeError(
+        f"Simulated rate limit: {self.max_concurrency} requests in flight",
+        provider=_PROVIDER,
+        status_code=429,
+    )
+
+  def _replay(self, key: str, recording: _Recording):
+    rng = self._rng(key)
+    delay = self.latency.sample(rng, recording.seconds)
+    fail = rng.random() < self.failure_rate
+    self._acquire_slot()
+    try:
+      with self._lock:
+        self._in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+        self.stats.simulated_seconds += delay
+      if delay:
+        time.sleep(delay)
+    finally:
+      with self._lock:
+        self._in_flight -= 1
+      if self._slots is not None:
+        self._slots.release()
+    if fail:
+      with self._lock:
+        self.stats.failures += 1
+      raise exceptions.InferenceRuntimeError(
+          "Simulated provider failure",
+          provider=_PROVIDER,
+          status_code=self.failure_status,
+      )
+    with self._lock:
+      self.stats.replayed += 1
+    return list(recording.outputs)
+
+  def _one(self, prompt: str, kwargs: dict[str, Any]):
+    key = self._key(prompt)
+    with self._lock:
+      self.stats.requests += 1
+      recording = (
+          None if self.mode == MODE_RECORD else self._recordings.get(key)
+      )
+    if recording is not None:
+      return self._replay(key, recording)
+    if self.mode == MODE_REPLAY:
+      raise exceptions.InferenceRuntimeError(
+          f"No recording for prompt {key[:12]} in {self.recording_path};"
+          " record it with mode='record' or 'auto'",
+          provider=_PROVIDER,
+      )
+    return self._live(key, prompt, kwargs)
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
+    """Answers prompts from the recording or the live model.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Passed to the live model when recording.
+
+    Yields:
+      Lists of ScoredOutputs, in prompt order.
+    """
+    merged_kwargs = self.merge_kwargs(kwargs)
+    yield from self._map_ordered(
+        lambda prompt: self._one(prompt, merged_kwargs),
+        batch_prompts,
+        self.max_workers,
+    )
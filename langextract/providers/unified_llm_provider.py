@@ -26,10 +26,12 @@ from datetime import datetime
 
 try:
   from langextract.core import biomarker_models as bm
+  from langextract.core import rate_limit as rate_limit_lib
 except ImportError:
   import sys
   sys.path.append('..')
   from langextract.core import biomarker_models as bm
+  from langextract.core import rate_limit as rate_limit_lib
 
 
 class UnifiedLLMProvider:
@@ -79,7 +81,10 @@ class UnifiedLLMProvider:
       model: Optional[str] = None,
       api_key: Optional[str] = None,
       temperature: float = 0.1,
-      max_tokens: int = 4000
+      max_tokens: int = 4000,
+      rate_limit: Optional[
+          rate_limit_lib.RateLimit | rate_limit_lib.RateLimiter
+      ] = None
   ):
     """Initialize unified LLM provider.
     
@@ -90,6 +95,10 @@ class UnifiedLLMProvider:
       api_key: API key for the service.
       temperature: Sampling temperature.
       max_tokens: Maximum tokens to generate.
+      rate_limit: Client-side request/token limits, or a RateLimiter to
+            share. Providers with equal limits for the same model share one
+            limiter. Defaults to any limiter registered with
+            rate_limit.configure() for this provider.
     """
     self.provider = provider.lower()
     
@@ -131,6 +140,10 @@ class UnifiedLLMProvider:
     if not self.api_key and self.provider != "ollama":
       raise ValueError(f"API key required for {provider}")
     
+    self.rate_limiter = rate_limit_lib.limiter_for(
+        self.provider, self.model_id, rate_limit
+    )
+    
     self.session = requests.Session()
     if self.api_key and self.provider != "gemini":
       self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
@@ -214,14 +227,20 @@ Respond ONLY with valid JSON in this exact format:
           "X-Title": "BiomarkerExtract"
       })
     
-    response = self.session.post(
-        f"{self.api_base}/chat/completions",
-        json=payload,
-        timeout=60
-    )
-    
-    response.raise_for_status()
+    tokens = rate_limit_lib.estimate_tokens(prompt, self.max_tokens)
+    with rate_limit_lib.limited(self.rate_limiter, tokens):
+      response = self.session.post(
+          f"{self.api_base}/chat/completions",
+          json=payload,
+          timeout=60
+      )
+      response.raise_for_status()
     result = response.json()
+    rate_limit_lib.reconcile_usage(
+        self.rate_limiter,
+        tokens,
+        (result.get("usage") or {}).get("total_tokens")
+    )
     
     content = result["choices"][0]["message"]["content"]
     
@@ -257,15 +276,23 @@ Respond ONLY with valid JSON in this exact format:
         "content-type": "application/json"
     }
     
-    response = requests.post(
-        f"{self.api_base}/messages",
-        json=payload,
-        headers=headers,
-        timeout=60
-    )
-    
-    response.raise_for_status()
+    tokens = rate_limit_lib.estimate_tokens(prompt, self.max_tokens)
+    with rate_limit_lib.limited(self.rate_limiter, tokens):
+      response = requests.post(
+          f"{self.api_base}/messages",
+          json=payload,
+          headers=headers,
+          timeout=60
+      )
+      response.raise_for_status()
     result = response.json()
+    usage = result.get("usage") or {}
+    if "input_tokens" in usage and "output_tokens" in usage:
+      rate_limit_lib.reconcile_usage(
+          self.rate_limiter,
+          tokens,
+          usage["input_tokens"] + usage["output_tokens"]
+      )
     
     content = result["content"][0]["text"]
     
@@ -299,9 +326,16 @@ Respond ONLY with valid JSON in this exact format:
         }
     }
     
-    response = requests.post(url, json=payload, timeout=60)
-    response.raise_for_status()
+    tokens = rate_limit_lib.estimate_tokens(prompt, self.max_tokens)
+    with rate_limit_lib.limited(self.rate_limiter, tokens):
+      response = requests.post(url, json=payload, timeout=60)
+      response.raise_for_status()
     result = response.json()
+    rate_limit_lib.reconcile_usage(
+        self.rate_limiter,
+        tokens,
+        (result.get("usageMetadata") or {}).get("totalTokenCount")
+    )
     
     content = result["candidates"][0]["content"]["parts"][0]["text"]
     
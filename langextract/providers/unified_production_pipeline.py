@@ -27,16 +27,23 @@ from tqdm import tqdm
 
 try:
   from langextract.core import biomarker_models as bm
+  from langextract.core import rate_limit as rate_limit_lib
   from langextract.literature import batch_processor
   from langextract.providers import unified_llm_provider as ullm
 except ImportError:
   import sys
   sys.path.append('..')
   from langextract.core import biomarker_models as bm
+  from langextract.core import rate_limit as rate_limit_lib
   from langextract.literature import batch_processor
   from langextract.providers import unified_llm_provider as ullm
 
 
+# Matches the previous fixed 0.5 s pause between extraction calls; the limiter
+# additionally backs off on 429 responses.
+DEFAULT_LLM_RATE_LIMIT = rate_limit_lib.RateLimit(requests_per_minute=120)
+
+
 class UnifiedProductionPipeline:
   """Complete production pipeline with all LLM providers."""
   
@@ -47,7 +54,11 @@ class UnifiedProductionPipeline:
       llm_model: Optional[str] = None,
       llm_api_key: Optional[str] = None,
       pubmed_api_key: Optional[str] = None,
-      output_dir: str = "pipeline_results"
+      output_dir: str = "pipeline_results",
+      llm_rate_limit: Optional[
+          rate_limit_lib.RateLimit | rate_limit_lib.RateLimiter
+      ] = DEFAULT_LLM_RATE_LIMIT,
+      metadata_cache_path: Optional[str] = None
   ):
     """Initialize production pipeline.
     
@@ -58,6 +69,12 @@ class UnifiedProductionPipeline:
       llm_api_key: API key for LLM service.
       pubmed_api_key: Optional PubMed API key.
       output_dir: Directory for output files.
+      llm_rate_limit: Client-side limits for LLM calls. Set them to the
+            provider's published RPM/TPM to run at its ceiling, or pass None
+            to disable pacing.
+      metadata_cache_path: Optional SQLite file caching paper metadata
+            between runs, so literature searches only download papers not
+            fetched recently.
     """
     self.pubmed_email = pubmed_email
     self.pubmed_api_key = pubmed_api_key
@@ -65,13 +82,15 @@ class UnifiedProductionPipeline:
     self.literature_processor = batch_processor.LiteratureBatchProcessor(
         pubmed_email=pubmed_email,
         pubmed_api_key=pubmed_api_key,
-        max_workers=5
+        max_workers=5,
+        metadata_cache_path=metadata_cache_path
     )
     
     self.llm_provider = ullm.UnifiedLLMProvider(
         provider=llm_provider,
         model=llm_model,
-        api_key=llm_api_key
+        api_key=llm_api_key,
+        rate_limit=llm_rate_limit
     )
     
     self.output_dir = Path(output_dir)
@@ -213,8 +232,6 @@ class UnifiedProductionPipeline:
         
         self.results["biomarkers_extracted"] += len(extraction.entities)
         
-        time.sleep(0.5)
-        
       except Exception as e:
         print(f"Error extracting from paper {paper.metadata.pmid}: {e}")
         continue
@@ -341,7 +358,8 @@ def run_pipeline(
     provider: str = "openrouter",
     model: Optional[str] = None,
     api_key: Optional[str] = None,
-    max_papers: int = 10
+    max_papers: int = 10,
+    metadata_cache_path: Optional[str] = None
 ) -> Dict:
   """Run complete production pipeline.
   
@@ -352,6 +370,7 @@ def run_pipeline(
     model: Model name. If None, uses latest default.
     api_key: LLM API key.
     max_papers: Max papers per term.
+    metadata_cache_path: Optional SQLite file caching paper metadata.
   
   Returns:
     Pipeline results.
@@ -360,7 +379,8 @@ def run_pipeline(
       pubmed_email=pubmed_email,
       llm_provider=provider,
       llm_model=model,
-      llm_api_key=api_key
+      llm_api_key=api_key,
+      metadata_cache_path=metadata_cache_path
   )
   
   return pipeline.run_complete_pipeline(
@@ -379,6 +399,7 @@ if __name__ == "__main__":
   parser.add_argument("--model", help="LLM model (optional, uses latest default)")
   parser.add_argument("--api-key", help="LLM API key")
   parser.add_argument("--max-papers", type=int, default=10, help="Max papers per term")
+  parser.add_argument("--metadata-cache", help="SQLite file caching paper metadata between runs")
   
   args = parser.parse_args()
   
@@ -388,5 +409,6 @@ if __name__ == "__main__":
       provider=args.provider,
       model=args.model,
       api_key=args.api_key,
-      max_papers=args.max_papers
+      max_papers=args.max_papers,
+      metadata_cache_path=args.metadata_cache
   )
@@ -0,0 +1,779 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retry, circuit breaking and request hedging for language models.
+
+ResilientLanguageModel wraps any BaseLanguageModel and sends each prompt of
+a batch as its own request, so that:
+
+- transient failures (timeouts, connection resets, 408/429/5xx) are retried
+  with exponential backoff and full jitter, honouring Retry-After;
+- a shared CircuitBreaker stops sending requests for a while after repeated
+  transient failures, instead of letting every prompt time out;
+- with a HedgePolicy, a duplicate request is sent for any prompt still
+  running after the observed p95 latency, and the first answer wins;
+- a prompt that still fails on a transient error once retries are
+  exhausted yields an empty FailedOutput rather than discarding the other
+  prompts' results (isolate_failures). Configuration and other permanent
+  errors, and an open circuit breaker, are always raised.
+
+Usage example:
+    model = ResilientLanguageModel(
+        model, ResilienceConfig(hedge=HedgePolicy(quantile=0.95))
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+from collections.abc import Iterator, Mapping, Sequence
+import concurrent.futures
+import dataclasses
+import random
+import threading
+import time
+from typing import Any, Callable
+
+from absl import logging
+import aiohttp
+import requests
+
+from langextract.core import base_model
+from langextract.core import exceptions
+from langextract.core import rate_limit
+from langextract.core import types
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FailedOutput",
+    "HedgePolicy",
+    "PromptFailure",
+    "ResilienceConfig",
+    "ResilienceStats",
+    "ResilientLanguageModel",
+    "RetryPolicy",
+    "is_transient_error",
+]
+
+# Statuses worth retrying: timeouts, rate limits and server-side failures.
+_TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Transient error classes of optional client libraries (openai, httpx),
+# matched by name so that those libraries need not be imported.
+_TRANSIENT_ERROR_NAMES = frozenset({
+    "APIConnectionError",
+    "APITimeoutError",
+    "InternalServerError",
+    "TimeoutException",
+    "TransportError",
+})
+
+_TRANSIENT_ERROR_TYPES = (
+    TimeoutError,
+    ConnectionError,
+    asyncio.TimeoutError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ServerTimeoutError,
+)
+
+
+class CircuitOpenError(exceptions.InferenceRuntimeError):
+  """Raised instead of sending a request while the circuit breaker is open."""
+
+
+def is_transient_error(error: BaseException) -> bool:
+  """Whether a failed call is worth retrying.
+
+  Configuration errors are never transient. Otherwise error, or an error it
+  wraps, must be a timeout or connection failure or carry a 408, 425, 429 or
+  5xx status code.
+
+  Args:
+    error: Exception raised by a provider call.
+
+  Returns:
+    True if the same request may succeed when retried.
+  """
+  if isinstance(error, (exceptions.InferenceConfigError, CircuitOpenError)):
+    return False
+  status = rate_limit.error_status_code(error)
+  if status is not None:
+    return status in _TRANSIENT_STATUS_CODES
+  current: BaseException | None = error
+  seen = set()
+  while current is not None and id(current) not in seen:
+    seen.add(id(current))
+    if isinstance(current, _TRANSIENT_ERROR_TYPES):
+      return True
+    if any(
+        cls.__name__ in _TRANSIENT_ERROR_NAMES for cls in type(current).__mro__
+    ):
+      return True
+    current = getattr(current, "original", None) or current.__cause__
+  return False
+
+
+@dataclasses.dataclass(frozen=True)
+class RetryPolicy:
+  """Exponential backoff with full jitter.
+
+  Attributes:
+    max_attempts: Total attempts per prompt, including the first.
+    initial_backoff: Upper bound of the first delay, in seconds.
+    max_backoff: Cap on the delay bound, in seconds.
+    multiplier: Growth of the delay bound per attempt.
+  """
+
+  max_attempts: int = 4
+  initial_backoff: float = 0.5
+  max_backoff: float = 30.0
+  multiplier: float = 2.0
+
+  def __post_init__(self):
+    if self.max_attempts < 1:
+      raise ValueError(
+          f"max_attempts must be at least 1, got {self.max_attempts}"
+      )
+
+  def backoff(
+      self,
+      attempt: int,
+      retry_after: float | None = None,
+      rng: random.Random | None = None,
+  ) -> float:
+    """Returns the delay before retry number attempt (starting at 0).
+
+    Args:
+      attempt: Zero-based index of the failed attempt.
+      retry_after: Delay the server asked for, used as a lower bound.
+      rng: Random source, for tests.
+
+    Returns:
+      Seconds to sleep.
+    """
+    bound = min(
+        self.max_backoff, self.initial_backoff * self.multiplier**attempt
+    )
+    delay = (rng or random).uniform(0, bound)
+    if retry_after is not None:
+      delay = max(delay, retry_after)
+    return delay
+
+
+@dataclasses.dataclass(frozen=True)
+class HedgePolicy:
+  """When to send a duplicate request for a slow prompt.
+
+  Attributes:
+    quantile: Latency quantile of recent successful calls after which a
+      prompt is hedged.
+    min_samples: Calls to observe before hedging on the quantile.
+    window: Number of recent latencies kept.
+    delay: Fixed hedge delay in seconds. Overrides the quantile when set.
+    min_delay: Lower bound on the hedge delay, in seconds.
+  """
+
+  quantile: float = 0.95
+  min_samples: int = 20
+  window: int = 200
+  delay: float | None = None
+  min_delay: float = 0.0
+
+  def __post_init__(self):
+    if not 0 < self.quantile < 1:
+      raise ValueError(f"quantile must be in (0, 1), got {self.quantile}")
+
+
+@dataclasses.dataclass(frozen=True)
+class ResilienceConfig:
+  """Settings for ResilientLanguageModel.
+
+  Attributes:
+    retry: Retry policy, or None to disable retries.
+    hedge: Hedging policy, or None to disable hedging.
+    failure_threshold: Consecutive transient failures that open the circuit
+      breaker. None disables the breaker.
+    reset_timeout: Seconds the breaker stays open before letting a probe
+      request through.
+    isolate_failures: Yield an empty FailedOutput for a prompt that still
+      fails on a transient error after retries, instead of raising and
+      losing the rest of the batch. Non-transient errors, such as an invalid
+      API key, and CircuitOpenError are raised regardless, since every
+      other prompt would fail the same way.
+  """
+
+  retry: RetryPolicy | None = RetryPolicy()
+  hedge: HedgePolicy | None = None
+  failure_threshold: int | None = 5
+  reset_timeout: float = 30.0
+  isolate_failures: bool = True
+
+
+class CircuitBreaker:
+  """Consecutive-failure circuit breaker.
+
+  Closed: requests flow. After failure_threshold consecutive failures the
+  breaker opens and rejects requests for reset_timeout seconds. It then lets
+  a single probe through (half-open); the probe's outcome closes or reopens
+  it. Thread-safe, and may be shared by several models hitting one endpoint.
+  """
+
+  def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+    """Initializes a closed breaker.
+
+    Args:
+      failure_threshold: Consecutive failures that open the breaker.
+      reset_timeout: Seconds to stay open before probing.
+    """
+    if failure_threshold < 1:
+      raise ValueError(
+          f"failure_threshold must be at least 1, got {failure_threshold}"
+      )
+    self.failure_threshold = failure_threshold
+    self.reset_timeout = reset_timeout
+    self._lock = threading.Lock()
+    self._failures = 0
+    self._opened_at: float | None = None
+    self._probing = False
+
+  @property
+  def state(self) -> str:
+    """"closed", "open" or "half_open"."""
+    with self._lock:
+      if self._opened_at is None:
+        return "closed"
+      if time.monotonic() - self._opened_at >= self.reset_timeout:
+        return "half_open"
+      return "open"
+
+  def before_call(self) -> None:
+    """Admits a request or raises CircuitOpenError."""
+    with self._lock:
+      if self._opened_at is None:
+        return
+      remaining = self._opened_at + self.reset_timeout - time.monotonic()
+      if remaining <= 0 and not self._probing:
+        self._probing = True
+        return
+    raise CircuitOpenError(
+        "Circuit breaker open after repeated failures; retry in"
+        f" {max(remaining, 0):.1f}s"
+    )
+
+  def record_success(self) -> None:
+    with self._lock:
+      self._failures = 0
+      self._opened_at = None
+      self._probing = False
+
+  def record_failure(self) -> None:
+    with self._lock:
+      self._failures += 1
+      if self._probing or self._failures >= self.failure_threshold:
+        if self._opened_at is None or self._probing:
+          logging.warning(
+              "Opening circuit breaker after %d consecutive failures.",
+              self._failures,
+          )
+        self._opened_at = time.monotonic()
+        self._probing = False
+
+
+@dataclasses.dataclass(frozen=True)
+class PromptFailure:
+  """A prompt that failed after all retries.
+
+  Attributes:
+    prompt: The prompt text.
+    error: The last error raised for it.
+    attempts: Number of requests sent.
+  """
+
+  prompt: str
+  error: BaseException
+  attempts: int
+
+
+class FailedOutput(list):
+  """Empty outputs yielded in place of a prompt that failed after retries.
+
+  It behaves as an empty list of ScoredOutputs, but lets the annotator tell
+  a deliberately isolated failure apart from a model that returned nothing.
+
+  Attributes:
+    failure: The recorded failure.
+  """
+
+  def __init__(self, failure: PromptFailure):
+    super().__init__()
+    self.failure = failure
+
+
+@dataclasses.dataclass
+class ResilienceStats:
+  """Counters for a ResilientLanguageModel."""
+
+  calls: int = 0
+  retries: int = 0
+  hedges: int = 0
+  hedge_wins: int = 0
+  failures: int = 0
+  short_circuited: int = 0
+
+
+class _LatencyTracker:
+  """Sliding window of call latencies with a quantile lookup."""
+
+  def __init__(self, window: int):
+    self._lock = threading.Lock()
+    self._latencies: collections.deque[float] = collections.deque(
+        maxlen=window
+    )
+
+  def add(self, seconds: float) -> None:
+    with self._lock:
+      self._latencies.append(seconds)
+
+  def quantile(self, q: float, min_samples: int) -> float | None:
+    with self._lock:
+      if len(self._latencies) < max(min_samples, 1):
+        return None
+      ordered = sorted(self._latencies)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class ResilientLanguageModel(base_model.BaseLanguageModel):
+  """Wraps a language model with retries, a circuit breaker and hedging.
+
+  Each prompt is sent to the wrapped model as a single-prompt batch, on a
+  long-lived pool of max_workers threads, so one prompt's failure or slowness
+  does not hold up the others. A batch the wrapped model would route to a
+  batch-job API (its _use_batch_api() returns True, as for Gemini and OpenAI
+  batch mode) is passed through whole instead, with retries and the breaker
+  applied to the batch and no hedging. Schema, fence and other attribute
+  lookups are delegated to the wrapped model.
+
+  Attributes:
+    model: The wrapped model.
+    config: The active settings.
+    circuit_breaker: The breaker in use, or None.
+    stats: Counters since construction.
+    failures: Prompts that failed after all retries, when isolate_failures is
+      set.
+  """
+
+  def __init__(
+      self,
+      model: base_model.BaseLanguageModel,
+      config: ResilienceConfig | None = None,
+      *,
+      circuit_breaker: CircuitBreaker | None = None,
+      max_workers: int | None = None,
+  ):
+    """Initializes the wrapper.
+
+    Args:
+      model: The language model to wrap.
+      config: Retry, hedging and breaker settings. Defaults to
+        ResilienceConfig().
+      circuit_breaker: Breaker to share with other models. Defaults to a new
+        one built from config, if config enables it.
+      max_workers: Prompts in flight at once. Defaults to the wrapped model's
+        max_workers, or 10.
+    """
+    super().__init__()
+    self.model = model
+    self.config = config or ResilienceConfig()
+    if circuit_breaker is None and self.config.failure_threshold is not None:
+      circuit_breaker = CircuitBreaker(
+          self.config.failure_threshold, self.config.reset_timeout
+      )
+    self.circuit_breaker = circuit_breaker
+    self.max_workers = max_workers or getattr(model, "max_workers", None) or 10
+    self.stats = ResilienceStats()
+    self.failures: list[PromptFailure] = []
+    self._lock = threading.Lock()
+    self._hedge_executor: concurrent.futures.ThreadPoolExecutor | None = None
+    self._latencies = _LatencyTracker(
+        self.config.hedge.window if self.config.hedge else 1
+    )
+
+  def __getattr__(self, name: str) -> Any:
+    # Only called for attributes not found on the wrapper itself.
+    if name == "model":
+      raise AttributeError(name)
+    return getattr(self.model, name)
+
+  @property
+  def schema(self):
+    return self.model.schema
+
+  def apply_schema(self, schema_instance) -> None:
+    self.model.apply_schema(schema_instance)
+
+  def set_fence_output(self, fence_output: bool | None) -> None:
+    self.model.set_fence_output(fence_output)
+
+  @property
+  def requires_fence_output(self) -> bool:
+    return self.model.requires_fence_output
+
+  def merge_kwargs(
+      self, runtime_kwargs: Mapping[str, Any] | None = None
+  ) -> dict[str, Any]:
+    return self.model.merge_kwargs(runtime_kwargs)
+
+  def parse_output(self, output: str) -> Any:
+    return self.model.parse_output(output)
+
+  def _count(self, field: str) -> None:
+    with self._lock:
+      setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+  def _hedge_delay(self) -> float | None:
+    hedge = self.config.hedge
+    if hedge is None:
+      return None
+    delay = hedge.delay
+    if delay is None:
+      delay = self._latencies.quantile(hedge.quantile, hedge.min_samples)
+      if delay is None:
+        return None
+    return max(delay, hedge.min_delay)
+
+  def _before_attempt(self) -> None:
+    if self.circuit_breaker is not None:
+      try:
+        self.circuit_breaker.before_call()
+      except CircuitOpenError:
+        self._count("short_circuited")
+        raise
+    self._count("calls")
+
+  def _after_attempt(self, error: BaseException | None) -> None:
+    if self.circuit_breaker is None:
+      return
+    # Any answer from the server, even a rejection, shows it is reachable.
+    if error is not None and is_transient_error(error):
+      self.circuit_breaker.record_failure()
+    else:
+      self.circuit_breaker.record_success()
+
+  def _retry_delay(self, attempt: int, error: BaseException) -> float | None:
+    """Returns the delay before the next attempt, or None to give up."""
+    retry = self.config.retry
+    if (
+        retry is None
+        or attempt + 1 >= retry.max_attempts
+        or not is_transient_error(error)
+    ):
+      return None
+    self._count("retries")
+    return retry.backoff(attempt, rate_limit.retry_after_seconds(error))
+
+  def _failed(
+      self, prompt: str, error: BaseException, attempts: int
+  ) -> FailedOutput:
+    """Isolates a transient failure, or raises any other one."""
+    if not self.config.isolate_failures or not is_transient_error(error):
+      if isinstance(
+          error,
+          (exceptions.InferenceConfigError, exceptions.InferenceRuntimeError),
+      ):
+        raise error
+      raise exceptions.InferenceRuntimeError(
+          f"Inference failed after {attempts} attempt(s): {error}",
+          original=error,
+      ) from error
+    logging.warning(
+        "Prompt failed after %d attempt(s), continuing without it: %s",
+        attempts,
+        error,
+    )
+    failure = PromptFailure(prompt, error, attempts)
+    with self._lock:
+      self.stats.failures += 1
+      self.failures.append(failure)
+    return FailedOutput(failure)
+
+  def _call(self, prompt: str, kwargs: dict[str, Any]) -> list[Any]:
+    """Sends one prompt to the wrapped model and records its latency."""
+    start = time.monotonic()
+    outputs = list(self.model.infer([prompt], **kwargs))
+    self._latencies.add(time.monotonic() - start)
+    return list(outputs[0]) if outputs else []
+
+  def _hedged_call(
+      self,
+      prompt: str,
+      kwargs: dict[str, Any],
+      executor: concurrent.futures.Executor | None,
+  ) -> list[Any]:
+    """Runs _call, racing a duplicate if it outlasts the hedge delay."""
+    delay = self._hedge_delay()
+    if delay is None or executor is None:
+      return self._call(prompt, kwargs)
+    primary = executor.submit(self._call, prompt, kwargs)
+    done, _ = concurrent.futures.wait([primary], timeout=delay)
+    if done:
+      return primary.result()
+    self._count("hedges")
+    hedge = executor.submit(self._call, prompt, kwargs)
+    pending = {primary, hedge}
+    error: BaseException | None = None
+    while pending:
+      done, pending = concurrent.futures.wait(
+          pending, return_when=concurrent.futures.FIRST_COMPLETED
+      )
+      for future in done:
+        if future.exception() is None:
+          if future is hedge:
+            self._count("hedge_wins")
+          return future.result()
+        error = error or future.exception()
+    assert error is not None
+    raise error
+
+  def _run_prompt(
+      self,
+      prompt: str,
+      kwargs: dict[str, Any],
+      executor: concurrent.futures.Executor | None,
+  ) -> list[Any]:
+    attempt = 0
+    while True:
+      try:
+        self._before_attempt()
+      except CircuitOpenError as e:
+        return self._failed(prompt, e, attempt)
+      try:
+        result = self._hedged_call(prompt, kwargs, executor)
+      except Exception as e:  # pylint: disable=broad-exception-caught
+        self._after_attempt(e)
+        delay = self._retry_delay(attempt, e)
+        if delay is None:
+          return self._failed(prompt, e, attempt + 1)
+        time.sleep(delay)
+        attempt += 1
+        continue
+      self._after_attempt(None)
+      return result
+
+  def _uses_batch_api(self, batch_prompts: Sequence[str]) -> bool:
+    """Whether the wrapped model would send this batch as a batch job."""
+    use_batch_api = getattr(self.model, "_use_batch_api", None)
+    return bool(use_batch_api is not None and use_batch_api(batch_prompts))
+
+  def _run_batch(
+      self, batch_prompts: Sequence[str], kwargs: dict[str, Any]
+  ) -> list[Sequence[Any]]:
+    """Sends a whole batch to the wrapped model, retrying it as one unit.
+
+    Splitting a batch into single prompts would keep it under the wrapped
+    model's batch-job threshold, so it is passed through unchanged.
+    """
+    attempt = 0
+    while True:
+      try:
+        self._before_attempt()
+      except CircuitOpenError as e:
+        return [self._failed(prompt, e, attempt) for prompt in batch_prompts]
+      try:
+        outputs = [
+            list(output) for output in self.model.infer(batch_prompts, **kwargs)
+        ]
+      except Exception as e:  # pylint: disable=broad-exception-caught
+        self._after_attempt(e)
+        delay = self._retry_delay(attempt, e)
+        if delay is None:
+          return [
+              self._failed(prompt, e, attempt + 1) for prompt in batch_prompts
+          ]
+        time.sleep(delay)
+        attempt += 1
+        continue
+      self._after_attempt(None)
+      return outputs
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[types.ScoredOutput]]:
+    """Runs each prompt with retries, hedging and failure isolation.
+
+    Args:
+      batch_prompts: Batch of inputs for inference.
+      **kwargs: Additional arguments for inference.
+
+    Yields:
+      Scored outputs for each prompt, in batch_prompts order. A prompt that
+      failed on a transient error after all retries yields an empty
+      FailedOutput when isolate_failures is set.
+
+    Raises:
+      InferenceConfigError: If the wrapped model rejects its configuration.
+      InferenceRuntimeError: If a prompt fails and the failure is not
+        isolated, including CircuitOpenError while the breaker is open.
+    """
+    if self._uses_batch_api(batch_prompts):
+      yield from self._run_batch(batch_prompts, kwargs)
+      return
+    calls = self._attempt_executor()
+    outputs = self._map_ordered(
+        lambda prompt: self._run_prompt(prompt, kwargs, calls),
+        batch_prompts,
+        self.max_workers,
+    )
+    try:
+      yield from outputs
+    finally:
+      outputs.close()
+
+  def _attempt_executor(self) -> concurrent.futures.Executor | None:
+    """Returns the pool for hedged attempts, or None when not hedging.
+
+    Attempts get their own pool so that prompt threads waiting on them can
+    never starve it.
+    """
+    if self.config.hedge is None:
+      return None
+    with self._lock:
+      if self._hedge_executor is None:
+        self._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2 * self.max_workers,
+            thread_name_prefix="ResilientLanguageModel-hedge",
+        )
+      return self._hedge_executor
+
+  def close(self) -> None:
+    """Releases the worker pools and closes the wrapped model."""
+    with self._lock:
+      hedge_executor, self._hedge_executor = self._hedge_executor, None
+    if hedge_executor is not None:
+      # Losing hedges may still be running; do not wait for them.
+      hedge_executor.shutdown(wait=False, cancel_futures=True)
+    super().close()
+    self.model.close()
+
+  async def _call_async(self, prompt: str, kwargs: dict[str, Any]) -> list[Any]:
+    start = time.monotonic()
+    outputs = await self.model.infer_async([prompt], **kwargs)
+    self._latencies.add(time.monotonic() - start)
+    return list(outputs[0]) if outputs else []
+
+  async def _hedged_call_async(
+      self, prompt: str, kwargs: dict[str, Any]
+  ) -> list[Any]:
+    delay = self._hedge_delay()
+    if delay is None:
+      return await self._call_async(prompt, kwargs)
+    primary = asyncio.ensure_future(self._call_async(prompt, kwargs))
+    done, _ = await asyncio.wait([primary], timeout=delay)
+    if done:
+      return primary.result()
+    self._count("hedges")
+    hedge = asyncio.ensure_future(self._call_async(prompt, kwargs))
+    pending = {primary, hedge}
+    error: BaseException | None = None
+    try:
+      while pending:
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+          if task.exception() is None:
+            if task is hedge:
+              self._count("hedge_wins")
+            return task.result()
+          error = error or task.exception()
+    finally:
+      for task in pending:
+        task.cancel()
+    assert error is not None
+    raise error
+
+  async def _run_prompt_async(
+      self, prompt: str, kwargs: dict[str, Any]
+  ) -> list[Any]:
+    attempt = 0
+    while True:
+      try:
+        self._before_attempt()
+      except CircuitOpenError as e:
+        return self._failed(prompt, e, attempt)
+      try:
+        result = await self._hedged_call_async(prompt, kwargs)
+      except Exception as e:  # pylint: disable=broad-exception-caught
+        self._after_attempt(e)
+        delay = self._retry_delay(attempt, e)
+        if delay is None:
+          return self._failed(prompt, e, attempt + 1)
+        await asyncio.sleep(delay)
+        attempt += 1
+        continue
+      self._after_attempt(None)
+      return result
+
+  async def infer_async(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[types.ScoredOutput]]:
+    """Async counterpart of infer() using the wrapped model's infer_async."""
+    if self._uses_batch_api(batch_prompts):
+      return await asyncio.to_thread(self._run_batch, batch_prompts, kwargs)
+    return list(
+        await asyncio.gather(
+            *(self._run_prompt_async(prompt, kwargs) for prompt in batch_prompts)
+        )
+    )
+
+  def infer_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+    """Streams one prompt, retrying failures that occur before any output.
+
+    Once text has been yielded a failure is raised as is, since the caller
+    has already consumed part of the response. Streams are not hedged.
+
+    Args:
+      prompt: The prompt to run.
+      **kwargs: Additional arguments for inference.
+
+    Yields:
+      Pieces of the output from the wrapped model's infer_stream().
+    """
+    attempt = 0
+    while True:
+      self._before_attempt()
+      stream = self.model.infer_stream(prompt, **kwargs)
+      started = False
+      try:
+        for delta in stream:
+          started = True
+          yield delta
+      except Exception as e:  # pylint: disable=broad-exception-caught
+        self._after_attempt(e)
+        delay = None if started else self._retry_delay(attempt, e)
+        if delay is None:
+          raise
+        time.sleep(delay)
+        attempt += 1
+        continue
+      finally:
+        close: Callable[[], None] | None = getattr(stream, "close", None)
+        if close is not None:
+          close()
+      self._after_attempt(None)
+      return
@@ -21,6 +21,8 @@ transform the textual output of an LLM into structured data.
 from __future__ import annotations
 
 import abc
+import array
+import bisect
 import collections
 from collections.abc import Iterator, Mapping, Sequence
 import difflib
@@ -38,6 +40,9 @@ from langextract.core import schema
 from langextract.core import tokenizer as tokenizer_lib
 
 _FUZZY_ALIGNMENT_MIN_THRESHOLD = 0.75
+# Fuzzy alignment only considers windows up to this multiple of the
+# extraction's token count.
+_FUZZY_ALIGNMENT_MAX_WINDOW_FACTOR = 3
 
 # Default suffix for extraction index keys (e.g., "entity_index")
 DEFAULT_INDEX_SUFFIX = "_index"  # Suffix for index fields in extraction sorting
@@ -119,6 +124,21 @@ class AbstractResolver(abc.ABC):
         Annotated text in the form of Extractions.
     """
 
+  def start_stream(self, **kwargs) -> StreamingResolution:
+    """Starts resolving model output that will arrive in pieces.
+
+    The default implementation buffers the output and runs resolve() on it
+    when the stream is finished. Subclasses that can parse incrementally
+    override this to return extractions earlier.
+
+    Args:
+        **kwargs: Additional arguments passed to resolve().
+
+    Returns:
+        A StreamingResolution to feed the model output to.
+    """
+    return StreamingResolution(self, **kwargs)
+
   @abc.abstractmethod
   def align(
       self,
@@ -167,6 +187,60 @@ class ResolverParsingError(exceptions.LangExtractError):
   """Error raised when content cannot be parsed as the given format."""
 
 
+class StreamingResolution:
+  """Resolves model output fed to it piece by piece.
+
+  This base implementation buffers the pieces and resolves the complete text
+  in finish().
+  """
+
+  def __init__(self, resolver: AbstractResolver, **kwargs):
+    """Initializes the resolution.
+
+    Args:
+        resolver: Resolver used to resolve the complete output.
+        **kwargs: Additional arguments passed to resolve().
+    """
+    self._resolver = resolver
+    self._kwargs = kwargs
+    self._pieces: list[str] = []
+
+  @property
+  def text(self) -> str:
+    """The output fed so far."""
+    return "".join(self._pieces)
+
+  def feed(self, delta: str) -> Sequence[data.Extraction]:
+    """Adds the next piece of model output.
+
+    Args:
+        delta: The next piece of model output.
+
+    Returns:
+        Extractions completed by this piece.
+    """
+    self._pieces.append(delta)
+    return []
+
+  def finish(self, *, partial: bool = False) -> Sequence[data.Extraction]:
+    """Resolves the rest of the output once the stream has ended.
+
+    Args:
+        partial: True if generation was cut short. Output that no longer
+          parses then yields no further extractions instead of raising.
+
+    Returns:
+        Extractions not returned by feed().
+    """
+    try:
+      return self._resolver.resolve(self.text, **self._kwargs)
+    except (ResolverParsingError, ValueError):
+      if partial:
+        logging.warning("Discarding unparsable output of a truncated stream.")
+        return []
+      raise
+
+
 class Resolver(AbstractResolver):
   """Resolver for YAML/JSON-based information extraction.
 
@@ -286,6 +360,7 @@ class Resolver(AbstractResolver):
       fuzzy_alignment_threshold: float = _FUZZY_ALIGNMENT_MIN_THRESHOLD,
       accept_match_lesser: bool = True,
       tokenizer_inst: tokenizer_lib.Tokenizer | None = None,
+      document_tokenized_text: tokenizer_lib.TokenizedText | None = None,
       **kwargs,
   ) -> Iterator[data.Extraction]:
     """Aligns annotated extractions with source text.
@@ -307,6 +382,9 @@ class Resolver(AbstractResolver):
       accept_match_lesser: Whether to accept partial exact matches (MATCH_LESSER
         status).
       tokenizer_inst: Optional tokenizer instance.
+      document_tokenized_text: Optional tokenization of the whole document the
+        chunk was cut from. When given, the chunk's tokens are read from it
+        instead of re-tokenizing `source_text`.
       **kwargs: Additional parameters.
 
     Yields:
@@ -333,6 +411,7 @@ class Resolver(AbstractResolver):
         fuzzy_alignment_threshold=fuzzy_alignment_threshold,
         accept_match_lesser=accept_match_lesser,
         tokenizer_impl=tokenizer_inst,
+        document_tokenized_text=document_tokenized_text,
     )
     logging.debug(
         "Aligned extractions count: %d",
@@ -414,72 +493,124 @@ class Resolver(AbstractResolver):
 
     processed_extractions = []
     extraction_index = 0
-    index_suffix = self.extraction_index_suffix
-    attributes_suffix = self.format_handler.attribute_suffix
 
     for group_index, group in enumerate(extraction_data):
-      for extraction_class, extraction_value in group.items():
-        if index_suffix and extraction_class.endswith(index_suffix):
-          if not isinstance(extraction_value, int):
-            logging.error(
-                "Index must be an integer. Found: %s",
-                type(extraction_value),
-            )
-            raise ValueError("Index must be an integer.")
-          continue
+      group_extractions = self._group_to_extractions(
+          group, group_index, extraction_index
+      )
+      if group_extractions and not self.extraction_index_suffix:
+        extraction_index = group_extractions[-1].extraction_index
+      processed_extractions.extend(group_extractions)
 
-        if attributes_suffix and extraction_class.endswith(attributes_suffix):
-          if not isinstance(extraction_value, (dict, type(None))):
-            logging.error(
-                "Attributes must be a dict or None. Found: %s",
-                type(extraction_value),
-            )
-            raise ValueError(
-                "Extraction value must be a dict or None for attributes."
-            )
-          continue
+    processed_extractions.sort(key=operator.attrgetter("extraction_index"))
+    logging.debug("Completed extraction and ordering of extractions.")
+    return processed_extractions
+
+  def _group_to_extractions(
+      self,
+      group: Mapping[str, fh.ExtractionValueType],
+      group_index: int,
+      extraction_index: int,
+  ) -> list[data.Extraction]:
+    """Converts one parsed extraction group into Extraction objects.
+
+    Args:
+        group: Extraction class keys with their values, plus optional index
+          and attribute keys.
+        group_index: Position of the group in the model output.
+        extraction_index: Index of the last extraction before this group, used
+          when extractions are numbered by order of appearance.
+
+    Returns:
+        The group's extractions in key order.
+
+    Raises:
+        ValueError: If the extraction text is not a string or integer, or if the
+        index is not an integer.
+    """
+    extractions = []
+    index_suffix = self.extraction_index_suffix
+    attributes_suffix = self.format_handler.attribute_suffix
+
+    for extraction_class, extraction_value in group.items():
+      if index_suffix and extraction_class.endswith(index_suffix):
+        if not isinstance(extraction_value, int):
+          logging.error(
+              "Index must be an integer. Found: %s",
+              type(extraction_value),
+          )
+          raise ValueError("Index must be an integer.")
+        continue
 
-        if not isinstance(extraction_value, (str, int, float)):
+      if attributes_suffix and extraction_class.endswith(attributes_suffix):
+        if not isinstance(extraction_value, (dict, type(None))):
           logging.error(
-              "Extraction text must be a string, integer, or float. Found: %s",
+              "Attributes must be a dict or None. Found: %s",
               type(extraction_value),
           )
           raise ValueError(
-              "Extraction text must be a string, integer, or float."
+              "Extraction value must be a dict or None for attributes."
           )
+        continue
 
-        if not isinstance(extraction_value, str):
-          extraction_value = str(extraction_value)
-
-        if index_suffix:
-          index_key = extraction_class + index_suffix
-          extraction_index = group.get(index_key, None)
-          if extraction_index is None:
-            logging.debug(
-                "No index value for %s. Skipping extraction.", extraction_class
-            )
-            continue
-        else:
-          extraction_index += 1
-
-        attributes = None
-        if attributes_suffix:
-          attributes_key = extraction_class + attributes_suffix
-          attributes = group.get(attributes_key, None)
-
-        processed_extractions.append(
-            data.Extraction(
-                extraction_class=extraction_class,
-                extraction_text=extraction_value,
-                extraction_index=extraction_index,
-                group_index=group_index,
-                attributes=attributes,
-            )
+      if not isinstance(extraction_value, (str, int, float)):
+        logging.error(
+            "Extraction text must be a string, integer, or float. Found: %s",
+            type(extraction_value),
         )
+        raise ValueError("Extraction text must be a string, integer, or float.")
 
-    processed_extractions.sort(key=operator.attrgetter("extraction_index"))
-    logging.debug("Completed extraction and ordering of extractions.")
-    return processed_extractions
+      if not isinstance(extraction_value, str):
+        extraction_value = str(extraction_value)
+
+      if index_suffix:
+        index_key = extraction_class + index_suffix
+        extraction_index = group.get(index_key, None)
+        if extraction_index is None:
+          logging.debug(
+              "No index value for %s. Skipping extraction.", extraction_class
+          )
+          continue
+      else:
+        extraction_index += 1
+
+      attributes = None
+      if attributes_suffix:
+        attributes_key = extraction_class + attributes_suffix
+        attributes = group.get(attributes_key, None)
+
+      extractions.append(
+          data.Extraction(
+              extraction_class=extraction_class,
+              extraction_text=extraction_value,
+              extraction_index=extraction_index,
+              group_index=group_index,
+              attributes=attributes,
+          )
+      )
+
+    return extractions
+
+  def start_stream(
+      self, suppress_parse_errors: bool = False, **kwargs
+  ) -> StreamingResolution:
+    """Starts resolving output that will arrive in pieces.
+
+    Extractions are returned as soon as the FormatHandler's StreamingParser
+    sees each extraction object complete. They come back in output order,
+    even when extraction_index_suffix is set; sort by extraction_index once
+    the stream is finished to get the order resolve() would produce.
+
+    Args:
+        suppress_parse_errors: Log errors and continue pipeline.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        A StreamingResolution to feed the model output to.
+    """
+    return _IncrementalResolution(
+        self, suppress_parse_errors=suppress_parse_errors
+    )
 
 
 class WordAligner:
@@ -543,15 +674,24 @@ class WordAligner:
       char_offset: int,
       fuzzy_alignment_threshold: float = _FUZZY_ALIGNMENT_MIN_THRESHOLD,
       tokenizer_impl: tokenizer_lib.Tokenizer | None = None,
+      extraction_tokens: Sequence[str] | None = None,
+      source_index: _NormalizedTokenIndex | None = None,
   ) -> data.Extraction | None:
     """Fuzzy-align an extraction using difflib.SequenceMatcher on tokens.
 
-    The algorithm scans every candidate window in `source_tokens` and selects
-    the window with the highest SequenceMatcher `ratio`. It uses an efficient
-    token-count intersection as a fast pre-check to discard windows that cannot
-    meet the alignment threshold. A match is accepted when the ratio is ≥
-    `fuzzy_alignment_threshold`. This only runs on unmatched extractions, which
-    is usually a small subset of the total extractions.
+    Candidate windows are between the extraction's token count and
+    `_FUZZY_ALIGNMENT_MAX_WINDOW_FACTOR` times that, and must contain at least
+    one source token that also occurs in the extraction. These anchor tokens are
+    found through an inverted index of the normalized source tokens, so regions
+    of the chunk that share nothing with the extraction are never visited.
+    Within a window the multiset overlap with the extraction is maintained
+    incrementally; it bounds the SequenceMatcher match count, so a window is
+    only scored when it could beat the best match found so far.
+
+    The best window is the one with the highest SequenceMatcher match ratio,
+    preferring smaller windows and then earlier starts. It is accepted when the
+    ratio is ≥ `fuzzy_alignment_threshold`. This only runs on unmatched
+    extractions, which is usually a small subset of the total extractions.
 
     Args:
       extraction: The extraction to align.
@@ -561,79 +701,101 @@ class WordAligner:
       char_offset: The character offset of the current chunk.
       fuzzy_alignment_threshold: The minimum ratio for a fuzzy match.
       tokenizer_impl: Optional tokenizer instance.
+      extraction_tokens: Lowercased tokens of the extraction text, if already
+        computed by the caller.
+      source_index: Index of `source_tokens`, if already built by the caller
+        for aligning several extractions against the same chunk.
 
     Returns:
       The aligned data.Extraction if successful, None otherwise.
     """
 
-    extraction_tokens = list(
-        _tokenize_with_lowercase(
-            extraction.extraction_text, tokenizer_inst=tokenizer_impl
-        )
-    )
-    # Work with lightly stemmed tokens so pluralisation doesn't block alignment
-    extraction_tokens_norm = [_normalize_token(t) for t in extraction_tokens]
+    if extraction_tokens is None:
+      extraction_tokens = list(
+          _tokenize_with_lowercase(
+              extraction.extraction_text, tokenizer_inst=tokenizer_impl
+          )
+      )
 
     if not extraction_tokens:
       return None
 
+    if source_index is None:
+      source_index = _NormalizedTokenIndex(source_tokens)
+    # Work with lightly stemmed tokens so pluralisation doesn't block alignment
+    extraction_tokens_norm = [_normalize_token(t) for t in extraction_tokens]
+
     logging.debug(
         "Fuzzy aligning %r (%d tokens)",
         extraction.extraction_text,
         len(extraction_tokens),
     )
 
-    best_ratio = 0.0
-    best_span: tuple[int, int] | None = None  # (start_idx, window_size)
-
     len_e = len(extraction_tokens)
-    max_window = len(source_tokens)
-
     extraction_counts = collections.Counter(extraction_tokens_norm)
-    min_overlap = int(len_e * fuzzy_alignment_threshold)
+    min_overlap = max(int(len_e * fuzzy_alignment_threshold), 1)
+
+    anchors = []
+    attainable = 0
+    for token, count in extraction_counts.items():
+      positions = source_index.positions.get(token, ())
+      anchors.extend(positions)
+      attainable += min(count, len(positions))
+    if attainable < min_overlap:
+      return None
+    anchors.sort()
 
+    source_norm = source_index.tokens
+    num_source = len(source_norm)
+    max_window = min(num_source, len_e * _FUZZY_ALIGNMENT_MAX_WINDOW_FACTOR)
     matcher = difflib.SequenceMatcher(autojunk=False, b=extraction_tokens_norm)
 
-    for window_size in range(len_e, max_window + 1):
-      if window_size > len(source_tokens):
-        break
-
-      # Initialize for sliding window
-      window_deque = collections.deque(source_tokens[0:window_size])
-      window_counts = collections.Counter(
-          [_normalize_token(t) for t in window_deque]
-      )
+    best_matches = 0
+    best_span: tuple[int, int] | None = None  # (start_idx, window_size)
 
-      for start_idx in range(len(source_tokens) - window_size + 1):
-        # Optimization: check if enough overlapping tokens exist before expensive
-        # sequence matching. This is an upper bound on the match count.
-        if (extraction_counts & window_counts).total() >= min_overlap:
-          window_tokens_norm = [_normalize_token(t) for t in window_deque]
-          matcher.set_seq1(window_tokens_norm)
+    for window_size in range(len_e, max_window + 1):
+      for first_start, last_start in _window_start_ranges(
+          anchors, window_size, num_source
+      ):
+        window_counts = dict.fromkeys(extraction_counts, 0)
+        overlap = 0
+        for token in source_norm[first_start : first_start + window_size]:
+          count = window_counts.get(token)
+          if count is not None:
+            window_counts[token] = count + 1
+            overlap += count < extraction_counts[token]
+
+        for start_idx in range(first_start, last_start + 1):
+          if start_idx > first_start:
+            # Slide the window one token to the right.
+            old_token = source_norm[start_idx - 1]
+            count = window_counts.get(old_token)
+            if count is not None:
+              window_counts[old_token] = count - 1
+              overlap -= count <= extraction_counts[old_token]
+            new_token = source_norm[start_idx + window_size - 1]
+            count = window_counts.get(new_token)
+            if count is not None:
+              window_counts[new_token] = count + 1
+              overlap += count < extraction_counts[new_token]
+
+          # The overlap is an upper bound on the match count, and ties go to
+          # the window found first.
+          if overlap <= best_matches or overlap < min_overlap:
+            continue
+          matcher.set_seq1(source_norm[start_idx : start_idx + window_size])
           matches = sum(size for _, _, size in matcher.get_matching_blocks())
-          if len_e > 0:
-            ratio = matches / len_e
-          else:
-            ratio = 0.0
-          if ratio > best_ratio:
-            best_ratio = ratio
+          if matches > best_matches:
+            best_matches = matches
             best_span = (start_idx, window_size)
+            if best_matches == len_e:
+              break
+        if best_matches == len_e:
+          break
+      if best_matches == len_e:
+        break
 
-        # Slide the window to the right
-        if start_idx + window_size < len(source_tokens):
-          # Remove the leftmost token from the count
-          old_token = window_deque.popleft()
-          old_token_norm = _normalize_token(old_token)
-          window_counts[old_token_norm] -= 1
-          if window_counts[old_token_norm] == 0:
-            del window_counts[old_token_norm]
-
-          # Add the new rightmost token to the deque and count
-          new_token = source_tokens[start_idx + window_size]
-          window_deque.append(new_token)
-          new_token_norm = _normalize_token(new_token)
-          window_counts[new_token_norm] += 1
-
+    best_ratio = best_matches / len_e
     if best_span and best_ratio >= fuzzy_alignment_threshold:
       start_idx, window_size = best_span
 
@@ -643,11 +805,10 @@ class WordAligner:
             end_index=start_idx + window_size + token_offset,
         )
 
-        start_token = tokenized_text.tokens[start_idx]
-        end_token = tokenized_text.tokens[start_idx + window_size - 1]
         extraction.char_interval = data.CharInterval(
-            start_pos=char_offset + start_token.char_interval.start_pos,
-            end_pos=char_offset + end_token.char_interval.end_pos,
+            start_pos=char_offset + tokenized_text.starts[start_idx],
+            end_pos=char_offset
+            + tokenized_text.ends[start_idx + window_size - 1],
         )
 
         extraction.alignment_status = data.AlignmentStatus.MATCH_FUZZY
@@ -671,6 +832,7 @@ class WordAligner:
       fuzzy_alignment_threshold: float = _FUZZY_ALIGNMENT_MIN_THRESHOLD,
       accept_match_lesser: bool = True,
       tokenizer_impl: tokenizer_lib.Tokenizer | None = None,
+      document_tokenized_text: tokenizer_lib.TokenizedText | None = None,
   ) -> Sequence[Sequence[data.Extraction]]:
     """Aligns extractions with their positions in the source text.
 
@@ -698,6 +860,11 @@ class WordAligner:
       accept_match_lesser: Whether to accept partial exact matches (MATCH_LESSER
         status).
       tokenizer_impl: Optional tokenizer instance.
+      document_tokenized_text: Optional tokenization of the document that
+        `source_text` was cut from, with `token_offset` and `char_offset`
+        locating the chunk in it. Its tokens are reused rather than
+        re-tokenizing the chunk; if they do not line up with `source_text`, the
+        chunk is tokenized as usual.
 
     Returns:
       A sequence of extractions aligned with the source text, including token
@@ -712,30 +879,32 @@ class WordAligner:
       logging.info("No extraction groups provided; returning empty list.")
       return []
 
-    source_tokens = list(
-        _tokenize_with_lowercase(source_text, tokenizer_inst=tokenizer_impl)
-    )
+    tokenized_text = None
+    if document_tokenized_text is not None:
+      tokenized_text = _chunk_tokens_from_document(
+          document_tokenized_text, source_text, token_offset, char_offset
+      )
+    if tokenized_text is None:
+      tokenized_text = (
+          tokenizer_impl.tokenize(source_text)
+          if tokenizer_impl
+          else tokenizer_lib.tokenize(source_text)
+      )
+    source_tokens = _lowercase_tokens(tokenized_text)
 
-    delim_len = len(
-        list(_tokenize_with_lowercase(delim, tokenizer_inst=tokenizer_impl))
+    delim_tokens = list(
+        _tokenize_with_lowercase(delim, tokenizer_inst=tokenizer_impl)
     )
+    delim_len = len(delim_tokens)
     if delim_len != 1:
       raise ValueError(f"Delimiter {delim!r} must be a single token.")
 
     logging.debug("Using delimiter %r for extraction alignment", delim)
 
-    extraction_tokens = list(
-        _tokenize_with_lowercase(
-            f" {delim} ".join(
-                extraction.extraction_text
-                for extraction in itertools.chain(*extraction_groups)
-            ),
-            tokenizer_inst=tokenizer_impl,
-        )
-    )
-
-    self._set_seqs(source_tokens, extraction_tokens)
-
+    # Each extraction is tokenized once; the concatenation with delimiter
+    # tokens is the tokenization of the delimiter-joined extraction texts.
+    extraction_tokens: list[str] = []
+    tokens_by_index: dict[int, list[str]] = {}
     index_to_extraction_group = {}
     extraction_index = 0
     for group_index, group in enumerate(extraction_groups):
@@ -759,16 +928,17 @@ class WordAligner:
                 extraction.extraction_text, tokenizer_inst=tokenizer_impl
             )
         )
+        tokens_by_index[extraction_index] = extraction_text_tokens
+        if extraction_index:
+          extraction_tokens.extend(delim_tokens)
+        extraction_tokens.extend(extraction_text_tokens)
         extraction_index += len(extraction_text_tokens) + delim_len
 
+    self._set_seqs(source_tokens, extraction_tokens)
+
     aligned_extraction_groups: list[list[data.Extraction]] = [
         [] for _ in extraction_groups
     ]
-    tokenized_text = (
-        tokenizer_impl.tokenize(source_text)
-        if tokenizer_impl
-        else tokenizer_lib.tokenize(source_text)
-    )
 
     # Track which extractions were aligned in the exact matching phase
     aligned_extractions = []
@@ -792,11 +962,9 @@ class WordAligner:
       )
 
       try:
-        start_token = tokenized_text.tokens[i]
-        end_token = tokenized_text.tokens[i + n - 1]
         extraction.char_interval = data.CharInterval(
-            start_pos=char_offset + start_token.char_interval.start_pos,
-            end_pos=char_offset + end_token.char_interval.end_pos,
+            start_pos=char_offset + tokenized_text.starts[i],
+            end_pos=char_offset + tokenized_text.ends[i + n - 1],
         )
       except IndexError as e:
         raise IndexError(
@@ -805,13 +973,7 @@ class WordAligner:
             f" tokens {tokenized_text.tokens}."
         ) from e
 
-      extraction_text_len = len(
-          list(
-              _tokenize_with_lowercase(
-                  extraction.extraction_text, tokenizer_inst=tokenizer_impl
-              )
-          )
-      )
+      extraction_text_len = len(tokens_by_index[j])
       if extraction_text_len < n:
         raise ValueError(
             "Delimiter prevents blocks greater than extraction length: "
@@ -835,9 +997,9 @@ class WordAligner:
 
     # Collect unaligned extractions
     unaligned_extractions = []
-    for extraction, _ in index_to_extraction_group.values():
+    for index, (extraction, _) in index_to_extraction_group.items():
       if extraction not in aligned_extractions:
-        unaligned_extractions.append(extraction)
+        unaligned_extractions.append((index, extraction))
 
     # Apply fuzzy alignment to remaining extractions
     if enable_fuzzy_alignment and unaligned_extractions:
@@ -845,7 +1007,8 @@ class WordAligner:
           "Starting fuzzy alignment for %d unaligned extractions",
           len(unaligned_extractions),
       )
-      for extraction in unaligned_extractions:
+      source_index = _NormalizedTokenIndex(source_tokens)
+      for index, extraction in unaligned_extractions:
         aligned_extraction = self._fuzzy_align_extraction(
             extraction,
             source_tokens,
@@ -854,6 +1017,8 @@ class WordAligner:
             char_offset,
             fuzzy_alignment_threshold,
             tokenizer_impl=tokenizer_impl,
+            extraction_tokens=tokens_by_index[index],
+            source_index=source_index,
         )
         if aligned_extraction:
           aligned_extractions.append(aligned_extraction)
@@ -891,13 +1056,110 @@ def _tokenize_with_lowercase(
     tokenized_pb2 = tokenizer_inst.tokenize(text)
   else:
     tokenized_pb2 = tokenizer_lib.tokenize(text)
-  original_text = tokenized_pb2.text
-  for token in tokenized_pb2.tokens:
-    start = token.char_interval.start_pos
-    end = token.char_interval.end_pos
-    token_str = original_text[start:end]
-    token_str = token_str.lower()
-    yield token_str
+  yield from _lowercase_tokens(tokenized_pb2)
+
+
+def _lowercase_tokens(tokenized_text: tokenizer_lib.TokenizedText) -> list[str]:
+  """Returns the lowercased text of every token."""
+  text = tokenized_text.text
+  return [
+      text[start:end].lower()
+      for start, end in zip(tokenized_text.starts, tokenized_text.ends)
+  ]
+
+
+def _chunk_tokens_from_document(
+    document_tokenized_text: tokenizer_lib.TokenizedText,
+    source_text: str,
+    token_offset: int,
+    char_offset: int,
+) -> tokenizer_lib.TokenizedText | None:
+  """Cuts a chunk's tokens out of its document's tokenization.
+
+  Chunks produced by ChunkIterator start on a document token and end on one, so
+  their tokens are a contiguous run of the document's tokens. This rebases that
+  run onto `source_text` so positions match what tokenizing the chunk would
+  give.
+
+  Args:
+    document_tokenized_text: Tokenization of the whole document.
+    source_text: The chunk text.
+    token_offset: Index of the chunk's first token in the document.
+    char_offset: Character offset of the chunk in the document.
+
+  Returns:
+    The chunk's tokens relative to `source_text`, or None if the chunk does not
+    line up with the document tokens.
+  """
+  starts = document_tokenized_text.starts
+  ends = document_tokenized_text.ends
+  if (
+      not source_text
+      or token_offset >= len(starts)
+      or starts[token_offset] != char_offset
+      or not document_tokenized_text.text.startswith(source_text, char_offset)
+  ):
+    return None
+  end_index = bisect.bisect_right(
+      ends, char_offset + len(source_text), lo=token_offset
+  )
+  chunk = tokenizer_lib.TokenizedText(text=source_text)
+  chunk.starts = array.array(
+      starts.typecode, [s - char_offset for s in starts[token_offset:end_index]]
+  )
+  chunk.ends = array.array(
+      ends.typecode, [e - char_offset for e in ends[token_offset:end_index]]
+  )
+  chunk.token_types = document_tokenized_text.token_types[
+      token_offset:end_index
+  ]
+  chunk.newline_flags = document_tokenized_text.newline_flags[
+      token_offset:end_index
+  ]
+  return chunk
+
+
+class _NormalizedTokenIndex:
+  """Normalized source tokens with an inverted index of their positions."""
+
+  __slots__ = ("tokens", "positions")
+
+  def __init__(self, source_tokens: Sequence[str]):
+    self.tokens = [_normalize_token(t) for t in source_tokens]
+    positions = collections.defaultdict(list)
+    for i, token in enumerate(self.tokens):
+      positions[token].append(i)
+    self.positions: dict[str, list[int]] = dict(positions)
+
+
+def _window_start_ranges(
+    anchors: Sequence[int], window_size: int, num_tokens: int
+) -> Iterator[tuple[int, int]]:
+  """Yields inclusive ranges of window starts whose window covers an anchor.
+
+  Args:
+    anchors: Sorted token positions.
+    window_size: Number of tokens in each window.
+    num_tokens: Total number of tokens windows may cover.
+
+  Yields:
+    Non-overlapping (first_start, last_start) pairs in increasing order.
+  """
+  last_valid = num_tokens - window_size
+  current: list[int] | None = None
+  for anchor in anchors:
+    first = max(0, anchor - window_size + 1)
+    last = min(anchor, last_valid)
+    if first > last:
+      continue
+    if current is not None and first <= current[1] + 1:
+      current[1] = max(current[1], last)
+      continue
+    if current is not None:
+      yield current[0], current[1]
+    current = [first, last]
+  if current is not None:
+    yield current[0], current[1]
 
 
 @functools.lru_cache(maxsize=10000)
@@ -907,3 +1169,51 @@ def _normalize_token(token: str) -> str:
   if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
     token = token[:-1]
   return token
+
+
+class _IncrementalResolution(StreamingResolution):
+  """Resolves extraction objects as soon as the stream completes them."""
+
+  def __init__(self, resolver: Resolver, suppress_parse_errors: bool = False):
+    super().__init__(resolver)
+    self._resolver = resolver
+    self._suppress_parse_errors = suppress_parse_errors
+    constraint = getattr(resolver, "_constraint", schema.Constraint())
+    self._parser = resolver.format_handler.stream_parser(
+        strict=getattr(constraint, "strict", False)
+    )
+    self._group_index = 0
+    self._extraction_index = 0
+
+  @property
+  def text(self) -> str:
+    return self._parser.text
+
+  def feed(self, delta: str) -> Sequence[data.Extraction]:
+    return self._convert(self._parser.feed(delta))
+
+  def finish(self, *, partial: bool = False) -> Sequence[data.Extraction]:
+    try:
+      groups = self._parser.finish(partial=partial)
+    except exceptions.FormatError as e:
+      if self._suppress_parse_errors:
+        logging.exception(
+            "Failed to parse input_text: %s, error: %s", self.text, e
+        )
+        return []
+      raise ResolverParsingError(str(e)) from e
+    return self._convert(groups)
+
+  def _convert(
+      self, groups: Sequence[Mapping[str, fh.ExtractionValueType]]
+  ) -> list[data.Extraction]:
+    extractions = []
+    for group in groups:
+      group_extractions = self._resolver._group_to_extractions(  # pylint: disable=protected-access
+          group, self._group_index, self._extraction_index
+      )
+      self._group_index += 1
+      if group_extractions and not self._resolver.extraction_index_suffix:
+        self._extraction_index = group_extractions[-1].extraction_index
+      extractions.extend(group_extractions)
+    return extractions
@@ -0,0 +1,531 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent, content-addressed cache for language model responses.
+
+Responses are stored in a single SQLite file keyed by a hash of the model
+identity, normalized generation parameters, output schema and prompt. Any
+provider can be wrapped with CachingLanguageModel so that repeated runs over
+unchanged inputs are served locally without network calls.
+
+Usage example:
+    cache = ResponseCache("~/.cache/langextract/responses.sqlite")
+    model = CachingLanguageModel(model, cache)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+import dataclasses
+import enum
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from absl import logging
+
+from langextract.core import base_model
+from langextract.core import types
+
+__all__ = [
+    "EXTRACTION_PASS_PARAM",
+    "CacheStats",
+    "CachingLanguageModel",
+    "ResponseCache",
+    "make_cache_key",
+]
+
+# Bump to invalidate all existing entries when the key or value layout changes.
+_CACHE_VERSION = 1
+
+# Model attributes that change what a provider returns for a given prompt.
+_MODEL_KEY_ATTRIBUTES = (
+    "model_id",
+    "model_url",
+    "base_url",
+    "format_type",
+    "temperature",
+)
+
+# Runtime parameters that change what a provider generates for a prompt.
+# Everything else passed to infer(), such as execution settings (max_workers,
+# timeout) or the annotator's alignment settings, is left out of the key.
+_GENERATION_PARAMS = frozenset({
+    "candidate_count",
+    "format",
+    "frequency_penalty",
+    "logprobs",
+    "max_output_tokens",
+    "max_tokens",
+    "num_ctx",
+    "presence_penalty",
+    "raw",
+    "reasoning",
+    "reasoning_effort",
+    "response_format",
+    "response_mime_type",
+    "response_schema",
+    "safety_settings",
+    "seed",
+    "stop",
+    "stop_sequences",
+    "structured_output_format",
+    "system",
+    "system_instruction",
+    "temperature",
+    "thinking_config",
+    "tools",
+    "top_k",
+    "top_logprobs",
+    "top_p",
+})
+
+# Keyword argument the annotator sets on passes after the first so that each
+# extraction pass gets its own response. CachingLanguageModel consumes it; it
+# is never forwarded to the wrapped model.
+EXTRACTION_PASS_PARAM = "extraction_pass"
+
+
+def _json_default(obj: Any) -> Any:
+  if isinstance(obj, enum.Enum):
+    return obj.value
+  if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+    return dataclasses.asdict(obj)
+  if isinstance(obj, (set, frozenset)):
+    return sorted(obj, key=repr)
+  return repr(obj)
+
+
+def _canonical_json(value: Any) -> str:
+  return json.dumps(
+      value, sort_keys=True, ensure_ascii=False, default=_json_default
+  )
+
+
+def _as_list(
+    outputs: Sequence[types.ScoredOutput],
+) -> list[types.ScoredOutput]:
+  # Lists are passed through so that markers such as
+  # resilience.FailedOutput reach the caller.
+  return outputs if isinstance(outputs, list) else list(outputs)
+
+
+def make_cache_key(
+    model: base_model.BaseLanguageModel,
+    prompt: str,
+    params: Mapping[str, Any] | None = None,
+) -> str:
+  """Computes the cache key for one prompt sent to a model.
+
+  Args:
+    model: The language model the prompt is sent to.
+    prompt: The prompt text.
+    params: Runtime keyword arguments passed to infer(). They are merged with
+      the model's stored kwargs; only generation parameters with non-None
+      values are kept. EXTRACTION_PASS_PARAM, if set, keys each extraction
+      pass separately.
+
+  Returns:
+    Hex SHA-256 digest identifying the request.
+  """
+  merged = model.merge_kwargs(params)
+  normalized_params = {
+      k: v
+      for k, v in merged.items()
+      if v is not None and k in _GENERATION_PARAMS
+  }
+  attributes = {
+      name: getattr(model, name)
+      for name in _MODEL_KEY_ATTRIBUTES
+      if getattr(model, name, None) is not None
+  }
+  schema_instance = model.schema
+  key_data = {
+      "version": _CACHE_VERSION,
+      "provider": type(model).__name__,
+      "model": attributes,
+      "params": normalized_params,
+      "schema": (
+          schema_instance.to_provider_config()
+          if schema_instance is not None
+          else None
+      ),
+      "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+  }
+  # The first pass keeps the key of a single-pass run.
+  extraction_pass = (params or {}).get(EXTRACTION_PASS_PARAM) or 0
+  if extraction_pass:
+    key_data["extraction_pass"] = extraction_pass
+  return hashlib.sha256(_canonical_json(key_data).encode("utf-8")).hexdigest()
+
+
+@dataclasses.dataclass
+class CacheStats:
+  """Counters describing cache effectiveness.
+
+  Attributes:
+    hits: Lookups served from the cache.
+    misses: Lookups not found, or found but expired.
+    writes: Entries stored.
+    evictions: Entries removed by age or size limits.
+  """
+
+  hits: int = 0
+  misses: int = 0
+  writes: int = 0
+  evictions: int = 0
+
+
+class ResponseCache:
+  """SQLite-backed store of scored model outputs with bounded size and age.
+
+  The cache is safe to share between threads. Entries older than max_age are
+  treated as misses, and once the cache grows past max_entries or max_bytes
+  the least recently used entries are evicted.
+  """
+
+  def __init__(
+      self,
+      path: str | os.PathLike[str],
+      max_entries: int | None = None,
+      max_bytes: int | None = None,
+      max_age: float | None = None,
+  ):
+    """Opens or creates the cache file.
+
+    Args:
+      path: SQLite database file. Parent directories are created as needed.
+        Use ":memory:" for a process-local cache.
+      max_entries: Maximum number of entries to keep.
+      max_bytes: Maximum total size of stored outputs, in bytes.
+      max_age: Maximum entry age in seconds.
+    """
+    self.max_entries = max_entries
+    self.max_bytes = max_bytes
+    self.max_age = max_age
+    self.stats = CacheStats()
+    self._lock = threading.Lock()
+
+    path = os.fspath(path)
+    if path != ":memory:":
+      path = os.path.expanduser(path)
+      pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    self.path = path
+    self._conn = sqlite3.connect(path, check_same_thread=False)
+    with self._conn:
+      if path != ":memory:":
+        self._conn.execute("PRAGMA journal_mode=WAL")
+      self._conn.execute("""
+          CREATE TABLE IF NOT EXISTS responses (
+              key TEXT PRIMARY KEY,
+              outputs TEXT NOT NULL,
+              size INTEGER NOT NULL,
+              created_at REAL NOT NULL,
+              accessed_at REAL NOT NULL
+          )""")
+      self._conn.execute(
+          "CREATE INDEX IF NOT EXISTS responses_accessed_at"
+          " ON responses (accessed_at)"
+      )
+
+  def __enter__(self) -> ResponseCache:
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+  def __len__(self) -> int:
+    with self._lock:
+      return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+  def close(self) -> None:
+    """Closes the underlying database connection."""
+    with self._lock:
+      self._conn.close()
+
+  def get_multi(
+      self, keys: Sequence[str]
+  ) -> dict[str, list[types.ScoredOutput]]:
+    """Looks up several keys at once.
+
+    Args:
+      keys: Cache keys from make_cache_key().
+
+    Returns:
+      Mapping from each key found (and not expired) to its scored outputs.
+    """
+    unique_keys = list(dict.fromkeys(keys))
+    now = time.time()
+    found: dict[str, list[types.ScoredOutput]] = {}
+    with self._lock, self._conn:
+      for start in range(0, len(unique_keys), 500):
+        chunk = unique_keys[start : start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = self._conn.execute(
+            "SELECT key, outputs, created_at FROM responses"
+            f" WHERE key IN ({placeholders})",
+            chunk,
+        ).fetchall()
+        for key, outputs, created_at in rows:
+          if self.max_age is not None and now - created_at > self.max_age:
+            continue
+          found[key] = [
+              types.ScoredOutput(score=o["score"], output=o["output"])
+              for o in json.loads(outputs)
+          ]
+      if found:
+        self._conn.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+            [(now, key) for key in found],
+        )
+      self.stats.hits += sum(1 for key in keys if key in found)
+      self.stats.misses += sum(1 for key in keys if key not in found)
+    return found
+
+  def set_multi(
+      self, items: Mapping[str, Sequence[types.ScoredOutput]]
+  ) -> None:
+    """Stores outputs for several keys and applies eviction limits.
+
+    Args:
+      items: Mapping from cache key to the scored outputs for that prompt.
+    """
+    if not items:
+      return
+    now = time.time()
+    rows = []
+    for key, outputs in items.items():
+      payload = json.dumps(
+          [{"score": o.score, "output": o.output} for o in outputs],
+          ensure_ascii=False,
+      )
+      rows.append((key, payload, len(payload.encode("utf-8")), now, now))
+    with self._lock, self._conn:
+      self._conn.executemany(
+          "INSERT OR REPLACE INTO responses"
+          " (key, outputs, size, created_at, accessed_at)"
+          " VALUES (?, ?, ?, ?, ?)",
+          rows,
+      )
+      self.stats.writes += len(rows)
+      self._evict_locked(now)
+
+  def evict(self) -> int:
+    """Removes expired entries and enforces size limits.
+
+    Returns:
+      Number of entries removed.
+    """
+    with self._lock, self._conn:
+      return self._evict_locked(time.time())
+
+  def clear(self) -> None:
+    """Removes all entries."""
+    with self._lock, self._conn:
+      self._conn.execute("DELETE FROM responses")
+
+  def iter_keys(self) -> Iterator[str]:
+    """Iterates over stored keys, least recently used first."""
+    with self._lock:
+      keys = [
+          row[0]
+          for row in self._conn.execute(
+              "SELECT key FROM responses ORDER BY accessed_at, rowid"
+          )
+      ]
+    yield from keys
+
+  def _evict_locked(self, now: float) -> int:
+    """Applies age, count and size limits. Caller must hold the lock."""
+    removed = 0
+    if self.max_age is not None:
+      removed += self._conn.execute(
+          "DELETE FROM responses WHERE created_at < ?", (now - self.max_age,)
+      ).rowcount
+
+    if self.max_entries is not None:
+      count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+      if count > self.max_entries:
+        removed += self._conn.execute(
+            "DELETE FROM responses WHERE rowid IN (SELECT rowid FROM"
+            " responses ORDER BY accessed_at, rowid LIMIT ?)",
+            (count - self.max_entries,),
+        ).rowcount
+
+    if self.max_bytes is not None:
+      total = self._conn.execute(
+          "SELECT COALESCE(SUM(size), 0) FROM responses"
+      ).fetchone()[0]
+      if total > self.max_bytes:
+        stale = []
+        for rowid, size in self._conn.execute(
+            "SELECT rowid, size FROM responses ORDER BY accessed_at, rowid"
+        ):
+          if total <= self.max_bytes:
+            break
+          stale.append((rowid,))
+          total -= size
+        self._conn.executemany("DELETE FROM responses WHERE rowid = ?", stale)
+        removed += len(stale)
+
+    if removed:
+      self.stats.evictions += removed
+      logging.debug("Evicted %d cached responses from %s", removed, self.path)
+    return removed
+
+
+class CachingLanguageModel(base_model.BaseLanguageModel):
+  """Wraps a language model so that responses are served from a cache.
+
+  Only prompts missing from the cache are forwarded to the wrapped model, in
+  a single call per batch, and their outputs are stored before being
+  returned. Schema, fence and other attribute lookups are delegated to the
+  wrapped model.
+  """
+
+  def __init__(self, model: base_model.BaseLanguageModel, cache: ResponseCache):
+    """Initializes the wrapper.
+
+    Args:
+      model: The language model to wrap.
+      cache: The response store.
+    """
+    super().__init__()
+    self.model = model
+    self.cache = cache
+
+  def __getattr__(self, name: str) -> Any:
+    # Only called for attributes not found on the wrapper itself.
+    if name == "model":
+      raise AttributeError(name)
+    return getattr(self.model, name)
+
+  @property
+  def schema(self):
+    return self.model.schema
+
+  def apply_schema(self, schema_instance) -> None:
+    self.model.apply_schema(schema_instance)
+
+  def set_fence_output(self, fence_output: bool | None) -> None:
+    self.model.set_fence_output(fence_output)
+
+  @property
+  def requires_fence_output(self) -> bool:
+    return self.model.requires_fence_output
+
+  def merge_kwargs(
+      self, runtime_kwargs: Mapping[str, Any] | None = None
+  ) -> dict[str, Any]:
+    return self.model.merge_kwargs(runtime_kwargs)
+
+  def parse_output(self, output: str) -> Any:
+    return self.model.parse_output(output)
+
+  def close(self) -> None:
+    """Closes the wrapped model; the cache is left open."""
+    self.model.close()
+
+  def _keys(self, batch_prompts: Sequence[str], kwargs) -> list[str]:
+    return [
+        make_cache_key(self.model, prompt, kwargs) for prompt in batch_prompts
+    ]
+
+  @staticmethod
+  def _model_kwargs(kwargs: Mapping[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in kwargs.items() if k != EXTRACTION_PASS_PARAM}
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[types.ScoredOutput]]:
+    """Runs inference, forwarding only cache misses to the wrapped model.
+
+    Args:
+      batch_prompts: Batch of inputs for inference.
+      **kwargs: Additional arguments for inference.
+
+    Yields:
+      Scored outputs for each prompt, in batch_prompts order.
+    """
+    keys = self._keys(batch_prompts, kwargs)
+    cached = self.cache.get_multi(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+      outputs = self.model.infer(
+          [batch_prompts[i] for i in missing], **self._model_kwargs(kwargs)
+      )
+      fresh = {keys[i]: _as_list(output) for i, output in zip(missing, outputs)}
+      # Empty results are returned but not stored, so they are retried.
+      self.cache.set_multi({k: v for k, v in fresh.items() if v})
+      cached.update(fresh)
+    for key in keys:
+      yield cached[key]
+
+  def infer_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+    """Streams one prompt, serving it from the cache when possible.
+
+    A cached response is yielded whole. On a miss the wrapped model's stream
+    is passed through piece by piece, and the joined text is stored only if
+    the stream ran to completion; a stream closed early, e.g. by a
+    StreamGuard abort, is not cached.
+
+    Args:
+      prompt: The prompt to run.
+      **kwargs: Additional arguments for inference, as for infer().
+
+    Yields:
+      Consecutive pieces of the output.
+    """
+    key = make_cache_key(self.model, prompt, kwargs)
+    cached = self.cache.get_multi([key]).get(key)
+    if cached is not None:
+      if cached and cached[0].output:
+        yield cached[0].output
+      return
+
+    stream = self.model.infer_stream(prompt, **self._model_kwargs(kwargs))
+    pieces = []
+    try:
+      for piece in stream:
+        pieces.append(piece)
+        yield piece
+    finally:
+      close = getattr(stream, "close", None)
+      if close is not None:
+        close()
+    text = "".join(pieces)
+    if text:
+      self.cache.set_multi({key: [types.ScoredOutput(score=1.0, output=text)]})
+
+  async def infer_async(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[types.ScoredOutput]]:
+    """Async counterpart of infer() using the wrapped model's infer_async."""
+    keys = self._keys(batch_prompts, kwargs)
+    cached = self.cache.get_multi(keys)
+    missing = [i for i, key in enumerate(keys) if key not in cached]
+    if missing:
+      outputs = await self.model.infer_async(
+          [batch_prompts[i] for i in missing], **self._model_kwargs(kwargs)
+      )
+      fresh = {keys[i]: _as_list(output) for i, output in zip(missing, outputs)}
+      # Empty results are returned but not stored, so they are retried.
+      self.cache.set_multi({k: v for k, v in fresh.items() if v})
+      cached.update(fresh)
+    return [cached[key] for key in keys]
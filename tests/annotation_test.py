@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from collections.abc import Sequence
 import dataclasses
 import inspect
+import random
 import textwrap
+import threading
+import time
 from typing import Type
 from unittest import mock
 
@@ -25,8 +29,10 @@ from absl.testing import parameterized
 from langextract import annotation
 from langextract import prompting
 from langextract import resolver as resolver_lib
+from langextract.core import base_model
 from langextract.core import data
 from langextract.core import exceptions
+from langextract.core import streaming
 from langextract.core import tokenizer
 from langextract.core import types
 from langextract.providers import gemini
@@ -985,6 +991,120 @@ class AnnotatorMultiPassTest(absltest.TestCase):
     self.assertEqual(result.extractions[0].extraction_class, "test")
 
 
+class MultiPassStreamingTest(parameterized.TestCase):
+  """Tests for shared chunking and streaming emission across passes."""
+
+  _DOCS = (
+      ("doc1", "Patient took Ibuprofen."),
+      ("doc2", "Patient was given Cefazolin."),
+      ("doc3", "No medications were administered."),
+  )
+
+  def setUp(self):
+    super().setUp()
+    self.mock_language_model = self.enter_context(
+        mock.patch.object(gemini, "GeminiLanguageModel", autospec=True)
+    )
+    self.annotator = annotation.Annotator(
+        language_model=self.mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+    self.infer_calls = []
+
+    def mock_infer(batch_prompts, **_):
+      self.infer_calls.append(list(batch_prompts))
+      return [
+          [types.ScoredOutput(score=1.0, output=self._response_for(p))]
+          for p in batch_prompts
+      ]
+
+    self.mock_language_model.infer.side_effect = mock_infer
+
+  def _response_for(self, prompt):
+    for med in ("Ibuprofen", "Cefazolin"):
+      if med in prompt:
+        return f'```yaml\n{data.EXTRACTIONS_KEY}:\n- medication: "{med}"\n```'
+    return f"```yaml\n{data.EXTRACTIONS_KEY}: []\n```"
+
+  def _annotate(self, documents, **kwargs):
+    return self.annotator.annotate_documents(
+        documents,
+        resolver=resolver_lib.Resolver(format_type=data.FormatType.YAML),
+        max_char_buffer=200,
+        batch_length=1,
+        show_progress=False,
+        debug=False,
+        extraction_passes=3,
+        **kwargs,
+    )
+
+  def test_passes_share_prompts_and_run_per_batch(self):
+    docs = [data.Document(text=t, document_id=i) for i, t in self._DOCS]
+
+    # Lock-step, so that calls are recorded in submission order.
+    results = list(self._annotate(docs, pipeline_depth=0))
+
+    self.assertEqual([d.document_id for d in results], ["doc1", "doc2", "doc3"])
+    self.assertEqual(
+        [[e.extraction_text for e in d.extractions] for d in results],
+        [["Ibuprofen"], ["Cefazolin"], []],
+    )
+    # Three passes per batch, issued back to back with identical prompts.
+    self.assertLen(self.infer_calls, 9)
+    for i in range(0, 9, 3):
+      self.assertEqual(self.infer_calls[i], self.infer_calls[i + 1])
+      self.assertEqual(self.infer_calls[i], self.infer_calls[i + 2])
+    self.assertIn("Ibuprofen", self.infer_calls[0][0])
+    self.assertIn("Cefazolin", self.infer_calls[3][0])
+
+  def test_documents_stream_before_input_is_exhausted(self):
+    consumed = []
+
+    def doc_stream():
+      for doc_id, text in self._DOCS:
+        consumed.append(doc_id)
+        yield data.Document(text=text, document_id=doc_id)
+
+    # Lock-step, so that no later batch is read ahead.
+    results = self._annotate(doc_stream(), pipeline_depth=0)
+    first = next(results)
+
+    self.assertEqual(first.document_id, "doc1")
+    self.assertNotIn("doc3", consumed)
+    self.assertLen(list(results), 2)
+
+  def test_pipelined_passes_are_in_flight_together(self):
+    calls_in_flight = threading.Barrier(3, timeout=5)
+
+    def mock_infer(batch_prompts, **_):
+      # Completes only if all three passes of the batch run concurrently.
+      calls_in_flight.wait()
+      return [
+          [types.ScoredOutput(score=1.0, output=self._response_for(p))]
+          for p in batch_prompts
+      ]
+
+    self.mock_language_model.infer.side_effect = mock_infer
+    docs = [data.Document(text=self._DOCS[0][1], document_id="doc1")]
+
+    results = list(self._annotate(docs))
+
+    self.assertEqual(
+        [e.extraction_text for e in results[0].extractions], ["Ibuprofen"]
+    )
+
+  @parameterized.named_parameters(
+      dict(testcase_name="single_pass", passes=1, max_workers=10, depth=0),
+      dict(testcase_name="all_passes", passes=3, max_workers=None, depth=3),
+      dict(testcase_name="within_workers", passes=3, max_workers=10, depth=3),
+      dict(testcase_name="capped_by_workers", passes=5, max_workers=2, depth=2),
+  )
+  def test_default_pipeline_depth(self, passes, max_workers, depth):
+    self.assertEqual(
+        depth, annotation._default_pipeline_depth(passes, max_workers)
+    )
+
+
 class MultiPassHelperFunctionsTest(parameterized.TestCase):
   """Tests for multi-pass helper functions."""
 
@@ -1119,6 +1239,39 @@ class MultiPassHelperFunctionsTest(parameterized.TestCase):
     result = annotation._extractions_overlap(ext1, ext2)
     self.assertEqual(result, expected)
 
+  def test_merge_matches_pairwise_reference(self):
+    """The indexed merge must agree with the pairwise overlap definition."""
+    rng = random.Random(0)
+
+    def random_extraction(i):
+      roll = rng.random()
+      if roll < 0.05:
+        interval = None
+      elif roll < 0.1:
+        interval = data.CharInterval(start_pos=None, end_pos=None)
+      else:
+        start = rng.randrange(0, 500)
+        interval = data.CharInterval(start, start + rng.randrange(0, 15))
+      return data.Extraction(f"class{i}", f"text{i}", char_interval=interval)
+
+    for _ in range(20):
+      all_extractions = [
+          [random_extraction(i) for i in range(rng.randrange(0, 60))]
+          for _ in range(rng.randrange(2, 5))
+      ]
+
+      expected = list(all_extractions[0])
+      for pass_extractions in all_extractions[1:]:
+        for extraction in pass_extractions:
+          if not any(
+              annotation._extractions_overlap(extraction, existing)
+              for existing in expected
+          ):
+            expected.append(extraction)
+
+      result = annotation._merge_non_overlapping_extractions(all_extractions)
+      self.assertEqual([id(e) for e in result], [id(e) for e in expected])
+
 
 class AnnotateDocumentsGeneratorTest(absltest.TestCase):
   """Tests that annotate_documents uses 'yield from' for proper delegation."""
@@ -1362,5 +1515,456 @@ class CrossChunkContextTest(absltest.TestCase):
     self.assertNotIn("Doc1", doc2_chunk2_prompt)
 
 
+class PipelinedInferenceTest(absltest.TestCase):
+  """Tests for overlapping inference with resolution via pipeline_depth."""
+
+  _DOCS = (
+      ("doc1", "Patient took 400 mg PO Ibuprofen q4h for two days."),
+      ("doc2", "Patient was given 250 mg IV Cefazolin TID for one week."),
+      ("doc3", "No medications were administered."),
+  )
+
+  def setUp(self):
+    super().setUp()
+    self.mock_language_model = self.enter_context(
+        mock.patch.object(gemini, "GeminiLanguageModel", autospec=True)
+    )
+    self.annotator = annotation.Annotator(
+        language_model=self.mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+
+  def _response_for(self, prompt):
+    for med in ("Ibuprofen", "Cefazolin"):
+      if med in prompt:
+        return textwrap.dedent(f"""\
+            ```yaml
+            {data.EXTRACTIONS_KEY}:
+            - medication: "{med}"
+            ```""")
+    return f"```yaml\n{data.EXTRACTIONS_KEY}: []\n```"
+
+  def _annotate(self, pipeline_depth):
+    docs = [data.Document(text=t, document_id=i) for i, t in self._DOCS]
+    return list(
+        self.annotator.annotate_documents(
+            docs,
+            resolver=resolver_lib.Resolver(format_type=data.FormatType.YAML),
+            max_char_buffer=200,
+            batch_length=1,
+            show_progress=False,
+            debug=False,
+            pipeline_depth=pipeline_depth,
+        )
+    )
+
+  def test_pipelined_matches_lock_step(self):
+    def mock_infer(batch_prompts, **_):
+      for prompt in batch_prompts:
+        yield [types.ScoredOutput(score=1.0, output=self._response_for(prompt))]
+
+    self.mock_language_model.infer.side_effect = mock_infer
+
+    expected = self._annotate(pipeline_depth=0)
+    actual = self._annotate(pipeline_depth=2)
+
+    self.assertEqual([d.document_id for d in actual], ["doc1", "doc2", "doc3"])
+    for expected_doc, actual_doc in zip(expected, actual):
+      self.assertDataclassEqual(expected_doc, actual_doc)
+
+  def test_next_batch_in_flight_before_previous_returns(self):
+    second_batch_started = threading.Event()
+
+    def mock_infer(batch_prompts, **_):
+      if "Cefazolin" in batch_prompts[0]:
+        second_batch_started.set()
+      elif "Ibuprofen" in batch_prompts[0]:
+        # Only completes promptly if the next batch was submitted concurrently.
+        second_batch_started.wait(timeout=5)
+      return [
+          [types.ScoredOutput(score=1.0, output=self._response_for(p))]
+          for p in batch_prompts
+      ]
+
+    self.mock_language_model.infer.side_effect = mock_infer
+
+    results = self._annotate(pipeline_depth=2)
+
+    self.assertTrue(second_batch_started.is_set())
+    self.assertEqual([d.document_id for d in results], ["doc1", "doc2", "doc3"])
+    self.assertEqual(
+        [e.extraction_text for e in results[0].extractions], ["Ibuprofen"]
+    )
+
+  def test_inference_error_propagates(self):
+    self.mock_language_model.infer.side_effect = (
+        exceptions.InferenceRuntimeError("boom")
+    )
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      self._annotate(pipeline_depth=1)
+
+  def test_negative_depth_raises(self):
+    with self.assertRaises(ValueError):
+      self._annotate(pipeline_depth=-1)
+
+
+class StreamingAnnotationTest(absltest.TestCase):
+  """Tests for resolving and aligning extractions while output streams."""
+
+  _TEXT = "Patient took 400 mg PO Ibuprofen and 250 mg IV Cefazolin."
+  _OUTPUT = textwrap.dedent(f"""\
+      ```yaml
+      {data.EXTRACTIONS_KEY}:
+      - medication: "Ibuprofen"
+      - medication: "Cefazolin"
+      ```""")
+
+  def setUp(self):
+    super().setUp()
+    self.mock_language_model = self.enter_context(
+        mock.patch.object(gemini, "GeminiLanguageModel", autospec=True)
+    )
+    self.mock_language_model.max_workers = 1
+    self.annotator = annotation.Annotator(
+        language_model=self.mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+    self.resolver = resolver_lib.Resolver(format_type=data.FormatType.YAML)
+
+  def _annotate(self, **kwargs):
+    return self.annotator.annotate_text(
+        self._TEXT,
+        resolver=self.resolver,
+        max_char_buffer=200,
+        show_progress=False,
+        debug=False,
+        **kwargs,
+    )
+
+  def test_stream_matches_non_streaming(self):
+    self.mock_language_model.infer.return_value = [
+        [types.ScoredOutput(score=1.0, output=self._OUTPUT)]
+    ]
+    self.mock_language_model.infer_stream.side_effect = (
+        lambda prompt, **_: iter(self._OUTPUT.splitlines(keepends=True))
+    )
+
+    expected = self._annotate()
+    actual = self._annotate(stream=True)
+
+    self.assertDataclassEqual(expected, actual)
+
+  def test_extraction_aligned_before_stream_ends(self):
+    aligned_before_end = []
+    align = self.resolver.align
+
+    def recording_align(extractions, *args, **kwargs):
+      aligned_before_end.extend(
+          e.extraction_text for e in extractions if not stream_done.is_set()
+      )
+      return align(extractions, *args, **kwargs)
+
+    stream_done = threading.Event()
+
+    def infer_stream(unused_prompt, **_):
+      yield from self._OUTPUT.splitlines(keepends=True)
+      stream_done.set()
+
+    self.mock_language_model.infer_stream.side_effect = infer_stream
+    self.enter_context(
+        mock.patch.object(self.resolver, "align", side_effect=recording_align)
+    )
+
+    result = self._annotate(stream=True)
+
+    self.assertEqual(["Ibuprofen"], aligned_before_end)
+    self.assertEqual(
+        ["Ibuprofen", "Cefazolin"],
+        [e.extraction_text for e in result.extractions],
+    )
+
+  def test_repetition_loop_stops_generation(self):
+    closed = threading.Event()
+    loop_item = '- medication: "Ibuprofen"\n'
+
+    def infer_stream(unused_prompt, **_):
+      try:
+        yield f"{data.EXTRACTIONS_KEY}:\n"
+        while True:
+          yield loop_item
+      finally:
+        closed.set()
+
+    self.mock_language_model.infer_stream.side_effect = infer_stream
+
+    result = self._annotate(
+        stream=True,
+        stream_limits=streaming.StreamLimits(check_interval=1),
+    )
+
+    self.assertTrue(closed.is_set())
+    self.assertNotEmpty(result.extractions)
+    self.assertEqual(
+        {"Ibuprofen"}, {e.extraction_text for e in result.extractions}
+    )
+
+
+  def test_streams_share_model_pool_bounded_by_max_workers(self):
+    model = _StreamingPoolModel(max_workers=2)
+    annotator = annotation.Annotator(
+        language_model=model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+
+    for _ in range(2):
+      list(
+          annotator.annotate_documents(
+              [
+                  data.Document(text=self._TEXT, document_id="doc1"),
+                  data.Document(text=self._TEXT, document_id="doc2"),
+                  data.Document(text=self._TEXT, document_id="doc3"),
+              ],
+              resolver=self.resolver,
+              max_char_buffer=200,
+              batch_length=3,
+              show_progress=False,
+              debug=False,
+              stream=True,
+          )
+      )
+
+    self.assertLessEqual(model.peak, 2)
+    self.assertLessEqual(len(model.threads), 2)
+    self.assertTrue(
+        all(name.startswith("_StreamingPoolModel") for name in model.threads)
+    )
+
+
+class _StreamingPoolModel(base_model.BaseLanguageModel):
+  """Streams a fixed output and records which threads ran the streams."""
+
+  def __init__(self, max_workers):
+    super().__init__()
+    self.max_workers = max_workers
+    self.threads = set()
+    self.peak = 0
+    self._active = 0
+    self._lock = threading.Lock()
+
+  def infer(self, batch_prompts, **kwargs):
+    raise AssertionError("infer called")
+
+  def infer_stream(self, prompt, **kwargs):
+    with self._lock:
+      self._active += 1
+      self.peak = max(self.peak, self._active)
+      self.threads.add(threading.current_thread().name)
+    try:
+      time.sleep(0.01)
+      yield from StreamingAnnotationTest._OUTPUT.splitlines(keepends=True)
+    finally:
+      with self._lock:
+        self._active -= 1
+
+
+class BudgetBatchingTest(absltest.TestCase):
+  """Tests for character-budget batching across documents."""
+
+  def test_char_budget_batches_span_documents(self):
+    mock_language_model = self.enter_context(
+        mock.patch.object(gemini, "GeminiLanguageModel", autospec=True)
+    )
+    batch_sizes = []
+
+    def mock_infer(batch_prompts, **_):
+      batch_sizes.append(len(batch_prompts))
+      for prompt in batch_prompts:
+        med = "Ibuprofen" if "Ibuprofen" in prompt else "Cefazolin"
+        yield [
+            types.ScoredOutput(
+                score=1.0,
+                output=(
+                    f"```yaml\n{data.EXTRACTIONS_KEY}:\n- medication:"
+                    f' "{med}"\n```'
+                ),
+            )
+        ]
+
+    mock_language_model.infer.side_effect = mock_infer
+    annotator = annotation.Annotator(
+        language_model=mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+    docs = [
+        data.Document(text="Took Ibuprofen.", document_id="doc1"),
+        data.Document(text="Given Cefazolin.", document_id="doc2"),
+    ]
+
+    results = list(
+        annotator.annotate_documents(
+            docs,
+            resolver=resolver_lib.Resolver(format_type=data.FormatType.YAML),
+            max_char_buffer=200,
+            batch_length=1,
+            show_progress=False,
+            debug=False,
+            max_batch_chars=1000,
+        )
+    )
+
+    self.assertEqual(batch_sizes, [2])
+    self.assertEqual([d.document_id for d in results], ["doc1", "doc2"])
+    self.assertEqual(
+        [e.extraction_text for d in results for e in d.extractions],
+        ["Ibuprofen", "Cefazolin"],
+    )
+
+
+class _AsyncFakeModel(base_model.BaseLanguageModel):
+  """Fake model with a native infer_async that records concurrency."""
+
+  def __init__(self, respond, delay=0.01):
+    super().__init__()
+    self._respond = respond
+    self._delay = delay
+    self.in_flight = 0
+    self.max_in_flight = 0
+
+  def infer(self, batch_prompts, **kwargs):
+    raise AssertionError("infer() should not be used by the async path")
+
+  async def infer_async(self, batch_prompts, **kwargs):
+    self.in_flight += 1
+    self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    try:
+      await asyncio.sleep(self._delay)
+      return [
+          [types.ScoredOutput(score=1.0, output=self._respond(p))]
+          for p in batch_prompts
+      ]
+    finally:
+      self.in_flight -= 1
+
+
+class AnnotateDocumentsAsyncTest(absltest.TestCase):
+  """Tests for Annotator.annotate_documents_async."""
+
+  @staticmethod
+  def _respond(prompt):
+    for med in ("Ibuprofen", "Cefazolin", "Aspirin"):
+      if med in prompt:
+        return f"```yaml\n{data.EXTRACTIONS_KEY}:\n- medication: {med}\n```"
+    return f"```yaml\n{data.EXTRACTIONS_KEY}: []\n```"
+
+  def _annotate(self, model, docs, **kwargs):
+    annotator = annotation.Annotator(
+        language_model=model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+
+    async def _collect():
+      return [
+          doc
+          async for doc in annotator.annotate_documents_async(
+              docs,
+              resolver=resolver_lib.Resolver(format_type=data.FormatType.YAML),
+              debug=False,
+              **kwargs,
+          )
+      ]
+
+    return asyncio.run(_collect())
+
+  def test_streams_documents_in_order(self):
+    docs = [
+        data.Document(
+            text="Patient took Ibuprofen. Then rested. Slept well.",
+            document_id="doc1",
+        ),
+        data.Document(text="", document_id="empty"),
+        data.Document(text="Given Cefazolin IV.", document_id="doc2"),
+        data.Document(text="Took Aspirin.", document_id="doc3"),
+    ]
+    model = _AsyncFakeModel(self._respond)
+
+    results = self._annotate(model, docs, max_char_buffer=20)
+
+    self.assertEqual(
+        [d.document_id for d in results], ["doc1", "empty", "doc2", "doc3"]
+    )
+    self.assertEqual(
+        [[e.extraction_text for e in d.extractions] for d in results],
+        [["Ibuprofen"], [], ["Cefazolin"], ["Aspirin"]],
+    )
+
+  def test_concurrency_bounded_by_semaphore(self):
+    docs = [
+        data.Document(text=f"Took Aspirin on day {i}.", document_id=f"d{i}")
+        for i in range(20)
+    ]
+    model = _AsyncFakeModel(self._respond)
+
+    results = self._annotate(model, docs, max_concurrency=4)
+
+    self.assertLen(results, 20)
+    self.assertEqual(model.max_in_flight, 4)
+
+  def test_default_infer_async_uses_sync_infer(self):
+    respond = self._respond
+
+    class SyncOnlyModel(base_model.BaseLanguageModel):  # pylint: disable=too-few-public-methods
+
+      def infer(self, batch_prompts, **kwargs):
+        for prompt in batch_prompts:
+          yield [types.ScoredOutput(score=1.0, output=respond(prompt))]
+
+    results = self._annotate(
+        SyncOnlyModel(), [data.Document(text="Took Aspirin.", document_id="d")]
+    )
+
+    self.assertEqual(
+        [e.extraction_text for e in results[0].extractions], ["Aspirin"]
+    )
+
+  def test_chunking_and_resolution_run_off_event_loop(self):
+    loop_thread = threading.get_ident()
+    threads = {"tokenize": set(), "resolve": set()}
+    real_tokenize = tokenizer.tokenize
+    real_resolve = resolver_lib.Resolver.resolve
+
+    def tokenize(*args, **kwargs):
+      threads["tokenize"].add(threading.get_ident())
+      return real_tokenize(*args, **kwargs)
+
+    def resolve(self, *args, **kwargs):
+      threads["resolve"].add(threading.get_ident())
+      return real_resolve(self, *args, **kwargs)
+
+    self.enter_context(mock.patch.object(tokenizer, "tokenize", tokenize))
+    self.enter_context(
+        mock.patch.object(resolver_lib.Resolver, "resolve", resolve)
+    )
+
+    results = self._annotate(
+        _AsyncFakeModel(self._respond),
+        [data.Document(text="Took Aspirin.", document_id="d")],
+    )
+
+    self.assertEqual(
+        [e.extraction_text for e in results[0].extractions], ["Aspirin"]
+    )
+    self.assertTrue(threads["tokenize"])
+    self.assertTrue(threads["resolve"])
+    self.assertNotIn(loop_thread, threads["tokenize"] | threads["resolve"])
+
+  def test_invalid_concurrency_raises(self):
+    with self.assertRaises(ValueError):
+      self._annotate(
+          _AsyncFakeModel(self._respond),
+          [data.Document(text="x", document_id="d")],
+          max_concurrency=0,
+      )
+
+
 if __name__ == "__main__":
   absltest.main()
@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.providers.batch_cache."""
+
+import dataclasses
+import os
+import tempfile
+
+from absl.testing import absltest
+
+from langextract.providers import batch_cache
+
+
+class SQLiteBatchCacheTest(absltest.TestCase):
+
+  def test_round_trip_and_partial_hits(self):
+    cache = batch_cache.SQLiteBatchCache(":memory:")
+    self.addCleanup(cache.close)
+
+    cache.set_multi([({"prompt": "a"}, "ra"), ({"prompt": "b"}, "rb")])
+    hits = cache.get_multi([{"prompt": "b"}, {"prompt": "c"}, {"prompt": "a"}])
+
+    self.assertEqual({0: "rb", 2: "ra"}, hits)
+    self.assertLen(cache, 2)
+    self.assertIsInstance(cache, batch_cache.BatchCache)
+
+  def test_key_order_does_not_matter(self):
+    cache = batch_cache.SQLiteBatchCache(":memory:")
+    self.addCleanup(cache.close)
+
+    cache.set_multi([({"model_id": "m", "prompt": "p"}, "r")])
+
+    self.assertEqual(
+        {0: "r"}, cache.get_multi([{"prompt": "p", "model_id": "m"}])
+    )
+
+  def test_non_string_results_serialized(self):
+    @dataclasses.dataclass
+    class Result:
+      value: int
+
+    cache = batch_cache.SQLiteBatchCache(":memory:")
+    self.addCleanup(cache.close)
+
+    cache.set_multi([({"prompt": "a"}, Result(1)), ({"prompt": "b"}, object())])
+
+    self.assertEqual(
+        [(batch_cache.compute_hash({"prompt": "a"}), '{"value": 1}')],
+        list(cache.iter_items()),
+    )
+
+  def test_persists_across_instances(self):
+    path = os.path.join(
+        self.enter_context(tempfile.TemporaryDirectory()), "sub", "c.sqlite"
+    )
+    with batch_cache.SQLiteBatchCache(path) as cache:
+      cache.set_multi([({"prompt": "a"}, "ra")])
+
+    with batch_cache.SQLiteBatchCache(path) as cache:
+      self.assertEqual({0: "ra"}, cache.get_multi([{"prompt": "a"}]))
+
+  def test_many_keys_in_one_lookup(self):
+    cache = batch_cache.SQLiteBatchCache(":memory:")
+    self.addCleanup(cache.close)
+    items = [({"prompt": str(i)}, f"r{i}") for i in range(1200)]
+
+    cache.set_multi(items)
+    hits = cache.get_multi([key_data for key_data, _ in items])
+
+    self.assertLen(hits, 1200)
+    self.assertEqual("r1199", hits[1199])
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,204 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.literature.biorxiv_client."""
+
+import threading
+from unittest import mock
+
+from absl.testing import absltest
+
+from langextract.literature import biorxiv_client
+from langextract.literature import metadata_cache
+from langextract.literature import term_matcher
+
+
+_FILLER = "Background and methods are described in full. " * 2
+
+
+def _paper(i, title="", abstract="", doi=None):
+  return {
+      "doi": doi or f"10.1101/{i:04d}",
+      "title": f"{title or 'Untitled'}: preprint number {i}",
+      "abstract": f"{abstract} {_FILLER}",
+      "date": "2025-01-02",
+      "version": "1",
+  }
+
+
+class _FakeDetailsApi:
+  """Serves /details/{server}/{start}/{end}/{cursor} in pages."""
+
+  def __init__(self, papers, page_size=3):
+    self.papers = papers
+    self.page_size = page_size
+    self.urls = []
+    self._lock = threading.Lock()
+
+  def get(self, url, timeout=None):
+    del timeout
+    with self._lock:
+      self.urls.append(url)
+    cursor = int(url.rsplit("/", 1)[1])
+    page = self.papers[cursor : cursor + self.page_size]
+    response = mock.Mock()
+    response.json.return_value = {
+        "messages": [{
+            "status": "ok",
+            "cursor": cursor,
+            "count": len(page),
+            "total": str(len(self.papers)),
+        }],
+        "collection": page,
+    }
+    return response
+
+
+class BioRxivClientTest(absltest.TestCase):
+
+  def _client(self, papers, page_size=3):
+    client = biorxiv_client.BioRxivClient(
+        requests_per_minute=60_000, max_workers=3
+    )
+    client.session = _FakeDetailsApi(papers, page_size)
+    return client
+
+  def test_fetch_papers_follows_cursor_pages_in_order(self):
+    papers = [_paper(i) for i in range(10)]
+    client = self._client(papers)
+
+    fetched = client.fetch_papers("2025-01-01", "2025-01-31")
+
+    self.assertEqual(papers, fetched)
+    self.assertCountEqual(
+        [
+            f"https://api.biorxiv.org/details/biorxiv/2025-01-01/2025-01-31/{c}"
+            for c in (0, 3, 6, 9)
+        ],
+        client.session.urls,
+    )
+
+  def test_fetch_papers_empty_window(self):
+    client = self._client([])
+
+    self.assertEqual([], client.fetch_papers("2025-01-01", "2025-01-02"))
+    self.assertLen(client.session.urls, 1)
+
+  def test_search_biomarkers_downloads_window_once(self):
+    papers = [
+        _paper(0, abstract="Serum IL-6 levels rose."),
+        _paper(1, title="CRP as a marker"),
+        _paper(2, abstract="Nothing relevant."),
+        _paper(3, abstract="crp and il-6 together"),
+        _paper(4, title="IL-6 again", doi="10.1101/0000"),
+        _paper(5, abstract="troponin"),
+        _paper(6, abstract="more CRP"),
+    ]
+    client = self._client(papers)
+
+    found = client.search_biomarkers(["CRP", "IL-6", "ferritin"])
+
+    self.assertLen(client.session.urls, 3)
+    self.assertEqual(
+        ["10.1101/0001", "10.1101/0003", "10.1101/0006", "10.1101/0000"],
+        [paper.doi for paper in found],
+    )
+
+  def test_search_biomarkers_matches_per_term_search(self):
+    papers = [
+        _paper(i, abstract=text)
+        for i, text in enumerate(
+            ["ALPHA beta", "gamma", "beta gamma", "delta", "alphabet"]
+        )
+    ]
+    terms = ["gamma", "alpha", "beta"]
+    client = self._client(papers)
+
+    expected = []
+    for term in terms:
+      for paper in client.search_by_keyword(term):
+        if paper.doi not in [p.doi for p in expected]:
+          expected.append(paper)
+
+    self.assertEqual(
+        [p.doi for p in expected],
+        [p.doi for p in client.search_biomarkers(terms)],
+    )
+
+  def test_cache_reuses_parsed_papers_of_same_version(self):
+    papers = [_paper(i, abstract="CRP") for i in range(4)]
+    cache = metadata_cache.MetadataCache(":memory:")
+    self.addCleanup(cache.close)
+    client = self._client(papers)
+    client.cache = cache
+
+    first = client.search_biomarkers(["crp"])
+    papers[1] = dict(papers[1], version="2", title="Revised: CRP preprint")
+    parse = self.enter_context(
+        mock.patch.object(
+            client, "_parse_preprint", wraps=client._parse_preprint
+        )
+    )
+    second = client.search_by_keyword("crp")
+
+    self.assertEqual(first[0], second[0])
+    self.assertEqual(
+        ["10.1101/0001"], [call.args[0]["doi"] for call in parse.mock_calls]
+    )
+    self.assertEqual("Revised: CRP preprint", second[1].title)
+    self.assertEqual(
+        "Revised: CRP preprint", cache.get("doi:10.1101/0001").title
+    )
+
+  def test_rate_limit_spaces_concurrent_requests(self):
+    client = biorxiv_client.BioRxivClient(requests_per_minute=60)
+    slept = []
+
+    with mock.patch.object(
+        biorxiv_client.time, "time", return_value=100.0
+    ), mock.patch.object(biorxiv_client.time, "sleep", slept.append):
+      for _ in range(3):
+        client._rate_limit()
+
+    self.assertEqual([1.0, 2.0], slept)
+
+
+class TermMatcherTest(absltest.TestCase):
+
+  def test_overlapping_and_nested_terms(self):
+    matcher = term_matcher.TermMatcher(["he", "she", "his", "hers", "IL-6"])
+
+    self.assertEqual({"he", "she", "hers"}, matcher.find("USHERS"))
+    self.assertEqual({"IL-6"}, matcher.find("sIL-6R"))
+    self.assertEqual(set(), matcher.find("xyz"))
+
+  def test_same_semantics_as_substring_search(self):
+    terms = ["ab", "b", "abc", "bca", "c", "AB"]
+    texts = ["abcabc", "cab", "", "BCA", "aab"]
+    matcher = term_matcher.TermMatcher(terms)
+
+    for text in texts:
+      expected = {t for t in terms if t.lower() in text.lower()}
+      self.assertEqual(expected, matcher.find(text), text)
+      self.assertEqual(bool(expected), matcher.matches(text), text)
+
+  def test_case_sensitive(self):
+    matcher = term_matcher.TermMatcher(["CRP"], case_sensitive=True)
+
+    self.assertFalse(matcher.matches("crp"))
+    self.assertTrue(matcher.matches("hs-CRP"))
+
+
+if __name__ == "__main__":
+  absltest.main()
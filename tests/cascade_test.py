@@ -0,0 +1,291 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.cascade."""
+
+import asyncio
+import json
+
+from absl.testing import absltest
+
+import langextract as lx
+from langextract import cascade
+from langextract.core import base_model
+from langextract.core import data
+from langextract.core import exceptions
+from langextract.core import types
+
+
+def _answer(*texts):
+  return json.dumps({"extractions": [{"medication": t} for t in texts]})
+
+
+def _prompt(chunk):
+  return f"Extract medications.\n\nQ: {chunk}\nA: "
+
+
+class _Model(base_model.BaseLanguageModel):
+  """Answers each prompt with answer_fn(chunk text) and records calls."""
+
+  def __init__(self, answer_fn, score=1.0, error=None):
+    super().__init__()
+    self._answer_fn = answer_fn
+    self._score = score
+    self._error = error
+    self.prompts = []
+    self.kwargs = []
+
+  def infer(self, batch_prompts, **kwargs):
+    self.kwargs.append(kwargs)
+    if self._error is not None:
+      raise self._error
+    for prompt in batch_prompts:
+      self.prompts.append(prompt)
+      chunk = prompt.rpartition("Q: ")[2].removesuffix("\nA: ")
+      yield [types.ScoredOutput(score=self._score, output=self._answer_fn(chunk))]
+
+  def infer_stream(self, prompt, **kwargs):
+    output = next(self.infer([prompt], **kwargs))[0].output
+    yield output[: len(output) // 2]
+    yield output[len(output) // 2 :]
+
+
+def _strong():
+  return _Model(lambda chunk: _answer("strong"))
+
+
+def _outputs(results):
+  return [r[0].output for r in results]
+
+
+class CascadeLanguageModelTest(absltest.TestCase):
+
+  def _cascade(self, cheap_fn, policy=None, **cheap_kwargs):
+    self.cheap = _Model(cheap_fn, **cheap_kwargs)
+    self.strong = _strong()
+    return cascade.CascadeLanguageModel(self.cheap, self.strong, policy)
+
+  def test_aligned_and_empty_answers_stay_on_cheap_model(self):
+    model = self._cascade(
+        lambda chunk: _answer("aspirin") if "aspirin" in chunk else _answer()
+    )
+
+    outputs = _outputs(
+        model.infer([_prompt("Took aspirin."), _prompt("Nothing here.")])
+    )
+
+    self.assertEqual([_answer("aspirin"), _answer()], outputs)
+    self.assertEmpty(self.strong.prompts)
+    self.assertEqual(2, model.stats.cheap_accepted)
+    self.assertEqual(0.0, model.stats.escalation_rate)
+
+  def test_invented_extraction_escalated(self):
+    model = self._cascade(lambda chunk: _answer("aspirin", "warfarin"))
+    prompts = [_prompt("Took aspirin."), _prompt("Took aspirin and warfarin.")]
+
+    outputs = _outputs(model.infer(prompts))
+
+    self.assertEqual([_answer("strong"), _answer("aspirin", "warfarin")], outputs)
+    self.assertEqual(prompts[:1], self.strong.prompts)
+    self.assertEqual({"unaligned": 1}, dict(model.stats.escalation_reasons))
+
+  def test_parse_error_escalated(self):
+    model = self._cascade(lambda chunk: "not json at all {")
+
+    outputs = _outputs(model.infer([_prompt("Took aspirin.")]))
+
+    self.assertEqual([_answer("strong")], outputs)
+    self.assertEqual({"parse_error": 1}, dict(model.stats.escalation_reasons))
+
+  def test_fuzzy_alignment_escalated(self):
+    model = self._cascade(
+        lambda chunk: _answer("aspirins tablets daily"),
+        cascade.CascadePolicy(max_fuzzy_ratio=0.0),
+    )
+
+    outputs = _outputs(model.infer([_prompt("Took aspirin tablets daily.")]))
+
+    self.assertEqual([_answer("strong")], outputs)
+    self.assertEqual({"fuzzy": 1}, dict(model.stats.escalation_reasons))
+
+  def test_low_score_and_custom_rule(self):
+    low = self._cascade(
+        lambda chunk: _answer(),
+        cascade.CascadePolicy(min_score=0.5),
+        score=0.2,
+    )
+    self.assertEqual([_answer("strong")], _outputs(low.infer([_prompt("x")])))
+    self.assertEqual({"low_score": 1}, dict(low.stats.escalation_reasons))
+
+    seen = []
+
+    def too_many(candidate):
+      seen.append(candidate)
+      return len(candidate.extractions) > 1
+
+    ruled = self._cascade(
+        lambda chunk: _answer("aspirin", "warfarin"),
+        cascade.CascadePolicy(rules=[too_many]),
+    )
+    self.assertEqual(
+        [_answer("strong")],
+        _outputs(ruled.infer([_prompt("aspirin and warfarin")])),
+    )
+    self.assertEqual("aspirin and warfarin", seen[0].source_text)
+    self.assertEqual(
+        data.AlignmentStatus.MATCH_EXACT, seen[0].extractions[0].alignment_status
+    )
+
+  def test_cheap_error_escalates_batch(self):
+    model = self._cascade(
+        lambda chunk: _answer(), error=exceptions.InferenceRuntimeError("down")
+    )
+
+    outputs = _outputs(model.infer([_prompt("a"), _prompt("b")]))
+
+    self.assertEqual([_answer("strong")] * 2, outputs)
+    self.assertEqual({"cheap_error": 2}, dict(model.stats.escalation_reasons))
+
+  def test_cheap_error_raised_when_not_escalating(self):
+    model = self._cascade(
+        lambda chunk: _answer(),
+        cascade.CascadePolicy(escalate_on_error=False),
+        error=exceptions.InferenceRuntimeError("down"),
+    )
+
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      list(model.infer([_prompt("a")]))
+
+  def test_infer_async(self):
+    model = self._cascade(lambda chunk: _answer("warfarin"))
+
+    outputs = asyncio.run(
+        model.infer_async([_prompt("warfarin"), _prompt("aspirin")])
+    )
+
+    self.assertEqual([_answer("warfarin"), _answer("strong")], _outputs(outputs))
+    self.assertEqual(1, model.stats.escalated)
+
+  def test_question_prefix_inside_chunk_kept(self):
+    model = self._cascade(lambda chunk: _answer("Plasma"))
+
+    outputs = _outputs(
+        model.infer([_prompt("Plasma CoQ: 0.8 umol/L; IL-6 elevated.")])
+    )
+
+    self.assertEqual([_answer("Plasma")], outputs)
+    self.assertEmpty(self.strong.prompts)
+
+  def test_source_texts_used_for_review(self):
+    model = self._cascade(lambda chunk: _answer("Labs"))
+    prompt = _prompt("Labs:\nQ: aspirin 5 mg")
+
+    without_source = _outputs(model.infer([prompt]))
+    with_source = _outputs(
+        model.infer(
+            [prompt],
+            **{cascade.SOURCE_TEXTS_PARAM: {prompt: "Labs:\nQ: aspirin 5 mg"}},
+        )
+    )
+
+    self.assertEqual([_answer("strong")], without_source)
+    self.assertEqual([_answer("Labs")], with_source)
+    for kwargs in self.cheap.kwargs + self.strong.kwargs:
+      self.assertNotIn(cascade.SOURCE_TEXTS_PARAM, kwargs)
+
+  def test_infer_stream(self):
+    model = self._cascade(lambda chunk: _answer("warfarin"))
+
+    self.assertEqual(
+        _answer("warfarin"), "".join(model.infer_stream(_prompt("warfarin")))
+    )
+    self.assertEqual(
+        _answer("strong"), "".join(model.infer_stream(_prompt("aspirin")))
+    )
+    self.assertEqual(1, model.stats.cheap_accepted)
+    self.assertEqual(1, model.stats.escalated)
+
+
+class ExtractCascadeTest(absltest.TestCase):
+
+  def test_only_unreliable_chunks_reach_strong_model(self):
+    # The cheap model always answers "aspirin", which is wrong for the
+    # second chunk.
+    cheap = _Model(lambda chunk: _answer("aspirin"))
+    strong = _Model(
+        lambda chunk: _answer(*[d for d in ("aspirin", "ibuprofen") if d in chunk])
+    )
+    model = cascade.CascadeLanguageModel(cheap, strong)
+    examples = [
+        lx.data.ExampleData(
+            text="Took aspirin.",
+            extractions=[lx.data.Extraction("medication", "aspirin")],
+        )
+    ]
+
+    result = lx.extract(
+        "Patient took aspirin daily. Later ibuprofen.",
+        prompt_description="Extract medications.",
+        examples=examples,
+        model=model,
+        fence_output=False,
+        use_schema_constraints=False,
+        show_progress=False,
+        max_char_buffer=28,
+    )
+
+    self.assertEqual(
+        ["aspirin", "ibuprofen"],
+        [e.extraction_text for e in result.extractions],
+    )
+    self.assertLen(strong.prompts, 1)
+    self.assertIn("ibuprofen", strong.prompts[0])
+    self.assertEqual(1, model.stats.cheap_accepted)
+    self.assertIsNotNone(model.resolver)
+
+  def test_chunk_with_question_line_reviewed_against_chunk(self):
+    cheap = _Model(lambda chunk: _answer("Labs"))
+    strong = _strong()
+    model = cascade.CascadeLanguageModel(cheap, strong)
+    examples = [
+        lx.data.ExampleData(
+            text="Took aspirin.",
+            extractions=[lx.data.Extraction("medication", "aspirin")],
+        )
+    ]
+
+    for use_async in (False, True):
+      kwargs = dict(
+          prompt_description="Extract medications.",
+          examples=examples,
+          model=model,
+          fence_output=False,
+          use_schema_constraints=False,
+          resilience=True,
+          response_cache=":memory:",
+      )
+      text = "Labs:\nQ: aspirin 5 mg"
+      if use_async:
+        result = asyncio.run(lx.extract_async(text, **kwargs))
+      else:
+        result = lx.extract(text, show_progress=False, **kwargs)
+
+      self.assertEqual(
+          ["Labs"], [e.extraction_text for e in result.extractions]
+      )
+    self.assertEmpty(strong.prompts)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -63,6 +63,18 @@ class SentenceIterTest(absltest.TestCase):
     with self.assertRaises(StopIteration):
       next(sentence_iter)
 
+  def test_uses_precomputed_sentence_ends(self):
+    text = "One two. Three four."
+    tokenized_text = tokenizer.tokenize(text)
+    sentence_ends = tokenizer.find_sentence_ends(text, tokenized_text)
+    sentence_iter = chunking.SentenceIterator(
+        tokenized_text, curr_token_pos=1, sentence_ends=sentence_ends
+    )
+    self.assertEqual(
+        [tokenizer.TokenInterval(1, 3), tokenizer.TokenInterval(3, 6)],
+        list(sentence_iter),
+    )
+
 
 class ChunkIteratorTest(absltest.TestCase):
 
@@ -443,6 +455,78 @@ class BatchingTest(parameterized.TestCase):
         "Batched chunks should match expected structure",
     )
 
+  def _chunks_of_lengths(self, *lengths: int) -> list[chunking.TextChunk]:
+    chunks = []
+    for i, length in enumerate(lengths):
+      document = data.Document(text="x" * length, document_id=f"doc_{i}")
+      chunks.append(
+          chunking.TextChunk(
+              token_interval=tokenizer.TokenInterval(
+                  start_index=0, end_index=1
+              ),
+              document=document,
+          )
+      )
+    return chunks
+
+  @parameterized.named_parameters(
+      dict(
+          testcase_name="fills_up_to_char_budget",
+          lengths=(40, 40, 20, 90, 10),
+          max_batch_chars=100,
+          max_batch_tokens=None,
+          expected_sizes=[3, 2],
+      ),
+      dict(
+          testcase_name="oversized_chunk_forms_own_batch",
+          lengths=(10, 150, 10),
+          max_batch_chars=100,
+          max_batch_tokens=None,
+          expected_sizes=[1, 1, 1],
+      ),
+      dict(
+          testcase_name="token_budget",
+          lengths=(40, 40, 40),
+          max_batch_chars=None,
+          max_batch_tokens=20,
+          expected_sizes=[2, 1],
+      ),
+      dict(
+          testcase_name="tighter_budget_wins",
+          lengths=(40, 40, 40),
+          max_batch_chars=50,
+          max_batch_tokens=100,
+          expected_sizes=[1, 1, 1],
+      ),
+  )
+  def test_make_batches_with_budget(
+      self, lengths, max_batch_chars, max_batch_tokens, expected_sizes
+  ):
+    chunks = self._chunks_of_lengths(*lengths)
+    batches = list(
+        chunking.make_batches_of_textchunk(
+            iter(chunks),
+            batch_length=1,
+            max_batch_chars=max_batch_chars,
+            max_batch_tokens=max_batch_tokens,
+        )
+    )
+
+    self.assertEqual([len(batch) for batch in batches], expected_sizes)
+    self.assertEqual(
+        [chunk for batch in batches for chunk in batch],
+        chunks,
+        "Budgeted batching must preserve chunk order across documents",
+    )
+
+  def test_make_batches_rejects_non_positive_budget(self):
+    with self.assertRaisesRegex(ValueError, "max_batch_chars"):
+      list(
+          chunking.make_batches_of_textchunk(
+              iter(self._chunks_of_lengths(5)), 1, max_batch_chars=0
+          )
+      )
+
 
 class TextChunkTest(absltest.TestCase):
 
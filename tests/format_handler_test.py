@@ -22,6 +22,7 @@ from absl.testing import parameterized
 from langextract import prompting
 from langextract import resolver
 from langextract.core import data
+from langextract.core import exceptions
 from langextract.core import format_handler
 
 
@@ -306,5 +307,102 @@ class NonGeminiModelParsingTest(parameterized.TestCase):
     self.assertEqual(parsed[0]["person"], "John Smith")
 
 
+
+class StreamingParserTest(parameterized.TestCase):
+  """Tests for incremental parsing of streamed model output."""
+
+  _EXTRACTIONS = [
+      data.Extraction("medication", "Ibuprofen", attributes={"dose": "400 mg"}),
+      data.Extraction("note", 'says "stop" [1] {x}'),
+      data.Extraction("medication", "Cefazolin"),
+  ]
+
+  def _feed_by_char(self, parser, text):
+    emitted_at = []
+    for i, char in enumerate(text):
+      for item in parser.feed(char):
+        emitted_at.append((i, item))
+    return emitted_at
+
+  @parameterized.named_parameters(
+      dict(
+          testcase_name="json_fenced",
+          format_type=data.FormatType.JSON,
+          use_fences=True,
+      ),
+      dict(
+          testcase_name="json_raw",
+          format_type=data.FormatType.JSON,
+          use_fences=False,
+      ),
+      dict(
+          testcase_name="yaml_fenced",
+          format_type=data.FormatType.YAML,
+          use_fences=True,
+      ),
+      dict(
+          testcase_name="yaml_raw",
+          format_type=data.FormatType.YAML,
+          use_fences=False,
+      ),
+  )
+  def test_streamed_items_match_parse_output(self, format_type, use_fences):
+    handler = format_handler.FormatHandler(
+        format_type=format_type, use_fences=use_fences
+    )
+    text = handler.format_extraction_example(self._EXTRACTIONS)
+    parser = handler.stream_parser()
+
+    emitted_at = self._feed_by_char(parser, text)
+    remaining = parser.finish()
+
+    self.assertEqual(
+        [item for _, item in emitted_at] + remaining,
+        list(handler.parse_output(text)),
+    )
+    # Everything but the last item is available before the output ends.
+    self.assertGreaterEqual(len(emitted_at), len(self._EXTRACTIONS) - 1)
+    self.assertLess(emitted_at[0][0], text.index("Cefazolin"))
+
+  def test_top_level_list_after_think_block(self):
+    handler = format_handler.FormatHandler(
+        format_type=data.FormatType.JSON, use_fences=False
+    )
+    parser = handler.stream_parser()
+
+    first = parser.feed('<think>maybe [a] or {b}</think>[{"person": "Bob"},')
+    second = parser.feed(' {"person": "Carol"}]')
+
+    self.assertEqual([{"person": "Bob"}], first)
+    self.assertEqual([{"person": "Carol"}], second)
+    self.assertEmpty(parser.finish())
+
+  def test_other_lists_in_wrapper_are_ignored(self):
+    handler = format_handler.FormatHandler(
+        format_type=data.FormatType.JSON, use_fences=False
+    )
+    parser = handler.stream_parser()
+
+    items = parser.feed(
+        '{"notes": [{"a": "b"}], "extractions": [{"person": "Alice"}, '
+    )
+
+    self.assertEqual([{"person": "Alice"}], items)
+
+  def test_truncated_output(self):
+    handler = format_handler.FormatHandler(
+        format_type=data.FormatType.JSON, use_fences=False
+    )
+    text = '{"extractions": [{"person": "Alice"}, {"person": "Bo'
+
+    parser = handler.stream_parser()
+    self.assertEqual([{"person": "Alice"}], parser.feed(text))
+    self.assertEmpty(parser.finish(partial=True))
+
+    parser = handler.stream_parser()
+    parser.feed(text)
+    with self.assertRaises(exceptions.FormatParseError):
+      parser.finish()
+
 if __name__ == "__main__":
   absltest.main()
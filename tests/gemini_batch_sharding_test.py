@@ -0,0 +1,390 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for sharded Gemini batch submission against a local fake client."""
+
+import io
+import itertools
+import json
+import threading
+import types
+from unittest import mock
+
+from absl.testing import absltest
+from google import genai
+
+from langextract.core import exceptions
+from langextract.providers import batch_cache
+from langextract.providers import gemini_batch as gb
+
+_STATE = genai.types.JobState
+
+
+class _FakeBlob:
+
+  def __init__(self, bucket, name):
+    self._bucket = bucket
+    self.name = name
+
+  def upload_from_filename(self, path):
+    with open(path, encoding="utf-8") as f:
+      self._bucket.objects[self.name] = f.read()
+
+  def upload_from_string(self, data, content_type=None):
+    del content_type
+    self._bucket.objects[self.name] = data
+
+  def download_as_text(self):
+    return self._bucket.objects[self.name]
+
+  def open(self, mode="r", encoding=None):
+    del mode, encoding
+    return io.StringIO(self._bucket.objects[self.name])
+
+  def delete(self):
+    del self._bucket.objects[self.name]
+
+
+class _FakeBucket:
+
+  def __init__(self, name):
+    self.name = name
+    self.objects = {}
+    self.lifecycle_rules = []
+
+  def blob(self, name):
+    return _FakeBlob(self, name)
+
+  def list_blobs(self, prefix=""):
+    return [
+        _FakeBlob(self, n) for n in sorted(self.objects) if n.startswith(prefix)
+    ]
+
+
+class _FakeStorage:
+  """In-memory stand-in for google.cloud.storage.Client."""
+
+  def __init__(self):
+    self.buckets = {}
+    self._lock = threading.Lock()
+
+  def client(self, project=None):
+    del project
+    return self
+
+  def create_bucket(self, name, location=None):
+    del location
+    return self.bucket(name)
+
+  def bucket(self, name):
+    with self._lock:
+      return self.buckets.setdefault(name, _FakeBucket(name))
+
+
+class _FakeBatches:
+  """Runs batch jobs against _FakeStorage.
+
+  A job answers each prompt with "echo:<prompt>" once it has been polled
+  `polls_to_finish` times and `ready(job)` returns True. Jobs whose input
+  contains "fail-job" end in JOB_STATE_FAILED instead.
+  """
+
+  def __init__(self, storage, polls_to_finish=2, ready=None):
+    self._storage = storage
+    self._polls_to_finish = polls_to_finish
+    self._ready = ready or (lambda job: True)
+    self._lock = threading.Lock()
+    self._ids = itertools.count()
+    self.jobs = {}
+    self.cancelled = []
+    self.running = 0
+    self.max_running = 0
+
+  def _input(self, src):
+    bucket, _, name = src[len("gs://") :].partition("/")
+    return [
+        json.loads(line)
+        for line in self._storage.bucket(bucket).objects[name].splitlines()
+    ]
+
+  def create(self, model, src, config):
+    del model
+    lines = self._input(src)
+    with self._lock:
+      name = f"batches/{next(self._ids)}"
+      job = types.SimpleNamespace(
+          name=name,
+          state=_STATE.JOB_STATE_PENDING,
+          error=None,
+          dest=None,
+          display=config["display_name"],
+          lines=lines,
+          polls=0,
+          bucket=src[len("gs://") :].partition("/")[0],
+      )
+      self.jobs[name] = job
+      self.running += 1
+      self.max_running = max(self.max_running, self.running)
+    return job
+
+  def _finish(self, job):
+    self.running -= 1
+    prompts = [
+        line["request"]["contents"][0]["parts"][0]["text"] for line in job.lines
+    ]
+    if any("fail-job" in p for p in prompts):
+      job.state = _STATE.JOB_STATE_FAILED
+      job.error = "boom"
+      return
+    out = "".join(
+        json.dumps({
+            "key": line["key"],
+            "response": {
+                "candidates": [
+                    {"content": {"parts": [{"text": f"echo:{prompt}"}]}}
+                ]
+            },
+        })
+        + "\n"
+        for line, prompt in reversed(list(zip(job.lines, prompts)))
+    )
+    prefix = f"output/{job.name}"
+    bucket = self._storage.bucket(job.bucket)
+    bucket.objects[f"{prefix}/predictions.jsonl"] = out
+    job.dest = types.SimpleNamespace(gcs_uri=f"gs://{job.bucket}/{prefix}")
+    job.state = _STATE.JOB_STATE_SUCCEEDED
+
+  def get(self, name):
+    with self._lock:
+      job = self.jobs[name]
+      if job.state == _STATE.JOB_STATE_PENDING:
+        job.polls += 1
+        if job.polls >= self._polls_to_finish and self._ready(job):
+          self._finish(job)
+      return job
+
+  def cancel(self, name):
+    with self._lock:
+      self.cancelled.append(name)
+      job = self.jobs[name]
+      if job.state == _STATE.JOB_STATE_PENDING:
+        self.running -= 1
+        job.state = _STATE.JOB_STATE_CANCELLED
+
+
+def _cfg(**overrides):
+  cfg = dict(
+      enabled=True,
+      threshold=1,
+      poll_interval=0.001,
+      max_poll_interval=0.005,
+      timeout=10,
+      enable_caching=False,
+      retention_days=None,
+      on_job_create=lambda job: None,
+  )
+  cfg.update(overrides)
+  return gb.BatchConfig(**cfg)
+
+
+class ShardedBatchTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.storage = _FakeStorage()
+    self.enter_context(
+        mock.patch.object(
+            gb.storage, "Client", side_effect=self.storage.client
+        )
+    )
+
+  def _infer(self, batches, prompts, cfg):
+    client = types.SimpleNamespace(
+        vertexai=True, project="p", location="l", batches=batches
+    )
+    return gb.infer_batch(
+        client=client,
+        model_id="gemini-2.5-flash",
+        prompts=prompts,
+        schema_dict=None,
+        gen_config={},
+        cfg=cfg,
+    )
+
+  def test_shards_submitted_concurrently_and_order_preserved(self):
+    prompts = [f"p{i}" for i in range(10)]
+    # No job finishes until all four exist, so sequential submission would
+    # time out instead of passing.
+    batches = _FakeBatches(
+        self.storage, ready=lambda job: len(batches.jobs) == 4
+    )
+
+    outs = self._infer(
+        batches, prompts, _cfg(max_prompts_per_job=3, timeout=5)
+    )
+
+    self.assertEqual([f"echo:{p}" for p in prompts], outs)
+    jobs = sorted(batches.jobs.values(), key=lambda job: job.display)
+    self.assertEqual([3, 3, 2, 2], [len(job.lines) for job in jobs])
+    self.assertEqual(4, batches.max_running)
+
+  def test_max_concurrent_jobs_bounds_jobs_in_flight(self):
+    batches = _FakeBatches(self.storage)
+
+    outs = self._infer(
+        batches,
+        [f"p{i}" for i in range(8)],
+        _cfg(max_prompts_per_job=2, max_concurrent_jobs=2),
+    )
+
+    self.assertLen(outs, 8)
+    self.assertLen(batches.jobs, 4)
+    self.assertLessEqual(batches.max_running, 2)
+
+  def test_finished_shards_cached_before_failure(self):
+    cache = batch_cache.SQLiteBatchCache(":memory:")
+    self.addCleanup(cache.close)
+    prompts = ["a", "b", "fail-job", "c"]
+
+    def ready(job):
+      # The failing shard only ends once every other shard has been
+      # submitted and has finished.
+      return "fail-job" not in json.dumps(job.lines) or (
+          len(batches.jobs) == len(prompts)
+          and all(
+              j.state == _STATE.JOB_STATE_SUCCEEDED
+              for j in batches.jobs.values()
+              if j is not job
+          )
+      )
+
+    batches = _FakeBatches(self.storage, ready=ready)
+
+    with self.assertRaisesRegex(exceptions.InferenceRuntimeError, "failed"):
+      self._infer(
+          batches,
+          prompts,
+          _cfg(max_prompts_per_job=1, enable_caching=True, cache=cache),
+      )
+
+    self.assertEqual(
+        ["echo:a", "echo:b", "echo:c"], sorted(t for _, t in cache.iter_items())
+    )
+
+  def test_failed_shard_cancels_running_shards(self):
+    # The failing job only finishes once the slow one was submitted, so the
+    # slow shard is always running (not skipped) when the failure lands.
+    batches = _FakeBatches(
+        self.storage,
+        polls_to_finish=1,
+        ready=lambda job: (
+            "fail-job" in json.dumps(job.lines) and len(batches.jobs) == 2
+        ),
+    )
+
+    with self.assertRaisesRegex(exceptions.InferenceRuntimeError, "failed"):
+      self._infer(
+          batches, ["fail-job", "slow"], _cfg(max_prompts_per_job=1)
+      )
+
+    slow = [j for j in batches.jobs.values() if "slow" in json.dumps(j.lines)]
+    self.assertEqual([slow[0].name], batches.cancelled)
+    self.assertEqual(_STATE.JOB_STATE_CANCELLED, slow[0].state)
+
+  def test_single_job_below_shard_limit(self):
+    batches = _FakeBatches(self.storage)
+
+    outs = self._infer(batches, ["x", "y"], _cfg())
+
+    self.assertEqual(["echo:x", "echo:y"], outs)
+    self.assertLen(batches.jobs, 1)
+
+
+class GCSBatchCacheCompactionTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.storage = _FakeStorage()
+    self.enter_context(
+        mock.patch.object(
+            gb.storage, "Client", side_effect=self.storage.client
+        )
+    )
+    self.bucket = self.storage.bucket("b")
+
+  def _packs(self):
+    return [n for n in self.bucket.objects if n.startswith("cache/packs/")]
+
+  def test_small_packs_compacted_on_lookup(self):
+    writer = gb.GCSBatchCache("b")
+    for i in range(gb._CACHE_COMPACT_MIN_PACKS - 1):
+      writer.set_multi([({"prompt": f"p{i}"}, f"r{i}")])
+    self.bucket.objects["cache/legacy.json"] = '{"text": "old"}'
+    self.bucket.objects["cache/packs/0-bad.jsonl"] = "not json\n"
+    reader = gb.GCSBatchCache("b")
+
+    hits = reader.get_multi(
+        [{"prompt": f"p{i}"} for i in range(gb._CACHE_COMPACT_MIN_PACKS)]
+    )
+
+    self.assertLen(hits, gb._CACHE_COMPACT_MIN_PACKS - 1)
+    # One merged pack remains next to the unreadable one, which is kept.
+    self.assertLen(self._packs(), 2)
+    self.assertIn("cache/packs/0-bad.jsonl", self._packs())
+    self.assertNotIn("cache/legacy.json", self.bucket.objects)
+    expected = {
+        batch_cache.compute_hash({"prompt": f"p{i}"}): f"r{i}"
+        for i in range(gb._CACHE_COMPACT_MIN_PACKS - 1)
+    }
+    expected["legacy"] = "old"
+    self.assertEqual(expected, dict(gb.GCSBatchCache("b").iter_items()))
+
+  def test_compact_keeps_originals_when_upload_fails(self):
+    cache = gb.GCSBatchCache("b")
+    cache.set_multi([({"prompt": "a"}, "ra")])
+    cache.set_multi([({"prompt": "b"}, "rb")])
+    before = self._packs()
+
+    with mock.patch.object(
+        _FakeBlob, "upload_from_string", side_effect=OSError("offline")
+    ):
+      self.assertEqual(0, cache.compact())
+
+    self.assertEqual(before, self._packs())
+    self.assertEqual(2, cache.compact())
+    self.assertLen(self._packs(), 1)
+    self.assertEqual(
+        {0: "ra", 1: "rb"},
+        gb.GCSBatchCache("b").get_multi([{"prompt": "a"}, {"prompt": "b"}]),
+    )
+
+
+class PollingTest(absltest.TestCase):
+
+  def test_poll_delays_grow_geometrically_up_to_cap(self):
+    cfg = _cfg(poll_interval=1, poll_backoff=2, max_poll_interval=5)
+
+    self.assertEqual(
+        [1, 2, 4, 5, 5], list(itertools.islice(gb._poll_delays(cfg), 5))
+    )
+
+  def test_shard_sizes_balanced(self):
+    self.assertEqual(
+        [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]], gb._shard(list(range(10)), 3)
+    )
+    self.assertEqual([[0, 1]], gb._shard([0, 1], 5))
+
+
+if __name__ == "__main__":
+  absltest.main()
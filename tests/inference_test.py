@@ -20,14 +20,21 @@ pylint warnings are expected for test fixtures.
 """
 # pylint: disable=attribute-defined-outside-init
 
+import asyncio
+import collections
+import threading
+import time
 from unittest import mock
 
 from absl.testing import absltest
+from aiohttp import test_utils
+from aiohttp import web
 from absl.testing import parameterized
 
 from langextract import exceptions
 from langextract.core import base_model
 from langextract.core import data
+from langextract.core import rate_limit
 from langextract.core import types
 from langextract.providers import gemini
 from langextract.providers import ollama
@@ -86,6 +93,71 @@ class TestBaseLanguageModel(absltest.TestCase):
         "merge_kwargs should work even without _extra_kwargs attribute",
     )
 
+  def test_infer_stream_defaults_to_full_output(self):
+    """Test the default infer_stream yields the whole infer() output."""
+
+    class TestModel(base_model.BaseLanguageModel):  # pylint: disable=too-few-public-methods
+
+      def infer(self, batch_prompts, **kwargs):
+        for prompt in batch_prompts:
+          yield [types.ScoredOutput(score=1.0, output=prompt.upper())]
+
+    self.assertEqual(["ABC"], list(TestModel().infer_stream("abc")))
+
+  def test_map_ordered_recreates_pool_after_close(self):
+    """Test the shared pool yields in order and survives close()."""
+
+    class TestModel(base_model.BaseLanguageModel):  # pylint: disable=too-few-public-methods
+
+      def infer(self, batch_prompts, **kwargs):
+        return iter([])
+
+    model = TestModel()
+    self.assertEqual(
+        [1, 4, 9], list(model._map_ordered(lambda x: x * x, [1, 2, 3], 2))
+    )
+    first = model._shared_executor(2)
+    model.close()
+    self.assertEqual([4], list(model._map_ordered(lambda x: x * x, [2], 2)))
+    self.assertIsNot(first, model._shared_executor(2))
+    model.close()
+
+  def test_shared_pool_not_shut_down_by_other_size(self):
+    """A caller asking for another pool size must not break running users."""
+
+    class TestModel(base_model.BaseLanguageModel):  # pylint: disable=too-few-public-methods
+
+      def infer(self, batch_prompts, **kwargs):
+        return iter([])
+
+    model = TestModel()
+    small = model._shared_executor(2)
+    large = model._shared_executor(3)
+
+    self.assertIsNot(small, large)
+    self.assertEqual(4, small.submit(lambda: 2 * 2).result())
+    self.assertIs(small, model._shared_executor(2))
+    model.close()
+    for executor in (small, large):
+      with self.assertRaises(RuntimeError):
+        executor.submit(lambda: None)
+
+  def test_map_ordered_runs_inline_on_own_pool(self):
+    """Nested calls from the pool's workers must not wait on the pool."""
+
+    class TestModel(base_model.BaseLanguageModel):  # pylint: disable=too-few-public-methods
+
+      def infer(self, batch_prompts, **kwargs):
+        return iter([])
+
+    model = TestModel()
+
+    def outer(x):
+      return sum(model._map_ordered(lambda y: x * y, [1, 2], 1))
+
+    self.assertEqual([3, 6], list(model._map_ordered(outer, [1, 2], 1)))
+    model.close()
+
 
 class TestOllamaLanguageModel(absltest.TestCase):
 
@@ -160,7 +232,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     ]]
     self.assertEqual(results, expected_results)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_extra_kwargs_passed_to_api(self, mock_post):
     """Verify extra kwargs like timeout and keep_alive are passed to the API."""
     mock_response = mock.Mock()
@@ -187,10 +259,10 @@ class TestOllamaLanguageModel(absltest.TestCase):
 
     self.assertEqual(json_payload["options"]["keep_alive"], 600)
     self.assertEqual(json_payload["options"]["num_thread"], 8)
-    # timeout is passed to requests.post, not in the JSON payload
+    # timeout is passed to Session.post, not in the JSON payload
     self.assertEqual(call_args.kwargs["timeout"], 300)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_stop_and_top_p_passthrough(self, mock_post):
     """Verify stop and top_p parameters are passed to Ollama API."""
     mock_response = mock.Mock()
@@ -218,7 +290,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     self.assertEqual(json_payload["stop"], ["\\n\\n", "END"])
     self.assertEqual(json_payload["options"]["top_p"], 0.9)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_defaults_when_unspecified(self, mock_post):
     """Verify Ollama uses correct defaults when parameters are not specified."""
     mock_response = mock.Mock()
@@ -243,7 +315,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     self.assertEqual(json_payload["options"]["num_ctx"], 2048)
     self.assertEqual(call_args.kwargs["timeout"], 120)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_runtime_kwargs_override_stored(self, mock_post):
     """Verify runtime kwargs override stored kwargs."""
     mock_response = mock.Mock()
@@ -270,7 +342,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     self.assertEqual(json_payload["options"]["temperature"], 0.8)
     self.assertEqual(json_payload["options"]["keep_alive"], 600)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_temperature_zero(self, mock_post):
     """Test that temperature=0.0 is properly passed to Ollama."""
     mock_response = mock.Mock()
@@ -306,7 +378,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     mock_response.json.return_value = {"response": "test output"}
 
     with mock.patch.object(
-        model._requests, "post", return_value=mock_response
+        model._session, "post", return_value=mock_response
     ) as mock_post:
       model._ollama_query(prompt="test prompt")
 
@@ -331,7 +403,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     mock_response.json.return_value = {"response": "test output"}
 
     with mock.patch.object(
-        model._requests, "post", return_value=mock_response
+        model._session, "post", return_value=mock_response
     ) as mock_post:
       list(model.infer(["test prompt"]))
 
@@ -343,6 +415,187 @@ class TestOllamaLanguageModel(absltest.TestCase):
           "Timeout from constructor should flow through infer()",
       )
 
+  def test_ollama_parallel_infer_round_robin_in_order(self):
+    model = ollama.OllamaLanguageModel(
+        model_id="test-model",
+        base_url=["http://host-a:11434", "http://host-b:11434"],
+        max_workers=3,
+        per_host_parallel=2,
+    )
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    urls = {}
+
+    def query(prompt, model_url, **unused_kwargs):
+      nonlocal in_flight, peak
+      with lock:
+        in_flight += 1
+        peak = max(peak, in_flight)
+        urls[prompt] = model_url
+      # Earlier prompts finish last, so completion order differs from input.
+      time.sleep(0.01 * (6 - int(prompt[1:])))
+      with lock:
+        in_flight -= 1
+      return {"response": f"out:{prompt}"}
+
+    prompts = [f"p{i}" for i in range(6)]
+    with mock.patch.object(model, "_ollama_query", side_effect=query):
+      results = list(model.infer(prompts))
+
+    self.assertEqual(
+        [f"out:{p}" for p in prompts], [r[0].output for r in results]
+    )
+    self.assertLessEqual(peak, 3)
+    self.assertGreater(peak, 1)
+    self.assertEqual(
+        ["http://host-a:11434", "http://host-b:11434"] * 3,
+        [urls[p] for p in prompts],
+    )
+
+  def test_ollama_max_workers_defaults_to_number_of_hosts(self):
+    single = ollama.OllamaLanguageModel(model_id="test-model")
+    multi = ollama.OllamaLanguageModel(
+        model_id="test-model",
+        model_url=["http://host-a:11434", "http://host-b:11434"],
+    )
+
+    self.assertEqual(1, single.max_workers)
+    self.assertEqual(2, multi.max_workers)
+    self.assertEqual("http://host-a:11434", multi._model_url)
+
+  def test_ollama_max_workers_capped_per_host(self):
+    # lx.extract() always passes its own max_workers=10.
+    capped = ollama.OllamaLanguageModel(
+        model_id="test-model",
+        model_url=["http://host-a:11434", "http://host-b:11434"],
+        max_workers=10,
+    )
+    parallel = ollama.OllamaLanguageModel(
+        model_id="test-model",
+        model_url=["http://host-a:11434", "http://host-b:11434"],
+        max_workers=10,
+        per_host_parallel=4,
+    )
+    below_cap = ollama.OllamaLanguageModel(
+        model_id="test-model", max_workers=2, per_host_parallel=4
+    )
+
+    self.assertEqual(2, capped.max_workers)
+    self.assertEqual(8, parallel.max_workers)
+    self.assertEqual(2, below_cap.max_workers)
+    with self.assertRaises(exceptions.InferenceConfigError):
+      ollama.OllamaLanguageModel(model_id="test-model", per_host_parallel=0)
+
+  def test_ollama_requests_never_exceed_per_host_parallel(self):
+    hosts = ["http://host-a:11434", "http://host-b:11434"]
+    lock = threading.Lock()
+    in_flight = collections.Counter()
+    peak = collections.Counter()
+
+    def enter(url):
+      with lock:
+        in_flight[url] += 1
+        peak[url] = max(peak[url], in_flight[url])
+
+    def leave(url):
+      with lock:
+        in_flight[url] -= 1
+
+    def query(prompt, model_url, **unused_kwargs):
+      enter(model_url)
+      # Host a answers slowly, so strict round-robin would stack on it.
+      time.sleep(0.03 if model_url == hosts[0] else 0.001)
+      leave(model_url)
+      return {"response": f"out:{prompt}"}
+
+    async def query_async(unused_session, prompt, model_url, **unused_kwargs):
+      enter(model_url)
+      await asyncio.sleep(0.01)
+      leave(model_url)
+      return {"response": f"out:{prompt}"}
+
+    prompts = [f"p{i}" for i in range(8)]
+    with ollama.OllamaLanguageModel(
+        model_id="test-model", base_url=hosts, max_workers=10
+    ) as model:
+      with mock.patch.object(model, "_ollama_query", side_effect=query):
+        results = list(model.infer(prompts))
+      self.assertEqual(
+          [f"out:{p}" for p in prompts], [r[0].output for r in results]
+      )
+      self.assertEqual({hosts[0]: 1, hosts[1]: 1}, dict(peak))
+
+      peak.clear()
+      with mock.patch.object(
+          model, "_ollama_query_async", side_effect=query_async
+      ):
+        results = asyncio.run(model.infer_async(prompts))
+      self.assertEqual(
+          [f"out:{p}" for p in prompts], [r[0].output for r in results]
+      )
+      self.assertEqual({hosts[0]: 1, hosts[1]: 1}, dict(peak))
+
+  @mock.patch("requests.Session.post")
+  def test_ollama_infer_stream_holds_host_slot(self, mock_post):
+    response = mock.Mock(status_code=200)
+    response.iter_lines.return_value = [b'{"response": "x", "done": true}']
+    mock_post.return_value = response
+    model = ollama.OllamaLanguageModel(model_id="test-model")
+
+    stream = model.infer_stream("prompt")
+    self.assertEqual("x", next(stream))
+    self.assertFalse(model._host_slots[model._model_url].acquire(False))
+    stream.close()
+    self.assertTrue(model._host_slots[model._model_url].acquire(False))
+
+  @mock.patch("requests.Session.post")
+  def test_ollama_infer_stream(self, mock_post):
+    response = mock.Mock(status_code=200)
+    response.iter_lines.return_value = [
+        b'{"response": "{\\"a\\"", "done": false}',
+        b"",
+        b'{"response": ": 1}", "done": false}',
+        b'{"response": "", "done": true}',
+        b'{"response": "ignored", "done": false}',
+    ]
+    mock_post.return_value = response
+    model = ollama.OllamaLanguageModel(model_id="test-model")
+
+    deltas = list(model.infer_stream("prompt"))
+
+    self.assertEqual(['{"a"', ": 1}"], deltas)
+    self.assertTrue(mock_post.call_args.kwargs["stream"])
+    self.assertTrue(mock_post.call_args.kwargs["json"]["stream"])
+    response.close.assert_called_once()
+
+  @mock.patch("requests.Session.post")
+  def test_ollama_infer_stream_closed_early(self, mock_post):
+    response = mock.Mock(status_code=200)
+    response.iter_lines.return_value = iter(
+        [b'{"response": "x", "done": false}'] * 5
+    )
+    mock_post.return_value = response
+    model = ollama.OllamaLanguageModel(model_id="test-model")
+
+    stream = model.infer_stream("prompt")
+    self.assertEqual("x", next(stream))
+    stream.close()
+
+    response.close.assert_called_once()
+
+  @mock.patch("requests.Session.post")
+  def test_ollama_infer_stream_error_chunk(self, mock_post):
+    response = mock.Mock(status_code=200)
+    response.iter_lines.return_value = [b'{"error": "out of memory"}']
+    mock_post.return_value = response
+    model = ollama.OllamaLanguageModel(model_id="test-model")
+
+    with self.assertRaisesRegex(
+        exceptions.InferenceRuntimeError, "out of memory"
+    ):
+      list(model.infer_stream("prompt"))
+
 
 class TestGeminiLanguageModel(absltest.TestCase):
 
@@ -625,6 +878,82 @@ class TestOpenAILanguageModel(absltest.TestCase):
     self.assertEqual(call_args.kwargs["presence_penalty"], 0.7)
     self.assertEqual(call_args.kwargs["seed"], 42)
 
+  @mock.patch("openai.OpenAI")
+  def test_openai_infer_stream(self, mock_openai_class):
+    mock_client = mock.Mock()
+    mock_openai_class.return_value = mock_client
+
+    def chunk(content):
+      return mock.Mock(choices=[mock.Mock(delta=mock.Mock(content=content))])
+
+    stream = mock.MagicMock()
+    stream.__iter__.return_value = iter(
+        [chunk('{"a"'), mock.Mock(choices=[]), chunk(None), chunk(": 1}")]
+    )
+    mock_client.chat.completions.create.return_value = stream
+
+    model = openai.OpenAILanguageModel(api_key="test-key", temperature=0.3)
+    deltas = list(model.infer_stream("test prompt"))
+
+    self.assertEqual(['{"a"', ": 1}"], deltas)
+    call_args = mock_client.chat.completions.create.call_args
+    self.assertTrue(call_args.kwargs["stream"])
+    self.assertEqual(0.3, call_args.kwargs["temperature"])
+    stream.close.assert_called_once()
+
+  @mock.patch("openai.OpenAI")
+  def test_openai_rate_limiter_backs_off_on_429(self, mock_openai_class):
+    mock_client = mock.Mock()
+    mock_openai_class.return_value = mock_client
+    error = Exception("Too Many Requests")
+    error.status_code = 429
+    mock_client.chat.completions.create.side_effect = error
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(requests_per_minute=600, default_retry_after=0)
+    )
+
+    model = openai.OpenAILanguageModel(api_key="test-key", rate_limit=limiter)
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      list(model.infer(["test prompt"]))
+
+    self.assertEqual(0.5, limiter.scale)
+
+  @mock.patch("openai.OpenAI")
+  def test_openai_pool_shared_across_batches(self, mock_openai_class):
+    mock_client = mock.Mock()
+    mock_openai_class.return_value = mock_client
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def create(**kwargs):
+      nonlocal active, peak
+      with lock:
+        active += 1
+        peak = max(peak, active)
+      time.sleep(0.02)
+      with lock:
+        active -= 1
+      content = kwargs["messages"][-1]["content"]
+      return mock.Mock(choices=[mock.Mock(message=mock.Mock(content=content))])
+
+    mock_client.chat.completions.create.side_effect = create
+
+    with openai.OpenAILanguageModel(api_key="test-key", max_workers=3) as model:
+      first = model.infer(["a", "b", "c", "d"])
+      second = model.infer(["e", "f", "g", "h"])
+      # Both batches are submitted before either is consumed.
+      self.assertEqual("a", next(first)[0].output)
+      self.assertEqual("e", next(second)[0].output)
+      rest = [r[0].output for r in first] + [r[0].output for r in second]
+      executor = model._shared_executor(3)
+      self.assertIs(executor, model._shared_executor(3))
+
+    self.assertEqual(["b", "c", "d", "f", "g", "h"], rest)
+    self.assertLessEqual(peak, 3)
+    with self.assertRaises(RuntimeError):
+      executor.submit(lambda: None)
+
   @mock.patch("openai.OpenAI")
   def test_openai_runtime_kwargs_override(self, mock_openai_class):
     """Test that runtime kwargs override stored kwargs."""
@@ -789,5 +1118,183 @@ class TestOpenAILanguageModel(absltest.TestCase):
     self.assertNotIn("candidate_count", config)
 
 
+class TestInferAsync(absltest.TestCase):
+  """Tests for the native async inference paths."""
+
+  def test_base_default_runs_sync_infer(self):
+
+    class TestModel(base_model.BaseLanguageModel):  # pylint: disable=too-few-public-methods
+
+      def infer(self, batch_prompts, **kwargs):
+        for prompt in batch_prompts:
+          yield [types.ScoredOutput(score=1.0, output=prompt.upper())]
+
+    results = asyncio.run(TestModel().infer_async(["a", "b"]))
+
+    self.assertEqual(
+        [
+            [types.ScoredOutput(score=1.0, output="A")],
+            [types.ScoredOutput(score=1.0, output="B")],
+        ],
+        results,
+    )
+
+  @mock.patch("openai.AsyncOpenAI")
+  @mock.patch("openai.OpenAI")
+  def test_openai_infer_async(self, unused_openai_class, mock_async_class):
+    mock_async_client = mock.Mock()
+    mock_async_class.return_value = mock_async_client
+
+    async def fake_create(**kwargs):
+      content = kwargs["messages"][-1]["content"]
+      return mock.Mock(
+          choices=[mock.Mock(message=mock.Mock(content=f"out:{content}"))]
+      )
+
+    mock_async_client.chat.completions.create.side_effect = fake_create
+
+    model = openai.OpenAILanguageModel(api_key="test-key", temperature=0.3)
+    results = asyncio.run(model.infer_async(["p1", "p2"], seed=7))
+
+    self.assertEqual(
+        [
+            [types.ScoredOutput(score=1.0, output="out:p1")],
+            [types.ScoredOutput(score=1.0, output="out:p2")],
+        ],
+        results,
+    )
+    call_kwargs = mock_async_client.chat.completions.create.call_args.kwargs
+    self.assertEqual(0.3, call_kwargs["temperature"])
+    self.assertEqual(7, call_kwargs["seed"])
+    mock_async_class.assert_called_once()
+
+  @mock.patch("openai.AsyncOpenAI")
+  @mock.patch("openai.OpenAI")
+  def test_openai_async_client_follows_event_loop(
+      self, unused_openai_class, mock_async_class
+  ):
+    clients = []
+
+    def new_client(**unused_kwargs):
+      client = mock.Mock()
+      client.close = mock.AsyncMock()
+
+      async def fake_create(**unused_kwargs):
+        return mock.Mock(choices=[mock.Mock(message=mock.Mock(content="x"))])
+
+      client.chat.completions.create.side_effect = fake_create
+      clients.append(client)
+      return client
+
+    mock_async_class.side_effect = new_client
+    model = openai.OpenAILanguageModel(api_key="test-key")
+
+    async def run_twice():
+      await model.infer_async(["p1"])
+      await model.infer_async(["p2"])
+
+    asyncio.run(run_twice())
+    self.assertLen(clients, 1)
+    asyncio.run(run_twice())
+    self.assertLen(clients, 2)
+    clients[0].close.assert_awaited_once()
+
+    model.close()
+    clients[1].close.assert_awaited_once()
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_infer_async(self, mock_client_class):
+    mock_client = mock.Mock()
+    mock_client_class.return_value = mock_client
+
+    async def fake_generate(model, contents, config):
+      del model, config
+      return mock.Mock(text=f"out:{contents}")
+
+    mock_client.aio.models.generate_content.side_effect = fake_generate
+
+    model = gemini.GeminiLanguageModel(
+        api_key="test-key", stop_sequences=["END"]
+    )
+    results = asyncio.run(model.infer_async(["p1", "p2"]))
+
+    self.assertEqual(["out:p1", "out:p2"], [r[0].output for r in results])
+    config = mock_client.aio.models.generate_content.call_args.kwargs["config"]
+    self.assertEqual(["END"], config["stop_sequences"])
+    mock_client.models.generate_content.assert_not_called()
+
+  def test_ollama_infer_async(self):
+    received = []
+
+    async def generate(request):
+      payload = await request.json()
+      received.append(payload)
+      return web.json_response({"response": f"out:{payload['prompt']}"})
+
+    async def run():
+      app = web.Application()
+      app.router.add_post("/api/generate", generate)
+      async with test_utils.TestServer(app) as server:
+        with ollama.OllamaLanguageModel(
+            model_id="gemma2:2b",
+            model_url=str(server.make_url("/")),
+        ) as model:
+          return await model.infer_async(["p1", "p2"], temperature=0.0)
+
+    results = asyncio.run(run())
+
+    self.assertEqual(["out:p1", "out:p2"], [r[0].output for r in results])
+    self.assertEqual({"p1", "p2"}, {p["prompt"] for p in received})
+    self.assertTrue(all(p["options"]["temperature"] == 0.0 for p in received))
+
+  def test_ollama_infer_async_reuses_session_until_closed(self):
+
+    async def generate(request):
+      payload = await request.json()
+      return web.json_response({"response": f"out:{payload['prompt']}"})
+
+    async def run():
+      app = web.Application()
+      app.router.add_post("/api/generate", generate)
+      async with test_utils.TestServer(app) as server:
+        model = ollama.OllamaLanguageModel(
+            model_id="gemma2:2b", model_url=str(server.make_url("/"))
+        )
+        await model.infer_async(["p1"])
+        session = model._async_session
+        await model.infer_async(["p2"])
+        self.assertIs(session, model._async_session)
+        model.close()
+        await asyncio.sleep(0)
+        self.assertTrue(session.closed)
+        self.assertIsNone(model._async_session)
+        # The model stays usable after close().
+        return await model.infer_async(["p3"]), model
+
+    results, model = asyncio.run(run())
+
+    self.assertEqual("out:p3", results[0][0].output)
+    # Closing after the loop has ended releases the session without warnings.
+    model.close()
+    self.assertIsNone(model._async_session)
+
+  def test_ollama_infer_async_model_not_found(self):
+
+    async def generate(unused_request):
+      return web.Response(status=404)
+
+    async def run():
+      app = web.Application()
+      app.router.add_post("/api/generate", generate)
+      async with test_utils.TestServer(app) as server:
+        with ollama.OllamaLanguageModel(
+            model_id="missing", model_url=str(server.make_url("/"))
+        ) as model:
+          return await model.infer_async(["p1"])
+
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      asyncio.run(run())
+
+
 if __name__ == "__main__":
   absltest.main()
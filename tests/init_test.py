@@ -14,6 +14,7 @@
 
 """Tests for the main package functions in __init__.py."""
 
+import asyncio
 import textwrap
 from unittest import mock
 import warnings
@@ -560,6 +561,7 @@ class InitTest(parameterized.TestCase):
         "tokenize",
         "tokens_text",
         "find_sentence_range",
+        "find_sentence_ends",
     ]
 
     for name in expected_exports:
@@ -753,6 +755,47 @@ class InitTest(parameterized.TestCase):
           "Expected deprecation warning for gemini_schema",
       )
 
+  @mock.patch("langextract.extraction.factory.create_model")
+  def test_extract_async_uses_infer_async(self, mock_create_model):
+    mock_model = mock.MagicMock()
+    mock_model.requires_fence_output = False
+    mock_model.schema = None
+    mock_model.infer_async = mock.AsyncMock(
+        return_value=[[
+            types.ScoredOutput(
+                output='{"extractions": [{"entity": "Aspirin"}]}', score=1.0
+            )
+        ]]
+    )
+    mock_create_model.return_value = mock_model
+
+    examples = [
+        lx.data.ExampleData(
+            text="Patient takes Tylenol 500mg daily.",
+            extractions=[
+                lx.data.Extraction(
+                    extraction_class="entity", extraction_text="Tylenol"
+                ),
+            ],
+        )
+    ]
+
+    result = asyncio.run(
+        lx.extract_async(
+            text_or_documents="Patient takes Aspirin daily.",
+            prompt_description="Extract medications.",
+            examples=examples,
+            api_key="test_key",
+            max_concurrency=4,
+        )
+    )
+
+    mock_model.infer.assert_not_called()
+    mock_model.infer_async.assert_awaited_once()
+    self.assertEqual(
+        ["Aspirin"], [e.extraction_text for e in result.extractions]
+    )
+
 
 if __name__ == "__main__":
   absltest.main()
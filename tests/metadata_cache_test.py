@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.literature.metadata_cache."""
+
+from datetime import datetime
+import os
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+
+from langextract.literature import metadata_cache
+from langextract.literature import metadata_models as mm
+
+_ABSTRACT = "Serum markers were measured at baseline and at follow-up visits."
+
+
+def _paper(i, doi=True):
+  return mm.PaperMetadata(
+      pmid=str(i),
+      doi=f"10.1000/ABC.{i}" if doi else None,
+      title=f"Biomarker study number {i}",
+      authors=[mm.Author(last_name="Doe", first_name="Jane")],
+      publication_date=datetime(2024, 5, 17),
+      publication_type=mm.PublicationType.REVIEW,
+      source=mm.LiteratureSource.PUBMED,
+      abstract=_ABSTRACT,
+      mesh_terms=["Aging"],
+      metadata_extras={"pmcid": f"PMC{i}"},
+  )
+
+
+class MetadataCacheTest(absltest.TestCase):
+
+  def _cache(self, path=":memory:", **kwargs):
+    cache = metadata_cache.MetadataCache(path, **kwargs)
+    self.addCleanup(cache.close)
+    return cache
+
+  def test_round_trip_by_pmid_and_doi(self):
+    cache = self._cache()
+    paper = _paper(1)
+
+    self.assertEqual(3, cache.put_papers([paper, _paper(2, doi=False)]))
+
+    found = cache.get_many([
+        metadata_cache.pmid_key("1"),
+        metadata_cache.doi_key("10.1000/abc.1"),
+        metadata_cache.pmid_key("2"),
+        metadata_cache.pmid_key("3"),
+    ])
+    self.assertEqual(paper, found["pmid:1"])
+    self.assertEqual(paper, found["doi:10.1000/abc.1"])
+    self.assertEqual("2", found["pmid:2"].pmid)
+    self.assertNotIn("pmid:3", found)
+    self.assertEqual((3, 1), (cache.hits, cache.misses))
+
+  def test_bulk_lookup_beyond_parameter_limit(self):
+    cache = self._cache()
+    cache.put_papers(_paper(i, doi=False) for i in range(1200))
+
+    found = cache.get_many(
+        metadata_cache.pmid_key(str(i)) for i in range(1300)
+    )
+
+    self.assertLen(found, 1200)
+
+  def test_expired_entries_are_misses(self):
+    cache = self._cache(ttl_seconds=60)
+    with mock.patch.object(metadata_cache.time, "time", return_value=1000.0):
+      cache.put_papers([_paper(1)])
+    with mock.patch.object(metadata_cache.time, "time", return_value=1059.0):
+      self.assertIsNotNone(cache.get("pmid:1"))
+    with mock.patch.object(metadata_cache.time, "time", return_value=1061.0):
+      self.assertIsNone(cache.get("pmid:1"))
+      self.assertEqual(2, cache.prune())
+    self.assertEqual(0, cache.count())
+
+  def test_no_ttl_keeps_entries(self):
+    cache = self._cache(ttl_seconds=None)
+    with mock.patch.object(metadata_cache.time, "time", return_value=0.0):
+      cache.put_papers([_paper(1)])
+
+    self.assertIsNotNone(cache.get("pmid:1"))
+
+  def test_version_change_invalidates_entries(self):
+    path = os.path.join(
+        self.enter_context(tempfile.TemporaryDirectory()), "sub", "c.db"
+    )
+    with metadata_cache.MetadataCache(path, version="entrez") as cache:
+      cache.put_papers([_paper(1)])
+
+    with metadata_cache.MetadataCache(path, version="entrez") as cache:
+      self.assertIsNotNone(cache.get("pmid:1"))
+    with metadata_cache.MetadataCache(path, version="stream") as cache:
+      self.assertIsNone(cache.get("pmid:1"))
+    with mock.patch.object(
+        metadata_cache, "CACHE_VERSION", metadata_cache.CACHE_VERSION + 1
+    ), metadata_cache.MetadataCache(path, version="entrez") as cache:
+      self.assertIsNone(cache.get("pmid:1"))
+
+
+if __name__ == "__main__":
+  absltest.main()
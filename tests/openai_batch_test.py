@@ -0,0 +1,390 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for OpenAI Batch API functionality.
+
+The OpenAI client talks to a local stand-in for the files and batches
+endpoints, so requests go through the real SDK and HTTP stack.
+"""
+
+import asyncio
+import email.parser
+import http.server
+import json
+import os
+import re
+import tempfile
+import threading
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+from langextract.core import exceptions
+from langextract.providers import batch_cache
+from langextract.providers import openai
+from langextract.providers import openai_batch as ob
+
+
+class _FakeOpenAIServer:
+  """Serves the subset of the OpenAI files and batches API used by batches.
+
+  Each chat request is answered with "echo:<user message>", or with an item
+  error when the message contains "fail". Output lines are written in
+  reverse order, and a job reports "in_progress" on its first retrieval.
+  """
+
+  def __init__(self, job_status="completed"):
+    self.job_status = job_status
+    self.files = {}
+    self.batches = {}
+    self.uploads = []
+    self.chat_requests = 0
+    self.cancelled = []
+    self._lock = threading.Lock()
+    self._server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), self._handler_class()
+    )
+    self._thread = threading.Thread(
+        target=self._server.serve_forever, daemon=True
+    )
+    self._thread.start()
+
+  @property
+  def base_url(self):
+    return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+  def close(self):
+    self._server.shutdown()
+    self._server.server_close()
+
+  def _add_file(self, content, purpose):
+    with self._lock:
+      file_id = f"file-{len(self.files)}"
+      self.files[file_id] = content
+    return {
+        "id": file_id,
+        "object": "file",
+        "bytes": len(content),
+        "created_at": 0,
+        "filename": f"{file_id}.jsonl",
+        "purpose": purpose,
+        "status": "processed",
+    }
+
+  def _batch_json(self, batch_id):
+    batch = self.batches[batch_id]
+    return {
+        "id": batch_id,
+        "object": "batch",
+        "endpoint": batch["endpoint"],
+        "input_file_id": batch["input_file_id"],
+        "completion_window": "24h",
+        "created_at": 0,
+        "status": batch["status"],
+        "output_file_id": batch.get("output_file_id"),
+        "error_file_id": batch.get("error_file_id"),
+    }
+
+  def _run_batch(self, batch_id):
+    """Answers every request of a batch and stores the result files."""
+    batch = self.batches[batch_id]
+    outputs, errors = [], []
+    lines = self.files[batch["input_file_id"]].decode("utf-8").splitlines()
+    for line in lines:
+      request = json.loads(line)
+      with self._lock:
+        self.chat_requests += 1
+      content = request["body"]["messages"][-1]["content"]
+      if "fail" in content:
+        errors.append({
+            "id": "batch_req_err",
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 400,
+                "body": {"error": {"message": "bad request"}},
+            },
+            "error": None,
+        })
+        continue
+      outputs.append({
+          "id": "batch_req",
+          "custom_id": request["custom_id"],
+          "response": {
+              "status_code": 200,
+              "body": {
+                  "choices": [{
+                      "index": 0,
+                      "message": {
+                          "role": "assistant",
+                          "content": f"echo:{content}",
+                      },
+                  }]
+              },
+          },
+          "error": None,
+      })
+
+    def _jsonl(rows):
+      return "".join(json.dumps(r) + "\n" for r in reversed(rows)).encode()
+
+    if outputs:
+      batch["output_file_id"] = self._add_file(_jsonl(outputs), "out")["id"]
+    if errors:
+      batch["error_file_id"] = self._add_file(_jsonl(errors), "err")["id"]
+
+  def _handler_class(self):
+    fake = self
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+
+      def log_message(self, *args):
+        del args
+
+      def _send(self, payload, content_type="application/json"):
+        body = (
+            payload
+            if isinstance(payload, bytes)
+            else json.dumps(payload).encode()
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+      def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+      def do_POST(self):  # pylint: disable=invalid-name
+        body = self._read_body()
+        if self.path == "/v1/files":
+          message = email.parser.BytesParser().parsebytes(
+              b"Content-Type: "
+              + self.headers["Content-Type"].encode()
+              + b"\r\n\r\n"
+              + body
+          )
+          fields = {
+              part.get_param("name", header="content-disposition"): (
+                  part.get_payload(decode=True)
+              )
+              for part in message.get_payload()
+          }
+          fake.uploads.append(fields)
+          self._send(
+              fake._add_file(fields["file"], fields["purpose"].decode())
+          )
+        elif self.path == "/v1/batches":
+          params = json.loads(body)
+          batch_id = f"batch-{len(fake.batches)}"
+          fake.batches[batch_id] = dict(
+              params, status="validating", polls=0
+          )
+          self._send(fake._batch_json(batch_id))
+        elif match := re.fullmatch(r"/v1/batches/([^/]+)/cancel", self.path):
+          fake.cancelled.append(match.group(1))
+          fake.batches[match.group(1)]["status"] = "cancelling"
+          self._send(fake._batch_json(match.group(1)))
+        else:
+          self.send_error(404)
+
+      def do_GET(self):  # pylint: disable=invalid-name
+        if match := re.fullmatch(r"/v1/batches/([^/]+)", self.path):
+          batch = fake.batches[match.group(1)]
+          batch["polls"] += 1
+          if batch["polls"] == 1:
+            batch["status"] = "in_progress"
+          elif batch["status"] == "in_progress":
+            batch["status"] = fake.job_status
+            if fake.job_status == "completed":
+              fake._run_batch(match.group(1))
+          self._send(fake._batch_json(match.group(1)))
+        elif match := re.fullmatch(r"/v1/files/([^/]+)/content", self.path):
+          self._send(fake.files[match.group(1)], "application/octet-stream")
+        else:
+          self.send_error(404)
+
+    return Handler
+
+
+class OpenAIBatchAPITest(absltest.TestCase):
+  """Test OpenAI Batch API routing and functionality."""
+
+  def setUp(self):
+    super().setUp()
+    self.server = _FakeOpenAIServer()
+    self.addCleanup(self.server.close)
+    tmpdir = self.enter_context(tempfile.TemporaryDirectory())
+    self.cache_path = os.path.join(tmpdir, "batch.sqlite")
+
+  def _model(self, **batch):
+    cfg = {
+        "enabled": True,
+        "threshold": 2,
+        "poll_interval": 0.01,
+        "enable_caching": False,
+        "retention_days": None,
+        "cache_path": self.cache_path,
+    }
+    cfg.update(batch)
+    return openai.OpenAILanguageModel(
+        model_id="gpt-4o-mini",
+        api_key="test-key",
+        base_url=self.server.base_url,
+        batch=cfg,
+    )
+
+  def test_batch_routing_preserves_order(self):
+    model = self._model()
+
+    outs = list(model.infer(["p0", "p1", "p2"], temperature=0.5))
+
+    self.assertEqual(
+        ["echo:p0", "echo:p1", "echo:p2"], [o[0].output for o in outs]
+    )
+    self.assertLen(self.server.batches, 1)
+    batch = next(iter(self.server.batches.values()))
+    self.assertEqual("/v1/chat/completions", batch["endpoint"])
+    self.assertEqual("24h", batch["completion_window"])
+    self.assertEqual(b"batch", self.server.uploads[0]["purpose"])
+    first_request = json.loads(
+        self.server.files[batch["input_file_id"]].splitlines()[0]
+    )
+    self.assertEqual("idx-0", first_request["custom_id"])
+    self.assertEqual(0.5, first_request["body"]["temperature"])
+    self.assertEqual(
+        {"type": "json_object"}, first_request["body"]["response_format"]
+    )
+
+  def test_realtime_when_below_threshold(self):
+    model = self._model(threshold=3)
+
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      # The stand-in does not serve chat completions, so the real-time path
+      # fails; what matters is that no batch job was created.
+      list(model.infer(["p0", "p1"]))
+    self.assertEmpty(self.server.batches)
+
+  def test_retention_sets_file_expiry(self):
+    model = self._model(retention_days=7)
+
+    list(model.infer(["p0", "p1"]))
+
+    expected = {"anchor": "created_at", "seconds": 7 * 86400}
+    batch = next(iter(self.server.batches.values()))
+    self.assertEqual(expected, batch["output_expires_after"])
+    self.assertIn("expires_after[seconds]", self.server.uploads[0])
+
+  def test_max_prompts_per_job_splits_jobs(self):
+    model = self._model(max_prompts_per_job=2)
+
+    outs = list(model.infer([f"p{i}" for i in range(5)]))
+
+    self.assertEqual(
+        [f"echo:p{i}" for i in range(5)], [o[0].output for o in outs]
+    )
+    self.assertLen(self.server.batches, 3)
+
+  def test_item_error_raises(self):
+    model = self._model()
+
+    with self.assertRaisesRegex(exceptions.InferenceRuntimeError, "idx-1"):
+      list(model.infer(["p0", "fail", "p2"]))
+
+  def test_item_error_ignored(self):
+    model = self._model(ignore_item_errors=True)
+
+    outs = list(model.infer(["p0", "fail", "p2"]))
+
+    self.assertEqual(["echo:p0", "", "echo:p2"], [o[0].output for o in outs])
+
+  def test_failed_job_raises(self):
+    self.server.job_status = "failed"
+    model = self._model()
+
+    with self.assertRaisesRegex(
+        exceptions.InferenceRuntimeError, "status=failed"
+    ):
+      list(model.infer(["p0", "p1"]))
+
+  def test_timeout_cancels_job(self):
+    self.server.job_status = "in_progress"
+    model = self._model(timeout=0.05)
+
+    with self.assertRaisesRegex(exceptions.InferenceRuntimeError, "timed out"):
+      list(model.infer(["p0", "p1"]))
+    self.assertEqual(["batch-0"], self.server.cancelled)
+
+  def test_cache_skips_submitted_prompts(self):
+    list(self._model(enable_caching=True).infer(["p0", "p1"]))
+    self.assertEqual(2, self.server.chat_requests)
+
+    outs = list(self._model(enable_caching=True).infer(["p1", "p0", "p2"]))
+
+    self.assertEqual(
+        ["echo:p1", "echo:p0", "echo:p2"], [o[0].output for o in outs]
+    )
+    self.assertEqual(3, self.server.chat_requests)
+    self.assertLen(self.server.batches, 2)
+
+  def test_fully_cached_run_submits_nothing(self):
+    list(self._model(enable_caching=True).infer(["p0", "p1"]))
+
+    outs = list(self._model(enable_caching=True).infer(["p0", "p1"]))
+
+    self.assertEqual(["echo:p0", "echo:p1"], [o[0].output for o in outs])
+    self.assertLen(self.server.batches, 1)
+
+  def test_custom_cache_backend(self):
+    cache = batch_cache.SQLiteBatchCache(":memory:")
+    self.addCleanup(cache.close)
+    list(self._model(enable_caching=True, cache=cache).infer(["p0", "p1"]))
+
+    outs = list(self._model(enable_caching=True, cache=cache).infer(["p1"] * 2))
+
+    self.assertEqual(["echo:p1", "echo:p1"], [o[0].output for o in outs])
+    self.assertLen(self.server.batches, 1)
+    self.assertFalse(os.path.exists(self.cache_path))
+
+  def test_infer_async_uses_batch(self):
+    model = self._model()
+
+    outs = asyncio.run(model.infer_async(["p0", "p1"]))
+
+    self.assertEqual(["echo:p0", "echo:p1"], [o[0].output for o in outs])
+    self.assertLen(self.server.batches, 1)
+
+
+class BatchConfigValidationTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      dict(testcase_name="threshold", threshold=0),
+      dict(testcase_name="poll_interval", poll_interval=0),
+      dict(testcase_name="timeout", timeout=0),
+      dict(testcase_name="max_prompts_per_job", max_prompts_per_job=0),
+      dict(testcase_name="retention_too_long", retention_days=31),
+      dict(testcase_name="caching_unset", enable_caching=ob._UNSET),
+  )
+  def test_validation_errors(self, **overrides):
+    cfg = dict(enabled=True, enable_caching=False, retention_days=None)
+    cfg.update(overrides)
+    with self.assertRaises(ValueError):
+      ob.BatchConfig(**cfg)
+
+  def test_empty_bodies_fast_path(self):
+    self.assertEqual([], ob.infer_batch(None, [], ob.BatchConfig()))
+
+
+if __name__ == "__main__":
+  absltest.main()
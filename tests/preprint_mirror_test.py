@@ -0,0 +1,206 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.literature.preprint_mirror."""
+
+from datetime import date, timedelta
+import os
+import tempfile
+from unittest import mock
+
+from absl.testing import absltest
+import requests
+
+from langextract.literature import biorxiv_client
+from langextract.literature import preprint_mirror
+
+_TODAY = date(2025, 3, 31)
+_FILLER = "Background and methods are described in full. " * 2
+
+
+def _paper(i, day, text="", version="1"):
+  return {
+      "doi": f"10.1101/{i:04d}",
+      "title": f"Preprint number {i} {text}",
+      "abstract": f"{text} {_FILLER}",
+      "date": day.strftime("%Y-%m-%d"),
+      "version": version,
+  }
+
+
+class _FakeServer:
+  """Stands in for BioRxivClient.fetch_papers over a fixed set of papers."""
+
+  def __init__(self, papers):
+    self.papers = papers
+    self.calls = []
+    self.fail = False
+
+  def fetch(self, start_date, end_date, server):
+    self.calls.append((start_date, end_date, server))
+    if self.fail:
+      raise requests.ConnectionError("offline")
+    return [p for p in self.papers if start_date <= p["date"] <= end_date]
+
+
+class PreprintMirrorTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.mirror = preprint_mirror.PreprintMirror(":memory:", refresh_days=1)
+    self.addCleanup(self.mirror.close)
+
+  def _sync(self, server, start, end):
+    return self.mirror.sync(
+        "biorxiv", start, end, server.fetch, today=_TODAY
+    )
+
+  def test_second_sync_fetches_only_new_and_recent_days(self):
+    papers = [_paper(i, _TODAY - timedelta(days=i)) for i in range(12)]
+    server = _FakeServer(papers)
+
+    self.assertEqual(10, self._sync(server, "2025-03-22", "2025-03-31"))
+    self.assertEqual([("2025-03-22", "2025-03-31", "biorxiv")], server.calls)
+
+    server.calls.clear()
+    self._sync(server, "2025-03-20", "2025-03-31")
+
+    # 03-20..21 are new. 03-31 is inside the one-day refresh window, so it
+    # is fetched again even though it was downloaded before.
+    self.assertEqual(
+        [
+            ("2025-03-20", "2025-03-21", "biorxiv"),
+            ("2025-03-31", "2025-03-31", "biorxiv"),
+        ],
+        server.calls,
+    )
+    self.assertEqual(12, self.mirror.count("biorxiv"))
+
+  def test_search_matches_substring_semantics(self):
+    texts = [
+        "Serum IL-6 rose",
+        "il-6r signalling",
+        "CRP and ferritin",
+        "hs-crp",
+        "nothing",
+        "IL6 spelled differently",
+    ]
+    papers = [_paper(i, _TODAY, text) for i, text in enumerate(texts)]
+    self.mirror.add_papers("biorxiv", papers)
+    self.mirror.add_papers("medrxiv", [_paper(99, _TODAY, "IL-6")])
+
+    for keyword in ["IL-6", "crp", "Ferritin", "l6", "zzz", "6r s"]:
+      expected = [
+          p["doi"] for p in papers
+          if keyword.lower() in p["title"].lower()
+          or keyword.lower() in p["abstract"].lower()
+      ]
+      found = self.mirror.search(
+          keyword, "biorxiv", "2025-03-31", "2025-03-31"
+      )
+      self.assertEqual(expected, [p["doi"] for p in found], keyword)
+
+  def test_new_version_replaces_indexed_text(self):
+    self.mirror.add_papers("biorxiv", [_paper(1, _TODAY, "troponin")])
+    self.mirror.add_papers("biorxiv", [_paper(1, _TODAY, "procalcitonin")])
+
+    self.assertEmpty(
+        self.mirror.search("troponin", "biorxiv", "2025-01-01", "2025-12-31")
+    )
+    self.assertLen(
+        self.mirror.search(
+            "procalcitonin", "biorxiv", "2025-01-01", "2025-12-31"
+        ),
+        1,
+    )
+    self.assertEqual(1, self.mirror.count())
+
+  def test_failed_sync_keeps_existing_papers(self):
+    server = _FakeServer([_paper(1, _TODAY - timedelta(days=5), "CRP")])
+    self._sync(server, "2025-03-20", "2025-03-27")
+    server.fail = True
+
+    self._sync(server, "2025-03-20", "2025-03-31")
+
+    self.assertLen(
+        self.mirror.search("crp", "biorxiv", "2025-03-20", "2025-03-31"), 1
+    )
+    self.assertEmpty(
+        self.mirror.missing_days(
+            "biorxiv", "2025-03-20", "2025-03-27", today=_TODAY
+        )
+    )
+
+  def test_persists_across_instances(self):
+    path = os.path.join(
+        self.enter_context(tempfile.TemporaryDirectory()), "sub", "m.db"
+    )
+    with preprint_mirror.PreprintMirror(path) as mirror:
+      mirror.add_papers(
+          "biorxiv", [_paper(1, _TODAY, "CRP")], synced_days=[_TODAY]
+      )
+
+    with preprint_mirror.PreprintMirror(path) as mirror:
+      self.assertLen(
+          mirror.search("crp", "biorxiv", "2025-03-31", "2025-03-31"), 1
+      )
+
+
+class BioRxivClientMirrorTest(absltest.TestCase):
+
+  def test_searches_answered_from_mirror(self):
+    today = date.today()
+    papers = [
+        _paper(0, today - timedelta(days=40), "CRP"),
+        _paper(1, today - timedelta(days=20), "IL-6 and crp"),
+        _paper(2, today - timedelta(days=10), "ferritin"),
+        _paper(3, today - timedelta(days=5), "IL-6"),
+    ]
+    server = _FakeServer(papers)
+    mirror = preprint_mirror.PreprintMirror(":memory:")
+    self.addCleanup(mirror.close)
+    client = biorxiv_client.BioRxivClient(mirror=mirror)
+    plain = biorxiv_client.BioRxivClient()
+    terms = ["il-6", "CRP", "troponin"]
+
+    self.enter_context(mock.patch.object(client, "fetch_papers", server.fetch))
+    self.enter_context(mock.patch.object(plain, "fetch_papers", server.fetch))
+
+    expected = plain.search_biomarkers(terms, days_back=90)
+    server.calls.clear()
+    found = client.search_biomarkers(terms, days_back=90)
+    self.assertLen(server.calls, 1)
+
+    server.calls.clear()
+    self.assertEqual(
+        [p.doi for p in found],
+        [p.doi for p in client.search_biomarkers(terms, days_back=90)],
+    )
+    # Only the refresh window is downloaded again.
+    self.assertLen(server.calls, 1)
+    refresh_from = today - timedelta(days=mirror.refresh_days)
+    self.assertGreaterEqual(server.calls[0][0], str(refresh_from))
+
+    both = client.fetch_both_servers("crp", days_back=30)
+
+    self.assertEqual([p.doi for p in expected], [p.doi for p in found])
+    self.assertEqual(["10.1101/0001"], [p.doi for p in both[:1]])
+    self.assertEqual(
+        ["biorxiv", "medrxiv"],
+        sorted({p.metadata_extras["server"] for p in both}),
+    )
+
+
+if __name__ == "__main__":
+  absltest.main()
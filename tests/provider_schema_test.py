@@ -150,7 +150,7 @@ class OllamaFormatParameterTest(absltest.TestCase):
 
   def test_ollama_json_format_in_request_payload(self):
     """Test that JSON format is passed to Ollama API by default."""
-    with mock.patch("requests.post", autospec=True) as mock_post:
+    with mock.patch("requests.Session.post", autospec=True) as mock_post:
       mock_response = mock.Mock(spec=["status_code", "json"])
       mock_response.status_code = 200
       mock_response.json.return_value = {"response": '{"test": "value"}'}
@@ -178,7 +178,7 @@ class OllamaFormatParameterTest(absltest.TestCase):
 
   def test_ollama_default_format_is_json(self):
     """Test that JSON is the default format when not specified."""
-    with mock.patch("requests.post", autospec=True) as mock_post:
+    with mock.patch("requests.Session.post", autospec=True) as mock_post:
       mock_response = mock.Mock(spec=["status_code", "json"])
       mock_response.status_code = 200
       mock_response.json.return_value = {"response": '{"test": "value"}'}
@@ -198,7 +198,7 @@ class OllamaFormatParameterTest(absltest.TestCase):
 
   def test_extract_with_ollama_passes_json_format(self):
     """Test that lx.extract() correctly passes JSON format to Ollama API."""
-    with mock.patch("requests.post", autospec=True) as mock_post:
+    with mock.patch("requests.Session.post", autospec=True) as mock_post:
       mock_response = mock.Mock(spec=["status_code", "json"])
       mock_response.status_code = 200
       mock_response.json.return_value = {
@@ -258,7 +258,7 @@ class OllamaYAMLOverrideTest(absltest.TestCase):
 
   def test_ollama_yaml_format_in_request_payload(self):
     """Test that YAML format override appears in Ollama request payload."""
-    with mock.patch("requests.post", autospec=True) as mock_post:
+    with mock.patch("requests.Session.post", autospec=True) as mock_post:
       mock_response = mock.Mock(spec=["status_code", "json"])
       mock_response.status_code = 200
       mock_response.json.return_value = {"response": '{"extractions": []}'}
@@ -292,7 +292,7 @@ class OllamaYAMLOverrideTest(absltest.TestCase):
         )
     ]
 
-    with mock.patch("requests.post", autospec=True) as mock_post:
+    with mock.patch("requests.Session.post", autospec=True) as mock_post:
       mock_response = mock.Mock(spec=["status_code", "json"])
       mock_response.status_code = 200
       mock_response.json.return_value = {"response": '{"extractions": []}'}
@@ -332,7 +332,7 @@ class OllamaYAMLOverrideTest(absltest.TestCase):
         )
     ]
 
-    with mock.patch("requests.post", autospec=True) as mock_post:
+    with mock.patch("requests.Session.post", autospec=True) as mock_post:
       mock_response = mock.Mock(spec=["status_code", "json"])
       mock_response.status_code = 200
       mock_response.json.return_value = {"response": '{"extractions": []}'}
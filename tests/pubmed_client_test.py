@@ -0,0 +1,311 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.literature.pubmed_client."""
+
+import io
+import threading
+import time
+from unittest import mock
+
+from absl.testing import absltest
+
+from langextract.core import rate_limit
+from langextract.literature import metadata_cache
+from langextract.literature import pubmed_client
+
+_ESEARCH = """<?xml version="1.0" encoding="UTF-8" ?>
+<!DOCTYPE eSearchResult PUBLIC "-//NLM//DTD esearch 20060628//EN" \
+"https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20060628/esearch.dtd">
+<eSearchResult><Count>{count}</Count><RetMax>{retmax}</RetMax>\
+<RetStart>0</RetStart>{history}<IdList>{ids}</IdList>\
+<TranslationSet/><QueryTranslation>q</QueryTranslation></eSearchResult>
+"""
+
+_EFETCH = """<?xml version="1.0" ?>
+<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January \
+2025//EN" "https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_250101.dtd">
+<PubmedArticleSet>{articles}</PubmedArticleSet>
+"""
+
+_ARTICLE = """<PubmedArticle>
+<MedlineCitation Status="MEDLINE" Owner="NLM">
+<PMID Version="1">{pmid}</PMID>
+<Article PubModel="Print">
+<Journal><ISSN IssnType="Print">1234-5678</ISSN>
+<JournalIssue CitedMedium="Print"><Volume>12</Volume><Issue>3</Issue>
+<PubDate><Year>2024</Year><Month>05</Month><Day>17</Day></PubDate>
+</JournalIssue><Title>Journal of Aging Biology</Title></Journal>
+<ArticleTitle>Biomarker study number {pmid}</ArticleTitle>
+<Abstract><AbstractText>Serum CRP in older adults ({pmid}) was measured at
+baseline and follow-up.</AbstractText>
+</Abstract>
+<AuthorList CompleteYN="Y"><Author ValidYN="Y"><LastName>Doe</LastName>
+<ForeName>Jane</ForeName><Initials>J</Initials></Author></AuthorList>
+<Language>eng</Language>
+<PublicationTypeList><PublicationType UI="D016454">Review</PublicationType>
+</PublicationTypeList>
+</Article>
+<MeshHeadingList><MeshHeading>
+<DescriptorName UI="D000375" MajorTopicYN="N">Aging</DescriptorName>
+</MeshHeading></MeshHeadingList>
+<KeywordList Owner="NOTNLM"><Keyword MajorTopicYN="N">CRP</Keyword>
+<Keyword MajorTopicYN="N">inflammaging</Keyword></KeywordList>
+</MedlineCitation>
+<PubmedData><ArticleIdList>
+<ArticleId IdType="pubmed">{pmid}</ArticleId>
+<ArticleId IdType="doi">10.1000/{pmid}</ArticleId>
+<ArticleId IdType="pmc">PMC{pmid}</ArticleId>
+</ArticleIdList></PubmedData>
+</PubmedArticle>"""
+
+
+class _FakeEutils:
+  """Serves esearch/efetch over a fixed list of PMIDs."""
+
+  def __init__(self, pmids, delay=0.0):
+    self.pmids = pmids
+    self.delay = delay
+    self.efetch_calls = []
+    self.in_flight = 0
+    self.max_in_flight = 0
+    self._lock = threading.Lock()
+
+  def esearch(self, **params):
+    history = ""
+    ids = self.pmids[: params["retmax"]]
+    if params.get("usehistory") == "y":
+      history = "<QueryKey>1</QueryKey><WebEnv>ENV_1</WebEnv>"
+    xml = _ESEARCH.format(
+        count=len(self.pmids),
+        retmax=len(ids),
+        history=history,
+        ids="".join(f"<Id>{pmid}</Id>" for pmid in ids),
+    )
+    return io.BytesIO(xml.encode())
+
+  def efetch(self, **params):
+    with self._lock:
+      self.efetch_calls.append(params)
+      self.in_flight += 1
+      self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    time.sleep(self.delay)
+    if "id" in params:
+      pmids = params["id"]
+    else:
+      assert (params["webenv"], params["query_key"]) == ("ENV_1", "1")
+      start = params["retstart"]
+      pmids = self.pmids[start : start + params["retmax"]]
+    with self._lock:
+      self.in_flight -= 1
+    xml = _EFETCH.format(
+        articles="".join(_ARTICLE.format(pmid=pmid) for pmid in pmids)
+    )
+    return io.BytesIO(xml.encode())
+
+
+class PubMedClientTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rate_limit.reset()
+    self.addCleanup(rate_limit.reset)
+
+  def _client(self, server, **kwargs):
+    kwargs.setdefault(
+        "rate_limiter",
+        rate_limit.RateLimiter(rate_limit.RateLimit(requests_per_minute=60e3)),
+    )
+    client = pubmed_client.PubMedClient("test@example.com", **kwargs)
+    self.enter_context(
+        mock.patch.object(
+            pubmed_client.Entrez, "esearch", server.esearch
+        )
+    )
+    self.enter_context(
+        mock.patch.object(
+            pubmed_client.Entrez, "efetch", server.efetch
+        )
+    )
+    return client
+
+  def test_history_paging_fetches_windows_concurrently_in_order(self):
+    pmids = [str(1000 + i) for i in range(25)]
+    server = _FakeEutils(pmids, delay=0.02)
+    client = self._client(server, max_workers=3)
+
+    history = client.search_history("crp AND aging")
+    papers = list(client.fetch_history(history, batch_size=4))
+
+    self.assertEqual(pubmed_client.HistorySearch(25, "ENV_1", "1"), history)
+    self.assertEqual(pmids, [paper.pmid for paper in papers])
+    windows = sorted(server.efetch_calls, key=lambda c: c["retstart"])
+    self.assertEqual(
+        list(range(0, 25, 4)), [c["retstart"] for c in windows]
+    )
+    self.assertEqual([4] * 6 + [1], [c["retmax"] for c in windows])
+    self.assertEqual(3, server.max_in_flight)
+
+  def test_fetch_history_respects_max_results(self):
+    server = _FakeEutils([str(i) for i in range(1, 11)])
+    client = self._client(server)
+
+    papers = list(
+        client.fetch_history(
+            client.search_history("crp"), max_results=5, batch_size=2
+        )
+    )
+
+    self.assertEqual(["1", "2", "3", "4", "5"], [p.pmid for p in papers])
+    self.assertEqual([2, 2, 1], [c["retmax"] for c in server.efetch_calls])
+
+  def test_fetch_abstracts_parses_records(self):
+    server = _FakeEutils([])
+    client = self._client(server)
+
+    papers = client.fetch_abstracts(["11", "12", "13"], batch_size=2)
+
+    self.assertEqual(["11", "12", "13"], [p.pmid for p in papers])
+    paper = papers[0]
+    self.assertEqual("Biomarker study number 11", paper.title)
+    self.assertEqual("10.1000/11", paper.doi)
+    self.assertEqual("PMC11", paper.metadata_extras["pmcid"])
+    self.assertEqual("Doe", paper.authors[0].last_name)
+    self.assertEqual("Journal of Aging Biology", paper.journal.name)
+    self.assertEqual(2024, paper.publication_date.year)
+    self.assertEqual("review", paper.publication_type.value)
+
+  def test_iteration_yields_before_later_batches_finish(self):
+    server = _FakeEutils([], delay=0.05)
+    client = self._client(server, max_workers=1)
+
+    papers = client.iter_abstracts([str(i) for i in range(1, 21)], batch_size=2)
+    first = next(papers)
+    papers.close()
+
+    self.assertEqual("1", first.pmid)
+    self.assertLess(len(server.efetch_calls), 10)
+
+  def test_streaming_parser_matches_entrez_parser(self):
+    pmids = [str(i) for i in range(1, 8)]
+    entrez = self._client(_FakeEutils(pmids)).fetch_abstracts(pmids, 3)
+    streamed = self._client(_FakeEutils(pmids), stream_xml=True)
+
+    self.assertEqual(entrez, streamed.fetch_abstracts(pmids, batch_size=3))
+    self.assertEqual(["Aging"], entrez[0].mesh_terms)
+    self.assertEqual(["CRP", "inflammaging"], entrez[0].keywords)
+
+  def test_streaming_parser_yields_before_reading_whole_response(self):
+    xml = _EFETCH.format(
+        articles="".join(_ARTICLE.format(pmid=i) for i in range(1, 200))
+    ).encode()
+    handle = io.BytesIO(xml)
+    client = pubmed_client.PubMedClient("test@example.com")
+
+    papers = client._iter_pubmed_xml(handle)
+    first = next(papers)
+
+    self.assertEqual("1", first.pmid)
+    self.assertLess(handle.tell(), len(xml) // 4)
+    self.assertLen(list(papers), 198)
+
+  def test_streaming_parser_flattens_markup_and_skips_bad_records(self):
+    articles = _ARTICLE.format(pmid=1).replace(
+        "Biomarker study", "Biomarker <i>in vivo</i> study"
+    ) + _ARTICLE.format(pmid=2).replace("<PMID", "<Other").replace(
+        "</PMID>", "</Other>"
+    )
+    handle = io.BytesIO(_EFETCH.format(articles=articles).encode())
+    client = pubmed_client.PubMedClient("test@example.com")
+
+    papers = list(client._iter_pubmed_xml(handle))
+
+    self.assertEqual(["1"], [p.pmid for p in papers])
+    self.assertEqual("Biomarker in vivo study number 1", papers[0].title)
+
+  def test_cache_fetches_only_misses_in_requested_order(self):
+    cache = metadata_cache.MetadataCache(":memory:")
+    self.addCleanup(cache.close)
+    server = _FakeEutils([])
+    client = self._client(server, cache=cache)
+    client.fetch_abstracts(["2", "4"])
+    server.efetch_calls.clear()
+
+    papers = client.fetch_abstracts(["1", "2", "3", "4", "5"], batch_size=2)
+
+    self.assertEqual(["1", "2", "3", "4", "5"], [p.pmid for p in papers])
+    self.assertEqual(
+        [["1", "3"], ["5"]], [call["id"] for call in server.efetch_calls]
+    )
+    self.assertLen(
+        cache.get_many(
+            metadata_cache.doi_key(f"10.1000/{i}") for i in range(1, 6)
+        ),
+        5,
+    )
+
+    server.efetch_calls.clear()
+    self.assertLen(client.fetch_abstracts(["5", "3", "1"]), 3)
+    self.assertEmpty(server.efetch_calls)
+
+  def test_search_biomarkers_with_cache_skips_cached_papers(self):
+    cache = metadata_cache.MetadataCache(":memory:")
+    self.addCleanup(cache.close)
+    server = _FakeEutils([str(i) for i in range(1, 7)])
+    client = self._client(server, cache=cache)
+
+    first = client.search_biomarkers(["CRP"], max_results=4)
+    server.efetch_calls.clear()
+    second = client.search_biomarkers(["CRP"], max_results=6)
+
+    self.assertEqual([p.pmid for p in first], [p.pmid for p in second[:4]])
+    self.assertEqual([["5", "6"]], [c["id"] for c in server.efetch_calls])
+
+  def test_clients_share_ncbi_limiter(self):
+    self.enter_context(mock.patch.object(pubmed_client.Entrez, "api_key"))
+    first = pubmed_client.PubMedClient("a@example.com")
+    second = pubmed_client.PubMedClient("b@example.com")
+    keyed = pubmed_client.PubMedClient("c@example.com", api_key="key")
+
+    self.assertIs(first.rate_limiter, second.rate_limiter)
+    self.assertIsNot(first.rate_limiter, keyed.rate_limiter)
+    self.assertEqual(180, first.rate_limiter.limit.requests_per_minute)
+    self.assertEqual(600, keyed.rate_limiter.limit.requests_per_minute)
+
+  def test_ncbi_limiter_keyed_by_api_key(self):
+    self.enter_context(mock.patch.object(pubmed_client.Entrez, "api_key"))
+    first = pubmed_client.PubMedClient("a@example.com", api_key="key-1")
+    same_key = pubmed_client.PubMedClient("b@example.com", api_key="key-1")
+    other_key = pubmed_client.PubMedClient("c@example.com", api_key="key-2")
+
+    self.assertIs(first.rate_limiter, same_key.rate_limiter)
+    self.assertIsNot(first.rate_limiter, other_key.rate_limiter)
+    self.assertNotIn("key-1", first.rate_limiter.name)
+
+  def test_configured_ncbi_limiter_not_replaced(self):
+    self.enter_context(mock.patch.object(pubmed_client.Entrez, "api_key"))
+    configured = rate_limit.configure(
+        "ncbi", rate_limit.RateLimit(requests_per_minute=60)
+    )
+
+    keyless = pubmed_client.PubMedClient("a@example.com")
+    keyed = pubmed_client.PubMedClient("b@example.com", api_key="key")
+
+    self.assertIs(configured, keyless.rate_limiter)
+    self.assertIs(configured, keyed.rate_limiter)
+    self.assertIs(configured, rate_limit.get_limiter("ncbi"))
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,268 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.core.rate_limit."""
+
+import asyncio
+from unittest import mock
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+from langextract.core import exceptions
+from langextract.core import rate_limit
+from langextract.core import tokenizer
+
+
+class _FakeClock:
+  """Monotonic clock whose sleep() advances time instantly."""
+
+  def __init__(self):
+    self.now = 1000.0
+    self.sleeps = []
+
+  def monotonic(self):
+    return self.now
+
+  def sleep(self, seconds):
+    self.sleeps.append(seconds)
+    self.now += seconds
+
+  async def async_sleep(self, seconds):
+    self.sleep(seconds)
+
+
+class _HTTPError(Exception):
+
+  def __init__(self, status_code, headers=None):
+    super().__init__(f"HTTP {status_code}")
+    self.status_code = status_code
+    self.response = mock.Mock(status_code=status_code, headers=headers or {})
+
+
+class RateLimiterTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.clock = _FakeClock()
+    for target, fake in (
+        ("langextract.core.rate_limit.time.monotonic", self.clock.monotonic),
+        ("langextract.core.rate_limit.time.sleep", self.clock.sleep),
+        (
+            "langextract.core.rate_limit.asyncio.sleep",
+            self.clock.async_sleep,
+        ),
+    ):
+      patcher = mock.patch(target, side_effect=fake)
+      patcher.start()
+      self.addCleanup(patcher.stop)
+    rate_limit.reset()
+    self.addCleanup(rate_limit.reset)
+
+  def test_requests_paced_after_burst(self):
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(requests_per_minute=60, burst_seconds=2)
+    )
+
+    for _ in range(5):
+      limiter.acquire()
+
+    # Two requests fit in the burst, the rest are spaced one second apart.
+    self.assertAlmostEqual(3.0, self.clock.now - 1000.0)
+
+  def test_token_bucket_limits_large_requests(self):
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(tokens_per_minute=600, burst_seconds=10)
+    )
+
+    limiter.acquire(tokens=100)
+    limiter.acquire(tokens=100)
+
+    self.assertAlmostEqual(10.0, self.clock.now - 1000.0)
+
+  def test_oversized_request_admitted_when_bucket_full(self):
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(tokens_per_minute=600, burst_seconds=10)
+    )
+
+    limiter.acquire(tokens=1000)
+    self.assertEqual(1000.0, self.clock.now)
+    # The overdraft delays the next request until the debt is repaid.
+    limiter.acquire(tokens=1)
+    self.assertAlmostEqual(90.1, self.clock.now - 1000.0)
+
+  def test_rate_limited_halves_rate_and_pauses(self):
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(requests_per_minute=60, burst_seconds=1)
+    )
+
+    with self.assertRaises(_HTTPError):
+      with limiter.request():
+        raise _HTTPError(429, {"Retry-After": "7"})
+
+    self.assertEqual(0.5, limiter.scale)
+    limiter.acquire()
+    self.assertAlmostEqual(7.0, self.clock.now - 1000.0)
+    limiter.acquire()
+    # The next request waits for the bucket to refill at half rate.
+    self.assertAlmostEqual(9.0, self.clock.now - 1000.0)
+
+  def test_success_restores_rate(self):
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(requests_per_minute=60, increase_step=0.25)
+    )
+    limiter.on_rate_limited(retry_after=0)
+    limiter.on_rate_limited(retry_after=0)
+    self.assertEqual(0.25, limiter.scale)
+
+    for _ in range(5):
+      with limiter.request():
+        pass
+
+    self.assertEqual(1.0, limiter.scale)
+
+  def test_other_errors_do_not_reduce_rate(self):
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(requests_per_minute=60)
+    )
+
+    with self.assertRaises(_HTTPError):
+      with limiter.request():
+        raise _HTTPError(500)
+
+    self.assertEqual(1.0, limiter.scale)
+
+  def test_record_usage_charges_difference(self):
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(tokens_per_minute=600, burst_seconds=10)
+    )
+
+    limiter.acquire(tokens=10)
+    limiter.record_usage(estimated_tokens=10, actual_tokens=100)
+    limiter.acquire(tokens=1)
+
+    # 10 reserved + 90 charged empties the bucket; one token takes 0.1s.
+    self.assertAlmostEqual(0.1, self.clock.now - 1000.0)
+
+  def test_acquire_async(self):
+    limiter = rate_limit.RateLimiter(
+        rate_limit.RateLimit(requests_per_minute=60, burst_seconds=1)
+    )
+
+    async def run():
+      for _ in range(3):
+        async with limiter.request_async():
+          pass
+
+    asyncio.run(run())
+
+    self.assertAlmostEqual(2.0, self.clock.now - 1000.0)
+
+  def test_limiter_for_shares_equal_limits(self):
+    limit = rate_limit.RateLimit(requests_per_minute=100)
+
+    first = rate_limit.limiter_for("openai", "gpt-4o", limit)
+    second = rate_limit.limiter_for(
+        "openai", "gpt-4o", rate_limit.RateLimit(requests_per_minute=100)
+    )
+    other_model = rate_limit.limiter_for("openai", "gpt-4o-mini", limit)
+
+    self.assertIs(first, second)
+    self.assertIsNot(first, other_model)
+    self.assertIs(first, rate_limit.limiter_for("openai", "gpt-4o", None))
+
+  def test_get_limiter_falls_back_to_provider_wide(self):
+    provider_wide = rate_limit.configure(
+        "gemini", rate_limit.RateLimit(requests_per_minute=10)
+    )
+
+    self.assertIs(provider_wide, rate_limit.get_limiter("gemini", "flash"))
+    self.assertIsNone(rate_limit.get_limiter("openai", "gpt-4o"))
+
+  def test_invalid_limit(self):
+    with self.assertRaises(ValueError):
+      rate_limit.RateLimit(requests_per_minute=0)
+
+  def test_estimate_tokens_matches_batch_budgeting(self):
+    prompt = "x" * 41
+
+    self.assertEqual(
+        tokenizer.estimate_token_count(prompt),
+        rate_limit.estimate_tokens(prompt),
+    )
+    self.assertEqual(11 + 100, rate_limit.estimate_tokens(prompt, 100))
+
+
+class RateLimitErrorTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      dict(
+          testcase_name="status_code",
+          error=_HTTPError(429),
+          expected=True,
+      ),
+      dict(
+          testcase_name="genai_code",
+          error=mock.Mock(spec=Exception, code=429),
+          expected=True,
+      ),
+      dict(
+          testcase_name="wrapped",
+          error=exceptions.InferenceRuntimeError(
+              "OpenAI API error", original=_HTTPError(429)
+          ),
+          expected=True,
+      ),
+      dict(
+          testcase_name="server_error",
+          error=_HTTPError(503),
+          expected=False,
+      ),
+      dict(
+          testcase_name="plain",
+          error=ValueError("bad"),
+          expected=False,
+      ),
+  )
+  def test_is_rate_limit_error(self, error, expected):
+    self.assertEqual(expected, rate_limit.is_rate_limit_error(error))
+
+  def test_retry_after_header(self):
+    self.assertEqual(
+        12.0,
+        rate_limit.retry_after_seconds(
+            _HTTPError(429, {"retry-after": "12"})
+        ),
+    )
+
+  def test_retry_after_gemini_retry_info(self):
+    error = Exception("429 RESOURCE_EXHAUSTED")
+    error.details = {
+        "error": {
+            "code": 429,
+            "details": [{
+                "@type": "type.googleapis.com/google.rpc.RetryInfo",
+                "retryDelay": "13s",
+            }],
+        }
+    }
+
+    self.assertEqual(13.0, rate_limit.retry_after_seconds(error))
+
+  def test_retry_after_missing(self):
+    self.assertIsNone(rate_limit.retry_after_seconds(_HTTPError(429)))
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,304 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.providers.replay."""
+
+import json
+import os
+import random
+import tempfile
+import threading
+
+from absl.testing import absltest
+from absl.testing import parameterized
+
+import langextract as lx
+from langextract import factory
+from langextract import resilience
+from langextract.core import base_model
+from langextract.core import exceptions
+from langextract.core import schema
+from langextract.core import types
+from langextract.providers import replay
+from langextract.providers.schemas import gemini as gemini_schema
+
+
+class _LiveModel(base_model.BaseLanguageModel):
+  """Answers "out:<prompt>" and counts calls."""
+
+  def __init__(self, answer_fn=None):
+    super().__init__()
+    self._answer_fn = answer_fn or (lambda prompt: f"out:{prompt}")
+    self.calls = []
+    self._lock = threading.Lock()
+
+  def infer(self, batch_prompts, **kwargs):
+    for prompt in batch_prompts:
+      with self._lock:
+        self.calls.append((prompt, kwargs))
+      yield [types.ScoredOutput(score=0.9, output=self._answer_fn(prompt))]
+
+
+def _outputs(results):
+  return [r[0].output for r in results]
+
+
+class ReplayLanguageModelTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.path = os.path.join(
+        self.enter_context(tempfile.TemporaryDirectory()), "rec", "run.jsonl"
+    )
+
+  def _model(self, mode=replay.MODE_REPLAY, **kwargs):
+    kwargs.setdefault("latency", 0)
+    model = replay.ReplayLanguageModel(
+        "replay:fake-model", self.path, mode, **kwargs
+    )
+    self.addCleanup(model.close)
+    return model
+
+  def _record(self, prompts):
+    live = _LiveModel()
+    recorder = self._model(replay.MODE_RECORD, live_model=live)
+    list(recorder.infer(prompts))
+    return live
+
+  def test_record_then_replay_without_live_model(self):
+    live = _LiveModel()
+    recorder = self._model(replay.MODE_RECORD, live_model=live)
+
+    recorded = _outputs(recorder.infer(["a", "b"], temperature=0.3))
+
+    self.assertEqual(["out:a", "out:b"], recorded)
+    self.assertEqual(
+        [("a", {"temperature": 0.3}), ("b", {"temperature": 0.3})],
+        sorted(live.calls),
+    )
+    with open(self.path, encoding="utf-8") as f:
+      lines = [json.loads(line) for line in f]
+    self.assertEqual(["fake-model"] * 2, [line["model_id"] for line in lines])
+
+    player = self._model()
+    self.assertEqual(["out:b", "out:a"], _outputs(player.infer(["b", "a"])))
+    self.assertEqual(2, player.stats.replayed)
+    self.assertEqual("fake-model", player.model_id)
+
+  def test_schema_and_fence_forwarded_to_live_model(self):
+    live = _LiveModel()
+    recorder = self._model(replay.MODE_RECORD, live_model=live)
+    format_schema = schema.FormatModeSchema()
+
+    recorder.apply_schema(format_schema)
+    recorder.set_fence_output(False)
+
+    self.assertIs(format_schema, live.schema)
+    self.assertFalse(live.requires_fence_output)
+    live.set_fence_output(True)
+    self.assertTrue(recorder.requires_fence_output)
+
+  def test_replay_without_live_model_keeps_settings(self):
+    player = self._model()
+
+    player.apply_schema(schema.FormatModeSchema())
+    player.set_fence_output(False)
+
+    self.assertIsInstance(player.schema, schema.FormatModeSchema)
+    self.assertFalse(player.requires_fence_output)
+
+  def test_missing_prompt_raises_in_replay_mode(self):
+    self._record(["a"])
+
+    with self.assertRaisesRegex(exceptions.InferenceRuntimeError, "record"):
+      list(self._model().infer(["a", "unknown"]))
+
+  def test_auto_mode_records_only_misses(self):
+    self._record(["a"])
+    live = _LiveModel()
+    model = self._model(replay.MODE_AUTO, live_model=live)
+
+    self.assertEqual(["out:a", "out:b"], _outputs(model.infer(["a", "b"])))
+    self.assertEqual([("b", {})], live.calls)
+    self.assertEqual(1, model.stats.replayed)
+    self.assertEqual(1, model.stats.recorded)
+
+  def test_rerecording_overrides_earlier_lines(self):
+    self._record(["a"])
+    recorder = self._model(
+        replay.MODE_RECORD, live_model=_LiveModel(lambda p: "new")
+    )
+    list(recorder.infer(["a"]))
+
+    self.assertEqual(["new"], _outputs(self._model().infer(["a"])))
+
+  def test_failure_rate_raises_transient_errors(self):
+    self._record(["a"])
+    model = self._model(failure_rate=1.0)
+
+    with self.assertRaises(exceptions.InferenceRuntimeError) as cm:
+      list(model.infer(["a"]))
+
+    self.assertEqual(503, cm.exception.status_code)
+    self.assertTrue(resilience.is_transient_error(cm.exception))
+    self.assertEqual(1, model.stats.failures)
+
+  def test_simulation_is_reproducible(self):
+    prompts = [f"p{i}" for i in range(20)]
+    self._record(prompts)
+
+    def run(seed):
+      model = self._model(
+          latency={"distribution": "uniform", "seconds": 0.002,
+                   "jitter": 0.002},
+          failure_rate=0.3,
+          seed=seed,
+      )
+      outcome = []
+      for prompt in prompts:
+        try:
+          list(model.infer([prompt]))
+          outcome.append(True)
+        except exceptions.InferenceRuntimeError:
+          outcome.append(False)
+      return outcome, round(model.stats.simulated_seconds, 9)
+
+    first = run(seed=1)
+    self.assertEqual(first, run(seed=1))
+    self.assertNotEqual(first, run(seed=2))
+    self.assertIn(False, first[0])
+
+  def test_max_concurrency_waits_for_slots(self):
+    prompts = [f"p{i}" for i in range(6)]
+    self._record(prompts)
+    model = self._model(latency=0.01, max_concurrency=2, max_workers=6)
+
+    self.assertLen(list(model.infer(prompts)), 6)
+    self.assertEqual(2, model.stats.max_in_flight)
+    self.assertEqual(0, model.stats.rejected)
+
+  def test_reject_over_limit_raises_rate_limit(self):
+    prompts = [f"p{i}" for i in range(4)]
+    self._record(prompts)
+    model = self._model(
+        latency=0.05, max_concurrency=1, reject_over_limit=True, max_workers=4
+    )
+
+    with self.assertRaises(exceptions.InferenceRuntimeError) as cm:
+      list(model.infer(prompts))
+
+    self.assertEqual(429, cm.exception.status_code)
+    self.assertGreater(model.stats.rejected, 0)
+
+  @parameterized.parameters(
+      dict(value={"distribution": "bogus"}),
+      dict(value={"distribution": "lognormal"}),
+      dict(value=-1.0),
+  )
+  def test_invalid_latency_rejected(self, value):
+    with self.assertRaises(exceptions.InferenceConfigError):
+      self._model(latency=value)
+
+  def test_latency_distributions(self):
+    rng = random.Random(0)
+    self.assertEqual(0.5, replay.LatencyModel.from_value(0.5).sample(rng, 9))
+    self.assertEqual(
+        4.5, replay.LatencyModel(scale=0.5).sample(rng, recorded=9)
+    )
+    lognormal = replay.LatencyModel("lognormal", seconds=1.0, jitter=0.5)
+    samples = sorted(lognormal.sample(rng, 0) for _ in range(999))
+    self.assertAlmostEqual(1.0, samples[499], delta=0.15)
+
+
+class ReplayRegistrationTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    lx.providers.registry.clear()
+    lx.providers._reset_for_testing()
+    self.addCleanup(lx.providers.registry.clear)
+    self.addCleanup(lx.providers._reset_for_testing)
+    self.path = os.path.join(
+        self.enter_context(tempfile.TemporaryDirectory()), "run.jsonl"
+    )
+
+  def test_factory_resolves_replay_prefix(self):
+    model = factory.create_model_from_id(
+        "replay:gemini-2.5-flash", recording_path=self.path
+    )
+    self.addCleanup(model.close)
+
+    self.assertIsInstance(model, replay.ReplayLanguageModel)
+    self.assertEqual("gemini-2.5-flash", model.model_id)
+
+  def test_schema_class_resolved_from_wrapped_model(self):
+    model = factory.create_model(
+        factory.ModelConfig(
+            model_id="replay:gemini-2.5-flash",
+            provider_kwargs={"recording_path": self.path},
+        ),
+        examples=[
+            lx.data.ExampleData(
+                text="Took aspirin.",
+                extractions=[lx.data.Extraction("medication", "aspirin")],
+            )
+        ],
+        use_schema_constraints=True,
+    )
+    self.addCleanup(model.close)
+
+    self.assertIsInstance(model.schema, gemini_schema.GeminiSchema)
+    self.assertFalse(model.requires_fence_output)
+
+  def test_extract_replays_recorded_run(self):
+    answer = json.dumps({"extractions": [{"medication": "aspirin"}]})
+    live = _LiveModel(lambda prompt: answer)
+    kwargs = dict(
+        text_or_documents="Patient took aspirin.",
+        prompt_description="Extract medications.",
+        examples=[
+            lx.data.ExampleData(
+                text="Took ibuprofen.",
+                extractions=[lx.data.Extraction("medication", "ibuprofen")],
+            )
+        ],
+        model_id="replay:gemini-2.5-flash",
+        fence_output=False,
+        use_schema_constraints=False,
+        show_progress=False,
+    )
+
+    recorded = lx.extract(
+        **kwargs,
+        language_model_params={
+            "recording_path": self.path,
+            "mode": "record",
+            "live_model": live,
+        },
+    )
+    replayed = lx.extract(
+        **kwargs,
+        language_model_params={"recording_path": self.path, "latency": 0},
+    )
+
+    self.assertLen(live.calls, 1)
+    self.assertEqual(
+        [(e.extraction_text, e.char_interval) for e in recorded.extractions],
+        [(e.extraction_text, e.char_interval) for e in replayed.extractions],
+    )
+    self.assertEqual("aspirin", replayed.extractions[0].extraction_text)
+
+
+if __name__ == "__main__":
+  absltest.main()
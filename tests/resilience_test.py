@@ -0,0 +1,404 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.resilience."""
+
+import asyncio
+import random
+import threading
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import requests
+
+import langextract as lx
+from langextract import resilience
+from langextract.core import base_model
+from langextract.core import exceptions
+from langextract.core import types
+
+_NO_BACKOFF = resilience.RetryPolicy(max_attempts=3, initial_backoff=0.0)
+
+
+def _transient(status_code=503):
+  return exceptions.InferenceRuntimeError(
+      "server error", status_code=status_code
+  )
+
+
+class _ScriptedModel(base_model.BaseLanguageModel):
+  """Model whose calls per prompt follow a script of errors and outputs.
+
+  Each script entry is an exception to raise, a callable run before
+  answering, or ignored; once a prompt's script is exhausted it echoes.
+  """
+
+  def __init__(self, scripts=None, max_workers=4):
+    super().__init__()
+    self.max_workers = max_workers
+    self._scripts = {k: list(v) for k, v in (scripts or {}).items()}
+    self._lock = threading.Lock()
+    self.calls = []
+
+  def _next(self, prompt):
+    with self._lock:
+      self.calls.append(prompt)
+      script = self._scripts.get(prompt)
+      step = script.pop(0) if script else None
+    if isinstance(step, BaseException):
+      raise step
+    if callable(step):
+      step()
+    return [types.ScoredOutput(score=1.0, output=f"echo:{prompt}")]
+
+  def infer(self, batch_prompts, **kwargs):
+    for prompt in batch_prompts:
+      yield self._next(prompt)
+
+  async def infer_async(self, batch_prompts, **kwargs):
+    return [self._next(prompt) for prompt in batch_prompts]
+
+
+def _texts(outputs):
+  return [[o.output for o in output] for output in outputs]
+
+
+class IsTransientErrorTest(parameterized.TestCase):
+
+  class APITimeoutError(Exception):
+    """Stands in for openai.APITimeoutError."""
+
+  @parameterized.named_parameters(
+      dict(testcase_name="server_error", error=_transient(503), expected=True),
+      dict(testcase_name="rate_limit", error=_transient(429), expected=True),
+      dict(testcase_name="bad_request", error=_transient(400), expected=False),
+      dict(
+          testcase_name="requests_timeout",
+          error=requests.exceptions.ReadTimeout(),
+          expected=True,
+      ),
+      dict(
+          testcase_name="wrapped_connection_reset",
+          error=exceptions.InferenceRuntimeError(
+              "failed", original=ConnectionResetError()
+          ),
+          expected=True,
+      ),
+      dict(
+          testcase_name="sdk_timeout_by_name",
+          error=APITimeoutError(),
+          expected=True,
+      ),
+      dict(
+          testcase_name="config_error",
+          error=exceptions.InferenceConfigError("no key"),
+          expected=False,
+      ),
+      dict(testcase_name="value_error", error=ValueError(), expected=False),
+  )
+  def test_is_transient_error(self, error, expected):
+    self.assertEqual(expected, resilience.is_transient_error(error))
+
+
+class RetryPolicyTest(absltest.TestCase):
+
+  def test_backoff_bounded_and_honours_retry_after(self):
+    policy = resilience.RetryPolicy(initial_backoff=1.0, max_backoff=4.0)
+    rng = random.Random(0)
+
+    for attempt in range(6):
+      delay = policy.backoff(attempt, rng=rng)
+      self.assertBetween(delay, 0.0, min(4.0, 2.0**attempt))
+    self.assertGreaterEqual(policy.backoff(0, retry_after=9.0, rng=rng), 9.0)
+
+
+class CircuitBreakerTest(absltest.TestCase):
+
+  def test_opens_then_probes_once(self):
+    breaker = resilience.CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+
+    breaker.record_failure()
+    self.assertEqual("closed", breaker.state)
+    breaker.record_failure()
+    self.assertEqual("half_open", breaker.state)
+
+    breaker.before_call()  # The probe.
+    with self.assertRaises(resilience.CircuitOpenError):
+      breaker.before_call()
+    breaker.record_success()
+    self.assertEqual("closed", breaker.state)
+    breaker.before_call()
+
+  def test_rejects_while_open(self):
+    breaker = resilience.CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+
+    self.assertEqual("open", breaker.state)
+    with self.assertRaises(resilience.CircuitOpenError):
+      breaker.before_call()
+
+
+class ResilientLanguageModelTest(absltest.TestCase):
+
+  def test_retries_transient_errors(self):
+    inner = _ScriptedModel({"a": [_transient(), _transient(502)]})
+    model = resilience.ResilientLanguageModel(
+        inner, resilience.ResilienceConfig(retry=_NO_BACKOFF)
+    )
+
+    self.assertEqual([["echo:a"], ["echo:b"]], _texts(model.infer(["a", "b"])))
+    self.assertEqual(3, inner.calls.count("a"))
+    self.assertEqual(2, model.stats.retries)
+
+  def test_failed_prompt_isolated(self):
+    inner = _ScriptedModel({"b": [_transient()] * 3})
+    model = resilience.ResilientLanguageModel(
+        inner, resilience.ResilienceConfig(retry=_NO_BACKOFF)
+    )
+
+    outputs = list(model.infer(["a", "b", "c"]))
+
+    self.assertEqual([["echo:a"], [], ["echo:c"]], _texts(outputs))
+    self.assertIsInstance(outputs[1], resilience.FailedOutput)
+    self.assertIs(model.failures[0], outputs[1].failure)
+    self.assertEqual(3, inner.calls.count("b"))
+    self.assertLen(model.failures, 1)
+    self.assertEqual("b", model.failures[0].prompt)
+    self.assertEqual(3, model.failures[0].attempts)
+
+  def test_non_transient_failure_raised_despite_isolation(self):
+    inner = _ScriptedModel({
+        "a": [_transient(400)],
+        "b": [exceptions.InferenceConfigError("401 invalid API key")],
+    })
+    model = resilience.ResilientLanguageModel(
+        inner, resilience.ResilienceConfig(retry=_NO_BACKOFF)
+    )
+
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      list(model.infer(["a"]))
+    with self.assertRaisesRegex(exceptions.InferenceConfigError, "API key"):
+      list(model.infer(["b"]))
+    self.assertEqual(["a", "b"], inner.calls)
+    self.assertEmpty(model.failures)
+
+  def test_failure_raised_without_isolation(self):
+    inner = _ScriptedModel({"a": [_transient()] * 3})
+    model = resilience.ResilientLanguageModel(
+        inner,
+        resilience.ResilienceConfig(retry=_NO_BACKOFF, isolate_failures=False),
+    )
+
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      list(model.infer(["a"]))
+    self.assertEqual(3, inner.calls.count("a"))
+
+  def test_circuit_breaker_short_circuits(self):
+    inner = _ScriptedModel({p: [_transient()] for p in "abcd"}, max_workers=1)
+    model = resilience.ResilientLanguageModel(
+        inner,
+        resilience.ResilienceConfig(
+            retry=None, failure_threshold=2, reset_timeout=60
+        ),
+    )
+
+    outputs = model.infer(list("abcd"))
+
+    self.assertEqual([[], []], _texts([next(outputs), next(outputs)]))
+    with self.assertRaises(resilience.CircuitOpenError):
+      next(outputs)
+    self.assertEqual(["a", "b"], inner.calls)
+    self.assertGreaterEqual(model.stats.short_circuited, 1)
+
+  def test_slow_prompt_hedged(self):
+    release = threading.Event()
+    self.addCleanup(release.set)
+    inner = _ScriptedModel({"slow": [lambda: release.wait(10)]})
+    model = resilience.ResilientLanguageModel(
+        inner,
+        resilience.ResilienceConfig(hedge=resilience.HedgePolicy(delay=0.05)),
+    )
+
+    self.assertEqual([["echo:slow"]], _texts(model.infer(["slow"])))
+    self.assertFalse(release.is_set())
+    self.assertEqual(1, model.stats.hedges)
+    self.assertEqual(1, model.stats.hedge_wins)
+
+  def test_hedge_delay_learned_from_latencies(self):
+    model = resilience.ResilientLanguageModel(
+        _ScriptedModel(),
+        resilience.ResilienceConfig(
+            hedge=resilience.HedgePolicy(quantile=0.9, min_samples=10)
+        ),
+    )
+    self.assertIsNone(model._hedge_delay())
+
+    for latency in range(1, 11):
+      model._latencies.add(float(latency))
+
+    self.assertEqual(10.0, model._hedge_delay())
+
+  def test_infer_async_retries_and_isolates(self):
+    inner = _ScriptedModel({
+        "a": [_transient()],
+        "b": [_transient()] * 3,
+        "c": [ValueError("bad")],
+    })
+    model = resilience.ResilientLanguageModel(
+        inner, resilience.ResilienceConfig(retry=_NO_BACKOFF)
+    )
+
+    outputs = asyncio.run(model.infer_async(["a", "b"]))
+
+    self.assertEqual([["echo:a"], []], _texts(outputs))
+    self.assertEqual(2, inner.calls.count("a"))
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      asyncio.run(model.infer_async(["c"]))
+
+  def test_batch_api_batches_passed_through_whole(self):
+
+    class _BatchModel(_ScriptedModel):
+
+      def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+
+      def _use_batch_api(self, batch_prompts):
+        return len(batch_prompts) >= 3
+
+      def infer(self, batch_prompts, **kwargs):
+        self.batches.append(list(batch_prompts))
+        return super().infer(batch_prompts, **kwargs)
+
+    inner = _BatchModel({"a": [_transient()]})
+    model = resilience.ResilientLanguageModel(
+        inner, resilience.ResilienceConfig(retry=_NO_BACKOFF)
+    )
+
+    outputs = _texts(model.infer(["a", "b", "c"]))
+    async_outputs = _texts(asyncio.run(model.infer_async(["a", "b", "c"])))
+    list(model.infer(["d", "e"]))
+
+    self.assertEqual([["echo:a"], ["echo:b"], ["echo:c"]], outputs)
+    self.assertEqual(outputs, async_outputs)
+    self.assertEqual(
+        [["a", "b", "c"]] * 3 + [["d"], ["e"]],
+        sorted(inner.batches[:3]) + sorted(inner.batches[3:]),
+    )
+    self.assertEqual(1, model.stats.retries)
+
+  def test_infer_stream_retries_before_output(self):
+    inner = _ScriptedModel({"a": [_transient()]})
+    model = resilience.ResilientLanguageModel(
+        inner, resilience.ResilienceConfig(retry=_NO_BACKOFF)
+    )
+
+    self.assertEqual(["echo:a"], list(model.infer_stream("a")))
+    self.assertEqual(2, inner.calls.count("a"))
+
+
+_EXAMPLES = [
+    lx.data.ExampleData(
+        text="Took aspirin.",
+        extractions=[lx.data.Extraction("medication", "aspirin")],
+    )
+]
+
+
+def _run_extract(use_async, text, model, **kwargs):
+  kwargs.update(
+      prompt_description="Extract medications.",
+      examples=_EXAMPLES,
+      model=model,
+      fence_output=False,
+      use_schema_constraints=False,
+  )
+  if use_async:
+    return asyncio.run(lx.extract_async(text, **kwargs))
+  return lx.extract(text, show_progress=False, **kwargs)
+
+
+class ExtractResilienceTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      dict(testcase_name="sync", use_async=False),
+      dict(testcase_name="async", use_async=True),
+  )
+  def test_failed_chunk_does_not_abort_document(self, use_async):
+    outputs = {
+        "aspirin": '{"extractions": [{"medication": "aspirin"}]}',
+        "ibuprofen": '{"extractions": [{"medication": "ibuprofen"}]}',
+    }
+
+    class _Model(_ScriptedModel):
+
+      def _next(self, prompt):
+        # The chunk text is at the end of the prompt, after the examples.
+        chunk = prompt[-40:]
+        if "warfarin" in chunk:
+          raise _transient()
+        for drug, output in outputs.items():
+          if drug in chunk:
+            return [types.ScoredOutput(score=1.0, output=output)]
+        return [types.ScoredOutput(score=1.0, output='{"extractions": []}')]
+
+    result = _run_extract(
+        use_async,
+        "Patient took aspirin daily. Then warfarin. Later ibuprofen.",
+        _Model(),
+        max_char_buffer=28,
+        resilience=resilience.ResilienceConfig(retry=None),
+    )
+
+    self.assertEqual(
+        ["aspirin", "ibuprofen"],
+        [e.extraction_text for e in result.extractions],
+    )
+
+  @parameterized.named_parameters(
+      dict(testcase_name="sync", use_async=False),
+      dict(testcase_name="async", use_async=True),
+  )
+  def test_config_error_aborts_extraction(self, use_async):
+
+    class _Model(_ScriptedModel):
+
+      def _next(self, prompt):
+        raise exceptions.InferenceConfigError("401 invalid API key")
+
+    with self.assertRaises(exceptions.InferenceConfigError):
+      _run_extract(
+          use_async,
+          "Patient took aspirin daily.",
+          _Model(),
+          resilience=resilience.ResilienceConfig(retry=_NO_BACKOFF),
+      )
+
+  @parameterized.named_parameters(
+      dict(testcase_name="sync", use_async=False),
+      dict(testcase_name="async", use_async=True),
+  )
+  def test_empty_output_from_plain_model_raises(self, use_async):
+
+    class _Model(_ScriptedModel):
+
+      def _next(self, prompt):
+        return []
+
+    with self.assertRaises(exceptions.InferenceOutputError):
+      _run_extract(use_async, "Patient took aspirin daily.", _Model())
+
+
+if __name__ == "__main__":
+  absltest.main()
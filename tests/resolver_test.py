@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import difflib
+import random
 import textwrap
 from typing import Sequence
 
@@ -1673,6 +1675,166 @@ class AlignEntitiesTest(parameterized.TestCase):
       )
       self.assertEqual(aligned_extraction_groups, expected_output)
 
+  def test_document_tokens_match_chunk_tokenization(self):
+    document = data.Document(
+        text=(
+            "Patient has diabetes.\nTaking metformin 500 mg daily.\n"
+            "Blood pressure is elevated; start lisinopril."
+        )
+    )
+    chunks = list(
+        chunking.ChunkIterator(
+            document.tokenized_text,
+            max_char_buffer=40,
+            tokenizer_impl=tokenizer.RegexTokenizer(),
+            document=document,
+        )
+    )
+    self.assertGreater(len(chunks), 1)
+
+    def extractions():
+      return [[
+          data.Extraction("condition", "diabetes"),
+          data.Extraction("medication", "metformin 500 mg"),
+          data.Extraction("medication", "Lisinopril"),
+          data.Extraction("vital", "blood pressures elevated"),
+      ]]
+
+    for chunk in chunks:
+      args = (
+          chunk.chunk_text,
+          chunk.token_interval.start_index,
+          chunk.char_interval.start_pos,
+      )
+      with self.subTest(chunk=chunk.chunk_text):
+        self.assertEqual(
+            self.aligner.align_extractions(
+                extractions(),
+                *args,
+                document_tokenized_text=document.tokenized_text,
+            ),
+            self.aligner.align_extractions(extractions(), *args),
+        )
+
+  def test_misaligned_document_tokens_fall_back_to_tokenizing(self):
+    document = data.Document(text="Unrelated text entirely.")
+    source_text = "Patient takes aspirin."
+
+    aligned = self.aligner.align_extractions(
+        [[data.Extraction("medication", "aspirin")]],
+        source_text,
+        document_tokenized_text=document.tokenized_text,
+    )
+
+    self.assertEqual(
+        aligned[0][0].char_interval, data.CharInterval(start_pos=14, end_pos=21)
+    )
+
+  def test_tokenizes_each_extraction_once(self):
+    document = data.Document(text="Patient takes aspirin and ibuprofen daily.")
+    calls = []
+
+    class RecordingTokenizer(tokenizer.RegexTokenizer):
+
+      def tokenize(self, text):
+        calls.append(text)
+        return super().tokenize(text)
+
+    self.aligner.align_extractions(
+        [[
+            data.Extraction("medication", "aspirin"),
+            data.Extraction("medication", "ibuprofen"),
+            data.Extraction("medication", "tylenol daily"),
+        ]],
+        document.text,
+        tokenizer_impl=RecordingTokenizer(),
+        document_tokenized_text=document.tokenized_text,
+    )
+
+    self.assertCountEqual(
+        calls, ["\u241f", "aspirin", "ibuprofen", "tylenol daily"]
+    )
+
+
+def _scan_all_windows(source_tokens, extraction_tokens, threshold, max_window):
+  """Reference fuzzy alignment that scores every window of allowed size."""
+  source_norm = [resolver_lib._normalize_token(t) for t in source_tokens]
+  extraction_norm = [
+      resolver_lib._normalize_token(t) for t in extraction_tokens
+  ]
+  matcher = difflib.SequenceMatcher(autojunk=False, b=extraction_norm)
+  best_matches, best_span = 0, None
+  for size in range(len(extraction_norm), max_window + 1):
+    for start in range(len(source_norm) - size + 1):
+      matcher.set_seq1(source_norm[start : start + size])
+      matches = sum(n for _, _, n in matcher.get_matching_blocks())
+      if matches > best_matches:
+        best_matches, best_span = matches, (start, start + size)
+  if best_span and best_matches / len(extraction_norm) >= threshold:
+    return best_span
+  return None
+
+
+class FuzzyAlignmentTest(absltest.TestCase):
+
+  def _fuzzy_align(self, source_text, extraction_text):
+    source_tokens = list(resolver_lib._tokenize_with_lowercase(source_text))
+    extraction = resolver_lib.WordAligner()._fuzzy_align_extraction(
+        data.Extraction("entity", extraction_text),
+        source_tokens,
+        tokenizer.tokenize(source_text),
+        token_offset=0,
+        char_offset=0,
+    )
+    if extraction is None:
+      return None
+    return (
+        extraction.token_interval.start_index,
+        extraction.token_interval.end_index,
+    )
+
+  def test_matches_exhaustive_window_scan(self):
+    rng = random.Random(0)
+    vocab = ["il", "6", "crp", "level", "levels", "serum", "high", "of", "in"]
+    factor = resolver_lib._FUZZY_ALIGNMENT_MAX_WINDOW_FACTOR
+    for _ in range(300):
+      source_text = " ".join(rng.choices(vocab, k=rng.randint(1, 40)))
+      extraction_text = " ".join(rng.choices(vocab, k=rng.randint(1, 6)))
+      extraction_tokens = list(
+          resolver_lib._tokenize_with_lowercase(extraction_text)
+      )
+      source_tokens = list(resolver_lib._tokenize_with_lowercase(source_text))
+      expected = _scan_all_windows(
+          source_tokens,
+          extraction_tokens,
+          resolver_lib._FUZZY_ALIGNMENT_MIN_THRESHOLD,
+          min(len(source_tokens), len(extraction_tokens) * factor),
+      )
+      with self.subTest(source=source_text, extraction=extraction_text):
+        self.assertEqual(
+            self._fuzzy_align(source_text, extraction_text), expected
+        )
+
+  def test_window_is_capped_relative_to_extraction_length(self):
+    filler = " ".join(["unrelated"] * 20)
+
+    self.assertIsNone(
+        self._fuzzy_align(
+            f"serum {filler} interleukin {filler} six", "serum interleukin six"
+        )
+    )
+    self.assertEqual(
+        self._fuzzy_align(
+            "serum high interleukin six", "serum interleukin six"
+        ),
+        (0, 4),
+    )
+
+  def test_no_shared_tokens_skips_scoring(self):
+    self.assertIsNone(
+        self._fuzzy_align("completely different words here", "troponin i")
+    )
+
 
 class ResolverTest(parameterized.TestCase):
   _TWO_MEDICATIONS_JSON_UNDELIMITED = textwrap.dedent(f"""\
@@ -0,0 +1,410 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.response_cache."""
+
+import asyncio
+import os
+import tempfile
+import time
+from unittest import mock
+
+from absl.testing import absltest
+
+import langextract as lx
+from langextract import response_cache
+from langextract.core import base_model
+from langextract.core import data
+from langextract.core import schema
+from langextract.core import types
+
+
+class _CountingModel(base_model.BaseLanguageModel):
+  """Echo model that records every prompt it is asked to infer."""
+
+  def __init__(self, model_id="fake-model", temperature=None, **kwargs):
+    super().__init__(**kwargs)
+    self.model_id = model_id
+    self.temperature = temperature
+    self.prompts = []
+
+  def infer(self, batch_prompts, **kwargs):
+    for prompt in batch_prompts:
+      self.prompts.append(prompt)
+      yield [types.ScoredOutput(score=1.0, output=f"echo:{prompt}")]
+
+
+class MakeCacheKeyTest(absltest.TestCase):
+
+  def test_key_is_stable_and_prompt_sensitive(self):
+    model = _CountingModel()
+    key = response_cache.make_cache_key(model, "a", {"top_p": 0.5})
+
+    self.assertEqual(
+        key, response_cache.make_cache_key(model, "a", {"top_p": 0.5})
+    )
+    self.assertNotEqual(key, response_cache.make_cache_key(model, "b"))
+
+  def test_key_depends_on_generation_settings(self):
+    base = response_cache.make_cache_key(_CountingModel(), "a")
+
+    self.assertNotEqual(
+        base, response_cache.make_cache_key(_CountingModel("other"), "a")
+    )
+    self.assertNotEqual(
+        base,
+        response_cache.make_cache_key(_CountingModel(temperature=0.7), "a"),
+    )
+    self.assertNotEqual(
+        base, response_cache.make_cache_key(_CountingModel(), "a", {"seed": 1})
+    )
+
+    with_schema = _CountingModel()
+    with_schema.apply_schema(schema.FormatModeSchema())
+    self.assertNotEqual(base, response_cache.make_cache_key(with_schema, "a"))
+
+  def test_key_ignores_execution_only_params(self):
+    model = _CountingModel()
+
+    self.assertEqual(
+        response_cache.make_cache_key(model, "a"),
+        response_cache.make_cache_key(
+            model, "a", {"max_workers": 8, "api_key": "secret", "top_k": None}
+        ),
+    )
+
+  def test_key_ignores_alignment_params(self):
+    model = _CountingModel()
+
+    self.assertEqual(
+        response_cache.make_cache_key(model, "a"),
+        response_cache.make_cache_key(
+            model,
+            "a",
+            {
+                "fuzzy_alignment_threshold": 0.5,
+                "enable_fuzzy_alignment": False,
+                "accept_match_lesser": False,
+                "suppress_parse_errors": True,
+            },
+        ),
+    )
+
+  def test_key_separates_extraction_passes(self):
+    model = _CountingModel()
+    first = response_cache.make_cache_key(model, "a")
+
+    self.assertEqual(
+        first,
+        response_cache.make_cache_key(
+            model, "a", {response_cache.EXTRACTION_PASS_PARAM: 0}
+        ),
+    )
+    self.assertNotEqual(
+        first,
+        response_cache.make_cache_key(
+            model, "a", {response_cache.EXTRACTION_PASS_PARAM: 1}
+        ),
+    )
+
+
+class ResponseCacheTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    tmpdir = self.enter_context(tempfile.TemporaryDirectory())
+    self.path = os.path.join(tmpdir, "nested", "cache.sqlite")
+
+  def _outputs(self, text):
+    return [types.ScoredOutput(score=1.0, output=text)]
+
+  def test_round_trip_persists_across_instances(self):
+    with response_cache.ResponseCache(self.path) as cache:
+      cache.set_multi({"k1": self._outputs("one")})
+
+    with response_cache.ResponseCache(self.path) as cache:
+      found = cache.get_multi(["k1", "k2"])
+
+      self.assertEqual(found, {"k1": self._outputs("one")})
+      self.assertEqual(cache.stats.hits, 1)
+      self.assertEqual(cache.stats.misses, 1)
+
+  def test_expired_entries_are_misses_and_evicted(self):
+    cache = response_cache.ResponseCache(self.path, max_age=60)
+    with mock.patch.object(time, "time", return_value=1000.0):
+      cache.set_multi({"old": self._outputs("old")})
+
+    with mock.patch.object(time, "time", return_value=1061.0):
+      self.assertEqual(cache.get_multi(["old"]), {})
+      self.assertEqual(cache.evict(), 1)
+
+    self.assertLen(cache, 0)
+    self.assertEqual(cache.stats.evictions, 1)
+
+  def test_max_entries_evicts_least_recently_used(self):
+    cache = response_cache.ResponseCache(self.path, max_entries=2)
+    with mock.patch.object(time, "time", return_value=1.0):
+      cache.set_multi({"a": self._outputs("a")})
+    with mock.patch.object(time, "time", return_value=2.0):
+      cache.set_multi({"b": self._outputs("b")})
+    with mock.patch.object(time, "time", return_value=3.0):
+      cache.get_multi(["a"])
+    with mock.patch.object(time, "time", return_value=4.0):
+      cache.set_multi({"c": self._outputs("c")})
+
+    self.assertCountEqual(cache.iter_keys(), ["a", "c"])
+
+  def test_max_bytes_bounds_total_size(self):
+    cache = response_cache.ResponseCache(self.path, max_bytes=200)
+    for i in range(10):
+      with mock.patch.object(time, "time", return_value=float(i)):
+        cache.set_multi({f"k{i}": self._outputs("x" * 50)})
+
+    remaining = list(cache.iter_keys())
+    self.assertNotEmpty(remaining)
+    self.assertLess(len(remaining), 10)
+    self.assertEqual(remaining[-1], "k9")
+
+
+class CachingLanguageModelTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.cache = response_cache.ResponseCache(":memory:")
+    self.inner = _CountingModel()
+    self.model = response_cache.CachingLanguageModel(self.inner, self.cache)
+
+  def test_only_misses_reach_wrapped_model(self):
+    first = [list(o) for o in self.model.infer(["a", "b"])]
+    second = [list(o) for o in self.model.infer(["b", "c", "a"])]
+
+    self.assertEqual(self.inner.prompts, ["a", "b", "c"])
+    self.assertEqual(first[0][0].output, "echo:a")
+    self.assertEqual(
+        [o[0].output for o in second], ["echo:b", "echo:c", "echo:a"]
+    )
+    self.assertEqual(self.cache.stats.hits, 2)
+    self.assertEqual(self.cache.stats.misses, 3)
+
+  def test_infer_async_uses_cache(self):
+    list(self.model.infer(["a"]))
+
+    results = asyncio.run(self.model.infer_async(["a", "b"]))
+
+    self.assertEqual([r[0].output for r in results], ["echo:a", "echo:b"])
+    self.assertEqual(self.inner.prompts, ["a", "b"])
+
+  def test_infer_stream_serves_hits_from_cache(self):
+    self.inner.infer_stream = mock.Mock(
+        side_effect=lambda prompt, **kwargs: iter(["he", "llo"])
+    )
+
+    first = list(self.model.infer_stream("a", extraction_pass=1))
+    second = list(self.model.infer_stream("a", extraction_pass=1))
+    other_pass = list(self.model.infer_stream("a", extraction_pass=2))
+
+    self.assertEqual(first, ["he", "llo"])
+    self.assertEqual(second, ["hello"])
+    self.assertEqual(other_pass, ["he", "llo"])
+    self.assertEqual(self.inner.infer_stream.call_count, 2)
+    for call in self.inner.infer_stream.call_args_list:
+      self.assertNotIn(response_cache.EXTRACTION_PASS_PARAM, call.kwargs)
+    self.assertEqual(
+        [o[0].output for o in self.model.infer(["a"], extraction_pass=1)],
+        ["hello"],
+    )
+
+  def test_infer_stream_does_not_cache_aborted_stream(self):
+    closed = []
+
+    def stream(prompt, **kwargs):
+      try:
+        yield "partial"
+        yield " rest"
+      finally:
+        closed.append(prompt)
+
+    self.inner.infer_stream = mock.Mock(side_effect=stream)
+
+    pieces = self.model.infer_stream("a")
+    self.assertEqual(next(pieces), "partial")
+    pieces.close()
+
+    self.assertEqual(closed, ["a"])
+    self.assertEqual(list(self.model.infer_stream("a")), ["partial", " rest"])
+    self.assertEqual(self.inner.infer_stream.call_count, 2)
+
+  def test_delegates_model_attributes(self):
+    self.inner.set_fence_output(False)
+
+    self.assertEqual(self.model.model_id, "fake-model")
+    self.assertFalse(self.model.requires_fence_output)
+    self.model.apply_schema(schema.FormatModeSchema())
+    self.assertIsNotNone(self.inner.schema)
+
+
+class ExtractResponseCacheTest(absltest.TestCase):
+
+  def test_rerun_makes_no_model_calls(self):
+    tmpdir = self.enter_context(tempfile.TemporaryDirectory())
+    path = os.path.join(tmpdir, "cache.sqlite")
+    inner = _CountingModel()
+    inner.infer = mock.Mock(
+        side_effect=lambda batch_prompts, **_: [
+            [
+                types.ScoredOutput(
+                    score=1.0,
+                    output='{"extractions": [{"medication": "aspirin"}]}',
+                )
+            ]
+            for _ in batch_prompts
+        ]
+    )
+    examples = [
+        lx.data.ExampleData(
+            text="Took aspirin.",
+            extractions=[lx.data.Extraction("medication", "aspirin")],
+        )
+    ]
+
+    def run():
+      return lx.extract(
+          "Patient took aspirin daily.",
+          prompt_description="Extract medications.",
+          examples=examples,
+          model=inner,
+          fence_output=False,
+          use_schema_constraints=False,
+          show_progress=False,
+          response_cache=path,
+      )
+
+    first = run()
+    calls_after_first = inner.infer.call_count
+    second = run()
+
+    self.assertGreater(calls_after_first, 0)
+    self.assertEqual(inner.infer.call_count, calls_after_first)
+    self.assertEqual(
+        [e.extraction_text for e in second.extractions],
+        [e.extraction_text for e in first.extractions],
+    )
+    self.assertIsInstance(first, data.AnnotatedDocument)
+
+  def test_each_extraction_pass_calls_model_once(self):
+    path = os.path.join(
+        self.enter_context(tempfile.TemporaryDirectory()), "cache.sqlite"
+    )
+    inner = _CountingModel()
+    seen_kwargs = []
+
+    def infer(batch_prompts, **kwargs):
+      seen_kwargs.append(kwargs)
+      return [
+          [
+              types.ScoredOutput(
+                  score=1.0,
+                  output='{"extractions": [{"medication": "aspirin"}]}',
+              )
+          ]
+          for _ in batch_prompts
+      ]
+
+    inner.infer = mock.Mock(side_effect=infer)
+    examples = [
+        lx.data.ExampleData(
+            text="Took aspirin.",
+            extractions=[lx.data.Extraction("medication", "aspirin")],
+        )
+    ]
+
+    def run(**kwargs):
+      return lx.extract(
+          "Patient took aspirin daily.",
+          prompt_description="Extract medications.",
+          examples=examples,
+          model=inner,
+          fence_output=False,
+          use_schema_constraints=False,
+          show_progress=False,
+          extraction_passes=3,
+          response_cache=path,
+          **kwargs,
+      )
+
+    run()
+    self.assertEqual(3, inner.infer.call_count)
+    self.assertTrue(
+        all(
+            response_cache.EXTRACTION_PASS_PARAM not in kwargs
+            for kwargs in seen_kwargs
+        )
+    )
+
+    run(resolver_params={"fuzzy_alignment_threshold": 0.5})
+    self.assertEqual(3, inner.infer.call_count)
+
+  def test_streamed_extraction_passes_each_call_model_once(self):
+    path = os.path.join(
+        self.enter_context(tempfile.TemporaryDirectory()), "cache.sqlite"
+    )
+    inner = _CountingModel()
+    inner.infer = mock.Mock(side_effect=AssertionError("infer called"))
+    seen_kwargs = []
+
+    def infer_stream(prompt, **kwargs):
+      seen_kwargs.append(kwargs)
+      yield '{"extractions": [{"medication": '
+      yield '"aspirin"}]}'
+
+    inner.infer_stream = mock.Mock(side_effect=infer_stream)
+    examples = [
+        lx.data.ExampleData(
+            text="Took aspirin.",
+            extractions=[lx.data.Extraction("medication", "aspirin")],
+        )
+    ]
+
+    def run():
+      return lx.extract(
+          "Patient took aspirin daily.",
+          prompt_description="Extract medications.",
+          examples=examples,
+          model=inner,
+          fence_output=False,
+          use_schema_constraints=False,
+          show_progress=False,
+          extraction_passes=3,
+          stream=True,
+          response_cache=path,
+      )
+
+    first = run()
+    self.assertEqual(3, inner.infer_stream.call_count)
+    self.assertTrue(
+        all(
+            response_cache.EXTRACTION_PASS_PARAM not in kwargs
+            for kwargs in seen_kwargs
+        )
+    )
+    self.assertEqual(
+        ["aspirin"], [e.extraction_text for e in first.extractions]
+    )
+
+    run()
+    self.assertEqual(3, inner.infer_stream.call_count)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -0,0 +1,126 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for langextract.core.streaming."""
+
+from absl.testing import absltest
+
+from langextract.core import streaming
+
+
+class FindRepetitionTest(absltest.TestCase):
+
+  def test_finds_shortest_period(self):
+    text = "preamble " + "abcd" * 10
+    self.assertEqual(
+        4,
+        streaming.find_repetition(
+            text, min_period=2, max_period=20, min_repeats=6
+        ),
+    )
+
+  def test_too_few_repeats(self):
+    text = "preamble " + "abcd" * 3
+    self.assertIsNone(
+        streaming.find_repetition(
+            text, min_period=2, max_period=20, min_repeats=6
+        )
+    )
+
+  def test_disabled_below_two_repeats(self):
+    self.assertIsNone(
+        streaming.find_repetition(
+            "ab" * 50, min_period=2, max_period=20, min_repeats=1
+        )
+    )
+
+  def test_ignores_periods_below_minimum(self):
+    text = "x" + "-" * 200
+    self.assertEqual(
+        16,
+        streaming.find_repetition(
+            text, min_period=16, max_period=20, min_repeats=6
+        ),
+    )
+
+
+class _Stream:
+  """Generator stand-in that records whether it was closed."""
+
+  def __init__(self, deltas):
+    self._deltas = iter(deltas)
+    self.consumed = 0
+    self.closed = False
+
+  def __iter__(self):
+    return self
+
+  def __next__(self):
+    delta = next(self._deltas)
+    self.consumed += 1
+    return delta
+
+  def close(self):
+    self.closed = True
+
+
+class StreamGuardTest(absltest.TestCase):
+
+  def test_passes_through_within_limits(self):
+    stream = _Stream(["ab", "", "cd"])
+    guard = streaming.StreamGuard()
+
+    self.assertEqual(["ab", "cd"], list(guard.wrap(stream)))
+    self.assertFalse(guard.aborted)
+    self.assertEqual("abcd", guard.text)
+    self.assertTrue(stream.closed)
+
+  def test_output_cap_truncates_and_closes(self):
+    stream = _Stream(["abc", "def", "ghi", "jkl"])
+    guard = streaming.StreamGuard(streaming.StreamLimits(max_output_chars=5))
+
+    self.assertEqual(["abc", "de"], list(guard.wrap(stream)))
+    self.assertEqual(streaming.ABORT_OUTPUT_CAP, guard.abort_reason)
+    self.assertEqual(2, stream.consumed)
+    self.assertTrue(stream.closed)
+
+  def test_repetition_stops_stream(self):
+    loop = '{"a": "b"}, ' * 1000
+    stream = _Stream([loop[i : i + 8] for i in range(0, len(loop), 8)])
+    guard = streaming.StreamGuard(
+        streaming.StreamLimits(
+            repetition_min_period=8, repetition_min_repeats=6, check_interval=32
+        )
+    )
+
+    list(guard.wrap(stream))
+
+    self.assertEqual(streaming.ABORT_REPETITION, guard.abort_reason)
+    self.assertLess(len(guard.text), 200)
+    self.assertTrue(stream.closed)
+
+  def test_repetition_detection_disabled(self):
+    loop = "abcdefgh" * 100
+    guard = streaming.StreamGuard(
+        streaming.StreamLimits(
+            repetition_min_period=8, repetition_min_repeats=0, check_interval=8
+        )
+    )
+
+    self.assertEqual(loop, "".join(guard.wrap([loop[:400], loop[400:]])))
+    self.assertFalse(guard.aborted)
+
+
+if __name__ == "__main__":
+  absltest.main()
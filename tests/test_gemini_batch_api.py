@@ -23,6 +23,7 @@ from absl.testing import parameterized
 from google import genai
 from google.api_core import exceptions
 
+from langextract.providers import batch_cache
 from langextract.providers import gemini
 from langextract.providers import gemini_batch as gb
 from langextract.providers import schemas
@@ -55,6 +56,16 @@ def _create_batch_response(idx, text_content):
   })
 
 
+def _create_cache_pack(entries, name="cache/packs/0-pack.jsonl"):
+  """Helper to create a mock cache pack blob holding key hash -> text."""
+  blob = mock.create_autospec(gb.storage.Blob, instance=True)
+  blob.name = name
+  blob.download_as_text.return_value = "".join(
+      json.dumps({"key": k, "text": v}) + "\n" for k, v in entries.items()
+  )
+  return blob
+
+
 def _create_batch_error(idx, code, message):
   """Helper to create a batch output line with error."""
   return json.dumps({
@@ -367,12 +378,20 @@ class TestGeminiBatchAPI(absltest.TestCase):
     self.mock_bucket.list_blobs.side_effect = list_blobs_side_effect
 
     # Setup mock jobs
-    job0 = create_mock_batch_job(gcs_uri="gs://b/batch-input/part-0/out")
-    job1 = create_mock_batch_job(gcs_uri="gs://b/batch-input/part-1/out")
-    job2 = create_mock_batch_job(gcs_uri="gs://b/batch-input/part-2/out")
+    # Shards are submitted concurrently, so jobs are looked up by name.
+    jobs = {}
+    for part in range(3):
+      job = create_mock_batch_job(gcs_uri=f"gs://b/batch-input/part-{part}/out")
+      job.name = f"batches/part-{part}"
+      jobs[job.name] = job
+
+    def create_side_effect(model, src, config):
+      del model, src
+      part = config["display_name"].rsplit("-", maxsplit=1)[-1]
+      return jobs[f"batches/part-{part}"]
 
-    mock_client.batches.create.side_effect = [job0, job1, job2]
-    mock_client.batches.get.side_effect = [job0, job1, job2]
+    mock_client.batches.create.side_effect = create_side_effect
+    mock_client.batches.get.side_effect = lambda name: jobs[name]
 
     model = gemini.GeminiLanguageModel(
         model_id="gemini-2.5-flash",
@@ -507,6 +526,8 @@ class GCSBatchCachingTest(absltest.TestCase):
 
   def setUp(self):
     super().setUp()
+    gb.reset_gcs_caches()
+    self.addCleanup(gb.reset_gcs_caches)
     self.mock_storage_cls = self.enter_context(
         mock.patch.object(gb.storage, "Client", autospec=True)
     )
@@ -522,7 +543,20 @@ class GCSBatchCachingTest(absltest.TestCase):
     mock_client.project = "p"
     mock_client.location = "l"
 
-    self.mock_blob.download_as_text.return_value = '{"text": "cached_response"}'
+    key_hash = gb.GCSBatchCache._compute_hash(
+        None,
+        {
+            "model_id": "m",
+            "prompt": "p1",
+            "system_instruction": None,
+            "gen_config": {},
+            "safety_settings": None,
+            "schema": None,
+        },
+    )
+    self.mock_bucket.list_blobs.return_value = [
+        _create_cache_pack({key_hash: "cached_response"})
+    ]
 
     cfg = gb.BatchConfig(
         enabled=True,
@@ -543,8 +577,41 @@ class GCSBatchCachingTest(absltest.TestCase):
     self.assertListEqual(outs, ["cached_response"])
 
     mock_client.batches.create.assert_not_called()
+    self.mock_bucket.list_blobs.assert_called_once_with(prefix="cache/")
 
-    self.mock_bucket.blob.assert_called()
+  @mock.patch.object(genai, "Client", autospec=True)
+  def test_cache_instance_reused_across_calls(self, mock_client_cls):
+    """Later batches only list the bucket; known packs are not re-read."""
+    mock_client = mock_client_cls.return_value
+    mock_client.vertexai = True
+    mock_client.project = "p"
+    mock_client.location = "l"
+    pack = _create_cache_pack({"hash_p1": "r1", "hash_p2": "r2"})
+    self.mock_bucket.list_blobs.return_value = [pack]
+    cfg = gb.BatchConfig(
+        enabled=True, threshold=1, enable_caching=True, retention_days=None
+    )
+
+    with mock.patch.object(
+        gb.GCSBatchCache,
+        "_compute_hash",
+        side_effect=lambda k: f"hash_{k['prompt']}",
+    ):
+      for prompts in (["p1"], ["p2", "p1"]):
+        outs = gb.infer_batch(
+            client=mock_client,
+            model_id="m",
+            prompts=prompts,
+            schema_dict=None,
+            gen_config={},
+            cfg=cfg,
+        )
+        self.assertEqual([f"r{p[1]}" for p in prompts], outs)
+
+    pack.download_as_text.assert_called_once()
+    self.assertEqual(2, self.mock_bucket.list_blobs.call_count)
+    self.mock_storage_cls.assert_called_once()
+    mock_client.batches.create.assert_not_called()
 
   @mock.patch.object(genai, "Client", autospec=True)
   def test_partial_cache_hit(self, mock_client_cls):
@@ -559,19 +626,7 @@ class GCSBatchCachingTest(absltest.TestCase):
     with mock.patch.object(gb.GCSBatchCache, "_compute_hash") as mock_hash:
       mock_hash.side_effect = lambda k: f"hash_{k['prompt']}"
 
-      # Pre-configure blobs
-      blob_hit = mock.create_autospec(gb.storage.Blob, instance=True)
-      blob_hit.download_as_text.return_value = '{"text": "cached_response"}'
-
-      blob_miss = mock.create_autospec(gb.storage.Blob, instance=True)
-      blob_miss.download_as_text.side_effect = exceptions.NotFound("Not found")
-
-      def get_blob(name):
-        if "hash_cached_prompt" in name:
-          return blob_hit
-        return blob_miss
-
-      self.mock_bucket.blob.side_effect = get_blob
+      pack_blob = _create_cache_pack({"hash_cached_prompt": "cached_response"})
 
       # Mock list_blobs to return the batch output file for the new prompt
       output_blob = mock.create_autospec(gb.storage.Blob, instance=True)
@@ -579,7 +634,9 @@ class GCSBatchCachingTest(absltest.TestCase):
       output_blob.open.return_value.__enter__.return_value = io.StringIO(
           _create_batch_response(0, "new_response")
       )
-      self.mock_bucket.list_blobs.return_value = [output_blob]
+      self.mock_bucket.list_blobs.side_effect = lambda prefix: (
+          [pack_blob] if prefix == "cache/" else [output_blob]
+      )
 
       job = create_mock_batch_job()
       mock_client.batches.create.return_value = job
@@ -604,12 +661,17 @@ class GCSBatchCachingTest(absltest.TestCase):
       self.assertListEqual(outs, ["cached_response", "new_response"])
       mock_client.batches.create.assert_called_once()
 
-      # Verify "new_response" was uploaded to cache (using the miss blob)
-      # The blob used for upload is blob_miss because it was returned for the miss key
+      # Verify "new_response" was uploaded to cache as a new pack file.
+      pack_names = [
+          call.args[0]
+          for call in self.mock_bucket.blob.mock_calls
+          if call.args and call.args[0].startswith(gb._CACHE_PACK_PREFIX)
+      ]
+      self.assertLen(pack_names, 1)
       upload_calls = [
           call
-          for call in blob_miss.upload_from_string.mock_calls
-          if "new_response" in str(call)
+          for call in self.mock_blob.upload_from_string.mock_calls
+          if "new_response" in str(call) and "hash_new_prompt" in str(call)
       ]
       self.assertTrue(
           upload_calls, "Should have uploaded new_response to cache"
@@ -672,6 +734,80 @@ class GCSBatchCachingTest(absltest.TestCase):
         f"but was called with: {[call.kwargs for call in storage_calls]}",
     )
 
+  def test_bulk_lookup_skips_missing_single_entries(self):
+    """Only keys listed in the bucket are fetched individually."""
+    pack = _create_cache_pack({"h1": "from_pack"})
+    single = mock.create_autospec(gb.storage.Blob, instance=True)
+    single.name = f"cache/h2{gb._EXT_JSON}"
+    single.download_as_text.return_value = '{"text": "from_single"}'
+    self.mock_bucket.list_blobs.return_value = [pack, single]
+    self.mock_blob.download_as_text.return_value = '{"text": "from_single"}'
+    cache = gb.GCSBatchCache("b")
+
+    with mock.patch.object(
+        gb.GCSBatchCache, "_compute_hash", side_effect=lambda k: k["h"]
+    ):
+      hits = cache.get_multi([{"h": "h1"}, {"h": "h2"}, {"h": "h3"}])
+
+    self.assertEqual({0: "from_pack", 1: "from_single"}, hits)
+    self.mock_bucket.blob.assert_called_once_with(f"cache/h2{gb._EXT_JSON}")
+    self.assertEqual(
+        [("h1", "from_pack"), ("h2", "from_single")],
+        list(cache.iter_items()),
+    )
+
+  def test_set_multi_writes_one_pack(self):
+    cache = gb.GCSBatchCache("b")
+
+    cache.set_multi([({"prompt": "a"}, "ra"), ({"prompt": "b"}, {"x": 1})])
+
+    self.mock_bucket.blob.assert_called_once()
+    self.assertTrue(
+        self.mock_bucket.blob.call_args.args[0].startswith(
+            gb._CACHE_PACK_PREFIX
+        )
+    )
+    payload = self.mock_blob.upload_from_string.call_args.args[0]
+    texts = [json.loads(line)["text"] for line in payload.splitlines()]
+    self.assertEqual(["ra", '{"x": 1}'], texts)
+
+  @mock.patch.object(genai, "Client", autospec=True)
+  def test_custom_cache_backend(self, mock_client_cls):
+    """A configured backend is used instead of GCS."""
+    mock_client = mock_client_cls.return_value
+    mock_client.vertexai = True
+    cache = batch_cache.SQLiteBatchCache(":memory:")
+    self.addCleanup(cache.close)
+    key_data = {
+        "model_id": "m",
+        "prompt": "p1",
+        "system_instruction": None,
+        "gen_config": {},
+        "safety_settings": None,
+        "schema": None,
+    }
+    cache.set_multi([(key_data, "local_response")])
+
+    cfg = gb.BatchConfig(
+        enabled=True,
+        threshold=1,
+        enable_caching=True,
+        retention_days=None,
+        cache=cache,
+    )
+    outs = gb.infer_batch(
+        client=mock_client,
+        model_id="m",
+        prompts=["p1"],
+        schema_dict=None,
+        gen_config={},
+        cfg=cfg,
+    )
+
+    self.assertEqual(["local_response"], outs)
+    mock_client.batches.create.assert_not_called()
+    self.mock_bucket.list_blobs.assert_not_called()
+
   def test_cache_hashing_stability(self):
     """Test that hash is stable for same inputs."""
     cache = gb.GCSBatchCache("b")
@@ -1012,5 +1012,102 @@ class SentenceRangeTest(parameterized.TestCase):
     self.assertEqual(sentence2.end_index, 6)
 
 
+class TokenizedTextStorageTest(parameterized.TestCase):
+  """Tests for the columnar TokenizedText storage and its Token view."""
+
+  _TEXT = "Dr. Smith saw 3 patients.\nThey improved!"
+
+  @parameterized.named_parameters(
+      ("regex", tokenizer.RegexTokenizer()),
+      ("unicode", tokenizer.UnicodeTokenizer()),
+  )
+  def test_view_matches_columns(self, tokenizer_impl):
+    tokenized = tokenizer_impl.tokenize(self._TEXT)
+
+    self.assertLen(tokenized.tokens, tokenized.num_tokens)
+    for i, token in enumerate(tokenized.tokens):
+      self.assertEqual(token.index, i)
+      self.assertEqual(token.char_interval.start_pos, tokenized.starts[i])
+      self.assertEqual(token.char_interval.end_pos, tokenized.ends[i])
+      self.assertEqual(token.token_type, tokenized.token_types[i])
+      self.assertIsInstance(token.token_type, tokenizer.TokenType)
+      self.assertEqual(
+          token.first_token_after_newline, bool(tokenized.newline_flags[i])
+      )
+    self.assertEqual(tokenized.token_text(0), "Dr")
+
+  def test_view_supports_list_operations(self):
+    tokenized = tokenizer.tokenize(self._TEXT)
+    tokens = list(tokenized.tokens)
+
+    self.assertEqual(tokenized.tokens[-1], tokens[-1])
+    self.assertEqual(tokenized.tokens[1:3], tokens[1:3])
+    self.assertEqual(tokenized.tokens, tokens)
+    with self.assertRaises(IndexError):
+      _ = tokenized.tokens[len(tokens)]
+
+  def test_round_trip_from_token_objects(self):
+    tokenized = tokenizer.tokenize(self._TEXT)
+
+    rebuilt = tokenizer.TokenizedText(
+        text=self._TEXT, tokens=list(tokenized.tokens)
+    )
+
+    self.assertEqual(rebuilt, tokenized)
+
+  def test_append_through_view(self):
+    tokenized = tokenizer.TokenizedText(text="ab")
+    tokenized.tokens.append(
+        tokenizer.Token(
+            index=0,
+            token_type=tokenizer.TokenType.WORD,
+            char_interval=tokenizer.CharInterval(0, 2),
+        )
+    )
+
+    self.assertEqual(tokenized.num_tokens, 1)
+    self.assertEqual(
+        tokenizer.tokens_text(tokenized, tokenizer.TokenInterval(0, 1)), "ab"
+    )
+
+  def test_sentence_ends_match_sentence_range(self):
+    text = 'Dr. Smith said "Stop!" (Really.)\nThen M. Jones left.\nok\nNext'
+    for tok in (tokenizer.RegexTokenizer(), tokenizer.UnicodeTokenizer()):
+      tokenized = tok.tokenize(text)
+      for abbreviations in (tokenizer._KNOWN_ABBREVIATIONS, {"M."}):
+        sentence_ends = tokenizer.find_sentence_ends(
+            text, tokenized, known_abbreviations=abbreviations
+        )
+        expected = [
+            tokenizer.find_sentence_range(
+                text, tokenized, i, known_abbreviations=abbreviations
+            ).end_index
+            for i in range(tokenized.num_tokens)
+        ]
+        self.assertEqual(list(sentence_ends), expected)
+
+  def test_sentence_ends_empty_input(self):
+    self.assertEmpty(tokenizer.find_sentence_ends("", []))
+
+  def test_sentence_range_accepts_token_list(self):
+    tokenized = tokenizer.tokenize(self._TEXT)
+
+    self.assertEqual(
+        tokenizer.find_sentence_range(self._TEXT, list(tokenized.tokens), 0),
+        tokenizer.find_sentence_range(self._TEXT, tokenized, 0),
+    )
+
+
+class EstimateTokenCountTest(parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ("empty", "", 0),
+      ("one_char", "a", 1),
+      ("rounds_up", "abcde", 2),
+  )
+  def test_estimate_token_count(self, text, expected):
+    self.assertEqual(tokenizer.estimate_token_count(text), expected)
+
+
 if __name__ == "__main__":
   absltest.main()